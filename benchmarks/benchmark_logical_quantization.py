@@ -0,0 +1,101 @@
+"""Compare quantizing after and before the pixel-mode upscale.
+
+Run from the repository root:
+
+    python benchmarks/benchmark_logical_quantization.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+from PIL import Image
+
+PROJECT_ROOT_DIRECTORY = Path(__file__).resolve().parents[1]
+SOURCE_DIRECTORY = PROJECT_ROOT_DIRECTORY / "src"
+if str(SOURCE_DIRECTORY) not in sys.path:
+    sys.path.insert(0, str(SOURCE_DIRECTORY))
+
+from pixelling.ops.pipeline import compile_transformation_plan
+from pixelling.ops.pixelate import pixelate_image_with_block_size
+from pixelling.ops.quantize import quantize_image_colors
+
+BENCHMARK_IMAGE_SIZE = (1920, 1080)
+BENCHMARK_BLOCK_SIZES = (4, 8, 16, 32)
+BENCHMARK_COLOR_COUNT = 16
+BENCHMARK_REPEAT_COUNT = 5
+
+
+def create_benchmark_image(image_size: tuple[int, int]) -> Image.Image:
+    """Return a smooth, colorful test image of the given size.
+
+    Args:
+        image_size: Width and height of the image.
+
+    Returns:
+        An RGB image with many distinct colors.
+    """
+    return Image.merge(
+        "RGB",
+        (
+            Image.linear_gradient("L").resize(image_size),
+            Image.linear_gradient("L").rotate(90).resize(image_size),
+            Image.radial_gradient("L").resize(image_size),
+        ),
+    )
+
+
+def measure_fastest_run_seconds(run_transformation, repeat_count: int) -> float:
+    """Return the fastest wall time of several runs in seconds.
+
+    Args:
+        run_transformation: Function to time, called without arguments.
+        repeat_count: Number of timed runs.
+
+    Returns:
+        The shortest run time in seconds.
+    """
+    fastest_run_seconds = float("inf")
+    for _ in range(repeat_count):
+        start_time = time.perf_counter()
+        run_transformation()
+        fastest_run_seconds = min(fastest_run_seconds, time.perf_counter() - start_time)
+    return fastest_run_seconds
+
+
+def main() -> int:
+    input_image = create_benchmark_image(BENCHMARK_IMAGE_SIZE)
+    print(
+        f"{BENCHMARK_IMAGE_SIZE[0]}x{BENCHMARK_IMAGE_SIZE[1]} RGB, "
+        f"{BENCHMARK_COLOR_COUNT} colors, best of {BENCHMARK_REPEAT_COUNT}"
+    )
+    print(f"{'block':>5}  {'upscale first':>13}  {'quantize first':>14}  {'speed-up':>8}  identical")
+    for block_size in BENCHMARK_BLOCK_SIZES:
+        transformation_plan = compile_transformation_plan(
+            transformation_mode="pixel", block_size=block_size, color_count=BENCHMARK_COLOR_COUNT
+        )
+        upscaled_first_image = quantize_image_colors(
+            pixelate_image_with_block_size(input_image, block_size), BENCHMARK_COLOR_COUNT
+        )
+        quantized_first_image = transformation_plan.apply(input_image)
+        upscaled_first_seconds = measure_fastest_run_seconds(
+            lambda: quantize_image_colors(
+                pixelate_image_with_block_size(input_image, block_size), BENCHMARK_COLOR_COUNT
+            ),
+            BENCHMARK_REPEAT_COUNT,
+        )
+        quantized_first_seconds = measure_fastest_run_seconds(
+            lambda: transformation_plan.apply(input_image),
+            BENCHMARK_REPEAT_COUNT,
+        )
+        print(
+            f"{block_size:>5}  {upscaled_first_seconds * 1000:>11.1f}ms  "
+            f"{quantized_first_seconds * 1000:>12.1f}ms  "
+            f"{upscaled_first_seconds / quantized_first_seconds:>7.1f}x  "
+            f"{upscaled_first_image.tobytes() == quantized_first_image.tobytes()}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,135 @@
+"""Measure how long the command line takes to import before it parses arguments.
+
+Run from the repository root:
+
+    python benchmarks/benchmark_startup.py
+    python benchmarks/benchmark_startup.py --max-import-ms 60
+
+With ``--max-import-ms`` the script exits with status 1 when the fastest
+import of ``pixelling.cli`` takes longer. It always exits with status 1
+when ``pixelling --help`` imports Pillow.
+"""
+
+import os
+import subprocess
+import sys
+from argparse import ArgumentParser, Namespace
+from pathlib import Path
+
+PROJECT_ROOT_DIRECTORY = Path(__file__).resolve().parents[1]
+SOURCE_DIRECTORY = PROJECT_ROOT_DIRECTORY / "src"
+
+DEFAULT_BENCHMARK_REPEAT_COUNT = 5
+MEASURED_MODULE_NAMES = ("pixelling", "pixelling.cli", "argparse")
+LIMITED_MODULE_NAME = "pixelling.cli"
+MICROSECONDS_PER_MILLISECOND = 1000
+
+
+def parse_import_times(import_time_output: str) -> dict[str, int]:
+    """Return the cumulative import time of every module in ``-X importtime`` output.
+
+    Args:
+        import_time_output: Standard error of a Python run with ``-X importtime``.
+
+    Returns:
+        Cumulative import times in microseconds, keyed by module name.
+    """
+    cumulative_import_times: dict[str, int] = {}
+    for output_line in import_time_output.splitlines():
+        if not output_line.startswith("import time:") or "|" not in output_line:
+            continue
+        _, cumulative_microseconds, module_name = output_line.split("|")
+        if cumulative_microseconds.strip().isdigit():
+            cumulative_import_times[module_name.strip()] = int(cumulative_microseconds)
+    return cumulative_import_times
+
+
+def measure_help_import_times() -> dict[str, int]:
+    """Run ``pixelling --help`` in a fresh interpreter and return its import times.
+
+    Returns:
+        Cumulative import times in microseconds, keyed by module name.
+    """
+    completed_process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "pixelling", "--help"],
+        capture_output=True,
+        text=True,
+        env=dict(os.environ, PYTHONPATH=str(SOURCE_DIRECTORY)),
+        cwd=PROJECT_ROOT_DIRECTORY,
+        check=True,
+    )
+    return parse_import_times(completed_process.stderr)
+
+
+def is_pillow_module_name(module_name: str) -> bool:
+    """Return whether a module belongs to Pillow.
+
+    Args:
+        module_name: Dotted module name.
+
+    Returns:
+        True for "PIL" and its submodules.
+    """
+    return module_name.split(".")[0] == "PIL"
+
+
+def create_startup_benchmark_argument_parser() -> ArgumentParser:
+    """Create and return the argument parser for the startup benchmark.
+
+    Returns:
+        An argument parser with the repeat count and import time limit.
+    """
+    argument_parser = ArgumentParser(description="Measure the import time of 'pixelling --help'.")
+    argument_parser.add_argument(
+        "--repeat",
+        type=int,
+        default=DEFAULT_BENCHMARK_REPEAT_COUNT,
+        help="Number of fresh interpreters to time; the fastest import is compared.",
+    )
+    argument_parser.add_argument(
+        "--max-import-ms",
+        type=float,
+        default=None,
+        help=f"Largest allowed import time of {LIMITED_MODULE_NAME} in milliseconds.",
+    )
+    return argument_parser
+
+
+def main(command_line_arguments: list[str] | None = None) -> int:
+    argument_parser = create_startup_benchmark_argument_parser()
+    parsed_arguments: Namespace = argument_parser.parse_args(command_line_arguments)
+    if parsed_arguments.repeat <= 0:
+        raise ValueError("Repeat count must be greater than 0.")
+
+    fastest_import_times: dict[str, int] = {}
+    imported_pillow = False
+    for _ in range(parsed_arguments.repeat):
+        import_times = measure_help_import_times()
+        imported_pillow = imported_pillow or any(map(is_pillow_module_name, import_times))
+        for module_name in MEASURED_MODULE_NAMES:
+            if module_name in import_times:
+                fastest_import_times[module_name] = min(
+                    fastest_import_times.get(module_name, import_times[module_name]),
+                    import_times[module_name],
+                )
+
+    print(f"pixelling --help, best of {parsed_arguments.repeat}")
+    for module_name, import_microseconds in fastest_import_times.items():
+        print(f"{module_name:<15} {import_microseconds / MICROSECONDS_PER_MILLISECOND:>7.1f}ms")
+    print(f"Pillow imported: {imported_pillow}")
+
+    exit_status = 1 if imported_pillow else 0
+    if parsed_arguments.max_import_ms is not None:
+        limited_import_microseconds = fastest_import_times[LIMITED_MODULE_NAME]
+        limited_import_milliseconds = limited_import_microseconds / MICROSECONDS_PER_MILLISECOND
+        if limited_import_milliseconds > parsed_arguments.max_import_ms:
+            print(
+                f"{LIMITED_MODULE_NAME} took {limited_import_milliseconds:.1f}ms, "
+                f"over the {parsed_arguments.max_import_ms:g}ms limit."
+            )
+            exit_status = 1
+    return exit_status
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
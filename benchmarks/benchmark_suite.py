@@ -0,0 +1,590 @@
+"""Benchmark the image operations, pipelines, and GIF input/output.
+
+Run from the repository root:
+
+    python benchmarks/benchmark_suite.py run -o benchmark_results.json
+    python benchmarks/benchmark_suite.py compare baseline.json benchmark_results.json
+
+Every case uses synthetic images and runs in a fresh process, so the peak
+memory reported for one case is not inflated by the cases before it.
+"""
+
+import json
+import multiprocessing
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from argparse import ArgumentParser, Namespace, RawTextHelpFormatter
+from collections.abc import Callable
+from datetime import datetime, timezone
+from pathlib import Path
+
+PROJECT_ROOT_DIRECTORY = Path(__file__).resolve().parents[1]
+SOURCE_DIRECTORY = PROJECT_ROOT_DIRECTORY / "src"
+if str(SOURCE_DIRECTORY) not in sys.path:
+    sys.path.insert(0, str(SOURCE_DIRECTORY))
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+BENCHMARK_RESULT_FORMAT_VERSION = 1
+DEFAULT_BENCHMARK_REPEAT_COUNT = 5
+DEFAULT_TIME_REGRESSION_THRESHOLD = 0.15
+DEFAULT_MEMORY_REGRESSION_THRESHOLD = 0.25
+MEMORY_REGRESSION_MINIMUM_MEGABYTES = 2.0
+TIME_REGRESSION_MINIMUM_SECONDS = 0.0005
+MINIMUM_MEASURED_SECONDS = 0.25
+MAXIMUM_BENCHMARK_REPEAT_COUNT = 200
+BYTES_PER_MEGABYTE = 1024 * 1024
+STILL_IMAGE_SIZES = ((256, 256), (1024, 1024), (2048, 2048))
+QUICK_STILL_IMAGE_SIZES = ((256, 256), (1024, 1024))
+STILL_IMAGE_MODES = ("RGB", "RGBA", "P")
+PIXEL_BLOCK_SIZES = (4, 16)
+BENCHMARK_GRID_SIZE = (64, 64)
+BENCHMARK_COLOR_COUNT = 16
+ANIMATED_FRAME_SIZE = (256, 256)
+ANIMATED_FRAME_COUNTS = (8, 32)
+QUICK_ANIMATED_FRAME_COUNTS = (8,)
+ENCODE_IMAGE_SIZE = (1024, 1024)
+ENCODE_FORMATS = ("png", "jpeg")
+
+
+def create_synthetic_image(image_size: tuple[int, int], mode: str, seed: int = 0):
+    """Return a deterministic image with smooth gradients and a hard-edged pattern.
+
+    Args:
+        image_size: Width and height of the image.
+        mode: "RGB", "RGBA", or "P".
+        seed: Offset that shifts the pattern, used to vary animation frames.
+
+    Returns:
+        A Pillow image in the requested mode.
+    """
+    from PIL import Image, ImageDraw
+
+    width, height = image_size
+    image = Image.merge(
+        "RGB",
+        (
+            Image.linear_gradient("L").resize(image_size),
+            Image.linear_gradient("L").rotate(90).resize(image_size),
+            Image.radial_gradient("L").resize(image_size),
+        ),
+    )
+    drawing = ImageDraw.Draw(image)
+    stripe_width = max(1, width // 16)
+    for stripe_left in range((seed * 7) % (2 * stripe_width), width, 2 * stripe_width):
+        drawing.rectangle(
+            (stripe_left, height // 4, stripe_left + stripe_width - 1, height // 2),
+            fill=((seed * 40) % 256, 200, 90),
+        )
+
+    if mode == "RGBA":
+        image = image.convert("RGBA")
+        image.putalpha(Image.linear_gradient("L").rotate(45).resize(image_size))
+    elif mode == "P":
+        image = image.quantize(colors=64)
+    return image
+
+
+def build_benchmark_cases(quick: bool = False) -> list[dict[str, object]]:
+    """Return the description of every benchmark case.
+
+    Args:
+        quick: Whether to leave out the largest sizes and frame counts.
+
+    Returns:
+        Case dictionaries with a unique "name", an "operation", and its parameters.
+    """
+    still_image_sizes = QUICK_STILL_IMAGE_SIZES if quick else STILL_IMAGE_SIZES
+    animated_frame_counts = QUICK_ANIMATED_FRAME_COUNTS if quick else ANIMATED_FRAME_COUNTS
+    benchmark_cases: list[dict[str, object]] = []
+
+    for image_size in still_image_sizes:
+        size_name = f"{image_size[0]}x{image_size[1]}"
+        for mode in STILL_IMAGE_MODES:
+            for block_size in PIXEL_BLOCK_SIZES:
+                benchmark_cases.append(
+                    {
+                        "name": f"pixelate/{mode}/{size_name}/block{block_size}",
+                        "operation": "pixelate",
+                        "image_size": image_size,
+                        "mode": mode,
+                        "block_size": block_size,
+                    }
+                )
+            benchmark_cases.append(
+                {
+                    "name": f"grid/{mode}/{size_name}",
+                    "operation": "grid",
+                    "image_size": image_size,
+                    "mode": mode,
+                }
+            )
+            benchmark_cases.append(
+                {
+                    "name": f"quantize/{mode}/{size_name}/colors{BENCHMARK_COLOR_COUNT}",
+                    "operation": "quantize",
+                    "image_size": image_size,
+                    "mode": mode,
+                }
+            )
+        for block_size in PIXEL_BLOCK_SIZES:
+            benchmark_cases.append(
+                {
+                    "name": f"still_pipeline/RGB/{size_name}/block{block_size}/colors{BENCHMARK_COLOR_COUNT}",
+                    "operation": "still_pipeline",
+                    "image_size": image_size,
+                    "mode": "RGB",
+                    "block_size": block_size,
+                }
+            )
+
+    from pixelling.ops.option_values import ENCODE_PROFILES
+
+    encode_size_name = f"{ENCODE_IMAGE_SIZE[0]}x{ENCODE_IMAGE_SIZE[1]}"
+    for encode_format in ENCODE_FORMATS:
+        for encode_profile in ENCODE_PROFILES:
+            benchmark_cases.append(
+                {
+                    "name": f"encode/{encode_format}/{encode_size_name}/{encode_profile}",
+                    "operation": "encode",
+                    "image_size": ENCODE_IMAGE_SIZE,
+                    "mode": "RGB",
+                    "encode_format": encode_format,
+                    "encode_profile": encode_profile,
+                    "block_size": 8,
+                }
+            )
+
+    frame_size_name = f"{ANIMATED_FRAME_SIZE[0]}x{ANIMATED_FRAME_SIZE[1]}"
+    for frame_count in animated_frame_counts:
+        for operation in ("animated_pipeline", "gif_save", "gif_load"):
+            benchmark_cases.append(
+                {
+                    "name": f"{operation}/RGBA/{frame_size_name}/frames{frame_count}",
+                    "operation": operation,
+                    "image_size": ANIMATED_FRAME_SIZE,
+                    "mode": "RGBA",
+                    "frame_count": frame_count,
+                    "block_size": 8,
+                }
+            )
+    return benchmark_cases
+
+
+def prepare_benchmark_case(benchmark_case: dict[str, object], work_directory_path: str) -> Callable[[], None]:
+    """Create the inputs for a case and return a function that runs it once.
+
+    Args:
+        benchmark_case: Case dictionary from ``build_benchmark_cases``.
+        work_directory_path: Directory for temporary GIF files.
+
+    Returns:
+        A function without arguments that performs the measured work. For
+        "encode" cases it returns the number of bytes written.
+    """
+    from pixelling.gif_io import open_media_source_gif_frame_stream, save_animated_gif_frames_to_path
+    from pixelling.io import save_image_to_path
+    from pixelling.media_source import probe_media_source
+    from pixelling.ops.animated_pipeline import iterate_animated_image_transformation_pipeline
+    from pixelling.ops.grid import resize_image_to_fixed_grid
+    from pixelling.ops.pipeline import run_image_transformation_pipeline
+    from pixelling.ops.pixelate import pixelate_image_with_block_size
+    from pixelling.ops.quantize import quantize_image_colors
+
+    operation = benchmark_case["operation"]
+    image_size = tuple(benchmark_case["image_size"])
+    mode = benchmark_case["mode"]
+
+    if operation in ("pixelate", "grid", "quantize", "still_pipeline"):
+        input_image = create_synthetic_image(image_size, mode)
+        if operation == "pixelate":
+            return lambda: pixelate_image_with_block_size(input_image, benchmark_case["block_size"])
+        if operation == "grid":
+            return lambda: resize_image_to_fixed_grid(input_image, *BENCHMARK_GRID_SIZE)
+        if operation == "quantize":
+            return lambda: quantize_image_colors(input_image, BENCHMARK_COLOR_COUNT)
+        return lambda: run_image_transformation_pipeline(
+            image=input_image,
+            transformation_mode="pixel",
+            block_size=benchmark_case["block_size"],
+            color_count=BENCHMARK_COLOR_COUNT,
+        )
+    if operation == "encode":
+        pixelated_image = pixelate_image_with_block_size(
+            create_synthetic_image(image_size, mode), benchmark_case["block_size"]
+        )
+        encode_path = os.path.join(work_directory_path, f"benchmark.{benchmark_case['encode_format']}")
+
+        def encode_image() -> int:
+            save_image_to_path(
+                pixelated_image,
+                encode_path,
+                allow_overwrite=True,
+                encode_profile=benchmark_case["encode_profile"],
+            )
+            return os.path.getsize(encode_path)
+
+        return encode_image
+
+    frames = [
+        create_synthetic_image(image_size, mode, seed=frame_index)
+        for frame_index in range(benchmark_case["frame_count"])
+    ]
+    gif_path = os.path.join(work_directory_path, "benchmark.gif")
+    metadata = {"loop": 0, "duration": 40}
+
+    if operation == "animated_pipeline":
+        return lambda: list(
+            iterate_animated_image_transformation_pipeline(
+                frames=frames,
+                transformation_mode="pixel",
+                block_size=benchmark_case["block_size"],
+                color_count=BENCHMARK_COLOR_COUNT,
+            )
+        )
+    if operation == "gif_save":
+        return lambda: save_animated_gif_frames_to_path(frames, gif_path, metadata)
+
+    save_animated_gif_frames_to_path(frames, gif_path, metadata)
+
+    def load_gif_frames() -> None:
+        with probe_media_source(gif_path) as media_source:
+            frame_stream, _ = open_media_source_gif_frame_stream(media_source)
+            for _ in frame_stream:
+                pass
+
+    return load_gif_frames
+
+
+def reset_peak_resident_memory() -> float | None:
+    """Reset Linux's peak resident memory counter and return the current usage.
+
+    Returns:
+        The resident set size in megabytes after the reset, or None where
+        the counter cannot be reset.
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as clear_references_file:
+            clear_references_file.write("5")
+    except OSError:
+        return None
+    return read_process_status_megabytes("VmRSS")
+
+
+def read_process_status_megabytes(field_name: str) -> float | None:
+    """Return a memory field of ``/proc/self/status`` in megabytes.
+
+    Args:
+        field_name: Field such as "VmRSS" or "VmHWM".
+
+    Returns:
+        The field value, or None when it is not available.
+    """
+    try:
+        with open("/proc/self/status", encoding="ascii") as status_file:
+            for status_line in status_file:
+                if status_line.startswith(f"{field_name}:"):
+                    return int(status_line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def read_peak_resident_megabytes() -> float | None:
+    """Return this process's peak resident memory in megabytes, if available.
+
+    Returns:
+        The peak resident set size, or None where ``resource`` is missing.
+    """
+    if resource is None:
+        return None
+    peak_resident_size = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        return peak_resident_size / BYTES_PER_MEGABYTE
+    return peak_resident_size / 1024
+
+
+def measure_benchmark_case(benchmark_case: dict[str, object], repeat_count: int) -> dict[str, object]:
+    """Run one case several times and return its timing and memory figures.
+
+    Peak memory is how far the resident set size rises above its level
+    once the modules are loaded and the inputs created. On Linux the peak
+    counter is reset after setup; elsewhere the growth of the lifetime
+    peak is used, which misses memory that setup had already reached.
+    Without ``resource``, Python-level allocations traced by ``tracemalloc``
+    are reported instead.
+
+    Args:
+        benchmark_case: Case dictionary from ``build_benchmark_cases``.
+        repeat_count: Minimum number of timed runs after one warm-up run.
+            Short cases run more often, until they fill
+            ``MINIMUM_MEASURED_SECONDS`` or reach
+            ``MAXIMUM_BENCHMARK_REPEAT_COUNT`` runs.
+
+    Returns:
+        The case dictionary extended with the measured figures, including
+        the output size of "encode" cases.
+    """
+    with tempfile.TemporaryDirectory(prefix="pixelling-benchmark-") as work_directory_path:
+        run_benchmark_case = prepare_benchmark_case(benchmark_case, work_directory_path)
+        setup_resident_megabytes = reset_peak_resident_memory()
+        setup_peak_megabytes = read_peak_resident_megabytes()
+        if setup_peak_megabytes is None:
+            tracemalloc.start()
+
+        warm_up_start_time = time.perf_counter()
+        encoded_byte_count = run_benchmark_case()
+        warm_up_seconds = time.perf_counter() - warm_up_start_time
+        repeat_count = max(
+            repeat_count,
+            min(MAXIMUM_BENCHMARK_REPEAT_COUNT, int(MINIMUM_MEASURED_SECONDS / max(warm_up_seconds, 1e-6))),
+        )
+        run_seconds: list[float] = []
+        for _ in range(repeat_count):
+            start_time = time.perf_counter()
+            run_benchmark_case()
+            run_seconds.append(time.perf_counter() - start_time)
+
+        if setup_resident_megabytes is not None:
+            peak_memory_megabytes = read_process_status_megabytes("VmHWM") - setup_resident_megabytes
+        elif setup_peak_megabytes is None:
+            peak_memory_megabytes = tracemalloc.get_traced_memory()[1] / BYTES_PER_MEGABYTE
+            tracemalloc.stop()
+        else:
+            peak_memory_megabytes = read_peak_resident_megabytes() - setup_peak_megabytes
+
+    image_width, image_height = benchmark_case["image_size"]
+    processed_megapixels = image_width * image_height * benchmark_case.get("frame_count", 1) / 1e6
+    best_seconds = min(run_seconds)
+    if encoded_byte_count is not None:
+        benchmark_case = {**benchmark_case, "encoded_byte_count": encoded_byte_count}
+    return {
+        **benchmark_case,
+        "image_size": [image_width, image_height],
+        "repeat_count": repeat_count,
+        "best_seconds": best_seconds,
+        "median_seconds": statistics.median(run_seconds),
+        "megapixels_per_second": processed_megapixels / best_seconds,
+        "peak_memory_megabytes": round(peak_memory_megabytes, 2),
+    }
+
+
+def run_benchmark_suite(
+    output_path: str,
+    repeat_count: int = DEFAULT_BENCHMARK_REPEAT_COUNT,
+    quick: bool = False,
+    name_filter: str | None = None,
+) -> list[dict[str, object]]:
+    """Run every selected case in its own process and write the results to JSON.
+
+    Args:
+        output_path: Destination JSON file path.
+        repeat_count: Number of timed runs per case.
+        quick: Whether to leave out the largest sizes and frame counts.
+        name_filter: Optional text that case names must contain.
+
+    Returns:
+        One result dictionary per case.
+    """
+    from PIL import __version__ as pillow_version
+
+    benchmark_cases = [
+        benchmark_case
+        for benchmark_case in build_benchmark_cases(quick)
+        if name_filter is None or name_filter in benchmark_case["name"]
+    ]
+    benchmark_results: list[dict[str, object]] = []
+    process_context = multiprocessing.get_context("spawn")
+    for benchmark_case in benchmark_cases:
+        with process_context.Pool(processes=1) as process_pool:
+            benchmark_result = process_pool.apply(measure_benchmark_case, (benchmark_case, repeat_count))
+        benchmark_results.append(benchmark_result)
+        print(
+            f"{benchmark_result['name']:<58} "
+            f"{benchmark_result['best_seconds'] * 1000:>9.2f} ms "
+            f"{benchmark_result['megapixels_per_second']:>9.1f} MP/s "
+            f"{benchmark_result['peak_memory_megabytes']:>8.1f} MB"
+            + (
+                f" {benchmark_result['encoded_byte_count'] / 1024:>9.1f} KiB"
+                if "encoded_byte_count" in benchmark_result
+                else ""
+            ),
+            flush=True,
+        )
+
+    with open(output_path, "w", encoding="utf-8") as output_file:
+        json.dump(
+            {
+                "format_version": BENCHMARK_RESULT_FORMAT_VERSION,
+                "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "pillow": pillow_version,
+                "platform": platform.platform(),
+                "results": benchmark_results,
+            },
+            output_file,
+            indent=2,
+        )
+    return benchmark_results
+
+
+def compare_benchmark_results(
+    baseline_results: list[dict[str, object]],
+    current_results: list[dict[str, object]],
+    time_regression_threshold: float = DEFAULT_TIME_REGRESSION_THRESHOLD,
+    memory_regression_threshold: float = DEFAULT_MEMORY_REGRESSION_THRESHOLD,
+) -> tuple[list[str], list[str]]:
+    """Compare two result lists case by case.
+
+    A case regresses when its best time grows by more than the time
+    threshold and by at least ``TIME_REGRESSION_MINIMUM_SECONDS``, or its
+    peak memory grows by more than the memory threshold
+    and by at least ``MEMORY_REGRESSION_MINIMUM_MEGABYTES``.
+
+    Args:
+        baseline_results: Results from the stored baseline.
+        current_results: Results from the run being checked.
+        time_regression_threshold: Allowed relative slowdown, such as 0.15.
+        memory_regression_threshold: Allowed relative memory growth.
+
+    Returns:
+        A tuple containing:
+        - One report line per case found in both result lists.
+        - The report lines of the cases that regressed.
+    """
+    baseline_results_by_name = {result["name"]: result for result in baseline_results}
+    report_lines: list[str] = []
+    regression_lines: list[str] = []
+    for current_result in current_results:
+        baseline_result = baseline_results_by_name.get(current_result["name"])
+        if baseline_result is None:
+            continue
+
+        time_ratio = current_result["best_seconds"] / baseline_result["best_seconds"]
+        memory_growth_megabytes = (
+            current_result["peak_memory_megabytes"] - baseline_result["peak_memory_megabytes"]
+        )
+        memory_regressed = (
+            memory_growth_megabytes >= MEMORY_REGRESSION_MINIMUM_MEGABYTES
+            and current_result["peak_memory_megabytes"]
+            > baseline_result["peak_memory_megabytes"] * (1 + memory_regression_threshold)
+        )
+        time_regressed = (
+            time_ratio > 1 + time_regression_threshold
+            and current_result["best_seconds"] - baseline_result["best_seconds"]
+            >= TIME_REGRESSION_MINIMUM_SECONDS
+        )
+
+        flags = []
+        if time_regressed:
+            flags.append("SLOWER")
+        if memory_regressed:
+            flags.append("MORE MEMORY")
+        report_line = (
+            f"{current_result['name']:<58} "
+            f"{baseline_result['best_seconds'] * 1000:>9.2f} -> "
+            f"{current_result['best_seconds'] * 1000:>9.2f} ms ({time_ratio - 1:+.0%}) "
+            f"{baseline_result['peak_memory_megabytes']:>7.1f} -> "
+            f"{current_result['peak_memory_megabytes']:>7.1f} MB"
+            + (f"  {', '.join(flags)}" if flags else "")
+        )
+        report_lines.append(report_line)
+        if flags:
+            regression_lines.append(report_line)
+    return report_lines, regression_lines
+
+
+def load_benchmark_results(results_path: str) -> list[dict[str, object]]:
+    """Read the results list from a benchmark JSON file.
+
+    Args:
+        results_path: Path written by ``run_benchmark_suite``.
+
+    Returns:
+        The stored result dictionaries.
+    """
+    with open(results_path, encoding="utf-8") as results_file:
+        stored_results = json.load(results_file)
+    if stored_results.get("format_version") != BENCHMARK_RESULT_FORMAT_VERSION:
+        raise ValueError(f"Unsupported benchmark result format in '{results_path}'.")
+    return stored_results["results"]
+
+
+def create_benchmark_argument_parser() -> ArgumentParser:
+    """Create and return the argument parser for the benchmark suite.
+
+    Returns:
+        An argument parser with "run" and "compare" commands.
+    """
+    argument_parser = ArgumentParser(
+        description="Benchmark pixelling operations and compare runs against a baseline.",
+        formatter_class=RawTextHelpFormatter,
+    )
+    command_parsers = argument_parser.add_subparsers(dest="command", required=True)
+
+    run_parser = command_parsers.add_parser("run", help="Run the benchmarks and write JSON results.")
+    run_parser.add_argument("-o", "--output", default="benchmark_results.json", help="Results JSON path.")
+    run_parser.add_argument(
+        "--repeat",
+        type=int,
+        default=DEFAULT_BENCHMARK_REPEAT_COUNT,
+        help="Timed runs per case; the best run is compared.",
+    )
+    run_parser.add_argument("--quick", action="store_true", help="Leave out the largest cases.")
+    run_parser.add_argument("--filter", default=None, help="Only run cases whose name contains this text.")
+
+    compare_parser = command_parsers.add_parser(
+        "compare", help="Flag cases that got slower or use more memory than a baseline."
+    )
+    compare_parser.add_argument("baseline", help="Baseline results JSON path.")
+    compare_parser.add_argument("current", help="Current results JSON path.")
+    compare_parser.add_argument(
+        "--time-threshold",
+        type=float,
+        default=DEFAULT_TIME_REGRESSION_THRESHOLD,
+        help="Allowed relative slowdown before a case is flagged. Defaults to 0.15.",
+    )
+    compare_parser.add_argument(
+        "--memory-threshold",
+        type=float,
+        default=DEFAULT_MEMORY_REGRESSION_THRESHOLD,
+        help="Allowed relative peak memory growth before a case is flagged. Defaults to 0.25.",
+    )
+    return argument_parser
+
+
+def main(command_line_arguments: list[str] | None = None) -> int:
+    parsed_arguments: Namespace = create_benchmark_argument_parser().parse_args(command_line_arguments)
+    if parsed_arguments.command == "run":
+        if parsed_arguments.repeat <= 0:
+            raise ValueError("Repeat count must be greater than 0.")
+        run_benchmark_suite(
+            output_path=parsed_arguments.output,
+            repeat_count=parsed_arguments.repeat,
+            quick=parsed_arguments.quick,
+            name_filter=parsed_arguments.filter,
+        )
+        print(f"Wrote {parsed_arguments.output}.")
+        return 0
+
+    report_lines, regression_lines = compare_benchmark_results(
+        load_benchmark_results(parsed_arguments.baseline),
+        load_benchmark_results(parsed_arguments.current),
+        time_regression_threshold=parsed_arguments.time_threshold,
+        memory_regression_threshold=parsed_arguments.memory_threshold,
+    )
+    print("\n".join(report_lines))
+    print(f"{len(regression_lines)} of {len(report_lines)} cases regressed.")
+    return 1 if regression_lines else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,239 @@
+"""Memory-mapped NumPy ``.npy`` and headerless raw pixel files.
+
+Array files hold uncompressed pixels, so they are mapped into memory
+instead of decoded. Modes whose bytes match Pillow's own layout ("L",
+"RGBA", "I;16") are used in place; other modes are unpacked once. The
+``.npy`` header is read directly, so NumPy is not required.
+"""
+
+import ast
+import mmap
+import os
+import struct
+from dataclasses import dataclass
+from typing import IO
+
+from PIL import Image
+
+NPY_FILE_EXTENSION = ".npy"
+RAW_FILE_EXTENSION = ".raw"
+ARRAY_FILE_EXTENSIONS = (NPY_FILE_EXTENSION, RAW_FILE_EXTENSION)
+NPY_FORMAT_NAME = "NPY"
+NPY_MAGIC_PREFIX = b"\x93NUMPY"
+NPY_HEADER_ALIGNMENT = 64
+NPY_HEADER_LENGTH_FORMATS = {1: "<H", 2: "<I", 3: "<I"}
+ARRAY_IMAGE_MODE_LAYOUTS = {
+    "L": ("|u1", 1),
+    "LA": ("|u1", 2),
+    "RGB": ("|u1", 3),
+    "RGBA": ("|u1", 4),
+    "I;16": ("<u2", 1),
+}
+NPY_UNSIGNED_BYTE_TYPE_NAMES = ("|u1", "<u1", ">u1")
+
+
+@dataclass(frozen=True)
+class RawImageLayout:
+    """Shape of a headerless raw pixel file.
+
+    Attributes:
+        width: Image width in pixels.
+        height: Image height in pixels.
+        mode: Pillow mode of the packed pixels, one of "L", "LA", "RGB",
+            "RGBA", or "I;16" (16-bit little-endian gray).
+    """
+
+    width: int
+    height: int
+    mode: str
+
+    def __post_init__(self) -> None:
+        if self.width <= 0 or self.height <= 0:
+            raise ValueError("Raw image width and height must be positive integers.")
+        if self.mode not in ARRAY_IMAGE_MODE_LAYOUTS:
+            raise ValueError(
+                f"Invalid raw image mode: '{self.mode}'. "
+                f"Valid options are: {', '.join(ARRAY_IMAGE_MODE_LAYOUTS)}."
+            )
+
+
+@dataclass(frozen=True)
+class ArrayImageRegion:
+    """Where the pixels of an array file are and how they are packed.
+
+    Attributes:
+        size: Image width and height.
+        mode: Pillow mode of the packed pixels.
+        data_offset: Byte offset of the first pixel.
+    """
+
+    size: tuple[int, int]
+    mode: str
+    data_offset: int
+
+    @property
+    def data_byte_count(self) -> int:
+        """Return the number of pixel bytes in the file."""
+        element_type_name, channel_count = ARRAY_IMAGE_MODE_LAYOUTS[self.mode]
+        element_byte_count = int(element_type_name[2:])
+        return self.size[0] * self.size[1] * channel_count * element_byte_count
+
+
+def read_npy_image_region(input_file: IO[bytes]) -> ArrayImageRegion:
+    """Read a ``.npy`` header and describe the image it holds.
+
+    Args:
+        input_file: Binary handle of the ``.npy`` file.
+
+    Returns:
+        The image size, mode, and pixel offset. Unsigned 8-bit arrays of
+        shape (height, width) map to "L", and (height, width, 2, 3, or 4)
+        to "LA", "RGB", or "RGBA". Little-endian unsigned 16-bit arrays of
+        shape (height, width) map to "I;16".
+    """
+    input_file.seek(0)
+    preamble = input_file.read(len(NPY_MAGIC_PREFIX) + 2)
+    if len(preamble) < len(NPY_MAGIC_PREFIX) + 2 or not preamble.startswith(NPY_MAGIC_PREFIX):
+        raise ValueError("Input file is not a NumPy .npy file.")
+    major_version = preamble[len(NPY_MAGIC_PREFIX)]
+    header_length_format = NPY_HEADER_LENGTH_FORMATS.get(major_version)
+    if header_length_format is None:
+        raise ValueError(f"Unsupported .npy format version: {major_version}.")
+    (header_length,) = struct.unpack(
+        header_length_format, input_file.read(struct.calcsize(header_length_format))
+    )
+    header_encoding = "utf-8" if major_version == 3 else "latin1"
+    header = ast.literal_eval(input_file.read(header_length).decode(header_encoding))
+    data_offset = input_file.tell()
+
+    element_type_name = header["descr"]
+    shape = tuple(header["shape"])
+    if header["fortran_order"]:
+        raise ValueError("Fortran-ordered .npy arrays are not supported.")
+    if element_type_name in NPY_UNSIGNED_BYTE_TYPE_NAMES and len(shape) == 2:
+        mode = "L"
+    elif element_type_name in NPY_UNSIGNED_BYTE_TYPE_NAMES and len(shape) == 3 and 2 <= shape[2] <= 4:
+        mode = ("LA", "RGB", "RGBA")[shape[2] - 2]
+    elif element_type_name == "<u2" and len(shape) == 2:
+        mode = "I;16"
+    else:
+        raise ValueError(
+            f"Unsupported .npy array: dtype '{element_type_name}' with shape {shape}. "
+            "Expected uint8 (height, width[, 2|3|4]) or little-endian uint16 (height, width)."
+        )
+    if shape[0] <= 0 or shape[1] <= 0:
+        raise ValueError("Array image width and height must be positive integers.")
+    return ArrayImageRegion(size=(shape[1], shape[0]), mode=mode, data_offset=data_offset)
+
+
+def map_array_image_region(input_file: IO[bytes], image_region: ArrayImageRegion) -> Image.Image:
+    """Map an array file's pixels into a read-only image without decoding.
+
+    The image holds the mapping open after ``input_file`` is closed.
+
+    Args:
+        input_file: Binary handle of the array file.
+        image_region: Image size, mode, and pixel offset in the file.
+
+    Returns:
+        A read-only image backed by the mapped file for "L", "RGBA", and
+        "I;16", or unpacked from the mapping for other modes.
+    """
+    data_end = image_region.data_offset + image_region.data_byte_count
+    if os.fstat(input_file.fileno()).st_size < data_end:
+        raise ValueError(
+            f"Array image file holds fewer than the {image_region.data_byte_count} pixel bytes "
+            f"of a {image_region.size[0]}x{image_region.size[1]} {image_region.mode} image."
+        )
+    mapped_file = mmap.mmap(input_file.fileno(), 0, access=mmap.ACCESS_READ)
+    pixel_buffer = memoryview(mapped_file)[image_region.data_offset : data_end]
+    return Image.frombuffer(
+        image_region.mode, image_region.size, pixel_buffer, "raw", image_region.mode, 0, 1
+    )
+
+
+def load_array_image_file(
+    input_image_path: str,
+    raw_image_layout: RawImageLayout | None = None,
+) -> Image.Image:
+    """Map a ``.npy`` file, or a raw pixel file with a given layout, as an image.
+
+    Args:
+        input_image_path: Path to the array file.
+        raw_image_layout: Shape of a headerless raw file. None reads the
+            shape from the ``.npy`` header.
+
+    Returns:
+        A read-only image backed by the mapped file where the mode allows.
+    """
+    with open(input_image_path, "rb") as input_file:
+        if raw_image_layout is None:
+            if os.path.splitext(input_image_path)[1].lower() != NPY_FILE_EXTENSION:
+                raise ValueError("Raw image input requires an explicit width, height, and mode.")
+            image_region = read_npy_image_region(input_file)
+        else:
+            image_region = ArrayImageRegion(
+                size=(raw_image_layout.width, raw_image_layout.height),
+                mode=raw_image_layout.mode,
+                data_offset=0,
+            )
+        return map_array_image_region(input_file, image_region)
+
+
+def convert_image_to_array_mode(image: Image.Image) -> Image.Image:
+    """Return an image in a mode that an array file can hold.
+
+    Args:
+        image: Image in any Pillow mode.
+
+    Returns:
+        The image itself when its mode is supported; otherwise a conversion
+        to "RGBA" when it has transparency, or to "RGB", or to "L" for
+        bilevel images.
+    """
+    if image.mode in ARRAY_IMAGE_MODE_LAYOUTS:
+        return image
+    if image.mode == "1":
+        return image.convert("L")
+    if image.has_transparency_data:
+        return image.convert("RGBA")
+    return image.convert("RGB")
+
+
+def build_npy_header(image_size: tuple[int, int], mode: str) -> bytes:
+    """Return a version 1.0 ``.npy`` header for an image.
+
+    Args:
+        image_size: Image width and height.
+        mode: Pillow mode from ``ARRAY_IMAGE_MODE_LAYOUTS``.
+
+    Returns:
+        The magic string, version, header length, and padded header dict.
+    """
+    element_type_name, channel_count = ARRAY_IMAGE_MODE_LAYOUTS[mode]
+    shape = (image_size[1], image_size[0])
+    if channel_count > 1:
+        shape += (channel_count,)
+    header = f"{{'descr': '{element_type_name}', 'fortran_order': False, 'shape': {shape}, }}"
+    preamble_byte_count = len(NPY_MAGIC_PREFIX) + 2 + 2
+    padding_byte_count = -(preamble_byte_count + len(header) + 1) % NPY_HEADER_ALIGNMENT
+    header_bytes = (header + " " * padding_byte_count + "\n").encode("latin1")
+    return NPY_MAGIC_PREFIX + bytes((1, 0)) + struct.pack("<H", len(header_bytes)) + header_bytes
+
+
+def save_image_as_array_file(image: Image.Image, output_image_path: str) -> None:
+    """Write an image's packed pixels as ``.npy`` or headerless raw bytes.
+
+    The extension selects the layout: ``.npy`` adds a header that NumPy's
+    ``numpy.load(path, mmap_mode="r")`` reads; ``.raw`` writes pixels only.
+
+    Args:
+        image: Image to save. Modes without an array layout are converted
+            with ``convert_image_to_array_mode``.
+        output_image_path: Destination ``.npy`` or ``.raw`` file path.
+    """
+    array_image = convert_image_to_array_mode(image)
+    with open(output_image_path, "wb") as output_file:
+        if os.path.splitext(output_image_path)[1].lower() == NPY_FILE_EXTENSION:
+            output_file.write(build_npy_header(array_image.size, array_image.mode))
+        output_file.write(array_image.tobytes())
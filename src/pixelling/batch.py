@@ -0,0 +1,295 @@
+"""Batch input discovery and worker-pool execution helpers."""
+
+import glob
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Callable
+
+from PIL import Image
+
+from .array_io import NPY_FILE_EXTENSION
+from .media_source import raise_pillow_pixel_limit
+from .ops.palette_cache import format_palette_cache_statistics, get_process_palette_cache
+from .result_cache import format_result_cache_statistics
+
+GLOB_PATTERN_CHARACTERS = "*?["
+DEFAULT_OUTPUT_FILE_SUFFIX = "_pixelling"
+DEFAULT_OUTPUT_FILE_STEM_PATTERN = re.compile(rf"{DEFAULT_OUTPUT_FILE_SUFFIX}(_[0-9]+)?$")
+
+
+@dataclass(frozen=True)
+class BatchImageResult:
+    """Outcome of transforming one input file inside a batch run.
+
+    Attributes:
+        input_image_path: Source image file path.
+        output_image_path: Path the output was written to, or the requested
+            destination path when the file failed.
+        succeeded: Whether the file was transformed and saved.
+        error_message: Error text when the file failed; otherwise None.
+        cache_hit: Whether the output came from the result cache, or None
+            when no result cache was used.
+        palette_cache_hit_count: Palette cache lookups for this file that
+            found a palette, counted in the process that transformed it.
+        palette_cache_miss_count: Palette cache lookups for this file that
+            did not.
+    """
+
+    input_image_path: str
+    output_image_path: str
+    succeeded: bool
+    error_message: str | None = None
+    cache_hit: bool | None = None
+    palette_cache_hit_count: int = 0
+    palette_cache_miss_count: int = 0
+
+
+def is_batch_input_path(input_path: str) -> bool:
+    """Return whether the input path selects multiple files.
+
+    Args:
+        input_path: Directory path, glob pattern, or single file path.
+
+    Returns:
+        True when the input is a directory, or a glob pattern that does not
+        name an existing file such as ``photo[1].png``; otherwise False.
+    """
+    if os.path.isdir(input_path):
+        return True
+    if os.path.exists(input_path):
+        return False
+    return any(character in input_path for character in GLOB_PATTERN_CHARACTERS)
+
+
+def is_default_output_file_path(file_path: str) -> bool:
+    """Return whether a file name looks like an earlier pixelling output.
+
+    Args:
+        file_path: File path or name.
+
+    Returns:
+        True when the file stem ends in ``_pixelling``, optionally followed
+        by the ``_<number>`` that keeps claimed output names unique.
+    """
+    file_stem = os.path.splitext(os.path.basename(file_path))[0]
+    return DEFAULT_OUTPUT_FILE_STEM_PATTERN.search(file_stem) is not None
+
+
+def collect_batch_input_image_paths(input_path: str) -> list[str]:
+    """Return the sorted image file paths selected by a directory or glob.
+
+    Directory inputs include every file with an image extension known to
+    Pillow and every ``.npy`` file. Glob inputs include every matching file.
+    Both skip files that look like earlier pixelling outputs, unless the
+    glob pattern itself names such outputs.
+
+    Args:
+        input_path: Directory path or glob pattern.
+
+    Returns:
+        Sorted list of image file paths.
+    """
+    if os.path.isdir(input_path):
+        supported_extensions = {*Image.registered_extensions(), NPY_FILE_EXTENSION}
+        input_image_paths: list[str] = []
+        for file_name in os.listdir(input_path):
+            if os.path.splitext(file_name)[1].lower() not in supported_extensions:
+                continue
+            if is_default_output_file_path(file_name):
+                continue
+            file_path = os.path.join(input_path, file_name)
+            if os.path.isfile(file_path):
+                input_image_paths.append(file_path)
+        return sorted(input_image_paths)
+
+    skips_earlier_outputs = DEFAULT_OUTPUT_FILE_SUFFIX not in os.path.basename(input_path)
+    return sorted(
+        path
+        for path in glob.glob(input_path)
+        if os.path.isfile(path) and not (skips_earlier_outputs and is_default_output_file_path(path))
+    )
+
+
+def build_batch_output_image_path(
+    input_image_path: str,
+    output_directory_path: str | None,
+    build_output_image_path: Callable[[str], str],
+) -> str:
+    """Return the output path for one batch input file.
+
+    Args:
+        input_image_path: Source image file path.
+        output_directory_path: Optional directory for all batch outputs.
+        build_output_image_path: Function that builds the default output path.
+
+    Returns:
+        Output image path next to the input, or inside the output directory.
+    """
+    default_output_image_path = build_output_image_path(input_image_path)
+    if output_directory_path is None:
+        return default_output_image_path
+    return os.path.join(output_directory_path, os.path.basename(default_output_image_path))
+
+
+def transform_batch_image_file(
+    transform_image_file: Callable[..., tuple[str, bool | None]],
+    input_image_path: str,
+    output_image_path: str,
+    transformation_options: dict[str, object],
+) -> BatchImageResult:
+    """Transform one batch file and capture failures as a result.
+
+    Args:
+        transform_image_file: Function that loads, transforms, and saves one
+            file, returning the path it wrote and whether the output came
+            from a result cache.
+        input_image_path: Source image file path.
+        output_image_path: Requested destination image file path.
+        transformation_options: Keyword arguments forwarded to the transform function.
+
+    Returns:
+        The result describing whether the file succeeded and the path it was
+        written to, with the palette cache lookups it made in this process.
+    """
+    initial_hit_count, initial_miss_count = read_palette_cache_counts(transformation_options)
+    try:
+        written_output_image_path, cache_hit = transform_image_file(
+            input_image_path=input_image_path,
+            output_image_path=output_image_path,
+            **transformation_options,
+        )
+    except Exception as error:
+        batch_result = BatchImageResult(
+            input_image_path=input_image_path,
+            output_image_path=output_image_path,
+            succeeded=False,
+            error_message=f"{type(error).__name__}: {error}",
+        )
+    else:
+        batch_result = BatchImageResult(
+            input_image_path=input_image_path,
+            output_image_path=written_output_image_path,
+            succeeded=True,
+            cache_hit=cache_hit,
+        )
+
+    final_hit_count, final_miss_count = read_palette_cache_counts(transformation_options)
+    return replace(
+        batch_result,
+        palette_cache_hit_count=final_hit_count - initial_hit_count,
+        palette_cache_miss_count=final_miss_count - initial_miss_count,
+    )
+
+
+def read_palette_cache_counts(transformation_options: dict[str, object]) -> tuple[int, int]:
+    """Return the hit and miss counts of this process's batch palette cache.
+
+    Args:
+        transformation_options: Batch keyword arguments, whose
+            ``palette_cache_capacity`` selects the process palette cache.
+
+    Returns:
+        The cache's hit and miss counts, or zeros when no cache is used.
+    """
+    palette_cache_capacity = transformation_options.get("palette_cache_capacity")
+    if palette_cache_capacity is None:
+        return 0, 0
+    palette_cache = get_process_palette_cache(palette_cache_capacity)
+    return palette_cache.hit_count, palette_cache.miss_count
+
+
+def run_batch_image_transformation(
+    transform_image_file: Callable[..., tuple[str, bool | None]],
+    input_and_output_image_paths: list[tuple[str, str]],
+    transformation_options: dict[str, object],
+    job_count: int = 1,
+) -> list[BatchImageResult]:
+    """Transform many files, optionally across a pool of worker processes.
+
+    Args:
+        transform_image_file: Module-level function that loads, transforms,
+            and saves one file. It must be picklable when ``job_count`` > 1.
+        input_and_output_image_paths: Ordered pairs of input and output paths.
+        transformation_options: Keyword arguments forwarded to every call.
+        job_count: Number of worker processes. One runs in the current process.
+
+    Returns:
+        One result per input file, in the same order as the inputs.
+    """
+    if job_count <= 0:
+        raise ValueError("Job count must be a positive integer.")
+
+    if job_count == 1 or len(input_and_output_image_paths) <= 1:
+        return [
+            transform_batch_image_file(
+                transform_image_file,
+                input_image_path,
+                output_image_path,
+                transformation_options,
+            )
+            for input_image_path, output_image_path in input_and_output_image_paths
+        ]
+
+    worker_count = min(job_count, len(input_and_output_image_paths))
+    with ProcessPoolExecutor(
+        max_workers=worker_count,
+        initializer=raise_pillow_pixel_limit,
+        initargs=(transformation_options.get("maximum_pixel_count"),),
+    ) as executor:
+        result_futures = [
+            executor.submit(
+                transform_batch_image_file,
+                transform_image_file,
+                input_image_path,
+                output_image_path,
+                transformation_options,
+            )
+            for input_image_path, output_image_path in input_and_output_image_paths
+        ]
+        return [result_future.result() for result_future in result_futures]
+
+
+def format_batch_result_summary(batch_results: list[BatchImageResult]) -> str:
+    """Return a printable per-file summary for a batch run.
+
+    Args:
+        batch_results: Results returned by the batch runner.
+
+    Returns:
+        Multi-line summary text with one line per file and a final total.
+    """
+    summary_lines: list[str] = []
+    failed_count = 0
+    for batch_result in batch_results:
+        if batch_result.succeeded:
+            summary_lines.append(
+                f"OK      {batch_result.input_image_path} -> {batch_result.output_image_path}"
+            )
+        else:
+            failed_count += 1
+            summary_lines.append(
+                f"FAILED  {batch_result.input_image_path}: {batch_result.error_message}"
+            )
+
+    succeeded_count = len(batch_results) - failed_count
+    summary_lines.append(
+        f"Processed {len(batch_results)} files: "
+        f"{succeeded_count} succeeded, {failed_count} failed."
+    )
+
+    cache_lookups = [
+        batch_result.cache_hit for batch_result in batch_results if batch_result.cache_hit is not None
+    ]
+    if cache_lookups:
+        hit_count = sum(cache_lookups)
+        summary_lines.append(format_result_cache_statistics(hit_count, len(cache_lookups) - hit_count))
+
+    palette_cache_hit_count = sum(result.palette_cache_hit_count for result in batch_results)
+    palette_cache_miss_count = sum(result.palette_cache_miss_count for result in batch_results)
+    if palette_cache_hit_count + palette_cache_miss_count > 0:
+        summary_lines.append(
+            format_palette_cache_statistics(palette_cache_hit_count, palette_cache_miss_count)
+        )
+    return "\n".join(summary_lines)
@@ -1,17 +1,24 @@
+import os
+import sys
 from argparse import ArgumentParser, Namespace, RawTextHelpFormatter
-from typing import Sequence
-
-from .ops.pipeline import run_image_transformation_pipeline
-from .io import (
-    build_default_output_image_path,
-    load_image_from_path,
-    save_animated_image_to_path,
-    save_image_to_path,
+from typing import TYPE_CHECKING, Sequence
+
+from .ops.option_values import (
+    DEFAULT_RESULT_CACHE_MAXIMUM_BYTE_COUNT,
+    ENCODE_PROFILES,
+    FRAME_PALETTE_STRATEGY,
+    NEAREST_SAMPLING,
+    PALETTE_STRATEGIES,
+    PIXEL_SAMPLING_METHODS,
 )
-from .gif_io import is_animated_gif_file, load_animated_gif_frames_from_path
-from .ops.animated_pipeline import run_animated_image_transformation_pipeline
 
-import sys
+if TYPE_CHECKING:
+    from .profiling import StageProfiler
+    from .result_cache import ResultCache
+
+BYTES_PER_MEGABYTE = 1024 * 1024
+SERVE_COMMAND_NAME = "serve"
+STREAM_COMMAND_NAME = "stream"
 
 def create_command_line_argument_parser() -> ArgumentParser:
     """Create and return the command-line argument parser for pixelling.
@@ -29,7 +36,11 @@ def create_command_line_argument_parser() -> ArgumentParser:
             "Examples:\n"
             "  pixelling input.png --mode pixel --block-size 8\n"
             "  pixelling input.png --mode grid --grid-width 32 --grid-height 32\n"
-            "  pixelling input.png --mode pixel --block-size 6 --color-count 16 -o out.png"
+            "  pixelling input.png --mode pixel --block-size 6 --color-count 16 -o out.png\n"
+            "  pixelling photos/ --mode pixel --block-size 8 --jobs 4 -o pixelated/\n"
+            "  pixelling serve --port 8765 --jobs 4   (see 'pixelling serve --help')\n"
+            "  pixelling stream --width 1280 --height 720 --mode pixel --block-size 8 < in.raw > out.raw\n"
+            "    (see 'pixelling stream --help')"
         ),
         formatter_class=RawTextHelpFormatter,
     )
@@ -37,7 +48,10 @@ def create_command_line_argument_parser() -> ArgumentParser:
     argument_parser.add_argument(
         "input_image_path",
         type=str,
-        help="Path to the input image file to transform.",
+        help=(
+            "Path to the input image file to transform.\n"
+            "A directory or a quoted glob pattern such as 'photos/*.png' runs batch mode."
+        ),
     )
     argument_parser.add_argument(
         "-o",
@@ -46,7 +60,8 @@ def create_command_line_argument_parser() -> ArgumentParser:
         default=None,
         help=(
             "Path to the output image file.\n"
-            "If omitted, defaults to output.png."
+            "If omitted, defaults to output.png.\n"
+            "In batch mode, this is the output directory instead."
         ),
     )
     argument_parser.add_argument(
@@ -88,6 +103,127 @@ def create_command_line_argument_parser() -> ArgumentParser:
         default=None,
         help="Optional number of colors for quantization. Must be greater than 0.",
     )
+    argument_parser.add_argument(
+        "--sampling",
+        choices=list(PIXEL_SAMPLING_METHODS),
+        default=None,
+        help=(
+            "Optional for pixel mode. How each block's color is chosen.\n"
+            "'nearest' (default) picks one pixel per block.\n"
+            "'mean', 'median', and 'mode' reduce every pixel in the block.\n"
+            "'median' and 'mode' require NumPy."
+        ),
+    )
+    argument_parser.add_argument(
+        "--upscale",
+        type=int,
+        default=None,
+        help=(
+            "Optional whole-number enlargement of the logical image, applied when saving.\n"
+            "In pixel mode the output then has one pixel per block times this factor,\n"
+            "so '--upscale 1' writes only the small image. Must be greater than 0."
+        ),
+    )
+    argument_parser.add_argument(
+        "--full-decode",
+        action="store_true",
+        help=(
+            "Always decode the full input image.\n"
+            "By default, JPEG inputs are decoded at a reduced size when the output is much smaller."
+        ),
+    )
+    argument_parser.add_argument(
+        "--strips",
+        action="store_true",
+        help=(
+            "Optional for pixel mode. Process very large still images band by band\n"
+            "and stream PNG or PPM output, keeping memory near one band.\n"
+            "Uncompressed PPM, PGM, BMP, and TIFF inputs are also read band by band;\n"
+            "compressed inputs such as PNG and JPEG are decoded whole, with a warning."
+        ),
+    )
+    argument_parser.add_argument(
+        "--max-pixels",
+        type=int,
+        default=None,
+        help=(
+            "Optional largest input width times height to accept. Must be greater than 0.\n"
+            "Larger inputs are rejected from their header before decoding.\n"
+            "Defaults to twice Pillow's decompression bomb limit, where Pillow refuses to open\n"
+            "an image; inputs above the limit itself only warn. Raise it for very large scans."
+        ),
+    )
+    argument_parser.add_argument(
+        "--palette-cache",
+        type=int,
+        default=None,
+        metavar="CAPACITY",
+        help=(
+            "Optional with --color-count. Remember up to CAPACITY palettes and reuse one\n"
+            "for frames and files whose color histograms look alike, instead of building\n"
+            "a new palette each time. Must be greater than 0."
+        ),
+    )
+    argument_parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=None,
+        help=(
+            "Optional directory for cached outputs.\n"
+            "An input file already transformed with the same options is copied from the cache\n"
+            "without decoding or transforming it again."
+        ),
+    )
+    argument_parser.add_argument(
+        "--cache-size-mb",
+        type=int,
+        default=DEFAULT_RESULT_CACHE_MAXIMUM_BYTE_COUNT // BYTES_PER_MEGABYTE,
+        help=(
+            "Largest total size of the cache directory in megabytes. Must be greater than 0.\n"
+            "The least recently used outputs are removed first."
+        ),
+    )
+    argument_parser.add_argument(
+        "--animated-palette",
+        choices=list(PALETTE_STRATEGIES),
+        default=FRAME_PALETTE_STRATEGY,
+        help=(
+            "Palette strategy for animated GIFs with --color-count.\n"
+            "'frame' builds a palette per frame.\n"
+            "'global' builds one palette from sampled frames and reuses it for every frame."
+        ),
+    )
+    argument_parser.add_argument(
+        "--encode-profile",
+        choices=list(ENCODE_PROFILES),
+        default=None,
+        help=(
+            "Optional encoder speed and size trade-off for PNG, JPEG, and GIF outputs.\n"
+            "'fast' encodes quickest, 'balanced' sits in between, and 'smallest' writes\n"
+            "the smallest files. Decoded pixels are the same for every profile.\n"
+            "By default Pillow's encoder settings are used."
+        ),
+    )
+    argument_parser.add_argument(
+        "--profile",
+        type=str,
+        default=None,
+        metavar="TRACE_PATH",
+        help=(
+            "Optional. Time each pipeline stage and write a Chrome trace JSON file\n"
+            "that opens in chrome://tracing or Perfetto. A per-stage summary is\n"
+            "printed to standard error. Requires --jobs 1."
+        ),
+    )
+    argument_parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help=(
+            "Number of worker processes. Must be greater than 0.\n"
+            "Batch mode spreads files across workers; a single animated GIF spreads its frames."
+        ),
+    )
 
     return argument_parser
 
@@ -125,6 +261,164 @@ def validate_command_line_arguments(parsed_arguments: Namespace) -> None:
             raise ValueError("Grid width and height must be provided for grid mode.")
         if parsed_arguments.block_size is not None:
             raise ValueError("Block size should not be provided for grid mode.")
+        if parsed_arguments.sampling is not None:
+            raise ValueError("Sampling should not be provided for grid mode.")
+        if parsed_arguments.strips:
+            raise ValueError("Strip processing is only available for pixel mode.")
+
+    if parsed_arguments.strips:
+        if parsed_arguments.color_count is not None:
+            raise ValueError("Color count cannot be combined with strip processing.")
+        if parsed_arguments.upscale is not None:
+            raise ValueError("Upscale factor cannot be combined with strip processing.")
+
+    if parsed_arguments.upscale is not None and parsed_arguments.upscale <= 0:
+        raise ValueError("Upscale factor must be greater than 0.")
+
+    if parsed_arguments.max_pixels is not None and parsed_arguments.max_pixels <= 0:
+        raise ValueError("Maximum pixel count must be greater than 0.")
+
+    if parsed_arguments.animated_palette != FRAME_PALETTE_STRATEGY:
+        if parsed_arguments.color_count is None:
+            raise ValueError("Color count must be provided for a global animated palette.")
+
+    if parsed_arguments.palette_cache is not None:
+        if parsed_arguments.palette_cache <= 0:
+            raise ValueError("Palette cache capacity must be greater than 0.")
+        if parsed_arguments.color_count is None:
+            raise ValueError("Color count must be provided for a palette cache.")
+
+    if parsed_arguments.jobs <= 0:
+        raise ValueError("Job count must be greater than 0.")
+
+    if parsed_arguments.profile is not None and parsed_arguments.jobs != 1:
+        raise ValueError("Profiling requires a job count of 1.")
+
+    if parsed_arguments.cache_size_mb <= 0:
+        raise ValueError("Cache size must be greater than 0.")
+
+
+def create_result_cache(parsed_arguments: Namespace) -> "ResultCache | None":
+    """Return the result cache selected on the command line, if any.
+
+    Args:
+        parsed_arguments: Validated command-line arguments.
+
+    Returns:
+        A result cache for ``--cache-dir``, or None when caching is off.
+    """
+    if parsed_arguments.cache_dir is None:
+        return None
+
+    from .result_cache import ResultCache
+
+    return ResultCache(
+        cache_directory_path=parsed_arguments.cache_dir,
+        maximum_byte_count=parsed_arguments.cache_size_mb * BYTES_PER_MEGABYTE,
+    )
+
+
+def build_transformation_options(parsed_arguments: Namespace) -> dict[str, object]:
+    """Return the keyword arguments of ``transform_image_file`` chosen on the command line.
+
+    The input path, output path, and job count are left out because batch
+    runs and the server choose them per file.
+
+    Args:
+        parsed_arguments: Validated command-line arguments.
+
+    Returns:
+        A dictionary of transformation options.
+    """
+    return {
+        "allow_overwrite": parsed_arguments.overwrite,
+        "transformation_mode": parsed_arguments.mode,
+        "block_size": parsed_arguments.block_size,
+        "grid_width": parsed_arguments.grid_width,
+        "grid_height": parsed_arguments.grid_height,
+        "color_count": parsed_arguments.color_count,
+        "sampling_method": parsed_arguments.sampling or NEAREST_SAMPLING,
+        "upscale_factor": parsed_arguments.upscale,
+        "allow_reduced_decoding": not parsed_arguments.full_decode,
+        "palette_strategy": parsed_arguments.animated_palette,
+        "use_strip_processing": parsed_arguments.strips,
+        "maximum_pixel_count": parsed_arguments.max_pixels,
+        "result_cache": create_result_cache(parsed_arguments),
+        "palette_cache_capacity": parsed_arguments.palette_cache,
+        "encode_profile": parsed_arguments.encode_profile,
+    }
+
+
+def write_stage_profile(stage_profiler: "StageProfiler", trace_path: str) -> None:
+    """Write the Chrome trace and print a per-stage time summary to standard error.
+
+    Args:
+        stage_profiler: Profiler that recorded the run.
+        trace_path: Destination Chrome trace JSON file path.
+    """
+    stage_profiler.write_chrome_trace(trace_path)
+    for stage_name, stage_duration in stage_profiler.summarize_stage_durations().items():
+        print(f"{stage_name}: {stage_duration * 1000:.2f} ms", file=sys.stderr)
+    print(f"Profile written to '{trace_path}'.", file=sys.stderr)
+
+
+def run_batch_command_line_interface(
+    parsed_arguments: Namespace,
+    stage_profiler: "StageProfiler | None" = None,
+) -> int:
+    """Transform every file selected by a directory or glob input.
+
+    Args:
+        parsed_arguments: Validated command-line arguments in batch mode.
+        stage_profiler: Optional profiler that records every file's stages.
+
+    Returns:
+        Process exit status code. Non-zero when any file failed.
+    """
+    from .batch import (
+        build_batch_output_image_path,
+        collect_batch_input_image_paths,
+        format_batch_result_summary,
+        run_batch_image_transformation,
+    )
+    from .io import build_default_output_image_path
+    from .transform import transform_image_file
+
+    input_image_paths = collect_batch_input_image_paths(parsed_arguments.input_image_path)
+    if len(input_image_paths) == 0:
+        raise ValueError(
+            f"No input images found for '{parsed_arguments.input_image_path}'."
+        )
+
+    output_directory_path = parsed_arguments.output_image_path
+    if output_directory_path is not None:
+        os.makedirs(output_directory_path, exist_ok=True)
+
+    input_and_output_image_paths = [
+        (
+            input_image_path,
+            build_batch_output_image_path(
+                input_image_path=input_image_path,
+                output_directory_path=output_directory_path,
+                build_output_image_path=build_default_output_image_path,
+            ),
+        )
+        for input_image_path in input_image_paths
+    ]
+    batch_results = run_batch_image_transformation(
+        transform_image_file=transform_image_file,
+        input_and_output_image_paths=input_and_output_image_paths,
+        transformation_options={
+            **build_transformation_options(parsed_arguments),
+            "stage_profiler": stage_profiler,
+        },
+        job_count=parsed_arguments.jobs,
+    )
+
+    print(format_batch_result_summary(batch_results))
+    if all(batch_result.succeeded for batch_result in batch_results):
+        return 0
+    return 1
 
 
 def run_command_line_interface(
@@ -132,58 +426,62 @@ def run_command_line_interface(
 ) -> int:
     """Run the pixelling command-line interface.
 
+    Pillow and the transformation modules are imported only after the
+    arguments are parsed and validated, so ``--help`` and argument errors
+    return without loading them.
+
     Args:
         command_line_arguments: Optional command-line arguments to process.
 
     Returns:
         Process exit status code.
     """
+    if command_line_arguments is None:
+        command_line_arguments = sys.argv[1:]
+    if len(command_line_arguments) > 0 and command_line_arguments[0] == SERVE_COMMAND_NAME:
+        from .server import run_server_command_line_interface
+
+        return run_server_command_line_interface(command_line_arguments[1:])
+    if len(command_line_arguments) > 0 and command_line_arguments[0] == STREAM_COMMAND_NAME:
+        from .raw_stream import run_stream_command_line_interface
+
+        return run_stream_command_line_interface(command_line_arguments[1:])
+
     parsed_arguments = parse_command_line_arguments(command_line_arguments)
     validate_command_line_arguments(parsed_arguments)
 
-    if parsed_arguments.output_image_path is None:
-        parsed_arguments.output_image_path = build_default_output_image_path(
-            parsed_arguments.input_image_path
-        )
+    from .batch import is_batch_input_path
+    from .io import build_default_output_image_path
+    from .media_source import raise_pillow_pixel_limit
+    from .profiling import StageProfiler
+    from .transform import transform_image_file
 
-    if is_animated_gif_file(parsed_arguments.input_image_path):
-        frames, metadata = load_animated_gif_frames_from_path(parsed_arguments.input_image_path)
-        transformed_frames = run_animated_image_transformation_pipeline(
-            frames=frames,
-            transformation_mode=parsed_arguments.mode,
-            block_size=parsed_arguments.block_size,
-            grid_width=parsed_arguments.grid_width,
-            grid_height=parsed_arguments.grid_height,
-            color_count=parsed_arguments.color_count,
-        )
-        save_animated_image_to_path(
-            frames=transformed_frames,
-            output_image_path=parsed_arguments.output_image_path,
-            allow_overwrite=parsed_arguments.overwrite,
-            metadata=metadata,
-        )
-        return 0
-    
-    else: 
-        image = load_image_from_path(parsed_arguments.input_image_path)
-
-        output_image = run_image_transformation_pipeline(
-                                  image=image,
-                                  transformation_mode=parsed_arguments.mode,
-                                  block_size=parsed_arguments.block_size,
-                                  grid_width=parsed_arguments.grid_width,
-                                  grid_height=parsed_arguments.grid_height,
-                                  color_count=parsed_arguments.color_count,
-                              )
-
-        save_image_to_path(
-            image=output_image,
+    raise_pillow_pixel_limit(parsed_arguments.max_pixels)
+    stage_profiler = None
+    if parsed_arguments.profile is not None:
+        stage_profiler = StageProfiler()
+
+    if is_batch_input_path(parsed_arguments.input_image_path):
+        exit_status = run_batch_command_line_interface(parsed_arguments, stage_profiler)
+    else:
+        if parsed_arguments.output_image_path is None:
+            parsed_arguments.output_image_path = build_default_output_image_path(
+                parsed_arguments.input_image_path
+            )
+
+        transform_image_file(
+            input_image_path=parsed_arguments.input_image_path,
             output_image_path=parsed_arguments.output_image_path,
-            allow_overwrite=parsed_arguments.overwrite,
+            job_count=parsed_arguments.jobs,
+            stage_profiler=stage_profiler,
+            **build_transformation_options(parsed_arguments),
         )
+        exit_status = 0
+
+    if stage_profiler is not None:
+        write_stage_profile(stage_profiler, parsed_arguments.profile)
+    return exit_status
 
-        return 0
-    
 
 def main() -> None:
     """Run the pixelling command-line entry point."""
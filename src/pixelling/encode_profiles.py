@@ -0,0 +1,73 @@
+"""Encoder settings behind each ``--encode-profile`` name.
+
+Profiles only trade encoding time against file size. JPEG quality and
+chroma subsampling are the same in every profile, and PNG and GIF are
+lossless, so the decoded pixels never depend on the profile.
+
+Run-length deflate only matches the previous pixel. On pixelated images,
+where runs of equal pixels dominate, it is the fastest PNG strategy and
+often the smallest. Flat artwork still compresses better with full
+deflate, so the smallest profile tries both.
+"""
+
+import zlib
+
+from .ops.option_values import (
+    BALANCED_ENCODE_PROFILE,
+    ENCODE_PROFILES,
+    FAST_ENCODE_PROFILE,
+    SMALLEST_ENCODE_PROFILE,
+)
+
+ENCODE_PROFILE_FORMAT_NAMES = {".png": "png", ".jpg": "jpeg", ".jpeg": "jpeg", ".gif": "gif"}
+JPEG_BASE_ENCODER_SETTINGS = {"quality": 75, "subsampling": "4:2:0"}
+
+ENCODE_PROFILE_SETTINGS: dict[str, dict[str, tuple[dict[str, object], ...]]] = {
+    FAST_ENCODE_PROFILE: {
+        "png": ({"compress_level": 1, "compress_type": zlib.Z_RLE},),
+        "jpeg": ({**JPEG_BASE_ENCODER_SETTINGS, "optimize": False},),
+        "gif": ({"optimize": False},),
+    },
+    BALANCED_ENCODE_PROFILE: {
+        "png": ({"compress_level": 6},),
+        "jpeg": ({**JPEG_BASE_ENCODER_SETTINGS, "optimize": True},),
+        "gif": ({"optimize": True},),
+    },
+    SMALLEST_ENCODE_PROFILE: {
+        "png": (
+            {"compress_level": 9, "optimize": True},
+            {"compress_level": 9, "compress_type": zlib.Z_RLE},
+        ),
+        "jpeg": ({**JPEG_BASE_ENCODER_SETTINGS, "optimize": True, "progressive": True},),
+        "gif": ({"optimize": True},),
+    },
+}
+
+
+def get_encoder_setting_candidates(
+    output_extension: str,
+    encode_profile: str | None,
+) -> tuple[dict[str, object], ...]:
+    """Return the encoder settings an encode profile uses for an output format.
+
+    Args:
+        output_extension: Output file extension, such as ".png".
+        encode_profile: Encode profile name, or None for Pillow's defaults.
+
+    Returns:
+        Keyword arguments for ``Image.save``. When there are several, each is
+        tried and the smallest output is kept. Empty when no profile is set
+        or the profile has no settings for the format.
+    """
+    if encode_profile is None:
+        return ()
+    if encode_profile not in ENCODE_PROFILES:
+        raise ValueError(
+            f"Invalid encode profile: '{encode_profile}'. "
+            f"Valid options are: {', '.join(ENCODE_PROFILES)}."
+        )
+
+    format_name = ENCODE_PROFILE_FORMAT_NAMES.get(output_extension.lower())
+    if format_name is None:
+        return ()
+    return ENCODE_PROFILE_SETTINGS[encode_profile][format_name]
@@ -1,7 +1,32 @@
-from PIL import Image, ImageSequence
+import warnings
+from collections.abc import Callable, Iterable, Iterator, Sized
+from functools import cache
+from io import BytesIO
+from itertools import chain
+from typing import IO
+
+from PIL import Image, ImageChops, ImageSequence
+
+from .media_source import MediaSource
+from .pillow_gif import (
+    PILLOW_GIF_WRITER_INTERNALS_AVAILABLE,
+    allocate_unused_gif_palette_index,
+    find_gif_background_index,
+    normalize_gif_frame_mode,
+    normalize_gif_frame_palette,
+    write_gif_frame_data,
+    write_gif_header,
+)
 
 DEFAULT_LOOP_COUNT = 0
 DEFAULT_FRAME_DURATION_MILLISECONDS = 100
+GIF_TRAILER_BYTES = b";"
+GIF_PALETTE_READY_MODES = ("1", "L", "P")
+GIF_DO_NOT_DISPOSE_DISPOSAL = 1
+GIF_RESTORE_TO_BACKGROUND_DISPOSAL = 2
+GIF_CHANGED_REGION_MAXIMUM_AREA_FRACTION = 0.5
+GIF_WRITER_CHECK_FRAME_SIZE = (8, 8)
+GIF_WRITER_CHECK_FRAME_COLORS = ((255, 0, 0), (0, 0, 255), (0, 255, 0))
 
 
 def is_animated_gif_file(input_image_path: str) -> bool:
@@ -23,55 +48,175 @@ def is_animated_gif_file(input_image_path: str) -> bool:
     return is_gif and is_animated 
 
 
-def load_animated_gif_frames_from_path(
+def open_animated_gif_frame_stream(
     input_image_path: str,
-) -> tuple[list[Image.Image], dict[str, object]]:
-    """Load animated GIF frames and metadata from a file path.
+) -> tuple[Iterator[Image.Image], dict[str, object]]:
+    """Open an animated GIF and return a lazy frame iterator and its metadata.
+
+    Only the frame currently being yielded is decoded and held in memory.
+    ``metadata["frame_durations"]`` starts empty and gains one entry each
+    time a frame is yielded, so it is complete once the iterator is exhausted.
 
     Args:
         input_image_path: Path to an animated GIF file.
 
     Returns:
         A tuple containing:
-        - A list of image frames.
+        - An iterator over RGBA image frames.
         - A metadata dictionary for fields like duration and loop.
     """
-    if not is_animated_gif_file(input_image_path):
-        raise ValueError("Input path must point to an animated GIF file.")
-
-    with Image.open(input_image_path) as image:
+    image = Image.open(input_image_path)
+    try:
+        if image.format != "GIF" or not bool(getattr(image, "is_animated", False)):
+            raise ValueError("Input path must point to an animated GIF file.")
 
         gif_metadata: dict[str, object] = {
             "loop": image.info.get("loop", 0),
             "duration": image.info.get("duration", 0),
             "disposal": image.info.get("disposal"),
             "transparency": image.info.get("transparency"),
+            "frame_durations": [],
         }
+    except BaseException:
+        image.close()
+        raise
+
+    return iterate_animated_gif_frames(image, gif_metadata), gif_metadata
+
+
+def open_media_source_gif_frame_stream(
+    media_source: MediaSource,
+) -> tuple[Iterator[Image.Image], dict[str, object]]:
+    """Return a lazy frame iterator and metadata for a probed animated GIF.
+
+    The frames are decoded from the media source's already-open image, and
+    ``metadata["frame_durations"]`` is complete from the start because the
+    probe read every frame header. The media source stays open; its owner
+    closes it once the frames have been consumed.
+
+    Args:
+        media_source: Probed animated GIF source.
+
+    Returns:
+        A tuple containing:
+        - An iterator over RGBA image frames.
+        - A metadata dictionary for fields like duration and loop.
+    """
+    if not media_source.is_animated_gif:
+        raise ValueError("Input path must point to an animated GIF file.")
+
+    image = media_source.image
+    gif_metadata: dict[str, object] = {
+        "loop": image.info.get("loop", 0),
+        "duration": image.info.get("duration", 0),
+        "disposal": image.info.get("disposal"),
+        "transparency": image.info.get("transparency"),
+        "frame_durations": list(media_source.frame_durations),
+    }
+    return iterate_animated_gif_frames(image, gif_metadata, close_image=False), gif_metadata
 
-        frame_images: list[Image.Image] = []
-        frame_durations: list[int] = []
 
-        for frame in ImageSequence.Iterator(image):
-            frame_images.append(frame.convert("RGBA").copy())
-            frame_durations.append(int(frame.info.get("duration", gif_metadata["duration"])))
+def iterate_animated_gif_frames(
+    image: Image.Image,
+    gif_metadata: dict[str, object],
+    close_image: bool = True,
+) -> Iterator[Image.Image]:
+    """Yield RGBA frames from an open GIF, optionally closing it once exhausted.
 
-        gif_metadata["frame_durations"] = frame_durations
-        return frame_images, gif_metadata
+    Args:
+        image: Open animated GIF image.
+        gif_metadata: Metadata dictionary whose ``frame_durations`` list is
+            extended with each yielded frame's duration when it does not
+            already hold one.
+        close_image: Whether to close the image after the last frame.
+
+    Yields:
+        Each frame converted to RGBA, in order.
+    """
+    frame_durations = gif_metadata["frame_durations"]
+    try:
+        for frame_index, frame in enumerate(ImageSequence.Iterator(image)):
+            if frame_index == len(frame_durations):
+                frame_durations.append(int(frame.info.get("duration", gif_metadata["duration"])))
+            yield frame.convert("RGBA")
+    finally:
+        if close_image:
+            image.close()
+
+
+def load_animated_gif_frames_from_path(
+    input_image_path: str,
+) -> tuple[list[Image.Image], dict[str, object]]:
+    """Load animated GIF frames and metadata from a file path.
+
+    Args:
+        input_image_path: Path to an animated GIF file.
+
+    Returns:
+        A tuple containing:
+        - A list of image frames.
+        - A metadata dictionary for fields like duration and loop.
+    """
+    frame_stream, gif_metadata = open_animated_gif_frame_stream(input_image_path)
+    frame_images = list(frame_stream)
+    return frame_images, gif_metadata
 
 
 def save_animated_gif_frames_to_path(
-    frames: list[Image.Image],
+    frames: Iterable[Image.Image],
     output_image_path: str,
     metadata: dict[str, object] | None = None,
+    encoder_settings: dict[str, object] | None = None,
 ) -> None:
     """Save animated GIF frames to a file path.
 
     Args:
-        frames: Ordered list of frames to save.
+        frames: Ordered frames to save. May be a list or a lazy iterator.
         output_image_path: Destination path for the GIF file.
         metadata: Optional GIF metadata such as duration and loop.
+        encoder_settings: Optional GIF encoder settings, such as
+            ``optimize``, that override the defaults.
     """
-    if len(frames) == 0:
+    frame_iterator = iter(frames)
+    first_frame = next(frame_iterator, None)
+    if first_frame is None:
+        raise ValueError("At least one frame is required to save an animated GIF.")
+
+    if not isinstance(frames, Sized):
+        frames = chain([first_frame], frame_iterator)
+
+    with open(output_image_path, "wb") as output_file:
+        write_animated_gif_frames(frames, output_file, metadata, encoder_settings)
+
+
+def write_animated_gif_frames(
+    frames: Iterable[Image.Image],
+    output_file: IO[bytes],
+    metadata: dict[str, object] | None = None,
+    encoder_settings: dict[str, object] | None = None,
+) -> None:
+    """Write animated GIF frames to a binary file object.
+
+    Frames are consumed one at a time and written as soon as the following
+    frame is known, so peak memory does not grow with the frame count. Each
+    frame after the first is written as only the region that changed since
+    the previous frame.
+
+    Streaming relies on internal functions of Pillow's GIF plugin, reached
+    through ``pixelling.pillow_gif``. When the installed Pillow lacks them,
+    or they fail ``can_stream_gif_frames``, every frame is collected and
+    saved with Pillow's own ``save_all`` writer instead, after a warning.
+
+    Args:
+        frames: Ordered frames to save. May be a list or a lazy iterator.
+        output_file: Binary file object positioned where the GIF starts.
+        metadata: Optional GIF metadata such as duration and loop.
+        encoder_settings: Optional GIF encoder settings, such as
+            ``optimize``, that override the defaults.
+    """
+    frame_iterator = iter(frames)
+    first_frame = next(frame_iterator, None)
+    if first_frame is None:
         raise ValueError("At least one frame is required to save an animated GIF.")
 
     metadata_dictionary = metadata or {}
@@ -81,41 +226,553 @@ def save_animated_gif_frames_to_path(
     )
 
     frame_duration_values = metadata_dictionary.get("frame_durations")
-    valid_frame_duration_list = isinstance(frame_duration_values, list) and (
-        len(frame_duration_values) == len(frames)
-    )
-    if valid_frame_duration_list:
-        frame_durations: list[int] = []
-        for frame_duration_value in frame_duration_values:
-            normalized_frame_duration = max(1, int(frame_duration_value))
-            frame_durations.append(normalized_frame_duration)
-    else:
-        frame_durations = []
-        for _ in range(len(frames)):
-            normalized_frame_duration = max(1, default_frame_duration_milliseconds)
-            frame_durations.append(normalized_frame_duration)
-
-    frames_converted_to_rgba: list[Image.Image] = []
-    for frame in frames:
-        frames_converted_to_rgba.append(frame.convert("RGBA"))
+    if not isinstance(frame_duration_values, list):
+        frame_duration_values = None
+    elif isinstance(frames, Sized) and len(frame_duration_values) != len(frames):
+        frame_duration_values = None
 
-    first_frame = frames_converted_to_rgba[0]
-    remaining_frames = frames_converted_to_rgba[1:]
+    def resolve_frame_duration(frame_index: int) -> int:
+        if frame_duration_values is not None and frame_index < len(frame_duration_values):
+            return max(1, int(frame_duration_values[frame_index]))
+        return max(1, default_frame_duration_milliseconds)
 
-    save_arguments: dict[str, object] = {
-        "format": "GIF",
+    encoder_settings = {
         "save_all": True,
-        "append_images": remaining_frames,
         "loop": loop_count,
-        "duration": frame_durations,
+        "duration": None,
+        "optimize": True,
+        **(encoder_settings or {}),
     }
 
     disposal_value = metadata_dictionary.get("disposal")
     if disposal_value is not None:
-        save_arguments["disposal"] = disposal_value
+        encoder_settings["disposal"] = disposal_value
 
     transparency_value = metadata_dictionary.get("transparency")
     if isinstance(transparency_value, int):
-        save_arguments["transparency"] = transparency_value
+        encoder_settings["transparency"] = transparency_value
+
+    if not can_stream_gif_frames():
+        warnings.warn(
+            "This Pillow version lacks working GIF writer internals for pixelling to stream frames "
+            "through; saving animated GIFs with Pillow's save_all writer, which holds every frame "
+            "in memory.",
+            RuntimeWarning,
+            stacklevel=2,
+        )
+        if first_frame.mode not in GIF_PALETTE_READY_MODES:
+            encoder_settings.pop("transparency", None)
+        output_frames = [
+            convert_frame_for_gif_encoding(frame) for frame in chain([first_frame], frame_iterator)
+        ]
+        encoder_settings["duration"] = [
+            resolve_frame_duration(frame_index) for frame_index in range(len(output_frames))
+        ]
+        output_frames[0].save(
+            output_file, format="GIF", append_images=output_frames[1:], **encoder_settings
+        )
+        return
+
+    write_animated_gif_frame_stream(
+        first_frame=first_frame,
+        remaining_frames=frame_iterator,
+        output_file=output_file,
+        encoder_settings=encoder_settings,
+        resolve_frame_duration=resolve_frame_duration,
+    )
+
+
+@cache
+def can_stream_gif_frames() -> bool:
+    """Return whether Pillow's GIF writer internals stream frames correctly.
+
+    The check runs once per process. Beyond the signature check made when
+    ``pixelling.pillow_gif`` is imported, a short palette animation is
+    written through the streaming writer and with Pillow's ``save_all``
+    writer, which must produce the same bytes. A TypeError or AttributeError
+    from Pillow, or any difference, means the streaming writer is not used.
+
+    Returns:
+        True when the streaming writer matches Pillow's output.
+    """
+    if not PILLOW_GIF_WRITER_INTERNALS_AVAILABLE:
+        return False
+
+    check_frames = [
+        Image.new("RGB", GIF_WRITER_CHECK_FRAME_SIZE, color).convert("P")
+        for color in GIF_WRITER_CHECK_FRAME_COLORS
+    ]
+    check_frames[1].paste(check_frames[0].crop((0, 0, 2, 2)), (2, 2))
+    encoder_settings = {"loop": DEFAULT_LOOP_COUNT, "optimize": True}
+    pillow_output_file = BytesIO()
+    check_frames[0].save(
+        pillow_output_file,
+        format="GIF",
+        save_all=True,
+        append_images=check_frames[1:],
+        duration=DEFAULT_FRAME_DURATION_MILLISECONDS,
+        **encoder_settings,
+    )
+    streamed_output_file = BytesIO()
+    try:
+        write_animated_gif_frame_stream(
+            first_frame=check_frames[0],
+            remaining_frames=iter(check_frames[1:]),
+            output_file=streamed_output_file,
+            encoder_settings={"save_all": True, "duration": None, **encoder_settings},
+            resolve_frame_duration=lambda frame_index: DEFAULT_FRAME_DURATION_MILLISECONDS,
+        )
+    except (TypeError, AttributeError):
+        return False
+    return streamed_output_file.getvalue() == pillow_output_file.getvalue()
+
+
+def write_animated_gif_frame_stream(
+    first_frame: Image.Image,
+    remaining_frames: Iterator[Image.Image],
+    output_file: IO[bytes],
+    encoder_settings: dict[str, object],
+    resolve_frame_duration: Callable[[int], int],
+) -> None:
+    """Encode a frame stream as an animated GIF while holding one pending frame.
+
+    Streams that start with a palette-ready frame are written exactly as
+    Pillow would write them. Other streams still need quantizing, so they
+    are compared before quantization and only each changed region is
+    quantized and written.
+
+    Args:
+        first_frame: First frame of the animation.
+        remaining_frames: Iterator over the remaining frames.
+        output_file: Binary file object positioned at the start of the GIF.
+        encoder_settings: GIF encoder settings such as loop and transparency.
+        resolve_frame_duration: Function returning the duration for a frame index.
+    """
+    if first_frame.mode in GIF_PALETTE_READY_MODES:
+        write_palette_gif_frame_stream(
+            first_frame, remaining_frames, output_file, encoder_settings, resolve_frame_duration
+        )
+    else:
+        write_changed_region_gif_frame_stream(
+            first_frame, remaining_frames, output_file, encoder_settings, resolve_frame_duration
+        )
+
+
+def write_changed_region_gif_frame_stream(
+    first_frame: Image.Image,
+    remaining_frames: Iterator[Image.Image],
+    output_file: IO[bytes],
+    encoder_settings: dict[str, object],
+    resolve_frame_duration: Callable[[int], int],
+) -> None:
+    """Encode frames that need quantizing, quantizing only small changed regions.
+
+    Each frame is compared with the previous source frame before it is
+    quantized. Identical frames are folded into the previous frame's
+    duration without being quantized, and a frame object repeated from the
+    previous frame is folded without being compared. When the changed
+    bounding box covers at most ``GIF_CHANGED_REGION_MAXIMUM_AREA_FRACTION``
+    of the frame, only the box is quantized, with its own local palette, and
+    pixels inside the box that did not change are set to a transparent
+    index so the previous frame shows through.
+
+    Larger changes gain little from a local palette, so those frames are
+    quantized whole and compared with the frame the decoder currently shows,
+    as Pillow's own writer does; only their changed area is written.
+
+    GIF transparency cannot erase pixels already drawn, so a frame with
+    transparent pixels is written at full size and the frame before it is
+    disposed to the background. The input's disposal and transparency
+    metadata describe its original frame layout, not these composited
+    frames, so they are not used here; every other frame is marked "do not
+    dispose" explicitly, because some decoders keep the last explicit
+    disposal for frames that leave it unspecified.
+
+    Args:
+        first_frame: First frame of the animation.
+        remaining_frames: Iterator over the remaining frames.
+        output_file: Binary file object positioned at the start of the GIF.
+        encoder_settings: GIF encoder settings such as loop.
+        resolve_frame_duration: Function returning the duration for a frame index.
+    """
+    encoder_settings["disposal"] = GIF_DO_NOT_DISPOSE_DISPOSAL
+    encoder_settings.pop("transparency", None)
+
+    pending_frame: tuple[Image.Image, tuple[int, int, int, int] | None, dict] | None = None
+    previous_frame: Image.Image | None = None
+    previous_source_frame: Image.Image | None = None
+    displayed_frame: Image.Image | None = None
+    unique_frame_count = 0
+
+    for frame_index, frame in enumerate(chain([first_frame], remaining_frames)):
+        if frame is previous_frame:
+            pending_frame[2]["duration"] += resolve_frame_duration(frame_index)
+            continue
+        previous_frame = frame
+
+        source_frame = frame.convert("RGBA")
+        frame_duration = resolve_frame_duration(frame_index)
+
+        changed_bounding_box = None
+        if previous_source_frame is not None:
+            changed_bounding_box = ImageChops.difference(
+                source_frame, previous_source_frame
+            ).getbbox(alpha_only=False)
+            if not changed_bounding_box:
+                pending_frame[2]["duration"] += frame_duration
+                continue
+
+        has_transparent_pixels = source_frame.getchannel("A").getextrema()[0] == 0
+        if changed_bounding_box is not None and has_transparent_pixels:
+            restore_pending_gif_frame_to_transparency(pending_frame)
+            changed_bounding_box = (0, 0) + source_frame.size
+        is_delta_frame = changed_bounding_box is not None and not has_transparent_pixels
+        writes_changed_region = is_delta_frame and is_small_gif_changed_region(
+            changed_bounding_box, source_frame.size
+        )
+        source_region = source_frame
+        if writes_changed_region:
+            source_region = source_frame.crop(changed_bounding_box)
+
+        output_frame = normalize_gif_frame_mode(source_region)
+        if frame_index == 0:
+            for information_key, information_value in output_frame.info.items():
+                if information_key == "transparency":
+                    continue
+                if isinstance(information_key, str):
+                    encoder_settings.setdefault(information_key, information_value)
+
+        frame_encoder_settings = encoder_settings.copy()
+        if "transparency" in output_frame.info:
+            frame_encoder_settings["transparency"] = output_frame.info["transparency"]
+        output_frame = normalize_gif_frame_palette(output_frame, frame_encoder_settings)
+        frame_encoder_settings["duration"] = frame_duration
+
+        frame_delta = None
+        if writes_changed_region:
+            frame_delta = ImageChops.difference(
+                source_region, previous_source_frame.crop(changed_bounding_box)
+            )
+        else:
+            rendered_frame = render_gif_frame(output_frame, frame_encoder_settings)
+            if is_delta_frame:
+                frame_delta, changed_bounding_box = calculate_gif_frame_delta(
+                    displayed_frame, rendered_frame
+                )
+                if not changed_bounding_box:
+                    pending_frame[2]["duration"] += frame_duration
+                    previous_source_frame = source_frame
+                    continue
+            displayed_frame = rendered_frame
+
+        if frame_delta is not None:
+            if "transparency" not in frame_encoder_settings:
+                try:
+                    frame_encoder_settings["transparency"] = allocate_unused_gif_palette_index(
+                        output_frame
+                    )
+                except ValueError:
+                    pass
+            if "transparency" in frame_encoder_settings:
+                output_frame = fill_unchanged_gif_pixels_with_transparency(
+                    output_frame, frame_delta, frame_encoder_settings["transparency"]
+                )
+        if writes_changed_region:
+            displayed_frame.alpha_composite(
+                render_gif_frame(output_frame, frame_encoder_settings), changed_bounding_box[:2]
+            )
+
+        if pending_frame is not None:
+            write_gif_frame(output_file, *pending_frame)
+        unique_frame_count += 1
+        previous_source_frame = source_frame
+        pending_frame = (output_frame, changed_bounding_box, frame_encoder_settings)
+
+    if unique_frame_count == 1:
+        encoder_settings["duration"] = [pending_frame[2]["duration"]]
+        convert_frame_for_gif_encoding(first_frame).save(
+            output_file, format="GIF", append_images=[], **encoder_settings
+        )
+        return
+
+    write_gif_frame(output_file, *pending_frame)
+    output_file.write(GIF_TRAILER_BYTES)
+
+
+def is_small_gif_changed_region(
+    changed_bounding_box: tuple[int, int, int, int],
+    frame_size: tuple[int, int],
+) -> bool:
+    """Return whether a changed region is small enough to quantize on its own.
+
+    Args:
+        changed_bounding_box: Changed area of the frame.
+        frame_size: Frame width and height.
+
+    Returns:
+        True when the area covers at most
+        ``GIF_CHANGED_REGION_MAXIMUM_AREA_FRACTION`` of the frame.
+    """
+    left, top, right, bottom = changed_bounding_box
+    changed_pixel_count = (right - left) * (bottom - top)
+    frame_pixel_count = frame_size[0] * frame_size[1]
+    return changed_pixel_count <= GIF_CHANGED_REGION_MAXIMUM_AREA_FRACTION * frame_pixel_count
+
+
+def render_gif_frame(frame: Image.Image, frame_encoder_settings: dict[str, object]) -> Image.Image:
+    """Return the RGBA pixels a decoder draws for a palette frame.
+
+    Args:
+        frame: Frame in palette or grayscale mode.
+        frame_encoder_settings: Encoder settings for this frame, whose
+            transparent index, if any, is drawn as fully transparent.
+
+    Returns:
+        The frame in RGBA mode.
+    """
+    rendered_frame = frame.copy()
+    rendered_frame.info.pop("transparency", None)
+    if "transparency" in frame_encoder_settings:
+        rendered_frame.info["transparency"] = frame_encoder_settings["transparency"]
+    return rendered_frame.convert("RGBA")
+
+
+def restore_pending_gif_frame_to_transparency(
+    pending_frame: tuple[Image.Image, tuple[int, int, int, int] | None, dict],
+) -> None:
+    """Make a frame that is not yet written clear to transparency after it is shown.
+
+    Decoders restore a disposed frame's area to its transparent index, or
+    to the background color when it has none, so an unused palette index is
+    marked transparent when the frame does not already have one.
+
+    Args:
+        pending_frame: Frame, changed bounding box, and encoder settings.
+    """
+    frame, _, frame_encoder_settings = pending_frame
+    frame_encoder_settings["disposal"] = GIF_RESTORE_TO_BACKGROUND_DISPOSAL
+    if "transparency" not in frame_encoder_settings:
+        try:
+            frame_encoder_settings["transparency"] = allocate_unused_gif_palette_index(frame)
+        except ValueError:
+            pass
+
+
+def write_palette_gif_frame_stream(
+    first_frame: Image.Image,
+    remaining_frames: Iterator[Image.Image],
+    output_file: IO[bytes],
+    encoder_settings: dict[str, object],
+    resolve_frame_duration: Callable[[int], int],
+) -> None:
+    """Encode a stream of palette-ready frames exactly as Pillow would.
+
+    This follows the frame-delta rules of Pillow's multi-frame GIF writer:
+    frames identical to their predecessor are folded into its duration,
+    later frames are cropped to their changed area, and unchanged pixels are
+    filled with a transparent index. Unlike Pillow, a frame is written as
+    soon as the next distinct frame arrives instead of after the last one.
+
+    Args:
+        first_frame: First frame of the animation.
+        remaining_frames: Iterator over the remaining frames.
+        output_file: Binary file object positioned at the start of the GIF.
+        encoder_settings: GIF encoder settings such as loop and transparency.
+        resolve_frame_duration: Function returning the duration for a frame index.
+    """
+    first_frame_information = first_frame.info
+    disposal_setting = encoder_settings.get(
+        "disposal", first_frame_information.get("disposal")
+    )
+
+    pending_frame: tuple[Image.Image, tuple[int, int, int, int] | None, dict] | None = None
+    previous_frame: Image.Image | None = None
+    previous_normalized_frame: Image.Image | None = None
+    first_frame_palette = None
+    background_frame: Image.Image | None = None
+    unique_frame_count = 0
+
+    for frame_index, frame in enumerate(chain([first_frame], remaining_frames)):
+        if frame is previous_frame:
+            pending_frame[2]["duration"] += resolve_frame_duration(frame_index)
+            continue
+        previous_frame = frame
+
+        normalized_frame = normalize_gif_frame_mode(convert_frame_for_gif_encoding(frame))
+        if frame_index == 0:
+            for information_key, information_value in normalized_frame.info.items():
+                if information_key == "transparency":
+                    continue
+                if isinstance(information_key, str):
+                    encoder_settings.setdefault(information_key, information_value)
+
+        frame_encoder_settings = encoder_settings.copy()
+        if "transparency" in normalized_frame.info:
+            frame_encoder_settings.setdefault(
+                "transparency", normalized_frame.info["transparency"]
+            )
+        normalized_frame = normalize_gif_frame_palette(normalized_frame, frame_encoder_settings)
+        frame_encoder_settings["duration"] = resolve_frame_duration(frame_index)
+        if isinstance(disposal_setting, (list, tuple)):
+            frame_encoder_settings["disposal"] = disposal_setting[frame_index]
+
+        output_frame = normalized_frame
+        changed_bounding_box = None
+        if pending_frame is not None and previous_normalized_frame is not None:
+            frame_delta, changed_bounding_box = calculate_gif_frame_delta(
+                previous_normalized_frame, normalized_frame
+            )
+            if not changed_bounding_box:
+                if frame_encoder_settings.get("duration"):
+                    pending_frame[2]["duration"] += frame_encoder_settings["duration"]
+                continue
+
+            if pending_frame[2].get("disposal") == 2:
+                transparency_color = encoder_settings.get(
+                    "transparency", first_frame_information.get("transparency")
+                )
+                if transparency_color is not None:
+                    if background_frame is None:
+                        background_index = find_gif_background_index(
+                            normalized_frame, transparency_color
+                        )
+                        background_frame = Image.new("P", normalized_frame.size, background_index)
+                        background_frame.putpalette(first_frame_palette, first_frame_palette.mode)
+                    changed_bounding_box = calculate_gif_frame_delta(
+                        background_frame, normalized_frame
+                    )[1]
+                else:
+                    changed_bounding_box = (0, 0) + normalized_frame.size
+            elif frame_encoder_settings.get("optimize") and normalized_frame.mode != "1":
+                if "transparency" not in frame_encoder_settings:
+                    try:
+                        frame_encoder_settings["transparency"] = (
+                            allocate_unused_gif_palette_index(normalized_frame)
+                        )
+                    except ValueError:
+                        pass
+                if "transparency" in frame_encoder_settings:
+                    output_frame = fill_unchanged_gif_pixels_with_transparency(
+                        normalized_frame,
+                        frame_delta,
+                        frame_encoder_settings["transparency"],
+                    )
+
+            write_gif_frame(output_file, *pending_frame)
+            first_frame = None
+
+        if unique_frame_count == 0:
+            first_frame_palette = normalized_frame.palette
+        unique_frame_count += 1
+        previous_normalized_frame = normalized_frame
+        pending_frame = (output_frame, changed_bounding_box, frame_encoder_settings)
+
+    if unique_frame_count == 1:
+        # Pillow writes a lone distinct frame as a still GIF with the folded duration.
+        encoder_settings["duration"] = [pending_frame[2]["duration"]]
+        convert_frame_for_gif_encoding(first_frame).save(
+            output_file, format="GIF", append_images=[], **encoder_settings
+        )
+        return
+
+    write_gif_frame(output_file, *pending_frame)
+    output_file.write(GIF_TRAILER_BYTES)
+
+
+def convert_frame_for_gif_encoding(frame: Image.Image) -> Image.Image:
+    """Return a frame in the mode handed to the GIF encoder.
+
+    Palette-mode frames keep their palette so they are not quantized again.
+    Every other frame is converted to RGBA and quantized by the encoder.
+
+    Args:
+        frame: Frame to encode.
+
+    Returns:
+        A copy of the frame in palette or RGBA mode.
+    """
+    if frame.mode == "P":
+        return frame.copy()
+    return frame.convert("RGBA")
+
 
-    first_frame.save(output_image_path, **save_arguments)
+def calculate_gif_frame_delta(
+    base_frame: Image.Image,
+    frame: Image.Image,
+) -> tuple[Image.Image, tuple[int, int, int, int] | None]:
+    """Return the modulo difference between two GIF frames and its bounding box.
+
+    Args:
+        base_frame: Previous frame in GIF-ready mode.
+        frame: Current frame in GIF-ready mode.
+
+    Returns:
+        A tuple containing the difference image and the changed bounding box,
+        or None for the box when the frames are identical.
+    """
+    palette_bytes = [
+        bytes(image.palette.palette) if image.palette else b"" for image in (base_frame, frame)
+    ]
+    if palette_bytes[0] != palette_bytes[1]:
+        frame = frame.convert("RGBA")
+        base_frame = base_frame.convert("RGBA")
+    frame_delta = ImageChops.subtract_modulo(frame, base_frame)
+    return frame_delta, frame_delta.getbbox(alpha_only=False)
+
+
+def fill_unchanged_gif_pixels_with_transparency(
+    frame: Image.Image,
+    frame_delta: Image.Image,
+    transparency_index: int,
+) -> Image.Image:
+    """Return a copy of a frame with unchanged pixels set to the transparent index.
+
+    Args:
+        frame: Current frame in palette mode.
+        frame_delta: Difference between the current and previous frame.
+        transparency_index: Palette index used for transparent pixels.
+
+    Returns:
+        A new frame where pixels that did not change are transparent.
+    """
+    if frame_delta.mode == "RGBA":
+        red_channel, green_channel, blue_channel, alpha_channel = frame_delta.split()
+        changed_channel = ImageChops.lighter(
+            ImageChops.lighter(red_channel, green_channel),
+            ImageChops.lighter(blue_channel, alpha_channel),
+        )
+    else:
+        changed_channel = Image.frombytes("L", frame_delta.size, frame_delta.tobytes())
+
+    unchanged_mask = changed_channel.point(lambda value: 255 if value == 0 else 0)
+    transparent_fill = Image.new("P", frame_delta.size, transparency_index)
+    filled_frame = frame.copy()
+    filled_frame.paste(transparent_fill, mask=unchanged_mask)
+    return filled_frame
+
+
+def write_gif_frame(
+    output_file: IO[bytes],
+    frame: Image.Image,
+    changed_bounding_box: tuple[int, int, int, int] | None,
+    frame_encoder_settings: dict[str, object],
+) -> None:
+    """Write one GIF frame, with the global header when it is the first frame.
+
+    Args:
+        output_file: Binary file object to write to.
+        frame: Frame in palette or grayscale mode, either full size or
+            already cropped to the changed area.
+        changed_bounding_box: Changed area, or None for the first frame.
+        frame_encoder_settings: Encoder settings for this frame.
+    """
+    if not changed_bounding_box:
+        write_gif_header(output_file, frame, frame_encoder_settings)
+        frame_offset = (0, 0)
+    else:
+        frame_encoder_settings["include_color_table"] = True
+        left, top, right, bottom = changed_bounding_box
+        if frame.size != (right - left, bottom - top):
+            frame = frame.crop(changed_bounding_box)
+        frame_offset = changed_bounding_box[:2]
+    write_gif_frame_data(output_file, frame, frame_offset, frame_encoder_settings)
@@ -1,72 +1,288 @@
 import os
+from collections.abc import Callable, Iterable, Iterator
+from io import BytesIO
+from typing import IO
 
 from PIL import Image
 
+from .array_io import (
+    ARRAY_FILE_EXTENSIONS,
+    NPY_FORMAT_NAME,
+    RawImageLayout,
+    load_array_image_file,
+    map_array_image_region,
+    read_npy_image_region,
+    save_image_as_array_file,
+)
+from .encode_profiles import get_encoder_setting_candidates
 from .gif_io import save_animated_gif_frames_to_path
+from .media_source import MediaSource, probe_media_source
+from .ops.resize import upscale_image_by_integer_factor
+from .output_writer import save_output_file
 
-def load_image_from_path(input_image_path: str) -> Image.Image:
+JPEG_DECODE_SCALES = (1, 2, 4, 8)
+
+def load_image_from_path(
+    input_image_path: str,
+    raw_image_layout: RawImageLayout | None = None,
+) -> Image.Image:
     """Load and return an image from a filesystem path.
 
+    ``.npy`` files, and raw pixel files given a layout, are memory-mapped
+    instead of decoded.
+
     Args:
         input_image_path: Path to the input image file.
+        raw_image_layout: Width, height, and mode of a headerless raw pixel
+            file. Required for ``.raw`` inputs.
+
+    Returns:
+        Loaded Pillow image. Array inputs are read-only and backed by the
+        mapped file where their mode allows.
+    """
+    if (
+        raw_image_layout is not None
+        or os.path.splitext(input_image_path)[1].lower() in ARRAY_FILE_EXTENSIONS
+    ):
+        return load_array_image_file(input_image_path, raw_image_layout)
+    with probe_media_source(input_image_path) as media_source:
+        image, _ = load_media_source_image(media_source)
+    return image
+
+
+def load_image_with_reduced_decoding(
+    input_image_path: str,
+    select_decode_size: Callable[[tuple[int, int]], tuple[int, int] | None],
+) -> tuple[Image.Image, int]:
+    """Load an image, letting JPEG decoding downscale when the output allows it.
+
+    JPEG files are decoded in the DCT domain at 1/2, 1/4, or 1/8 scale
+    when the result stays at least as large as the size the selector asks
+    for. Other formats are always decoded in full.
+
+    Args:
+        input_image_path: Path to the input image file.
+        select_decode_size: Function that receives the full image size and
+            returns the minimum decode size, or None to decode in full.
+
+    Returns:
+        A tuple containing:
+        - The loaded Pillow image.
+        - The decode scale: 1 for a full decode, otherwise 2, 4, or 8.
+    """
+    with probe_media_source(input_image_path) as media_source:
+        return load_media_source_image(media_source, select_decode_size)
+
+
+def load_media_source_image(
+    media_source: MediaSource,
+    select_decode_size: Callable[[tuple[int, int]], tuple[int, int] | None] | None = None,
+) -> tuple[Image.Image, int]:
+    """Decode a probed still image from its already-open handle.
+
+    ``.npy`` sources are mapped again rather than copied, so the returned
+    image stays valid after the source is closed.
+
+    Args:
+        media_source: Probed image source. It stays open.
+        select_decode_size: Optional function that receives the full image
+            size and returns the minimum JPEG decode size, or None to decode
+            in full. When omitted, the image is always decoded in full.
 
     Returns:
-        Loaded Pillow image.
+        A tuple containing:
+        - The loaded Pillow image.
+        - The decode scale: 1 for a full decode, otherwise 2, 4, or 8.
     """
-    with Image.open(input_image_path) as image:
-        return image.copy()
+    if media_source.format == NPY_FORMAT_NAME:
+        image_region = read_npy_image_region(media_source.input_file)
+        return map_array_image_region(media_source.input_file, image_region), 1
+
+    image = media_source.image
+    full_width, full_height = image.size
+    if image.format == "JPEG" and select_decode_size is not None:
+        minimum_decode_size = select_decode_size(image.size)
+        if minimum_decode_size is not None:
+            image.draft(image.mode, minimum_decode_size)
+    decoded_image = image.copy()
+
+    decode_scale = 1
+    for candidate_decode_scale in JPEG_DECODE_SCALES:
+        candidate_size = (
+            -(-full_width // candidate_decode_scale),
+            -(-full_height // candidate_decode_scale),
+        )
+        if decoded_image.size == candidate_size:
+            decode_scale = candidate_decode_scale
+            break
+    return decoded_image, decode_scale
 
 
 def save_image_to_path(
     image: Image.Image,
     output_image_path: str,
     allow_overwrite: bool,
-) -> None:
+    upscale_factor: int = 1,
+    encode_profile: str | None = None,
+) -> str:
     """Save an image to a filesystem path.
 
+    The image is encoded to a temporary file and renamed into place, and
+    a numbered path is claimed atomically when overwriting is disabled.
+    ``.npy`` and ``.raw`` paths receive the packed pixels without encoding.
+
     Args:
         image: Image object to save.
         output_image_path: Destination image file path.
         allow_overwrite: Whether an existing file may be overwritten.
+        upscale_factor: Whole-number nearest-neighbor enlargement applied
+            just before encoding.
+        encode_profile: Optional encode profile name. None keeps Pillow's
+            encoder defaults.
+
+    Returns:
+        The path the output was written to, which is numbered when the
+        requested path already exists and overwriting is disabled.
     """
-    output_image_path = build_available_output_image_path(
-        output_image_path=output_image_path,
-        allow_overwrite=allow_overwrite,
-    )
-    image.save(output_image_path)
+    output_extension = os.path.splitext(output_image_path)[1].lower()
+    upscaled_image = upscale_image_by_integer_factor(image, upscale_factor)
+    if output_extension in ARRAY_FILE_EXTENSIONS:
+        return save_output_file(
+            output_image_path,
+            allow_overwrite,
+            lambda temporary_output_image_path: save_image_as_array_file(
+                upscaled_image, temporary_output_image_path
+            ),
+        )
+
+    output_format = get_output_image_format(output_extension)
+    encoder_setting_candidates = get_encoder_setting_candidates(output_extension, encode_profile)
+
+    def write_output_image(temporary_output_image_path: str) -> None:
+        with open(temporary_output_image_path, "wb") as output_file:
+            write_image_with_encoder_settings(
+                upscaled_image, output_file, output_format, encoder_setting_candidates
+            )
+
+    return save_output_file(output_image_path, allow_overwrite, write_output_image)
+
+
+def get_output_image_format(output_extension: str) -> str:
+    """Return the Pillow format name that encodes an output extension.
+
+    Args:
+        output_extension: Output file extension, such as ".png".
+
+    Returns:
+        A Pillow format name such as "PNG".
+    """
+    output_format = Image.registered_extensions().get(output_extension.lower())
+    if output_format is None:
+        raise ValueError(f"Unsupported output format: '{output_extension}'.")
+    return output_format
+
+
+def write_image_with_encoder_settings(
+    image: Image.Image,
+    output_file: IO[bytes],
+    output_format: str,
+    encoder_setting_candidates: tuple[dict[str, object], ...],
+) -> None:
+    """Encode an image to a file object, keeping the smallest of several encodings.
+
+    Args:
+        image: Image object to save.
+        output_file: Binary file object to write the encoded image to.
+        output_format: Pillow format name such as "PNG".
+        encoder_setting_candidates: Keyword arguments for ``Image.save``.
+            With more than one, each is encoded in memory and the smallest
+            output is written. With none, Pillow's defaults are used.
+    """
+    if len(encoder_setting_candidates) <= 1:
+        image.save(output_file, format=output_format, **next(iter(encoder_setting_candidates), {}))
+        return
+
+    smallest_encoded_buffer: BytesIO | None = None
+    for encoder_settings in encoder_setting_candidates:
+        encoded_buffer = BytesIO()
+        image.save(encoded_buffer, format=output_format, **encoder_settings)
+        if smallest_encoded_buffer is None or encoded_buffer.tell() < smallest_encoded_buffer.tell():
+            smallest_encoded_buffer = encoded_buffer
+    output_file.write(smallest_encoded_buffer.getbuffer())
 
 
 def save_animated_image_to_path(
-    frames: list[Image.Image],
+    frames: Iterable[Image.Image],
     output_image_path: str,
     allow_overwrite: bool,
     metadata: dict[str, object] | None = None,
-) -> None:
+    upscale_factor: int = 1,
+    encode_profile: str | None = None,
+) -> str:
     """Save an animated frame sequence to a filesystem path.
 
     Args:
-        frames: Ordered list of image frames to save.
+        frames: Ordered image frames to save. May be a lazy iterator.
         output_image_path: Destination image file path.
         allow_overwrite: Whether an existing file may be overwritten.
         metadata: Optional animation metadata such as duration and loop.
+        upscale_factor: Whole-number nearest-neighbor enlargement applied to
+            each frame just before it is encoded.
+        encode_profile: Optional encode profile name. None keeps the GIF
+            writer's defaults.
+
+    Returns:
+        The path the output was written to.
     """
-    output_image_path = build_available_output_image_path(
-        output_image_path=output_image_path,
-        allow_overwrite=allow_overwrite,
-    )
-    save_animated_gif_frames_to_path(
-        frames=frames,
-        output_image_path=output_image_path,
-        metadata=metadata,
+    encoder_setting_candidates = get_encoder_setting_candidates(".gif", encode_profile)
+    if upscale_factor != 1:
+        frames = iterate_upscaled_frames(frames, upscale_factor)
+    return save_output_file(
+        output_image_path,
+        allow_overwrite,
+        lambda temporary_output_image_path: save_animated_gif_frames_to_path(
+            frames=frames,
+            output_image_path=temporary_output_image_path,
+            metadata=metadata,
+            encoder_settings=next(iter(encoder_setting_candidates), None),
+        ),
     )
 
 
+def iterate_upscaled_frames(
+    frames: Iterable[Image.Image],
+    upscale_factor: int,
+) -> Iterator[Image.Image]:
+    """Yield frames enlarged by a whole-number factor, reusing repeated frames.
+
+    When the same frame object appears twice in a row, its enlarged copy is
+    yielded again instead of being enlarged a second time.
+
+    Args:
+        frames: Frames to enlarge. May be a lazy iterator.
+        upscale_factor: Number of output pixels per input pixel along each axis.
+
+    Yields:
+        The enlarged frames, in order.
+    """
+    previous_frame: Image.Image | None = None
+    previous_upscaled_frame: Image.Image | None = None
+    for frame in frames:
+        if frame is not previous_frame:
+            previous_frame = frame
+            previous_upscaled_frame = upscale_image_by_integer_factor(frame, upscale_factor)
+        yield previous_upscaled_frame
+
+
 def build_available_output_image_path(
     output_image_path: str,
     allow_overwrite: bool,
 ) -> str:
     """Return an output path that respects overwrite behavior.
 
+    The path is only checked, not reserved. Writers use
+    ``output_writer.claim_output_image_path``, which reserves it atomically.
+
     Args:
         output_image_path: Requested destination image file path.
         allow_overwrite: Whether an existing file may be overwritten.
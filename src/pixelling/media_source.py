@@ -0,0 +1,303 @@
+"""Single-open input probing with cached header details and size limits."""
+
+import os
+import struct
+from dataclasses import dataclass
+from typing import IO
+
+from PIL import Image
+
+from .array_io import NPY_FILE_EXTENSION, NPY_FORMAT_NAME, map_array_image_region, read_npy_image_region
+
+GIF_EXTENSION_INTRODUCER = 0x21
+GIF_IMAGE_SEPARATOR = 0x2C
+GIF_TRAILER = 0x3B
+GIF_GRAPHIC_CONTROL_LABEL = 0xF9
+GIF_HEADER_BYTE_COUNT = 13
+PILLOW_DECOMPRESSION_BOMB_ERROR_FACTOR = 2
+
+
+@dataclass
+class MediaSource:
+    """An input image file opened once, with its header details cached.
+
+    The image is opened lazily: no pixels are decoded until a loader asks
+    for them. Close the source, or use it as a context manager, to release
+    the file handle.
+
+    Attributes:
+        input_image_path: Source image file path.
+        input_file: Binary file handle shared by every loader.
+        image: Pillow image opened on ``input_file`` with pixels not yet decoded.
+        format: Pillow format name such as "PNG" or "GIF", or "NPY" for a
+            memory-mapped NumPy array file.
+        size: Image width and height.
+        mode: Pillow mode of the first frame.
+        frame_count: Number of frames; 1 for still images.
+        frame_durations: Per-frame GIF durations in milliseconds; empty for
+            other formats.
+    """
+
+    input_image_path: str
+    input_file: IO[bytes]
+    image: Image.Image
+    format: str | None
+    size: tuple[int, int]
+    mode: str
+    frame_count: int
+    frame_durations: tuple[int, ...]
+
+    @property
+    def is_animated_gif(self) -> bool:
+        """Return whether the source is a GIF with more than one frame."""
+        return self.format == "GIF" and self.frame_count > 1
+
+    def close(self) -> None:
+        """Close the Pillow image and the shared file handle."""
+        self.image.close()
+        self.input_file.close()
+
+    def __enter__(self) -> "MediaSource":
+        return self
+
+    def __exit__(self, *exception_details: object) -> None:
+        self.close()
+
+
+def raise_pillow_pixel_limit(maximum_pixel_count: int | None) -> None:
+    """Raise Pillow's process-wide decompression bomb limit once, at startup.
+
+    Pillow refuses to open images above twice ``Image.MAX_IMAGE_PIXELS``,
+    so a pixel limit above Pillow's only takes effect after this call.
+    Lower limits need no call, because the probe enforces them itself. The
+    setting is shared by every thread, so call this before any work starts
+    rather than around individual files.
+
+    Args:
+        maximum_pixel_count: Largest accepted width times height. None, or a
+            value below Pillow's current limit, leaves the limit unchanged.
+    """
+    if maximum_pixel_count is None or Image.MAX_IMAGE_PIXELS is None:
+        return
+    if maximum_pixel_count > Image.MAX_IMAGE_PIXELS:
+        Image.MAX_IMAGE_PIXELS = maximum_pixel_count
+
+
+def open_image_within_pillow_pixel_limit(
+    input_file: IO[bytes],
+    input_image_path: str,
+) -> Image.Image:
+    """Open an image header, reporting Pillow's decompression bomb error as a ValueError.
+
+    Args:
+        input_file: Binary file handle positioned at the start of the file.
+        input_image_path: Source path, used in the error message.
+
+    Returns:
+        The opened, not yet decoded, Pillow image.
+    """
+    try:
+        return Image.open(input_file)
+    except Image.DecompressionBombError as error:
+        raise ValueError(
+            f"Input image '{input_image_path}' exceeds Pillow's decompression bomb limit: {error}"
+        ) from error
+
+
+def skip_gif_data_sub_blocks(gif_file: IO[bytes]) -> None:
+    """Move past a chain of GIF data sub-blocks without reading their data.
+
+    Args:
+        gif_file: Binary file handle positioned at the first sub-block size.
+    """
+    while True:
+        sub_block_size = gif_file.read(1)
+        if not sub_block_size or sub_block_size[0] == 0:
+            return
+        gif_file.seek(sub_block_size[0], 1)
+
+
+def read_gif_frame_headers(gif_file: IO[bytes]) -> tuple[list[int | None], tuple[int, int]]:
+    """Walk a GIF's block structure and collect frame details without decoding.
+
+    Image data is skipped sub-block by sub-block, so this costs one pass of
+    small reads and no LZW decoding. The file position is restored afterward.
+
+    Args:
+        gif_file: Binary file handle opened on a GIF file.
+
+    Returns:
+        A tuple containing:
+        - Each frame's duration in milliseconds, or None when the frame has
+          no graphic control extension.
+        - The right and bottom edges covered by any frame.
+    """
+    original_position = gif_file.tell()
+    frame_durations: list[int | None] = []
+    try:
+        gif_file.seek(0)
+        header_bytes = gif_file.read(GIF_HEADER_BYTE_COUNT)
+        canvas_width, canvas_height, screen_flags = struct.unpack("<HHB", header_bytes[6:11])
+        frame_extent = (canvas_width, canvas_height)
+        if screen_flags & 0x80:
+            gif_file.seek(3 << ((screen_flags & 7) + 1), 1)
+
+        pending_frame_duration = None
+        while True:
+            block_introducer = gif_file.read(1)
+            if not block_introducer or block_introducer[0] == GIF_TRAILER:
+                break
+
+            if block_introducer[0] == GIF_EXTENSION_INTRODUCER:
+                extension_label = gif_file.read(1)
+                if extension_label and extension_label[0] == GIF_GRAPHIC_CONTROL_LABEL:
+                    sub_block_size = gif_file.read(1)
+                    sub_block_length = sub_block_size[0] if sub_block_size else 0
+                    control_bytes = gif_file.read(sub_block_length)
+                    if len(control_bytes) >= 3:
+                        pending_frame_duration = struct.unpack("<H", control_bytes[1:3])[0] * 10
+                    if sub_block_length:
+                        skip_gif_data_sub_blocks(gif_file)
+                else:
+                    skip_gif_data_sub_blocks(gif_file)
+
+            elif block_introducer[0] == GIF_IMAGE_SEPARATOR:
+                descriptor_bytes = gif_file.read(9)
+                if len(descriptor_bytes) < 9:
+                    break
+                left, top, width, height, image_flags = struct.unpack("<HHHHB", descriptor_bytes)
+                frame_extent = (
+                    max(frame_extent[0], left + width),
+                    max(frame_extent[1], top + height),
+                )
+                if image_flags & 0x80:
+                    gif_file.seek(3 << ((image_flags & 7) + 1), 1)
+                gif_file.read(1)
+                skip_gif_data_sub_blocks(gif_file)
+                frame_durations.append(pending_frame_duration)
+                pending_frame_duration = None
+    finally:
+        gif_file.seek(original_position)
+
+    return frame_durations, frame_extent
+
+
+def check_pixel_count_limit(
+    image_size: tuple[int, int],
+    maximum_pixel_count: int | None,
+    input_image_path: str,
+) -> None:
+    """Raise when an image size exceeds the allowed pixel count.
+
+    Args:
+        image_size: Width and height to check.
+        maximum_pixel_count: Largest allowed pixel count, or None for no limit.
+        input_image_path: Source path, used in the error message.
+    """
+    if maximum_pixel_count is None:
+        return
+    pixel_count = image_size[0] * image_size[1]
+    if pixel_count > maximum_pixel_count:
+        raise ValueError(
+            f"Input image '{input_image_path}' has {pixel_count} pixels, "
+            f"which exceeds the limit of {maximum_pixel_count}."
+        )
+
+
+def probe_media_source(
+    input_image_path: str,
+    maximum_pixel_count: int | None = None,
+) -> MediaSource:
+    """Open an input file once and cache its format, size, mode, and frames.
+
+    Oversized images, including GIFs whose frames reach beyond the logical
+    screen, are rejected from their headers before any pixel is decoded.
+    ``.npy`` files are memory-mapped instead of opened by Pillow.
+
+    Args:
+        input_image_path: Path to the input image file.
+        maximum_pixel_count: Largest allowed width times height. None uses
+            twice Pillow's ``Image.MAX_IMAGE_PIXELS``, the size at which
+            Pillow refuses to open an image; inputs above
+            ``Image.MAX_IMAGE_PIXELS`` itself only raise Pillow's
+            ``DecompressionBombWarning``. Pillow's own limit still applies
+            while opening, so raise it with ``raise_pillow_pixel_limit`` to
+            accept larger images.
+
+    Returns:
+        An open media source. The caller must close it.
+    """
+    if maximum_pixel_count is not None and maximum_pixel_count <= 0:
+        raise ValueError("Maximum pixel count must be a positive integer.")
+    return probe_media_file(open(input_image_path, "rb"), input_image_path, maximum_pixel_count)
+
+
+def probe_media_file(
+    input_file: IO[bytes],
+    input_image_path: str,
+    maximum_pixel_count: int | None = None,
+) -> MediaSource:
+    """Probe an already open binary file, which the media source then owns.
+
+    Args:
+        input_file: Seekable binary file positioned at the image start. It
+            is closed when the media source is closed, or when probing fails.
+        input_image_path: Path or label of the input, used to detect
+            ``.npy`` files and in error messages.
+        maximum_pixel_count: Largest allowed width times height. None uses
+            twice Pillow's ``Image.MAX_IMAGE_PIXELS``, the size at which
+            Pillow refuses to open an image; inputs above
+            ``Image.MAX_IMAGE_PIXELS`` itself only raise Pillow's
+            ``DecompressionBombWarning``. Pillow's own limit still applies
+            while opening, so raise it with ``raise_pillow_pixel_limit`` to
+            accept larger images.
+
+    Returns:
+        An open media source. The caller must close it.
+    """
+    if maximum_pixel_count is None:
+        if Image.MAX_IMAGE_PIXELS is not None:
+            maximum_pixel_count = PILLOW_DECOMPRESSION_BOMB_ERROR_FACTOR * Image.MAX_IMAGE_PIXELS
+    elif maximum_pixel_count <= 0:
+        input_file.close()
+        raise ValueError("Maximum pixel count must be a positive integer.")
+
+    try:
+        if os.path.splitext(input_image_path)[1].lower() == NPY_FILE_EXTENSION:
+            image_region = read_npy_image_region(input_file)
+            check_pixel_count_limit(image_region.size, maximum_pixel_count, input_image_path)
+            image = map_array_image_region(input_file, image_region)
+            image.format = NPY_FORMAT_NAME
+        else:
+            image = open_image_within_pillow_pixel_limit(input_file, input_image_path)
+        try:
+            check_pixel_count_limit(image.size, maximum_pixel_count, input_image_path)
+            if image.format == "GIF":
+                gif_frame_durations, gif_frame_extent = read_gif_frame_headers(input_file)
+                check_pixel_count_limit(gif_frame_extent, maximum_pixel_count, input_image_path)
+                default_frame_duration = int(image.info.get("duration", 0))
+                frame_count = max(1, len(gif_frame_durations))
+                frame_durations = tuple(
+                    default_frame_duration if frame_duration is None else frame_duration
+                    for frame_duration in gif_frame_durations
+                )
+            else:
+                frame_count = int(getattr(image, "n_frames", 1))
+                frame_durations = ()
+        except BaseException:
+            image.close()
+            raise
+    except BaseException:
+        input_file.close()
+        raise
+
+    return MediaSource(
+        input_image_path=input_image_path,
+        input_file=input_file,
+        image=image,
+        format=image.format,
+        size=image.size,
+        mode=image.mode,
+        frame_count=frame_count,
+        frame_durations=frame_durations,
+    )
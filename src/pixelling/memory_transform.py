@@ -0,0 +1,282 @@
+"""Transform encoded image bytes in memory, without touching the filesystem.
+
+This is the library entry point for callers that already hold the input,
+such as services that receive images over the network. It runs the same
+decode, transformation, and encode steps as the command line, reading the
+input buffer in place and encoding the output into memory.
+"""
+
+import io
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from typing import IO
+
+from PIL import Image
+
+from .encode_profiles import get_encoder_setting_candidates
+from .gif_io import write_animated_gif_frames
+from .io import get_output_image_format, iterate_upscaled_frames, write_image_with_encoder_settings
+from .media_source import probe_media_file
+from .ops.option_values import FRAME_PALETTE_STRATEGY, NEAREST_SAMPLING
+from .ops.palette_cache import get_process_palette_cache
+from .ops.resize import upscale_image_by_integer_factor
+from .profiling import StageProfiler, measure_pipeline_stage
+from .transform import open_transformed_frame_stream, transform_media_source_image
+
+DEFAULT_MEMORY_OUTPUT_FORMAT = "png"
+ANIMATED_MEMORY_OUTPUT_FORMAT = "gif"
+MEMORY_INPUT_LABEL = "<memory>"
+
+
+class MemoryViewReader(io.RawIOBase):
+    """A seekable, read-only binary file over a buffer, without copying it.
+
+    Only the bytes each read asks for are copied. Closing the reader
+    releases its view of the buffer.
+
+    Attributes:
+        buffer: Byte view of the input buffer.
+        position: Offset of the next byte to read.
+    """
+
+    def __init__(self, buffer: bytes | bytearray | memoryview) -> None:
+        super().__init__()
+        self.buffer = memoryview(buffer).cast("B")
+        self.position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def read(self, size: int | None = -1) -> bytes:
+        end_position = len(self.buffer) if size is None or size < 0 else self.position + size
+        data = self.buffer[self.position : end_position].tobytes()
+        self.position += len(data)
+        return data
+
+    def readinto(self, target_buffer) -> int:
+        target_view = memoryview(target_buffer).cast("B")
+        byte_count = max(0, min(len(target_view), len(self.buffer) - self.position))
+        target_view[:byte_count] = self.buffer[self.position : self.position + byte_count]
+        self.position += byte_count
+        return byte_count
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            new_position = offset
+        elif whence == io.SEEK_CUR:
+            new_position = self.position + offset
+        elif whence == io.SEEK_END:
+            new_position = len(self.buffer) + offset
+        else:
+            raise ValueError(f"Invalid whence value: {whence}.")
+        if new_position < 0:
+            raise ValueError("Negative seek position.")
+        self.position = new_position
+        return self.position
+
+    def tell(self) -> int:
+        return self.position
+
+    def close(self) -> None:
+        if not self.closed:
+            self.buffer.release()
+        super().close()
+
+
+@dataclass(frozen=True)
+class TransformedImageBytes:
+    """An encoded output image and its details.
+
+    Attributes:
+        image_bytes: The encoded output image.
+        format: Pillow format name of the output, such as "PNG" or "GIF".
+        size: Output width and height.
+        frame_count: Number of input frames; 1 for still images. The GIF
+            writer may merge identical consecutive frames into one.
+        frame_durations: Per-frame durations in milliseconds for animated
+            GIF inputs; empty for still images.
+        loop: GIF loop count for animated outputs; None for still images.
+    """
+
+    image_bytes: bytes
+    format: str
+    size: tuple[int, int]
+    frame_count: int = 1
+    frame_durations: tuple[int, ...] = ()
+    loop: int | None = None
+
+
+def open_input_image_buffer(
+    input_image_data: bytes | bytearray | memoryview | IO[bytes],
+) -> MemoryViewReader:
+    """Wrap input image data in a reader, sharing its buffer where possible.
+
+    Args:
+        input_image_data: Encoded image as ``bytes``, ``bytearray``,
+            ``memoryview``, or a binary file object. A ``BytesIO`` is read
+            in place from its current position; other file objects are read
+            to the end.
+
+    Returns:
+        A seekable reader over the encoded image.
+    """
+    if isinstance(input_image_data, (bytes, bytearray, memoryview)):
+        return MemoryViewReader(input_image_data)
+    if isinstance(input_image_data, io.BytesIO):
+        return MemoryViewReader(input_image_data.getbuffer()[input_image_data.tell() :])
+    return MemoryViewReader(input_image_data.read())
+
+
+def transform_image_bytes(
+    input_image_data: bytes | bytearray | memoryview | IO[bytes],
+    transformation_mode: str,
+    block_size: int | None = None,
+    grid_width: int | None = None,
+    grid_height: int | None = None,
+    color_count: int | None = None,
+    sampling_method: str = NEAREST_SAMPLING,
+    upscale_factor: int | None = None,
+    allow_reduced_decoding: bool = True,
+    job_count: int = 1,
+    palette_strategy: str = FRAME_PALETTE_STRATEGY,
+    maximum_pixel_count: int | None = None,
+    palette_cache_capacity: int | None = None,
+    encode_profile: str | None = None,
+    output_format: str | None = None,
+    stage_profiler: StageProfiler | None = None,
+) -> TransformedImageBytes:
+    """Transform an encoded still image or animated GIF held in memory.
+
+    Args:
+        input_image_data: Encoded input image as ``bytes``, ``bytearray``,
+            ``memoryview``, or a binary file object.
+        transformation_mode: Transformation mode such as "pixel" or "grid".
+        block_size: Pixel block size used for pixel mode.
+        grid_width: Target grid width used for grid mode.
+        grid_height: Target grid height used for grid mode.
+        color_count: Optional number of colors for quantization.
+        sampling_method: Block sampling method used for pixel mode.
+        upscale_factor: Optional whole-number enlargement of the logical image.
+        allow_reduced_decoding: Whether JPEG inputs may be decoded at a
+            reduced size that still covers the final logical grid.
+        job_count: Number of worker processes used for animated GIF frames.
+        palette_strategy: Palette strategy used for animated GIF quantization.
+        maximum_pixel_count: Optional largest input width times height to
+            accept. Defaults to Pillow's decompression bomb limit.
+        palette_cache_capacity: Optional capacity of this process's palette
+            cache, which quantization uses to reuse palettes of similar images.
+        encode_profile: Optional encode profile name. None keeps the
+            encoders' defaults.
+        output_format: Output format name such as "png" or "jpeg". Defaults
+            to "png". Animated GIF inputs are always encoded as GIF.
+        stage_profiler: Optional profiler that records the "probe", "decode",
+            transformation, and "encode" stages, or "animated" for GIFs.
+
+    Returns:
+        The encoded output image with its format, size, and frame details.
+    """
+    output_extension = f".{(output_format or DEFAULT_MEMORY_OUTPUT_FORMAT).lower()}"
+    output_image_format = get_output_image_format(output_extension)
+    keep_logical_resolution = upscale_factor is not None
+    save_upscale_factor = upscale_factor or 1
+    palette_cache = None
+    if palette_cache_capacity is not None:
+        palette_cache = get_process_palette_cache(palette_cache_capacity)
+
+    with measure_pipeline_stage(stage_profiler, "probe"):
+        probed_media_source = probe_media_file(
+            open_input_image_buffer(input_image_data), MEMORY_INPUT_LABEL, maximum_pixel_count
+        )
+    output_buffer = io.BytesIO()
+    with probed_media_source as media_source:
+        if media_source.is_animated_gif:
+            transformed_frame_stream, metadata = open_transformed_frame_stream(
+                media_source=media_source,
+                transformation_mode=transformation_mode,
+                block_size=block_size,
+                grid_width=grid_width,
+                grid_height=grid_height,
+                color_count=color_count,
+                sampling_method=sampling_method,
+                keep_logical_resolution=keep_logical_resolution,
+                job_count=job_count,
+                palette_strategy=palette_strategy,
+                palette_cache=palette_cache,
+                stage_profiler=stage_profiler,
+            )
+            if save_upscale_factor != 1:
+                transformed_frame_stream = iterate_upscaled_frames(
+                    transformed_frame_stream, save_upscale_factor
+                )
+            animated_output_extension = f".{ANIMATED_MEMORY_OUTPUT_FORMAT}"
+            encoder_setting_candidates = get_encoder_setting_candidates(
+                animated_output_extension, encode_profile
+            )
+            output_frame_sizes: list[tuple[int, int]] = []
+            with measure_pipeline_stage(stage_profiler, "animated"):
+                write_animated_gif_frames(
+                    frames=iterate_frames_recording_first_size(
+                        transformed_frame_stream, output_frame_sizes
+                    ),
+                    output_file=output_buffer,
+                    metadata=metadata,
+                    encoder_settings=next(iter(encoder_setting_candidates), None),
+                )
+            return TransformedImageBytes(
+                image_bytes=output_buffer.getvalue(),
+                format=get_output_image_format(animated_output_extension),
+                size=output_frame_sizes[0],
+                frame_count=media_source.frame_count,
+                frame_durations=media_source.frame_durations,
+                loop=int(metadata["loop"]),
+            )
+
+        output_image = transform_media_source_image(
+            media_source=media_source,
+            transformation_mode=transformation_mode,
+            block_size=block_size,
+            grid_width=grid_width,
+            grid_height=grid_height,
+            color_count=color_count,
+            sampling_method=sampling_method,
+            keep_logical_resolution=keep_logical_resolution,
+            allow_reduced_decoding=allow_reduced_decoding,
+            palette_cache=palette_cache,
+            stage_profiler=stage_profiler,
+        )
+
+    with measure_pipeline_stage(stage_profiler, "encode", output_image):
+        upscaled_image = upscale_image_by_integer_factor(output_image, save_upscale_factor)
+        write_image_with_encoder_settings(
+            upscaled_image,
+            output_buffer,
+            output_image_format,
+            get_encoder_setting_candidates(output_extension, encode_profile),
+        )
+    return TransformedImageBytes(
+        image_bytes=output_buffer.getvalue(),
+        format=output_image_format,
+        size=upscaled_image.size,
+    )
+
+
+def iterate_frames_recording_first_size(
+    frames: Iterable[Image.Image],
+    frame_sizes: list[tuple[int, int]],
+) -> Iterator[Image.Image]:
+    """Yield frames unchanged, appending the first frame's size to a list.
+
+    Args:
+        frames: Frames to pass through. May be a lazy iterator.
+        frame_sizes: List that receives the size of the first frame.
+
+    Yields:
+        The input frames, in order.
+    """
+    for frame in frames:
+        if not frame_sizes:
+            frame_sizes.append(frame.size)
+        yield frame
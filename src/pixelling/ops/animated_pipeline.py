@@ -1,6 +1,22 @@
+from collections import deque
+from collections.abc import Iterable, Iterator, Sequence
+from itertools import chain, islice
+
 from PIL import Image
 
-from .pipeline import run_image_transformation_pipeline
+from ..profiling import StageProfiler
+from .palette_cache import PaletteCache
+from .pipeline import TransformationPlan, compile_transformation_plan
+from .option_values import (
+    FRAME_PALETTE_STRATEGY,
+    GLOBAL_PALETTE_STRATEGY,
+    NEAREST_SAMPLING,
+    PALETTE_STRATEGIES,
+)
+from .quantize import build_shared_palette_image, map_image_to_shared_palette
+from .shared_frames import iterate_frames_transformed_across_workers
+GLOBAL_PALETTE_SAMPLE_FRAME_COUNT = 16
+DUPLICATE_FRAME_PROBE_GRID_SIZE = 4
 
 def run_animated_image_transformation_pipeline(
     frames: list[Image.Image],
@@ -9,6 +25,12 @@ def run_animated_image_transformation_pipeline(
     grid_width: int | None = None,
     grid_height: int | None = None,
     color_count: int | None = None,
+    sampling_method: str = NEAREST_SAMPLING,
+    keep_logical_resolution: bool = False,
+    job_count: int = 1,
+    palette_strategy: str = FRAME_PALETTE_STRATEGY,
+    palette_cache: PaletteCache | None = None,
+    stage_profiler: StageProfiler | None = None,
 ) -> list[Image.Image]:
     """Run the transformation pipeline across an ordered frame sequence.
 
@@ -19,6 +41,15 @@ def run_animated_image_transformation_pipeline(
         grid_width: Target grid width used for grid mode.
         grid_height: Target grid height used for grid mode.
         color_count: Optional number of colors for quantization.
+        sampling_method: Block sampling method used for pixel mode.
+        keep_logical_resolution: Whether pixel mode keeps one pixel per block.
+        job_count: Number of worker processes. One transforms frames in the
+            current process.
+        palette_strategy: "frame" quantizes each frame on its own; "global"
+            maps every frame to one palette built from sampled frames.
+        palette_cache: Optional cache that lets per-frame quantization reuse
+            palettes built for similar frames.
+        stage_profiler: Optional profiler that records each frame's stages.
 
     Returns:
         Transformed frame sequence in the same order as the input frames.
@@ -26,15 +57,284 @@ def run_animated_image_transformation_pipeline(
     if len(frames) == 0:
         raise ValueError("At least one frame is required for animated processing.")
 
-    transformed_frames: list[Image.Image] = []
-    for frame in frames:
-        transformed_frame = run_image_transformation_pipeline(
-            image=frame,
+    transformed_frames = list(
+        iterate_animated_image_transformation_pipeline(
+            frames=frames,
             transformation_mode=transformation_mode,
             block_size=block_size,
             grid_width=grid_width,
             grid_height=grid_height,
             color_count=color_count,
+            sampling_method=sampling_method,
+            keep_logical_resolution=keep_logical_resolution,
+            job_count=job_count,
+            palette_strategy=palette_strategy,
+            palette_cache=palette_cache,
+            stage_profiler=stage_profiler,
         )
-        transformed_frames.append(transformed_frame)
+    )
     return transformed_frames
+
+
+def iterate_animated_image_transformation_pipeline(
+    frames: Iterable[Image.Image],
+    transformation_mode: str,
+    block_size: int | None = None,
+    grid_width: int | None = None,
+    grid_height: int | None = None,
+    color_count: int | None = None,
+    sampling_method: str = NEAREST_SAMPLING,
+    keep_logical_resolution: bool = False,
+    job_count: int = 1,
+    palette_strategy: str = FRAME_PALETTE_STRATEGY,
+    palette_cache: PaletteCache | None = None,
+    stage_profiler: StageProfiler | None = None,
+    palette_sample_frames: Iterable[Image.Image] | None = None,
+) -> Iterator[Image.Image]:
+    """Lazily run the transformation pipeline across an ordered frame stream.
+
+    Each frame is transformed only when the consumer asks for it, so a
+    decode → transform → encode chain holds a bounded number of frames.
+    A run of identical consecutive input frames is transformed once and the
+    same output frame is yielded for every copy, so the frame count and
+    timing are unchanged.
+
+    Args:
+        frames: Input frames to transform. May be a lazy iterator.
+        transformation_mode: Transformation mode such as "pixel" or "grid".
+        block_size: Pixel block size used for pixel mode.
+        grid_width: Target grid width used for grid mode.
+        grid_height: Target grid height used for grid mode.
+        color_count: Optional number of colors for quantization.
+        sampling_method: Block sampling method used for pixel mode.
+        keep_logical_resolution: Whether pixel mode keeps one pixel per block.
+        job_count: Number of worker processes. One transforms frames in the
+            current process; more pass frame pixels to workers through shared
+            memory.
+        palette_strategy: "frame" quantizes each frame on its own; "global"
+            maps every frame to one palette built from sampled frames and
+            yields palette-mode frames.
+        palette_cache: Optional cache that lets per-frame quantization reuse
+            palettes built for similar frames.
+        stage_profiler: Optional profiler that records each frame's stages.
+            Frames transformed in worker processes are not recorded.
+        palette_sample_frames: Optional input frames to build the global
+            palette from, read in full before ``frames`` is started. Without
+            them a lazy ``frames`` stream is sampled from its first frames.
+
+    Yields:
+        Transformed frames in the same order as the input frames.
+    """
+    if job_count <= 0:
+        raise ValueError("Job count must be a positive integer.")
+    if palette_strategy not in PALETTE_STRATEGIES:
+        raise ValueError(
+            f"Invalid palette strategy: '{palette_strategy}'. "
+            f"Valid options are: {', '.join(PALETTE_STRATEGIES)}."
+        )
+
+    use_global_palette = palette_strategy == GLOBAL_PALETTE_STRATEGY and color_count is not None
+    frame_color_count = None if use_global_palette else color_count
+
+    repeat_counts: deque[int] = deque()
+
+    def iterate_unique_frames() -> Iterator[Image.Image]:
+        for unique_frame, repeat_count in iterate_frames_with_repeat_counts(frames):
+            repeat_counts.append(repeat_count)
+            yield unique_frame
+
+    transformation_plan = compile_transformation_plan(
+        transformation_mode=transformation_mode,
+        block_size=block_size,
+        grid_width=grid_width,
+        grid_height=grid_height,
+        color_count=frame_color_count,
+        sampling_method=sampling_method,
+        keep_logical_resolution=keep_logical_resolution,
+    )
+    transformed_frame_stream = iterate_transformed_frames(
+        frames=iterate_unique_frames(),
+        transformation_plan=transformation_plan,
+        job_count=job_count,
+        palette_cache=palette_cache,
+        stage_profiler=stage_profiler,
+    )
+    if use_global_palette:
+        transformed_sample_frames = None
+        if palette_sample_frames is not None:
+            transformed_sample_frames = list(
+                iterate_transformed_frames(
+                    frames=palette_sample_frames,
+                    transformation_plan=transformation_plan,
+                    job_count=1,
+                )
+            )
+        elif isinstance(frames, Sequence) and len(frames) > GLOBAL_PALETTE_SAMPLE_FRAME_COUNT:
+            transformed_frame_stream = list(transformed_frame_stream)
+        transformed_frame_stream = iterate_frames_mapped_to_global_palette(
+            frames=transformed_frame_stream,
+            color_count=color_count,
+            sample_frames=transformed_sample_frames,
+        )
+
+    transformed_frame_count = 0
+    for transformed_frame in transformed_frame_stream:
+        for _ in range(repeat_counts.popleft()):
+            transformed_frame_count += 1
+            yield transformed_frame
+
+    if transformed_frame_count == 0:
+        raise ValueError("At least one frame is required for animated processing.")
+
+
+def are_frames_identical(first_frame: Image.Image, second_frame: Image.Image) -> bool:
+    """Return whether two frames have the same mode, size, and pixels.
+
+    A grid of probe pixels is compared first, so frames that differ are
+    usually rejected without copying their pixel buffers.
+
+    Args:
+        first_frame: First decoded frame.
+        second_frame: Second decoded frame.
+
+    Returns:
+        True when every pixel of both frames is equal.
+    """
+    if first_frame.mode != second_frame.mode or first_frame.size != second_frame.size:
+        return False
+
+    width, height = first_frame.size
+    for row_index in range(DUPLICATE_FRAME_PROBE_GRID_SIZE):
+        for column_index in range(DUPLICATE_FRAME_PROBE_GRID_SIZE):
+            probe_position = (
+                (2 * column_index + 1) * width // (2 * DUPLICATE_FRAME_PROBE_GRID_SIZE),
+                (2 * row_index + 1) * height // (2 * DUPLICATE_FRAME_PROBE_GRID_SIZE),
+            )
+            if first_frame.getpixel(probe_position) != second_frame.getpixel(probe_position):
+                return False
+    return first_frame.tobytes() == second_frame.tobytes()
+
+
+def iterate_frames_with_repeat_counts(
+    frames: Iterable[Image.Image],
+) -> Iterator[tuple[Image.Image, int]]:
+    """Collapse runs of identical consecutive frames into one frame and a count.
+
+    A frame is yielded once the next different frame arrives, so at most
+    one extra input frame is held.
+
+    Args:
+        frames: Input frames. May be a lazy iterator.
+
+    Yields:
+        Each distinct frame with the number of consecutive times it appears.
+    """
+    current_frame: Image.Image | None = None
+    repeat_count = 0
+    for frame in frames:
+        if current_frame is not None and are_frames_identical(current_frame, frame):
+            repeat_count += 1
+            continue
+        if current_frame is not None:
+            yield current_frame, repeat_count
+        current_frame = frame
+        repeat_count = 1
+
+    if current_frame is not None:
+        yield current_frame, repeat_count
+
+
+def iterate_transformed_frames(
+    frames: Iterable[Image.Image],
+    transformation_plan: TransformationPlan,
+    job_count: int,
+    palette_cache: PaletteCache | None = None,
+    stage_profiler: StageProfiler | None = None,
+) -> Iterator[Image.Image]:
+    """Yield frames transformed by one plan, in process or across workers.
+
+    Args:
+        frames: Input frames to transform. May be a lazy iterator.
+        transformation_plan: Compiled plan applied to every frame.
+        job_count: Number of worker processes.
+        palette_cache: Optional palette cache. Workers use their own
+            process's cache of the same capacity.
+        stage_profiler: Optional profiler for frames transformed in this
+            process.
+
+    Yields:
+        Transformed frames in the same order as the input frames.
+    """
+    if job_count > 1:
+        yield from iterate_frames_transformed_across_workers(
+            frames=frames,
+            transformation_plan=transformation_plan,
+            job_count=job_count,
+            palette_cache=palette_cache,
+        )
+        return
+
+    for frame in frames:
+        yield transformation_plan.apply(frame, palette_cache, stage_profiler)
+
+
+def select_palette_sample_frames(
+    frames: Iterable[Image.Image],
+    frame_count: int,
+) -> Iterator[Image.Image]:
+    """Return evenly spaced frames of a stream whose length is known ahead.
+
+    Reading stops after the last sample, and only the samples are kept, so
+    a lazy stream can be sampled across its whole length in one bounded pass.
+
+    Args:
+        frames: Frames to sample. May be a lazy iterator.
+        frame_count: Number of frames in the stream.
+
+    Returns:
+        An iterator over at most ``GLOBAL_PALETTE_SAMPLE_FRAME_COUNT`` frames.
+    """
+    sample_step = max(1, frame_count // GLOBAL_PALETTE_SAMPLE_FRAME_COUNT)
+    return islice(frames, 0, sample_step * GLOBAL_PALETTE_SAMPLE_FRAME_COUNT, sample_step)
+
+
+def iterate_frames_mapped_to_global_palette(
+    frames: Iterable[Image.Image],
+    color_count: int,
+    sample_frames: list[Image.Image] | None = None,
+) -> Iterator[Image.Image]:
+    """Yield frames mapped to one palette built from sampled frames.
+
+    The palette is built from ``sample_frames`` when they are given.
+    Otherwise a list is sampled evenly across its whole length, and a lazy
+    iterator is sampled from its first ``GLOBAL_PALETTE_SAMPLE_FRAME_COUNT``
+    frames so that only that window is held in memory. Colors that first
+    appear after that window map to the nearest sampled color.
+
+    Args:
+        frames: Transformed frames to quantize.
+        color_count: Maximum number of colors in the shared palette.
+        sample_frames: Optional transformed frames to build the palette from.
+
+    Yields:
+        Palette-mode frames that all share the same palette.
+    """
+    if sample_frames:
+        remaining_frames: Iterable[Image.Image] = frames
+    elif isinstance(frames, Sequence):
+        if len(frames) == 0:
+            return
+        sample_step = max(1, len(frames) // GLOBAL_PALETTE_SAMPLE_FRAME_COUNT)
+        sample_frames = list(frames[::sample_step][:GLOBAL_PALETTE_SAMPLE_FRAME_COUNT])
+        remaining_frames = frames
+    else:
+        frame_iterator = iter(frames)
+        sample_frames = list(islice(frame_iterator, GLOBAL_PALETTE_SAMPLE_FRAME_COUNT))
+        if len(sample_frames) == 0:
+            return
+        remaining_frames = chain(sample_frames, frame_iterator)
+
+    palette_image = build_shared_palette_image(sample_frames, color_count)
+    del sample_frames
+    for frame in remaining_frames:
+        yield map_image_to_shared_palette(frame, palette_image)
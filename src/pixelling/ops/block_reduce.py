@@ -0,0 +1,176 @@
+"""Vectorized block reduction used by the sampled pixelation engine."""
+
+from PIL import Image
+
+from .option_values import (
+    BLOCK_REDUCTION_SAMPLING_METHODS,
+    MEAN_SAMPLING,
+    MEDIAN_SAMPLING,
+    MODE_SAMPLING,
+)
+
+BLOCK_REDUCTION_MODES = ("L", "LA", "RGB", "RGBA", "I;16")
+SIXTEEN_BIT_GRAY_MODE = "I;16"
+
+
+def import_numpy():
+    """Return the NumPy module or raise a helpful error when it is missing.
+
+    Returns:
+        The imported ``numpy`` module.
+    """
+    try:
+        import numpy
+    except ImportError as error:
+        raise ImportError(
+            "Median and mode block sampling require NumPy. Install it with 'pip install pixelling[numpy]'."
+        ) from error
+    return numpy
+
+
+def convert_image_for_block_reduction(image: Image.Image) -> Image.Image:
+    """Return the image in a mode whose channels can be averaged directly.
+
+    Args:
+        image: Input image in any Pillow mode.
+
+    Returns:
+        The image itself, or a converted copy in L, LA, RGB, or RGBA mode.
+        16-bit grayscale ("I;16") images are kept as they are.
+    """
+    if image.mode in BLOCK_REDUCTION_MODES:
+        return image
+    if "A" in image.getbands() or "transparency" in image.info:
+        return image.convert("RGBA")
+    return image.convert("RGB")
+
+
+def reduce_image_blocks(
+    image: Image.Image,
+    block_size: int,
+    sampling_method: str,
+) -> Image.Image:
+    """Return a small image with one pixel per block of the input image.
+
+    The image is viewed as a grid of ``block_size`` x ``block_size`` blocks
+    and every block is reduced in a single vectorized pass. The mean uses
+    Pillow's integer-factor ``reduce``. For images without alpha it rounds
+    like a NumPy block sum. For "RGBA" and "LA" images Pillow premultiplies
+    by alpha, so each block's color is the alpha-weighted mean of its pixels
+    rather than a plain per-channel mean. The median and mode reshape the
+    pixel array with NumPy and treat every channel alike.
+    Pixels to the right of or below the last whole block are not sampled.
+
+    Args:
+        image: Input image to reduce.
+        block_size: Size of each square block in pixels.
+        sampling_method: One of "mean", "median", or "mode".
+
+    Returns:
+        An image of size ``(width // block_size, height // block_size)``.
+    """
+    if sampling_method not in BLOCK_REDUCTION_SAMPLING_METHODS:
+        raise ValueError(
+            f"Invalid sampling method: '{sampling_method}'. "
+            f"Valid options are: {', '.join(BLOCK_REDUCTION_SAMPLING_METHODS)}."
+        )
+
+    reducible_image = convert_image_for_block_reduction(image)
+    width, height = reducible_image.size
+    reduced_width = width // block_size
+    reduced_height = height // block_size
+
+    if sampling_method == MEAN_SAMPLING:
+        reduction_box = (0, 0, reduced_width * block_size, reduced_height * block_size)
+        if reducible_image.mode == SIXTEEN_BIT_GRAY_MODE:
+            return reducible_image.convert("I").reduce(block_size, box=reduction_box).convert(
+                SIXTEEN_BIT_GRAY_MODE
+            )
+        return reducible_image.reduce(block_size, box=reduction_box)
+
+    numpy = import_numpy()
+
+    pixel_array = numpy.asarray(reducible_image)
+    if pixel_array.ndim == 2:
+        pixel_array = pixel_array[:, :, numpy.newaxis]
+    channel_count = pixel_array.shape[2]
+
+    block_array = pixel_array[: reduced_height * block_size, : reduced_width * block_size].reshape(
+        reduced_height, block_size, reduced_width, block_size, channel_count
+    )
+
+    if sampling_method == MEDIAN_SAMPLING:
+        reduced_array = reduce_blocks_to_median(numpy, block_array, block_size)
+    else:
+        reduced_array = reduce_blocks_to_mode(numpy, block_array, block_size)
+
+    if channel_count == 1:
+        reduced_array = reduced_array[:, :, 0]
+    return Image.fromarray(numpy.ascontiguousarray(reduced_array))
+
+
+def reduce_blocks_to_median(numpy, block_array, block_size: int):
+    """Return the per-channel median of every block, rounding halves up.
+
+    Args:
+        numpy: Imported NumPy module.
+        block_array: Array shaped (rows, block, columns, block, channels).
+        block_size: Size of each square block in pixels.
+
+    Returns:
+        An array of the input's type shaped (rows, columns, channels).
+    """
+    reduced_height, _, reduced_width, _, channel_count = block_array.shape
+    block_pixels = block_array.transpose(0, 2, 4, 1, 3).reshape(
+        reduced_height, reduced_width, channel_count, block_size * block_size
+    )
+    channel_medians = numpy.median(block_pixels, axis=3)
+    return numpy.floor(channel_medians + 0.5).astype(block_array.dtype)
+
+
+def reduce_blocks_to_mode(numpy, block_array, block_size: int):
+    """Return the most frequent color of every block.
+
+    Each pixel's channels are packed into one integer so whole colors are
+    compared. Ties go to the color with the smallest packed value.
+
+    Args:
+        numpy: Imported NumPy module.
+        block_array: Array shaped (rows, block, columns, block, channels),
+            with 8-bit channels or a single 16-bit channel.
+        block_size: Size of each square block in pixels.
+
+    Returns:
+        An array of the input's type shaped (rows, columns, channels).
+    """
+    reduced_height, _, reduced_width, _, channel_count = block_array.shape
+    channel_bit_count = 8 * block_array.dtype.itemsize
+    channel_mask = (1 << channel_bit_count) - 1
+    block_pixels = block_array.transpose(0, 2, 1, 3, 4).reshape(
+        reduced_height, reduced_width, block_size * block_size, channel_count
+    )
+    packed_colors = numpy.zeros(block_pixels.shape[:3], dtype=numpy.uint32)
+    for channel_index in range(channel_count):
+        packed_colors |= block_pixels[..., channel_index].astype(numpy.uint32) << (
+            channel_bit_count * channel_index
+        )
+
+    sorted_colors = numpy.sort(packed_colors, axis=2)
+    pixel_positions = numpy.arange(sorted_colors.shape[2])
+    run_starts = numpy.ones(sorted_colors.shape, dtype=bool)
+    run_starts[:, :, 1:] = sorted_colors[:, :, 1:] != sorted_colors[:, :, :-1]
+    run_start_positions = numpy.maximum.accumulate(
+        numpy.where(run_starts, pixel_positions, 0),
+        axis=2,
+    )
+    run_lengths = pixel_positions - run_start_positions
+    dominant_positions = numpy.argmax(run_lengths, axis=2)
+    dominant_colors = numpy.take_along_axis(
+        sorted_colors, dominant_positions[:, :, numpy.newaxis], axis=2
+    )[:, :, 0]
+
+    channel_values = [
+        (dominant_colors >> (channel_bit_count * channel_index)) & channel_mask
+        for channel_index in range(channel_count)
+    ]
+    return numpy.stack(channel_values, axis=2).astype(block_array.dtype)
@@ -1,25 +1,27 @@
 from PIL import Image
-from .resize import resize_image_with_resampling
+from ..profiling import StageProfiler, measure_pipeline_stage
 
 GRID_DOWNSCALE_RESAMPLING_FILTER = Image.Resampling.BOX
+GRID_REDUCING_GAP = 16
+GRID_UNREDUCIBLE_MODES = ("1", "P", "I;16", "I;16L", "I;16B", "I;16N")
 
 
-def crop_image_to_target_aspect_ratio(
-    image: Image.Image,
+def calculate_center_crop_box(
+    source_size: tuple[int, int],
     target_width: int,
     target_height: int,
-) -> Image.Image:
-    """Return a center-cropped image that matches the target aspect ratio.
+) -> tuple[int, int, int, int]:
+    """Return the centered crop box that matches the target aspect ratio.
 
     Args:
-        image: Source image to crop.
+        source_size: Source image width and height.
         target_width: Target output width in pixels.
         target_height: Target output height in pixels.
 
     Returns:
-        A cropped image with the same aspect ratio as the target dimensions.
+        The crop box as (left, top, right, bottom).
     """
-    source_width, source_height = image.size
+    source_width, source_height = source_size
     source_aspect_ratio = source_width / source_height
     target_aspect_ratio = target_width / target_height
 
@@ -27,31 +29,55 @@ def crop_image_to_target_aspect_ratio(
         cropped_width = int(round(source_height * target_aspect_ratio))
         left_crop = (source_width - cropped_width) // 2
         right_crop = left_crop + cropped_width
-        return image.crop((left_crop, 0, right_crop, source_height))
+        return (left_crop, 0, right_crop, source_height)
 
     if source_aspect_ratio < target_aspect_ratio:
         cropped_height = int(round(source_width / target_aspect_ratio))
         top_crop = (source_height - cropped_height) // 2
         bottom_crop = top_crop + cropped_height
-        return image.crop((0, top_crop, source_width, bottom_crop))
+        return (0, top_crop, source_width, bottom_crop)
+
+    return (0, 0, source_width, source_height)
 
-    return image
+
+def crop_image_to_target_aspect_ratio(
+    image: Image.Image,
+    target_width: int,
+    target_height: int,
+) -> Image.Image:
+    """Return a center-cropped image that matches the target aspect ratio.
+
+    Args:
+        image: Source image to crop.
+        target_width: Target output width in pixels.
+        target_height: Target output height in pixels.
+
+    Returns:
+        A cropped image with the same aspect ratio as the target dimensions.
+    """
+    crop_box = calculate_center_crop_box(image.size, target_width, target_height)
+    if crop_box == (0, 0) + image.size:
+        return image
+    return image.crop(crop_box)
 
 
 def resize_image_to_fixed_grid(
     image: Image.Image,
     grid_width: int,
     grid_height: int,
+    stage_profiler: StageProfiler | None = None,
 ) -> Image.Image:
     """Return an image resized to a fixed grid width and height.
 
     The operation center-crops to match the target aspect ratio, then
     downsamples with a box filter for cleaner low-resolution pixel-art output.
+    Both happen in one resample of the crop box, so the crop is never copied.
 
     Args:
         image: Input image to resize.
         grid_width: Target grid width in pixels.
         grid_height: Target grid height in pixels.
+        stage_profiler: Optional profiler that records the "resize" stage.
 
     Returns:
         A new image resized to the requested grid dimensions.
@@ -59,16 +85,76 @@ def resize_image_to_fixed_grid(
     if grid_width <= 0 or grid_height <= 0:
         raise ValueError("Grid dimensions must be positive integers.")
 
-    cropped_image = crop_image_to_target_aspect_ratio(
-        image=image,
-        target_width=grid_width,
-        target_height=grid_height,
+    crop_box = calculate_center_crop_box(image.size, grid_width, grid_height)
+    with measure_pipeline_stage(stage_profiler, "resize", image) as stage_measurement:
+        grid_image = resize_crop_box_to_grid(image, crop_box, grid_width, grid_height)
+        stage_measurement.record_output(grid_image)
+    return grid_image
+
+
+def calculate_grid_reduction_factor(crop_length: int, grid_length: int) -> int:
+    """Return the integer factor to reduce one crop axis by before resizing.
+
+    An axis whose crop length is a whole multiple of the grid length is
+    reduced by exactly that multiple. Any other axis is reduced by a factor
+    that leaves at least ``GRID_REDUCING_GAP`` reduced pixels per grid cell.
+
+    Args:
+        crop_length: Width or height of the crop box in pixels.
+        grid_length: Matching grid width or height.
+
+    Returns:
+        The reduction factor, at least 1.
+    """
+    if crop_length % grid_length == 0:
+        return crop_length // grid_length
+    return max(1, crop_length // (grid_length * GRID_REDUCING_GAP))
+
+
+def resize_crop_box_to_grid(
+    image: Image.Image,
+    crop_box: tuple[int, int, int, int],
+    grid_width: int,
+    grid_height: int,
+) -> Image.Image:
+    """Box-filter the crop box of an image down to the grid size.
+
+    When the crop is a whole multiple of the grid on both axes, ``reduce``
+    averages each cell directly. Otherwise the crop is first reduced by
+    integer factors and then box-resized the rest of the way. A box filter
+    weighs every reduced pixel inside a cell as a whole, so the result
+    differs from box-resizing the full-resolution crop by at most 4 levels
+    per channel on opaque images, and by under 1 level on average. Modes
+    ``reduce`` does not support are box-resized from the crop box directly.
+
+    Args:
+        image: Input image.
+        crop_box: Region to resize as (left, top, right, bottom).
+        grid_width: Target grid width in pixels.
+        grid_height: Target grid height in pixels.
+
+    Returns:
+        A new image of size ``(grid_width, grid_height)``.
+    """
+    grid_size = (grid_width, grid_height)
+    if image.mode in GRID_UNREDUCIBLE_MODES:
+        return image.resize(grid_size, resample=GRID_DOWNSCALE_RESAMPLING_FILTER, box=crop_box)
+
+    left_crop, top_crop, right_crop, bottom_crop = crop_box
+    crop_width = right_crop - left_crop
+    crop_height = bottom_crop - top_crop
+    reduction_factors = (
+        calculate_grid_reduction_factor(crop_width, grid_width),
+        calculate_grid_reduction_factor(crop_height, grid_height),
     )
-    
-    grid_image = resize_image_with_resampling(
-        image=cropped_image,
-        width=grid_width,
-        height=grid_height,
-        resampling_filter=GRID_DOWNSCALE_RESAMPLING_FILTER,
+    if reduction_factors == (1, 1):
+        return image.resize(grid_size, resample=GRID_DOWNSCALE_RESAMPLING_FILTER, box=crop_box)
+
+    reduced_image = image.reduce(reduction_factors, box=crop_box)
+    if reduced_image.size == grid_size:
+        return reduced_image
+    return reduced_image.resize(
+        grid_size,
+        resample=GRID_DOWNSCALE_RESAMPLING_FILTER,
+        box=(0, 0, crop_width / reduction_factors[0], crop_height / reduction_factors[1]),
     )
-    return grid_image
@@ -0,0 +1,23 @@
+"""Names and defaults of transformation options.
+
+This module imports nothing, so the command line can list the choices in
+its help text and validate arguments without loading Pillow.
+"""
+
+NEAREST_SAMPLING = "nearest"
+MEAN_SAMPLING = "mean"
+MEDIAN_SAMPLING = "median"
+MODE_SAMPLING = "mode"
+BLOCK_REDUCTION_SAMPLING_METHODS = (MEAN_SAMPLING, MEDIAN_SAMPLING, MODE_SAMPLING)
+PIXEL_SAMPLING_METHODS = (NEAREST_SAMPLING,) + BLOCK_REDUCTION_SAMPLING_METHODS
+
+FRAME_PALETTE_STRATEGY = "frame"
+GLOBAL_PALETTE_STRATEGY = "global"
+PALETTE_STRATEGIES = (FRAME_PALETTE_STRATEGY, GLOBAL_PALETTE_STRATEGY)
+
+DEFAULT_RESULT_CACHE_MAXIMUM_BYTE_COUNT = 1 << 30
+
+FAST_ENCODE_PROFILE = "fast"
+BALANCED_ENCODE_PROFILE = "balanced"
+SMALLEST_ENCODE_PROFILE = "smallest"
+ENCODE_PROFILES = (FAST_ENCODE_PROFILE, BALANCED_ENCODE_PROFILE, SMALLEST_ENCODE_PROFILE)
@@ -0,0 +1,155 @@
+"""In-process memoization of quantization palettes for similar images."""
+
+from collections import OrderedDict
+
+from PIL import Image
+
+DEFAULT_PALETTE_CACHE_CAPACITY = 64
+PALETTE_SIGNATURE_SAMPLE_SIZE = (32, 32)
+PALETTE_SIGNATURE_CHANNEL_BITS = 3
+PALETTE_SIGNATURE_SHARE_LEVELS = 32
+
+
+def build_color_histogram_signature(image: Image.Image, color_count: int) -> tuple:
+    """Return a cheap, hashable summary of an image's color distribution.
+
+    The image is box-downscaled to a small sample and each channel is cut to
+    a few bits. Each remaining color's share of the sample is rounded to a
+    coarse step, and colors that round to zero are dropped. Images that
+    differ only in small details therefore share a signature.
+
+    Args:
+        image: Image that is about to be quantized.
+        color_count: Number of palette colors requested.
+
+    Returns:
+        A tuple of the color count, whether the image has alpha, and the
+        sorted coarse color shares.
+    """
+    sample_image = image.convert("RGB").resize(
+        PALETTE_SIGNATURE_SAMPLE_SIZE,
+        resample=Image.Resampling.BOX,
+        reducing_gap=2.0,
+    )
+    discarded_bit_count = 8 - PALETTE_SIGNATURE_CHANNEL_BITS
+    posterized_image = sample_image.point(lambda value: value >> discarded_bit_count)
+    sample_pixel_count = sample_image.width * sample_image.height
+    color_shares = []
+    for pixel_count, color in posterized_image.getcolors(maxcolors=sample_pixel_count):
+        color_share = round(pixel_count * PALETTE_SIGNATURE_SHARE_LEVELS / sample_pixel_count)
+        if color_share > 0:
+            color_shares.append((color, color_share))
+    return color_count, "A" in image.getbands(), tuple(sorted(color_shares))
+
+
+class PaletteCache:
+    """A least-recently-used cache of palettes keyed by histogram signature.
+
+    There is one cache per process and capacity: creating one through
+    ``get_process_palette_cache``, or sending one to a worker process,
+    yields that process's shared instance. Palettes built for one frame or
+    file are therefore reused by later frames and files handled by the same
+    process.
+
+    Attributes:
+        capacity: Largest number of palettes kept.
+        hit_count: Number of lookups that found a palette.
+        miss_count: Number of lookups that did not.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_PALETTE_CACHE_CAPACITY) -> None:
+        if capacity <= 0:
+            raise ValueError("Palette cache capacity must be a positive integer.")
+        self.capacity = capacity
+        self.hit_count = 0
+        self.miss_count = 0
+        self.palette_images: OrderedDict[tuple, Image.Image] = OrderedDict()
+
+    def __reduce__(self):
+        return get_process_palette_cache, (self.capacity,)
+
+    def __len__(self) -> int:
+        return len(self.palette_images)
+
+    @property
+    def hit_rate(self) -> float:
+        """Return the share of lookups that found a palette, from 0.0 to 1.0."""
+        lookup_count = self.hit_count + self.miss_count
+        if lookup_count == 0:
+            return 0.0
+        return self.hit_count / lookup_count
+
+    def look_up_palette(self, signature: tuple) -> Image.Image | None:
+        """Return the cached palette image for a signature, if any.
+
+        Args:
+            signature: Signature from ``build_color_histogram_signature``.
+
+        Returns:
+            A palette-mode image, or None on a miss.
+        """
+        palette_image = self.palette_images.get(signature)
+        if palette_image is None:
+            self.miss_count += 1
+            return None
+        self.palette_images.move_to_end(signature)
+        self.hit_count += 1
+        return palette_image
+
+    def store_palette(self, signature: tuple, quantized_image: Image.Image) -> None:
+        """Keep the palette of a freshly quantized image, evicting the oldest if full.
+
+        Only the palette is kept, in a one-pixel image, not the pixels.
+
+        Args:
+            signature: Signature from ``build_color_histogram_signature``.
+            quantized_image: Palette-mode image returned by ``quantize``.
+        """
+        palette_image = Image.new("P", (1, 1))
+        palette_image.putpalette(quantized_image.getpalette())
+        self.palette_images[signature] = palette_image
+        self.palette_images.move_to_end(signature)
+        while len(self.palette_images) > self.capacity:
+            self.palette_images.popitem(last=False)
+
+    def format_statistics(self) -> str:
+        """Return a one-line summary of the cache counters.
+
+        Returns:
+            Summary text such as "Palette cache: 3 hits, 1 misses (75% hit rate)."
+        """
+        return format_palette_cache_statistics(self.hit_count, self.miss_count)
+
+
+def format_palette_cache_statistics(hit_count: int, miss_count: int) -> str:
+    """Return a one-line summary of palette cache counters.
+
+    Args:
+        hit_count: Number of lookups that found a palette.
+        miss_count: Number of lookups that did not.
+
+    Returns:
+        Summary text such as "Palette cache: 3 hits, 1 misses (75% hit rate)."
+    """
+    lookup_count = hit_count + miss_count
+    hit_rate = hit_count / lookup_count if lookup_count > 0 else 0.0
+    return f"Palette cache: {hit_count} hits, {miss_count} misses ({hit_rate:.0%} hit rate)."
+
+
+PROCESS_PALETTE_CACHES: dict[int, PaletteCache] = {}
+
+
+def get_process_palette_cache(capacity: int = DEFAULT_PALETTE_CACHE_CAPACITY) -> PaletteCache:
+    """Return this process's palette cache for a capacity, creating it if needed.
+
+    Args:
+        capacity: Largest number of palettes kept.
+
+    Returns:
+        The palette cache shared by everything in this process.
+    """
+    palette_cache = PROCESS_PALETTE_CACHES.get(capacity)
+    if palette_cache is None:
+        palette_cache = PaletteCache(capacity)
+        PROCESS_PALETTE_CACHES[capacity] = palette_cache
+    return palette_cache
@@ -1,8 +1,262 @@
+import math
+from dataclasses import dataclass
+from functools import lru_cache
+
 from PIL import Image
 
+from ..profiling import StageProfiler, measure_pipeline_stage
+from .block_reduce import reduce_image_blocks
+from .palette_cache import PaletteCache
 from .quantize import quantize_image_colors
-from .pixelate import pixelate_image_with_block_size
-from .grid import resize_image_to_fixed_grid
+from .pixelate import (
+    NEAREST_SAMPLING,
+    MEAN_SAMPLING,
+    validate_pixelation_arguments,
+)
+from .grid import calculate_center_crop_box, resize_crop_box_to_grid
+from .option_values import PIXEL_SAMPLING_METHODS
+from .resize import resize_image_with_resampling
+
+REDUCED_DECODE_SCALES = (8, 4, 2)
+REDUCED_DECODE_PIXEL_SAMPLING_METHODS = (NEAREST_SAMPLING, MEAN_SAMPLING)
+TRANSFORMATION_PLAN_CACHE_SIZE = 32
+RESOLVED_TRANSFORMATION_PLAN_CACHE_SIZE = 64
+
+
+@dataclass(frozen=True)
+class ResolvedTransformationPlan:
+    """Every size a transformation plan needs for one input size.
+
+    Attributes:
+        input_size: Width and height of the images this plan accepts.
+        logical_size: Size after pixelation or the grid resize, before any
+            upscale.
+        crop_box: Grid-mode center crop as (left, top, right, bottom), or
+            None in pixel mode.
+        quantization_size: Size at which colors are quantized, or None
+            without quantization.
+        output_size: Width and height of the transformed image.
+    """
+
+    input_size: tuple[int, int]
+    logical_size: tuple[int, int]
+    crop_box: tuple[int, int, int, int] | None
+    quantization_size: tuple[int, int] | None
+    output_size: tuple[int, int]
+
+
+@dataclass(frozen=True)
+class TransformationPlan:
+    """A validated transformation mode and its parameters.
+
+    Build plans with ``compile_transformation_plan``. A plan is immutable, so
+    one plan can transform every image of a batch or every frame of an
+    animation. Sizes are resolved once per plan and input size and kept in
+    the thread-safe cache of ``resolve_transformation_plan``, not on the
+    plan, so plans shared between threads hold no mutable state.
+
+    Attributes:
+        transformation_mode: Transformation mode name, "pixel" or "grid".
+        block_size: Pixel block size in pixel mode; otherwise None.
+        grid_width: Target grid width in grid mode; otherwise None.
+        grid_height: Target grid height in grid mode; otherwise None.
+        color_count: Optional number of colors for quantization.
+        sampling_method: Block sampling method used for pixel mode.
+        keep_logical_resolution: Whether pixel mode keeps one pixel per block.
+    """
+
+    transformation_mode: str
+    block_size: int | None = None
+    grid_width: int | None = None
+    grid_height: int | None = None
+    color_count: int | None = None
+    sampling_method: str = NEAREST_SAMPLING
+    keep_logical_resolution: bool = False
+
+    def resolve_input_size(self, input_size: tuple[int, int]) -> ResolvedTransformationPlan:
+        """Return the crop box and target sizes for images of one size.
+
+        Args:
+            input_size: Width and height of the input image.
+
+        Returns:
+            The resolved sizes, computed on the first call for each size.
+        """
+        return resolve_transformation_plan(self, input_size)
+
+    def apply(
+        self,
+        image: Image.Image,
+        palette_cache: PaletteCache | None = None,
+        stage_profiler: StageProfiler | None = None,
+    ) -> Image.Image:
+        """Transform one image with this plan.
+
+        In pixel mode, quantization runs before the final upscale, where
+        there are far fewer pixels to reduce.
+
+        Args:
+            image: Input image to transform.
+            palette_cache: Optional cache that lets quantization reuse
+                palettes built for similar images.
+            stage_profiler: Optional profiler that records the duration and
+                pixel counts of each stage.
+
+        Returns:
+            A transformed image after applying the planned operations.
+        """
+        resolved_plan = self.resolve_input_size(image.size)
+
+        if self.transformation_mode == "grid":
+            with measure_pipeline_stage(stage_profiler, "resize", image) as stage_measurement:
+                transformed_image = resize_crop_box_to_grid(
+                    image, resolved_plan.crop_box, *resolved_plan.logical_size
+                )
+                stage_measurement.record_output(transformed_image)
+        else:
+            with measure_pipeline_stage(stage_profiler, "pixelate", image) as stage_measurement:
+                if self.sampling_method == NEAREST_SAMPLING:
+                    transformed_image = resize_image_with_resampling(
+                        image=image,
+                        width=resolved_plan.logical_size[0],
+                        height=resolved_plan.logical_size[1],
+                        resampling_filter=Image.Resampling.NEAREST,
+                    )
+                else:
+                    transformed_image = reduce_image_blocks(
+                        image=image,
+                        block_size=self.block_size,
+                        sampling_method=self.sampling_method,
+                    )
+                stage_measurement.record_output(transformed_image)
+
+        if self.color_count is not None:
+            if resolved_plan.quantization_size != transformed_image.size:
+                transformed_image = upscale_logical_image(
+                    transformed_image, resolved_plan.quantization_size, stage_profiler
+                )
+            transformed_image = quantize_image_colors(
+                transformed_image, self.color_count, palette_cache, stage_profiler
+            )
+
+        if transformed_image.size != resolved_plan.output_size:
+            transformed_image = upscale_logical_image(
+                transformed_image, resolved_plan.output_size, stage_profiler
+            )
+        return transformed_image
+
+
+@lru_cache(maxsize=TRANSFORMATION_PLAN_CACHE_SIZE)
+def compile_transformation_plan(
+    transformation_mode: str,
+    block_size: int | None = None,
+    grid_width: int | None = None,
+    grid_height: int | None = None,
+    color_count: int | None = None,
+    sampling_method: str = NEAREST_SAMPLING,
+    keep_logical_resolution: bool = False,
+) -> TransformationPlan:
+    """Validate transformation options once and return a reusable plan.
+
+    Options the mode does not use are dropped, so equal settings compile to
+    the same plan. Repeated calls with the same options return the same plan
+    object and its already resolved sizes.
+
+    Args:
+        transformation_mode: Transformation mode name, such as "pixel" or "grid".
+        block_size: Pixel block size used for pixel mode.
+        grid_width: Target grid width used for grid mode.
+        grid_height: Target grid height used for grid mode.
+        color_count: Optional number of colors for quantization.
+        sampling_method: Block sampling method used for pixel mode.
+        keep_logical_resolution: Whether pixel mode returns the small image
+            with one pixel per block instead of enlarging it to the input
+            size.
+
+    Returns:
+        An immutable transformation plan.
+    """
+    if color_count is not None and color_count <= 0:
+        raise ValueError("Color count must be a positive integer.")
+
+    if transformation_mode == "pixel":
+        if block_size is None:
+            raise ValueError("Block size must be provided for pixel mode.")
+        if block_size <= 0:
+            raise ValueError("Block size must be a positive integer.")
+        if sampling_method not in PIXEL_SAMPLING_METHODS:
+            raise ValueError(
+                f"Invalid sampling method: '{sampling_method}'. "
+                f"Valid options are: {', '.join(PIXEL_SAMPLING_METHODS)}."
+            )
+        return TransformationPlan(
+            transformation_mode=transformation_mode,
+            block_size=block_size,
+            color_count=color_count,
+            sampling_method=sampling_method,
+            keep_logical_resolution=keep_logical_resolution,
+        )
+
+    if transformation_mode == "grid":
+        if grid_width is None or grid_height is None:
+            raise ValueError("Grid width and height must be provided for grid mode.")
+        if grid_width <= 0 or grid_height <= 0:
+            raise ValueError("Grid dimensions must be positive integers.")
+        return TransformationPlan(
+            transformation_mode=transformation_mode,
+            grid_width=grid_width,
+            grid_height=grid_height,
+            color_count=color_count,
+        )
+
+    raise ValueError(f"Invalid transformation mode: '{transformation_mode}'. "
+                     f"Valid options are: 'pixel' or 'grid'.")
+
+
+@lru_cache(maxsize=RESOLVED_TRANSFORMATION_PLAN_CACHE_SIZE)
+def resolve_transformation_plan(
+    transformation_plan: TransformationPlan,
+    input_size: tuple[int, int],
+) -> ResolvedTransformationPlan:
+    """Compute the crop box and target sizes of a plan for one input size.
+
+    Results are cached per plan and input size, so repeated calls return
+    the same resolved plan.
+
+    Args:
+        transformation_plan: Compiled transformation plan.
+        input_size: Width and height of the input image.
+
+    Returns:
+        The resolved sizes for images of ``input_size``.
+    """
+    input_width, input_height = input_size
+
+    if transformation_plan.transformation_mode == "grid":
+        grid_size = (transformation_plan.grid_width, transformation_plan.grid_height)
+        return ResolvedTransformationPlan(
+            input_size=input_size,
+            logical_size=grid_size,
+            crop_box=calculate_center_crop_box(input_size, *grid_size),
+            quantization_size=None if transformation_plan.color_count is None else grid_size,
+            output_size=grid_size,
+        )
+
+    block_size = transformation_plan.block_size
+    validate_pixelation_arguments(input_size, block_size, transformation_plan.sampling_method)
+    logical_size = (input_width // block_size, input_height // block_size)
+    output_size = logical_size if transformation_plan.keep_logical_resolution else input_size
+    quantization_size = None
+    if transformation_plan.color_count is not None:
+        quantization_size = calculate_weighted_quantization_size(logical_size, output_size)
+    return ResolvedTransformationPlan(
+        input_size=input_size,
+        logical_size=logical_size,
+        crop_box=None,
+        quantization_size=quantization_size,
+        output_size=output_size,
+    )
+
 
 def run_image_transformation_pipeline(
     image: Image.Image,
@@ -11,6 +265,10 @@ def run_image_transformation_pipeline(
     grid_width: int | None = None,
     grid_height: int | None = None,
     color_count: int | None = None,
+    sampling_method: str = NEAREST_SAMPLING,
+    keep_logical_resolution: bool = False,
+    palette_cache: PaletteCache | None = None,
+    stage_profiler: StageProfiler | None = None,
 ) -> Image.Image:
     """Run the image transformation pipeline and return a transformed image.
 
@@ -18,6 +276,9 @@ def run_image_transformation_pipeline(
     1. Apply either pixel mode or grid mode.
     2. Optionally apply color quantization.
 
+    It compiles the options with ``compile_transformation_plan`` and applies
+    the plan. Callers transforming many images should apply one plan instead.
+
     Args:
         image: Input image to transform.
         transformation_mode: Transformation mode name, such as "pixel" or "grid".
@@ -25,23 +286,145 @@ def run_image_transformation_pipeline(
         grid_width: Target grid width used for grid mode.
         grid_height: Target grid height used for grid mode.
         color_count: Optional number of colors for quantization.
+        sampling_method: Block sampling method used for pixel mode.
+        keep_logical_resolution: Whether pixel mode returns the small image
+            with one pixel per block instead of enlarging it to the input
+            size. The caller enlarges it when saving.
+        palette_cache: Optional cache that lets quantization reuse palettes
+            built for similar images.
+        stage_profiler: Optional profiler that records the duration and
+            pixel counts of each stage.
 
     Returns:
         A transformed image after applying the selected operations.
     """
-    if transformation_mode == "pixel":
-        if block_size is None:
-            raise ValueError("Block size must be provided for pixel mode.")
-        transformed_image = pixelate_image_with_block_size(image, block_size)
-    elif transformation_mode == "grid":
-        if grid_width is None or grid_height is None:
-            raise ValueError("Grid width and height must be provided for grid mode.")
-        transformed_image = resize_image_to_fixed_grid(image, grid_width, grid_height)
-    else:
-        raise ValueError(f"Invalid transformation mode: '{transformation_mode}'. "
-                         f"Valid options are: 'pixel' or 'grid'.")
+    transformation_plan = compile_transformation_plan(
+        transformation_mode=transformation_mode,
+        block_size=block_size,
+        grid_width=grid_width,
+        grid_height=grid_height,
+        color_count=color_count,
+        sampling_method=sampling_method,
+        keep_logical_resolution=keep_logical_resolution,
+    )
+    return transformation_plan.apply(image, palette_cache, stage_profiler)
+
+
+def upscale_logical_image(
+    logical_image: Image.Image,
+    output_size: tuple[int, int],
+    stage_profiler: StageProfiler | None = None,
+) -> Image.Image:
+    """Enlarge a pixelated image with one pixel per block back to the output size.
+
+    Args:
+        logical_image: Pixelated image, one pixel per block.
+        output_size: Width and height to enlarge to.
+        stage_profiler: Optional profiler that records the "upscale" stage.
+
+    Returns:
+        The enlarged image, as ``pixelate_image_with_block_size`` returns it.
+    """
+    with measure_pipeline_stage(stage_profiler, "upscale", logical_image) as stage_measurement:
+        upscaled_image = resize_image_with_resampling(
+            image=logical_image,
+            width=output_size[0],
+            height=output_size[1],
+            resampling_filter=Image.Resampling.NEAREST,
+        )
+        stage_measurement.record_output(upscaled_image)
+    return upscaled_image
+
+
+def calculate_weighted_quantization_size(
+    logical_size: tuple[int, int],
+    output_size: tuple[int, int],
+) -> tuple[int, int]:
+    """Return the smallest size whose color counts weigh like the output's.
 
-    if color_count is not None:
-        transformed_image = quantize_image_colors(transformed_image, color_count)
+    Median-cut quantization weighs each color by its pixel count, so the
+    palette only stays the same if every logical pixel keeps the same share
+    of pixels. An axis whose output length is a whole multiple of its
+    logical length repeats every pixel equally and can stay logical. Any
+    other axis repeats some pixels once more than others and must be
+    enlarged to its output length.
+
+    Args:
+        logical_size: Width and height with one pixel per block.
+        output_size: Width and height of the final upscaled image.
+
+    Returns:
+        The width and height to quantize at.
+    """
+    return tuple(
+        logical_length if output_length % logical_length == 0 else output_length
+        for logical_length, output_length in zip(logical_size, output_size)
+    )
+
+
+def calculate_reduced_decode_size(
+    input_size: tuple[int, int],
+    transformation_mode: str,
+    block_size: int | None = None,
+    grid_width: int | None = None,
+    grid_height: int | None = None,
+    sampling_method: str = NEAREST_SAMPLING,
+    keep_logical_resolution: bool = False,
+) -> tuple[int, int] | None:
+    """Return the smallest decode size that still covers the final logical grid.
+
+    Decoders that can downscale while decoding, such as JPEG, may decode at
+    any size at least this large without changing the output dimensions.
+
+    Grid mode needs the center-cropped area to stay at least as large as
+    the grid. Pixel mode is only reduced when it keeps its logical
+    resolution, samples with "nearest" or "mean", and the decode scale
+    divides the block size without changing the number of blocks.
+
+    Args:
+        input_size: Full width and height of the input image.
+        transformation_mode: Transformation mode name, such as "pixel" or "grid".
+        block_size: Pixel block size used for pixel mode.
+        grid_width: Target grid width used for grid mode.
+        grid_height: Target grid height used for grid mode.
+        sampling_method: Block sampling method used for pixel mode.
+        keep_logical_resolution: Whether pixel mode keeps one pixel per block.
+
+    Returns:
+        The minimum decode width and height, or None when a full decode is needed.
+    """
+    input_width, input_height = input_size
+
+    if transformation_mode == "grid":
+        if grid_width is None or grid_height is None or grid_width <= 0 or grid_height <= 0:
+            return None
+        left_crop, top_crop, right_crop, bottom_crop = calculate_center_crop_box(
+            input_size, grid_width, grid_height
+        )
+        decode_width = math.ceil(grid_width * input_width / (right_crop - left_crop))
+        decode_height = math.ceil(grid_height * input_height / (bottom_crop - top_crop))
+        if decode_width * 2 > input_width or decode_height * 2 > input_height:
+            return None
+        return decode_width, decode_height
+
+    if transformation_mode == "pixel":
+        if block_size is None or block_size <= 0 or not keep_logical_resolution:
+            return None
+        if sampling_method not in REDUCED_DECODE_PIXEL_SAMPLING_METHODS:
+            return None
+        logical_size = (input_width // block_size, input_height // block_size)
+        for decode_scale in REDUCED_DECODE_SCALES:
+            if all(
+                block_size % smaller_scale == 0
+                and (
+                    math.ceil(input_width / smaller_scale) // (block_size // smaller_scale),
+                    math.ceil(input_height / smaller_scale) // (block_size // smaller_scale),
+                )
+                == logical_size
+                for smaller_scale in REDUCED_DECODE_SCALES
+                if smaller_scale <= decode_scale
+            ):
+                return input_width // decode_scale, input_height // decode_scale
+        return None
 
-    return transformed_image
+    return None
@@ -1,32 +1,28 @@
 from PIL import Image
+from .block_reduce import reduce_image_blocks
+from .option_values import MEAN_SAMPLING, NEAREST_SAMPLING, PIXEL_SAMPLING_METHODS
 from .resize import resize_image_with_resampling
 
 
-def pixelate_image_with_block_size(image: Image.Image, block_size: int) -> Image.Image:
+def pixelate_image_with_block_size(
+    image: Image.Image,
+    block_size: int,
+    sampling_method: str = NEAREST_SAMPLING,
+) -> Image.Image:
     """Return a pixelated copy of the image using a fixed block size.
 
     Args:
         image: Input image to pixelate.
         block_size: Size of each pixel block in pixels.
+        sampling_method: How each block's color is chosen. "nearest" picks one
+            pixel per block; "mean", "median", and "mode" reduce every pixel
+            in the block.
 
     Returns:
         A new image with block-style pixelation applied.
     """
     width, height = image.size
-    if block_size <= 0:
-        raise ValueError("Block size must be a positive integer.")
-    if block_size > min(width, height):
-        raise ValueError("Block size must not exceed the smaller image dimension.")
-    
-    pixelate_width = width // block_size
-    pixelate_height = height // block_size
-
-    pixelate_image = resize_image_with_resampling(
-        image=image,
-        width=pixelate_width,
-        height=pixelate_height,
-        resampling_filter=Image.Resampling.NEAREST,
-    )
+    pixelate_image = pixelate_image_to_logical_resolution(image, block_size, sampling_method)
     
     upscaled_image = resize_image_with_resampling(
         image=pixelate_image,
@@ -36,3 +32,64 @@ def pixelate_image_with_block_size(image: Image.Image, block_size: int) -> Image
     )
 
     return upscaled_image
+
+
+def pixelate_image_to_logical_resolution(
+    image: Image.Image,
+    block_size: int,
+    sampling_method: str = NEAREST_SAMPLING,
+) -> Image.Image:
+    """Return the small image holding one pixel per block.
+
+    This is the pixelated image before it is enlarged back to the input size.
+
+    Args:
+        image: Input image to pixelate.
+        block_size: Size of each pixel block in pixels.
+        sampling_method: How each block's color is chosen.
+
+    Returns:
+        An image of size ``(width // block_size, height // block_size)``.
+    """
+    width, height = image.size
+    validate_pixelation_arguments(image.size, block_size, sampling_method)
+
+    pixelate_width = width // block_size
+    pixelate_height = height // block_size
+
+    if sampling_method == NEAREST_SAMPLING:
+        return resize_image_with_resampling(
+            image=image,
+            width=pixelate_width,
+            height=pixelate_height,
+            resampling_filter=Image.Resampling.NEAREST,
+        )
+
+    return reduce_image_blocks(
+        image=image,
+        block_size=block_size,
+        sampling_method=sampling_method,
+    )
+
+
+def validate_pixelation_arguments(
+    image_size: tuple[int, int],
+    block_size: int,
+    sampling_method: str,
+) -> None:
+    """Validate pixel-mode arguments for an image of the given size.
+
+    Args:
+        image_size: Input image width and height.
+        block_size: Size of each pixel block in pixels.
+        sampling_method: How each block's color is chosen.
+    """
+    if block_size <= 0:
+        raise ValueError("Block size must be a positive integer.")
+    if block_size > min(image_size):
+        raise ValueError("Block size must not exceed the smaller image dimension.")
+    if sampling_method not in PIXEL_SAMPLING_METHODS:
+        raise ValueError(
+            f"Invalid sampling method: '{sampling_method}'. "
+            f"Valid options are: {', '.join(PIXEL_SAMPLING_METHODS)}."
+        )
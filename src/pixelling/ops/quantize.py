@@ -1,41 +1,186 @@
 from PIL import Image
 
+from ..profiling import StageProfiler, measure_pipeline_stage
+from .palette_cache import PaletteCache, build_color_histogram_signature
+
 RED_GREEN_BLUE_MODE = "RGB"
 RED_GREEN_BLUE_ALPHA_MODE = "RGBA"
 QUANTIZATION_METHOD = Image.Quantize.MEDIANCUT
+MAXIMUM_PALETTE_COLOR_COUNT = 256
+UNQUANTIZABLE_IMAGE_MODES = ("I;16",)
+SHARED_PALETTE_SAMPLE_PIXELS_PER_IMAGE = 256 * 256
 
 
-def quantize_image_colors(image: Image.Image, color_count: int) -> Image.Image:
+def quantize_image_colors(
+    image: Image.Image,
+    color_count: int,
+    palette_cache: PaletteCache | None = None,
+    stage_profiler: StageProfiler | None = None,
+) -> Image.Image:
     """Return an image with colors reduced to the given count.
 
     Args:
         image: Input image to quantize.
         color_count: Number of colors to keep in the output image.
+        palette_cache: Optional cache of palettes built for similar images.
+            On a hit the cached palette is applied without dithering and
+            no new palette is built.
+        stage_profiler: Optional profiler that records the
+            "split_alpha", "quantize", and "restore_mode" stages.
 
     Returns:
         A new image with a reduced color palette and preserved transparency.
     """
     if color_count <= 0:
         raise ValueError("Color count must be a positive integer.")
-
-    if "A" in image.getbands():
-        image_with_alpha = image.convert(RED_GREEN_BLUE_ALPHA_MODE)
-        red_channel, green_channel, blue_channel, alpha_channel = image_with_alpha.split()
-        image_without_alpha = Image.merge(
-            RED_GREEN_BLUE_MODE,
-            (red_channel, green_channel, blue_channel),
+    if image.mode in UNQUANTIZABLE_IMAGE_MODES:
+        raise ValueError(
+            f"Color reduction does not support {image.mode} images, whose 16-bit values "
+            "do not fit an 8-bit palette. Leave out the color count."
         )
-        quantized_image = image_without_alpha.quantize(
-            colors=color_count,
-            method=QUANTIZATION_METHOD,
+
+    has_alpha = "A" in image.getbands()
+    with measure_pipeline_stage(stage_profiler, "split_alpha", image) as stage_measurement:
+        if has_alpha:
+            image_with_alpha = image.convert(RED_GREEN_BLUE_ALPHA_MODE)
+            red_channel, green_channel, blue_channel, alpha_channel = image_with_alpha.split()
+            image_without_alpha = Image.merge(
+                RED_GREEN_BLUE_MODE,
+                (red_channel, green_channel, blue_channel),
+            )
+        else:
+            image_without_alpha = image.convert(RED_GREEN_BLUE_MODE)
+        stage_measurement.record_output(image_without_alpha)
+
+    with measure_pipeline_stage(stage_profiler, "quantize", image_without_alpha) as stage_measurement:
+        quantized_image = quantize_opaque_image_colors(
+            image_without_alpha, color_count, palette_cache, image
         )
-        restored_image = quantized_image.convert(RED_GREEN_BLUE_ALPHA_MODE)
-        restored_image.putalpha(alpha_channel)
-        return restored_image
+        stage_measurement.record_output(quantized_image)
 
-    image_without_alpha = image.convert(RED_GREEN_BLUE_MODE)
-    quantized_image = image_without_alpha.quantize(
-        colors=color_count,
+    with measure_pipeline_stage(stage_profiler, "restore_mode", quantized_image) as stage_measurement:
+        if has_alpha:
+            restored_image = quantized_image.convert(RED_GREEN_BLUE_ALPHA_MODE)
+            restored_image.putalpha(alpha_channel)
+        else:
+            restored_image = quantized_image.convert(RED_GREEN_BLUE_MODE)
+        stage_measurement.record_output(restored_image)
+    return restored_image
+
+
+def quantize_opaque_image_colors(
+    image_without_alpha: Image.Image,
+    color_count: int,
+    palette_cache: PaletteCache | None,
+    signature_image: Image.Image,
+) -> Image.Image:
+    """Return a palette-mode image, reusing a cached palette when one matches.
+
+    Args:
+        image_without_alpha: RGB image to quantize.
+        color_count: Number of colors to keep in the output image.
+        palette_cache: Optional cache of palettes built for similar images.
+        signature_image: Original image used to build the cache signature.
+
+    Returns:
+        A palette-mode image.
+    """
+    if palette_cache is None:
+        return image_without_alpha.quantize(colors=color_count, method=QUANTIZATION_METHOD)
+
+    signature = build_color_histogram_signature(signature_image, color_count)
+    cached_palette_image = palette_cache.look_up_palette(signature)
+    if cached_palette_image is not None:
+        return image_without_alpha.quantize(palette=cached_palette_image, dither=Image.Dither.NONE)
+
+    quantized_image = image_without_alpha.quantize(colors=color_count, method=QUANTIZATION_METHOD)
+    palette_cache.store_palette(signature, quantized_image)
+    return quantized_image
+
+
+def build_shared_palette_image(
+    sample_images: list[Image.Image],
+    color_count: int,
+) -> Image.Image:
+    """Return a palette image built once from several sample images.
+
+    The samples are subsampled with nearest-neighbor resampling so only
+    colors that really occur contribute, then stacked into one image and
+    quantized together. When any sample has transparency, one palette slot
+    is left free for the transparent index.
+
+    Args:
+        sample_images: Images whose colors the palette should cover.
+        color_count: Maximum number of visible colors in the palette.
+
+    Returns:
+        A palette-mode image whose palette is shared by all mapped images.
+    """
+    if color_count <= 0:
+        raise ValueError("Color count must be a positive integer.")
+    if len(sample_images) == 0:
+        raise ValueError("At least one sample image is required to build a palette.")
+
+    has_transparency = any("A" in sample_image.getbands() for sample_image in sample_images)
+    visible_color_count = min(color_count, MAXIMUM_PALETTE_COLOR_COUNT - int(has_transparency))
+
+    first_sample_width, first_sample_height = sample_images[0].size
+    sample_scale = min(
+        1.0,
+        (SHARED_PALETTE_SAMPLE_PIXELS_PER_IMAGE / (first_sample_width * first_sample_height)) ** 0.5,
+    )
+    sample_width = max(1, int(first_sample_width * sample_scale))
+    sample_height = max(1, int(first_sample_height * sample_scale))
+
+    sample_sheet = Image.new(RED_GREEN_BLUE_MODE, (sample_width, sample_height * len(sample_images)))
+    for sample_index, sample_image in enumerate(sample_images):
+        sample_without_alpha = sample_image.convert(RED_GREEN_BLUE_MODE)
+        if sample_without_alpha.size != (sample_width, sample_height):
+            sample_without_alpha = sample_without_alpha.resize(
+                (sample_width, sample_height),
+                resample=Image.Resampling.NEAREST,
+            )
+        sample_sheet.paste(sample_without_alpha, (0, sample_index * sample_height))
+
+    palette_image = sample_sheet.quantize(
+        colors=visible_color_count,
         method=QUANTIZATION_METHOD,
     )
-    return quantized_image.convert(RED_GREEN_BLUE_MODE)
+    palette_image.info["has_transparency"] = has_transparency
+    return palette_image
+
+
+def map_image_to_shared_palette(
+    image: Image.Image,
+    palette_image: Image.Image,
+) -> Image.Image:
+    """Return a palette-mode image that uses an existing shared palette.
+
+    Colors are mapped to their nearest palette entry without dithering, so
+    the palette is never rebuilt. Fully transparent pixels are set to an
+    extra transparent index stored in ``info["transparency"]``.
+
+    Args:
+        image: Input image to map.
+        palette_image: Palette image from ``build_shared_palette_image``.
+
+    Returns:
+        A palette-mode image ready to be written to a GIF without re-quantizing.
+    """
+    image_without_alpha = image.convert(RED_GREEN_BLUE_MODE)
+    paletted_image = image_without_alpha.quantize(
+        palette=palette_image,
+        dither=Image.Dither.NONE,
+    )
+
+    if palette_image.info.get("has_transparency"):
+        palette_values = palette_image.getpalette()
+        transparency_index = len(palette_values) // 3
+        paletted_image.putpalette(palette_values + [0, 0, 0])
+        paletted_image.info["transparency"] = transparency_index
+        if "A" in image.getbands():
+            alpha_channel = image.getchannel("A")
+            transparent_mask = alpha_channel.point(lambda alpha: 255 if alpha == 0 else 0)
+            paletted_image.paste(transparency_index, mask=transparent_mask)
+
+    return paletted_image
@@ -27,6 +27,30 @@ def resize_image_with_resampling(
     return resized_image
 
 
+def upscale_image_by_integer_factor(image: Image.Image, upscale_factor: int) -> Image.Image:
+    """Return an image enlarged by a whole-number factor with nearest-neighbor.
+
+    Args:
+        image: Input image to enlarge.
+        upscale_factor: Number of output pixels per input pixel along each axis.
+
+    Returns:
+        The image itself when the factor is one; otherwise a new enlarged image.
+    """
+    if upscale_factor <= 0:
+        raise ValueError("Upscale factor must be a positive integer.")
+    if upscale_factor == 1:
+        return image
+
+    width, height = image.size
+    return resize_image_with_resampling(
+        image=image,
+        width=width * upscale_factor,
+        height=height * upscale_factor,
+        resampling_filter=Image.Resampling.NEAREST,
+    )
+
+
 def select_resampling_filter(resampling_name: str) -> Image.Resampling:
     """Return the Pillow resampling filter for a given user-facing name.
 
@@ -0,0 +1,210 @@
+"""Parallel frame transformation with pixels passed through shared memory."""
+
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+
+from PIL import Image
+
+from .palette_cache import PaletteCache
+from .pipeline import TransformationPlan
+
+MAXIMUM_BYTES_PER_PIXEL = 4
+FRAMES_IN_FLIGHT_PER_WORKER = 2
+
+
+def estimate_transformed_frame_byte_capacity(
+    frame_size: tuple[int, int],
+    transformation_plan: TransformationPlan,
+) -> int:
+    """Return an upper bound on the pixel bytes of a transformed frame.
+
+    Args:
+        frame_size: Input frame width and height.
+        transformation_plan: Compiled plan applied to the frame.
+
+    Returns:
+        Byte count large enough for the transformed frame in any Pillow mode.
+    """
+    output_width, output_height = transformation_plan.resolve_input_size(frame_size).output_size
+    return max(1, output_width * output_height * MAXIMUM_BYTES_PER_PIXEL)
+
+
+def transform_shared_frame(
+    input_block_name: str,
+    input_mode: str,
+    input_size: tuple[int, int],
+    input_information: dict[str, object],
+    output_block_name: str,
+    transformation_plan: TransformationPlan,
+    palette_cache: PaletteCache | None = None,
+) -> tuple[str, tuple[int, int], dict[str, object]]:
+    """Transform one frame stored in shared memory and write the result back.
+
+    This runs inside a worker process. Both shared memory blocks are created
+    and unlinked by the parent; the worker only attaches to them.
+
+    Args:
+        input_block_name: Name of the block holding the input pixels.
+        input_mode: Pillow mode of the input frame.
+        input_size: Width and height of the input frame.
+        input_information: Pillow ``info`` dictionary of the input frame.
+        output_block_name: Name of the block that receives the output pixels.
+        transformation_plan: Compiled plan applied to the frame.
+        palette_cache: Optional palette cache. The worker uses its own
+            process's cache of the same capacity.
+
+    Returns:
+        A tuple containing the output mode, output size, and output ``info``.
+    """
+    input_block = SharedMemory(name=input_block_name)
+    try:
+        input_frame = Image.frombuffer(
+            input_mode, input_size, input_block.buf, "raw", input_mode, 0, 1
+        )
+        input_frame.info = dict(input_information)
+        output_frame = transformation_plan.apply(input_frame, palette_cache)
+        output_frame.load()
+        output_mode = output_frame.mode
+        output_size = output_frame.size
+        output_information = dict(output_frame.info)
+        output_bytes = output_frame.tobytes()
+        del input_frame, output_frame
+    finally:
+        input_block.close()
+
+    output_block = SharedMemory(name=output_block_name)
+    try:
+        if len(output_bytes) > output_block.size:
+            raise ValueError("Transformed frame does not fit in its shared memory block.")
+        output_block.buf[: len(output_bytes)] = output_bytes
+    finally:
+        output_block.close()
+
+    return output_mode, output_size, output_information
+
+
+def submit_shared_frame(
+    executor: ProcessPoolExecutor,
+    frame: Image.Image,
+    transformation_plan: TransformationPlan,
+    palette_cache: PaletteCache | None = None,
+) -> tuple[Future, SharedMemory, SharedMemory]:
+    """Copy a frame into shared memory and submit it to a worker.
+
+    Args:
+        executor: Process pool that runs the transformation.
+        frame: Input frame to transform.
+        transformation_plan: Compiled plan applied to the frame.
+        palette_cache: Optional palette cache sent to the worker.
+
+    Returns:
+        A tuple containing the pending result and both shared memory blocks.
+    """
+    frame_bytes = frame.tobytes()
+    input_block = SharedMemory(create=True, size=max(1, len(frame_bytes)))
+    input_block.buf[: len(frame_bytes)] = frame_bytes
+    output_block = SharedMemory(
+        create=True,
+        size=estimate_transformed_frame_byte_capacity(frame.size, transformation_plan),
+    )
+    frame_future = executor.submit(
+        transform_shared_frame,
+        input_block.name,
+        frame.mode,
+        frame.size,
+        dict(frame.info),
+        output_block.name,
+        transformation_plan,
+        palette_cache,
+    )
+    return frame_future, input_block, output_block
+
+
+def collect_shared_frame(
+    frame_job: tuple[Future, SharedMemory, SharedMemory],
+) -> Image.Image:
+    """Wait for a submitted frame and return it as a regular image.
+
+    The job's shared memory blocks are released whether or not it succeeded.
+
+    Args:
+        frame_job: Pending result and shared memory blocks from submission.
+
+    Returns:
+        The transformed frame.
+    """
+    frame_future, input_block, output_block = frame_job
+    try:
+        output_mode, output_size, output_information = frame_future.result()
+        output_frame = Image.new(output_mode, output_size)
+        output_byte_count = len(output_frame.tobytes())
+        output_view = output_block.buf[:output_byte_count]
+        try:
+            output_frame.frombytes(output_view)
+        finally:
+            output_view.release()
+        output_frame.info = output_information
+        return output_frame
+    finally:
+        release_shared_memory_block(input_block)
+        release_shared_memory_block(output_block)
+
+
+def release_shared_memory_block(shared_memory_block: SharedMemory) -> None:
+    """Close and unlink a shared memory block owned by this process.
+
+    Args:
+        shared_memory_block: Block created with ``create=True``.
+    """
+    shared_memory_block.close()
+    shared_memory_block.unlink()
+
+
+def iterate_frames_transformed_across_workers(
+    frames: Iterable[Image.Image],
+    transformation_plan: TransformationPlan,
+    job_count: int,
+    palette_cache: PaletteCache | None = None,
+) -> Iterator[Image.Image]:
+    """Transform frames in worker processes and yield them in input order.
+
+    At most ``job_count * FRAMES_IN_FLIGHT_PER_WORKER`` frames are in flight
+    at once, so memory stays bounded for long frame streams.
+
+    Args:
+        frames: Input frames to transform. May be a lazy iterator.
+        transformation_plan: Compiled plan applied to every frame.
+        job_count: Number of worker processes.
+        palette_cache: Optional palette cache sent to each worker.
+
+    Yields:
+        Transformed frames in the same order as the input frames.
+    """
+    if job_count <= 0:
+        raise ValueError("Job count must be a positive integer.")
+
+    maximum_frames_in_flight = job_count * FRAMES_IN_FLIGHT_PER_WORKER
+    pending_frame_jobs: deque[tuple[Future, SharedMemory, SharedMemory]] = deque()
+    with ProcessPoolExecutor(max_workers=job_count) as executor:
+        try:
+            for frame in frames:
+                pending_frame_jobs.append(
+                    submit_shared_frame(executor, frame, transformation_plan, palette_cache)
+                )
+                if len(pending_frame_jobs) >= maximum_frames_in_flight:
+                    yield collect_shared_frame(pending_frame_jobs.popleft())
+
+            while pending_frame_jobs:
+                yield collect_shared_frame(pending_frame_jobs.popleft())
+        finally:
+            while pending_frame_jobs:
+                frame_future, input_block, output_block = pending_frame_jobs.popleft()
+                frame_future.cancel()
+                try:
+                    frame_future.exception()
+                except Exception:
+                    pass
+                release_shared_memory_block(input_block)
+                release_shared_memory_block(output_block)
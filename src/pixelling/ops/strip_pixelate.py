@@ -0,0 +1,192 @@
+"""Band-by-band pixelation for images too large to hold in memory."""
+
+from array import array
+from bisect import bisect_left
+from collections.abc import Callable, Iterator
+
+from PIL import Image
+
+from .block_reduce import reduce_image_blocks
+from .pixelate import NEAREST_SAMPLING, validate_pixelation_arguments
+from .resize import resize_image_with_resampling
+
+STRIP_BAND_TARGET_PIXEL_COUNT = 1 << 22
+
+
+def calculate_nearest_source_indices(source_length: int, target_length: int) -> list[int]:
+    """Return the source index Pillow's nearest resize picks for each target index.
+
+    The mapping is read back from Pillow itself by resizing a one-pixel-wide
+    image that stores each row's own index, so it follows Pillow's rounding
+    exactly. Nearest resizing is separable, so the same mapping applies to
+    rows and columns of any image with the same length along that axis.
+
+    Args:
+        source_length: Number of rows or columns before resizing.
+        target_length: Number of rows or columns after resizing.
+
+    Returns:
+        One source index per target index, in ascending order.
+    """
+    index_image = Image.new("I", (1, source_length))
+    index_image.putdata(range(source_length))
+    resized_index_image = index_image.resize((1, target_length), resample=Image.Resampling.NEAREST)
+    return array("i", resized_index_image.tobytes()).tolist()
+
+
+def calculate_strip_block_row_count(image_width: int, block_size: int) -> int:
+    """Return how many block rows to read per band for an image width.
+
+    Args:
+        image_width: Input image width in pixels.
+        block_size: Size of each pixel block in pixels.
+
+    Returns:
+        Number of block rows per band, at least one.
+    """
+    band_source_row_count = STRIP_BAND_TARGET_PIXEL_COUNT // max(1, image_width)
+    return max(1, band_source_row_count // block_size)
+
+
+def iterate_pixelated_image_bands(
+    read_image_rows: Callable[[int, int], Image.Image],
+    image_size: tuple[int, int],
+    block_size: int,
+    sampling_method: str = NEAREST_SAMPLING,
+    band_block_row_count: int | None = None,
+) -> Iterator[Image.Image]:
+    """Pixelate an image band by band and yield full-width output bands.
+
+    Each band covers a whole number of block rows. Output rows are mapped to
+    logical rows, and logical rows to source rows, with the same index
+    mapping the in-memory nearest resizes use, so stacking the yielded bands
+    reproduces ``pixelate_image_with_block_size`` exactly.
+
+    Args:
+        read_image_rows: Function that returns the full-width input rows
+            from a top row up to, but not including, a bottom row.
+        image_size: Input image width and height.
+        block_size: Size of each pixel block in pixels.
+        sampling_method: How each block's color is chosen.
+        band_block_row_count: Optional number of block rows per band.
+
+    Yields:
+        Output bands from top to bottom, together as tall as the input.
+    """
+    validate_pixelation_arguments(image_size, block_size, sampling_method)
+    if band_block_row_count is None:
+        band_block_row_count = calculate_strip_block_row_count(image_size[0], block_size)
+    if band_block_row_count <= 0:
+        raise ValueError("Band block row count must be a positive integer.")
+
+    width, height = image_size
+    logical_width = width // block_size
+    logical_height = height // block_size
+    output_logical_rows = calculate_nearest_source_indices(logical_height, height)
+    if sampling_method == NEAREST_SAMPLING:
+        logical_source_rows = calculate_nearest_source_indices(height, logical_height)
+
+    for band_top_logical_row in range(0, logical_height, band_block_row_count):
+        band_bottom_logical_row = min(band_top_logical_row + band_block_row_count, logical_height)
+        band_logical_row_count = band_bottom_logical_row - band_top_logical_row
+
+        if sampling_method == NEAREST_SAMPLING:
+            sampled_rows_image = None
+            for band_row_index in range(band_logical_row_count):
+                source_row = logical_source_rows[band_top_logical_row + band_row_index]
+                source_row_image = read_image_rows(source_row, source_row + 1)
+                if sampled_rows_image is None:
+                    sampled_rows_image = create_blank_image_like(
+                        source_row_image, (width, band_logical_row_count)
+                    )
+                sampled_rows_image.paste(source_row_image, (0, band_row_index))
+            logical_band_image = resize_image_with_resampling(
+                image=sampled_rows_image,
+                width=logical_width,
+                height=band_logical_row_count,
+                resampling_filter=Image.Resampling.NEAREST,
+            )
+        else:
+            source_band_image = read_image_rows(
+                band_top_logical_row * block_size,
+                band_bottom_logical_row * block_size,
+            )
+            logical_band_image = reduce_image_blocks(
+                image=source_band_image,
+                block_size=block_size,
+                sampling_method=sampling_method,
+            )
+            del source_band_image
+
+        yield build_output_band_from_logical_band(
+            logical_band_image=logical_band_image,
+            band_top_logical_row=band_top_logical_row,
+            output_logical_rows=output_logical_rows,
+            output_width=width,
+        )
+
+
+def build_output_band_from_logical_band(
+    logical_band_image: Image.Image,
+    band_top_logical_row: int,
+    output_logical_rows: list[int],
+    output_width: int,
+) -> Image.Image:
+    """Enlarge a band of logical rows into the output rows that show them.
+
+    Args:
+        logical_band_image: Logical pixels for consecutive logical rows.
+        band_top_logical_row: Logical row index of the band's first row.
+        output_logical_rows: Logical row shown by each output row.
+        output_width: Output image width in pixels.
+
+    Returns:
+        The full-width output rows covered by the band's logical rows.
+    """
+    band_logical_row_count = logical_band_image.height
+    widened_band_image = resize_image_with_resampling(
+        image=logical_band_image,
+        width=output_width,
+        height=band_logical_row_count,
+        resampling_filter=Image.Resampling.NEAREST,
+    )
+
+    band_top_output_row = bisect_left(output_logical_rows, band_top_logical_row)
+    band_bottom_output_row = bisect_left(
+        output_logical_rows, band_top_logical_row + band_logical_row_count
+    )
+    output_band_image = create_blank_image_like(
+        widened_band_image,
+        (output_width, band_bottom_output_row - band_top_output_row),
+    )
+    for band_row_index in range(band_logical_row_count):
+        logical_row = band_top_logical_row + band_row_index
+        run_top_output_row = bisect_left(output_logical_rows, logical_row)
+        run_bottom_output_row = bisect_left(output_logical_rows, logical_row + 1)
+        if run_bottom_output_row == run_top_output_row:
+            continue
+        repeated_row_image = widened_band_image.crop(
+            (0, band_row_index, output_width, band_row_index + 1)
+        ).resize(
+            (output_width, run_bottom_output_row - run_top_output_row),
+            resample=Image.Resampling.NEAREST,
+        )
+        output_band_image.paste(repeated_row_image, (0, run_top_output_row - band_top_output_row))
+    return output_band_image
+
+
+def create_blank_image_like(image: Image.Image, size: tuple[int, int]) -> Image.Image:
+    """Return an empty image with the same mode, palette, and info as another.
+
+    Args:
+        image: Image whose mode, palette, and ``info`` are copied.
+        size: Width and height of the new image.
+
+    Returns:
+        A new image ready to have rows pasted into it.
+    """
+    blank_image = Image.new(image.mode, size)
+    if image.mode in ("P", "PA") and image.palette is not None:
+        blank_image.putpalette(image.palette.tobytes(), image.palette.mode)
+    blank_image.info = dict(image.info)
+    return blank_image
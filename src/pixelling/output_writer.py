@@ -0,0 +1,207 @@
+"""Output file naming and atomic writes for many writers sharing one directory."""
+
+import os
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+OUTPUT_TEMPORARY_FILE_PREFIX = ".pixelling-partial-"
+EXCLUSIVE_CREATE_FLAGS = os.O_CREAT | os.O_EXCL | os.O_WRONLY
+
+OUTPUT_NAME_INDEX_CAPACITY = 64
+OUTPUT_NAME_INDEX_IDLE_SECONDS = 30.0
+
+PROCESS_OUTPUT_NAME_INDEXES: OrderedDict[str, "OutputNameIndex"] = OrderedDict()
+
+
+@dataclass
+class OutputNameIndex:
+    """File names known to be taken in one output directory.
+
+    The directory is listed once. A claim then checks names against the
+    index and touches the filesystem only to create the chosen name, so
+    writing n outputs that share a name costs O(n) system calls instead of
+    O(n²) existence checks. Names taken by other processes after the listing
+    are caught by the exclusive create and skipped.
+
+    Attributes:
+        directory_path: Directory whose file names are indexed.
+        taken_file_names: Names listed in the directory or claimed since.
+        next_copy_numbers: Next copy number to try for each requested name.
+        last_used_time: ``time.monotonic`` value of the last lookup.
+    """
+
+    directory_path: str
+    taken_file_names: set[str]
+    next_copy_numbers: dict[str, int] = field(default_factory=dict)
+    last_used_time: float = 0.0
+
+    def claim_output_file_name(self, output_file_name: str) -> str:
+        """Create an empty file under the first free numbered name.
+
+        Args:
+            output_file_name: Requested file name, such as "photo.png".
+
+        Returns:
+            The claimed name: the requested one, or "photo_1.png",
+            "photo_2.png", and so on when it is taken.
+        """
+        output_file_stem, output_file_extension = os.path.splitext(output_file_name)
+        copy_number = self.next_copy_numbers.get(output_file_name, 0)
+        while True:
+            candidate_file_name = output_file_name
+            if copy_number > 0:
+                candidate_file_name = f"{output_file_stem}_{copy_number}{output_file_extension}"
+            copy_number += 1
+            if candidate_file_name in self.taken_file_names:
+                continue
+
+            self.taken_file_names.add(candidate_file_name)
+            try:
+                os.close(
+                    os.open(
+                        os.path.join(self.directory_path, candidate_file_name),
+                        EXCLUSIVE_CREATE_FLAGS,
+                    )
+                )
+            except FileExistsError:
+                continue
+            self.next_copy_numbers[output_file_name] = copy_number
+            return candidate_file_name
+
+    def release_output_file_name(self, output_file_name: str, claimed_file_name: str) -> None:
+        """Remove a claimed file that was never written and free its name.
+
+        Args:
+            output_file_name: Name that was requested.
+            claimed_file_name: Name returned by ``claim_output_file_name``.
+        """
+        try:
+            os.remove(os.path.join(self.directory_path, claimed_file_name))
+        except FileNotFoundError:
+            pass
+        self.taken_file_names.discard(claimed_file_name)
+        self.next_copy_numbers.pop(output_file_name, None)
+
+
+def get_output_name_index(directory_path: str) -> OutputNameIndex:
+    """Return this process's name index for a directory, listing it on first use.
+
+    Indexes are kept for the ``OUTPUT_NAME_INDEX_CAPACITY`` most recently
+    used directories. An index left unused for
+    ``OUTPUT_NAME_INDEX_IDLE_SECONDS`` is dropped, so a long-lived process
+    lists a directory again instead of trusting a listing that files deleted
+    since have made stale.
+
+    Args:
+        directory_path: Output directory. An empty string means the current
+            directory.
+
+    Returns:
+        The shared index for that directory.
+    """
+    current_time = time.monotonic()
+    while PROCESS_OUTPUT_NAME_INDEXES:
+        oldest_output_name_index = next(iter(PROCESS_OUTPUT_NAME_INDEXES.values()))
+        if current_time - oldest_output_name_index.last_used_time < OUTPUT_NAME_INDEX_IDLE_SECONDS:
+            break
+        PROCESS_OUTPUT_NAME_INDEXES.popitem(last=False)
+
+    listing_directory_path = directory_path or os.curdir
+    index_key = os.path.abspath(listing_directory_path)
+    output_name_index = PROCESS_OUTPUT_NAME_INDEXES.get(index_key)
+    if output_name_index is None:
+        try:
+            taken_file_names = set(os.listdir(listing_directory_path))
+        except FileNotFoundError:
+            taken_file_names = set()
+        output_name_index = OutputNameIndex(listing_directory_path, taken_file_names)
+        PROCESS_OUTPUT_NAME_INDEXES[index_key] = output_name_index
+    output_name_index.last_used_time = current_time
+    PROCESS_OUTPUT_NAME_INDEXES.move_to_end(index_key)
+    while len(PROCESS_OUTPUT_NAME_INDEXES) > OUTPUT_NAME_INDEX_CAPACITY:
+        PROCESS_OUTPUT_NAME_INDEXES.popitem(last=False)
+    return output_name_index
+
+
+@contextmanager
+def claim_output_image_path(output_image_path: str, allow_overwrite: bool) -> Iterator[str]:
+    """Reserve an output path for the duration of a write.
+
+    Without overwriting, the first free numbered path is created empty with
+    an exclusive create, so concurrent writers never pick the same path. If
+    the block raises, the empty file is removed again.
+
+    Args:
+        output_image_path: Requested destination image file path.
+        allow_overwrite: Whether an existing file may be overwritten.
+
+    Yields:
+        The path to write the output to.
+    """
+    if allow_overwrite:
+        yield output_image_path
+        return
+
+    output_directory_path, output_file_name = os.path.split(output_image_path)
+    output_name_index = get_output_name_index(output_directory_path)
+    claimed_file_name = output_name_index.claim_output_file_name(output_file_name)
+    claimed_output_image_path = os.path.join(output_directory_path, claimed_file_name)
+    try:
+        yield claimed_output_image_path
+    except BaseException:
+        output_name_index.release_output_file_name(output_file_name, claimed_file_name)
+        raise
+
+
+def write_output_file_atomically(
+    output_image_path: str,
+    write_output_file: Callable[[str], None],
+) -> None:
+    """Write a file next to its destination, then rename it into place.
+
+    The temporary file keeps the destination's extension, so encoders that
+    pick a format from the file name still choose the right one. Readers
+    never see a partly written output.
+
+    Args:
+        output_image_path: Destination image file path.
+        write_output_file: Function that writes the complete file to the
+            path it is given.
+    """
+    output_directory_path, output_file_name = os.path.split(output_image_path)
+    temporary_output_image_path = os.path.join(
+        output_directory_path,
+        f"{OUTPUT_TEMPORARY_FILE_PREFIX}{uuid.uuid4().hex}{os.path.splitext(output_file_name)[1]}",
+    )
+    try:
+        write_output_file(temporary_output_image_path)
+        os.replace(temporary_output_image_path, output_image_path)
+    except BaseException:
+        if os.path.exists(temporary_output_image_path):
+            os.remove(temporary_output_image_path)
+        raise
+
+
+def save_output_file(
+    output_image_path: str,
+    allow_overwrite: bool,
+    write_output_file: Callable[[str], None],
+) -> str:
+    """Claim an output path and write the file to it atomically.
+
+    Args:
+        output_image_path: Requested destination image file path.
+        allow_overwrite: Whether an existing file may be overwritten.
+        write_output_file: Function that writes the complete file to the
+            path it is given.
+
+    Returns:
+        The path the output was written to.
+    """
+    with claim_output_image_path(output_image_path, allow_overwrite) as claimed_output_image_path:
+        write_output_file_atomically(claimed_output_image_path, write_output_file)
+    return claimed_output_image_path
@@ -0,0 +1,138 @@
+import inspect
+from typing import IO
+
+from PIL import GifImagePlugin, Image, ImagePalette
+
+PILLOW_GIF_WRITER_FUNCTION_PARAMETER_NAMES = {
+    "_normalize_mode": ("im",),
+    "_normalize_palette": ("im", "palette", "info"),
+    "_get_background": ("im", "info_background"),
+    "_get_global_header": ("im", "info"),
+    "_write_frame_data": ("fp", "im_frame", "offset", "params"),
+}
+PILLOW_PALETTE_NEW_COLOR_INDEX_PARAMETER_NAMES = ("self", "image", "e")
+
+
+def has_pillow_function_parameters(function: object, parameter_names: tuple[str, ...]) -> bool:
+    """Return whether a function exists and takes exactly the given parameters.
+
+    Args:
+        function: Function looked up from Pillow, or None when it is missing.
+        parameter_names: Expected parameter names, in order.
+
+    Returns:
+        True when the function's parameters match the expected names.
+    """
+    if not callable(function):
+        return False
+    try:
+        function_parameters = inspect.signature(function).parameters
+    except (TypeError, ValueError):
+        return False
+    return tuple(function_parameters) == parameter_names
+
+
+def has_pillow_gif_writer_internals() -> bool:
+    """Return whether Pillow's private GIF writer functions have the expected signatures.
+
+    Returns:
+        True when every private function used by this module exists with the
+        parameters of the Pillow releases it was tested against.
+    """
+    return all(
+        has_pillow_function_parameters(getattr(GifImagePlugin, function_name, None), parameter_names)
+        for function_name, parameter_names in PILLOW_GIF_WRITER_FUNCTION_PARAMETER_NAMES.items()
+    ) and has_pillow_function_parameters(
+        getattr(ImagePalette.ImagePalette, "_new_color_index", None),
+        PILLOW_PALETTE_NEW_COLOR_INDEX_PARAMETER_NAMES,
+    )
+
+
+PILLOW_GIF_WRITER_INTERNALS_AVAILABLE = has_pillow_gif_writer_internals()
+
+
+def normalize_gif_frame_mode(frame: Image.Image) -> Image.Image:
+    """Return a frame in a mode the GIF encoder writes, quantizing when needed.
+
+    Args:
+        frame: Frame to encode.
+
+    Returns:
+        The frame in "1", "L", or "P" mode.
+    """
+    return GifImagePlugin._normalize_mode(frame)
+
+
+def normalize_gif_frame_palette(
+    frame: Image.Image,
+    frame_encoder_settings: dict[str, object],
+) -> Image.Image:
+    """Return a frame with its palette trimmed for GIF encoding.
+
+    Args:
+        frame: Frame returned by ``normalize_gif_frame_mode``.
+        frame_encoder_settings: Encoder settings for this frame. Pillow
+            remaps its transparent index when the palette is trimmed.
+
+    Returns:
+        The frame with a palette the GIF encoder writes.
+    """
+    return GifImagePlugin._normalize_palette(frame, None, frame_encoder_settings)
+
+
+def find_gif_background_index(frame: Image.Image, background_color: object) -> int:
+    """Return the palette index of a GIF background color.
+
+    Args:
+        frame: Palette frame whose palette holds the color.
+        background_color: Palette index or color tuple.
+
+    Returns:
+        Palette index of the background color.
+    """
+    return GifImagePlugin._get_background(frame, background_color)
+
+
+def allocate_unused_gif_palette_index(frame: Image.Image) -> int:
+    """Return a palette index that no pixel of the frame uses.
+
+    Args:
+        frame: Palette frame.
+
+    Returns:
+        An unused palette index. A ValueError is raised when all 256 are used.
+    """
+    return frame.palette._new_color_index(frame)
+
+
+def write_gif_header(
+    output_file: IO[bytes],
+    frame: Image.Image,
+    frame_encoder_settings: dict[str, object],
+) -> None:
+    """Write the GIF header, global palette, and loop extension for the first frame.
+
+    Args:
+        output_file: Binary file object positioned at the start of the GIF.
+        frame: First frame in palette or grayscale mode.
+        frame_encoder_settings: Encoder settings for the first frame.
+    """
+    for header_bytes in GifImagePlugin._get_global_header(frame, frame_encoder_settings):
+        output_file.write(header_bytes)
+
+
+def write_gif_frame_data(
+    output_file: IO[bytes],
+    frame: Image.Image,
+    frame_offset: tuple[int, int],
+    frame_encoder_settings: dict[str, object],
+) -> None:
+    """Write one frame's control extension, descriptor, and image data.
+
+    Args:
+        output_file: Binary file object to write to.
+        frame: Frame in palette or grayscale mode.
+        frame_offset: Position of the frame's top-left corner.
+        frame_encoder_settings: Encoder settings for this frame.
+    """
+    GifImagePlugin._write_frame_data(output_file, frame, frame_offset, frame_encoder_settings)
@@ -0,0 +1,222 @@
+"""Per-stage timing hooks and Chrome trace output for the transformation pipeline."""
+
+import json
+import os
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from typing import Any
+
+IMAGE_BUFFER_BYTES_PER_PIXEL = {"1": 1, "L": 1, "P": 1, "I;16": 2, "I;16L": 2, "I;16B": 2, "I;16N": 2}
+DEFAULT_IMAGE_BUFFER_BYTES_PER_PIXEL = 4
+CHROME_TRACE_CATEGORY = "pixelling"
+MICROSECONDS_PER_SECOND = 1_000_000
+
+
+def calculate_image_pixel_count(image: Any) -> int:
+    """Return the number of pixels in an image, or zero for anything else.
+
+    Args:
+        image: A Pillow image or any other value.
+
+    Returns:
+        Width times height for objects with a ``size``; otherwise zero.
+    """
+    image_size = getattr(image, "size", None)
+    if not isinstance(image_size, tuple) or len(image_size) != 2:
+        return 0
+    return image_size[0] * image_size[1]
+
+
+def calculate_image_buffer_byte_count(image: Any) -> int:
+    """Return the bytes Pillow allocates for an image's pixels.
+
+    Pillow stores one byte per pixel for "1", "L", and "P", two bytes for
+    16-bit modes, and four bytes for every other mode, including "RGB".
+
+    Args:
+        image: A Pillow image or any other value.
+
+    Returns:
+        The pixel storage size in bytes, or zero when ``image`` is not an image.
+    """
+    bytes_per_pixel = IMAGE_BUFFER_BYTES_PER_PIXEL.get(
+        getattr(image, "mode", None), DEFAULT_IMAGE_BUFFER_BYTES_PER_PIXEL
+    )
+    return calculate_image_pixel_count(image) * bytes_per_pixel
+
+
+@dataclass
+class StageRecord:
+    """Measurements for one completed pipeline stage.
+
+    Attributes:
+        name: Stage name such as "decode", "pixelate", or "encode".
+        start_seconds: Start time in seconds since the profiler was created.
+        duration_seconds: Wall time the stage took.
+        input_pixel_count: Pixels in the stage's input image, if known.
+        output_pixel_count: Pixels in the stage's output image, if known.
+        allocated_byte_count: Pixel storage allocated for the output image.
+        process_id: Identifier of the process that ran the stage.
+        thread_id: Identifier of the thread that ran the stage.
+    """
+
+    name: str
+    start_seconds: float
+    duration_seconds: float
+    input_pixel_count: int
+    output_pixel_count: int
+    allocated_byte_count: int
+    process_id: int
+    thread_id: int
+
+
+@dataclass
+class StageMeasurement:
+    """Output details reported from inside a running stage.
+
+    Attributes:
+        output_pixel_count: Pixels in the stage's output image.
+        allocated_byte_count: Pixel storage allocated for the output image.
+    """
+
+    output_pixel_count: int = 0
+    allocated_byte_count: int = 0
+
+    def record_output(self, output_image: Any) -> None:
+        """Record the image a stage produced.
+
+        Args:
+            output_image: The stage's result.
+        """
+        self.output_pixel_count = calculate_image_pixel_count(output_image)
+        self.allocated_byte_count = calculate_image_buffer_byte_count(output_image)
+
+
+class DisabledStageMeasurement:
+    """Stand-in measurement used when profiling is off; records nothing."""
+
+    def record_output(self, output_image: Any) -> None:
+        pass
+
+
+DISABLED_STAGE_CONTEXT = nullcontext(DisabledStageMeasurement())
+
+
+@dataclass
+class StageProfiler:
+    """Collects stage records and passes each one to optional callbacks.
+
+    Attributes:
+        stage_callbacks: Functions called with every completed stage record.
+        stage_records: Every completed stage, in completion order.
+        start_time: ``time.perf_counter`` value that record times are relative to.
+    """
+
+    stage_callbacks: list[Callable[[StageRecord], None]] = field(default_factory=list)
+    stage_records: list[StageRecord] = field(default_factory=list)
+    start_time: float = field(default_factory=time.perf_counter)
+
+    @contextmanager
+    def measure_stage(self, stage_name: str, input_image: Any = None) -> Iterator[StageMeasurement]:
+        """Time the enclosed block as one stage and record it.
+
+        Args:
+            stage_name: Stage name shown in the trace.
+            input_image: Optional image the stage reads, used for its pixel count.
+
+        Yields:
+            A measurement on which the block can record its output image.
+        """
+        stage_measurement = StageMeasurement()
+        stage_start_time = time.perf_counter()
+        try:
+            yield stage_measurement
+        finally:
+            stage_end_time = time.perf_counter()
+            stage_record = StageRecord(
+                name=stage_name,
+                start_seconds=stage_start_time - self.start_time,
+                duration_seconds=stage_end_time - stage_start_time,
+                input_pixel_count=calculate_image_pixel_count(input_image),
+                output_pixel_count=stage_measurement.output_pixel_count,
+                allocated_byte_count=stage_measurement.allocated_byte_count,
+                process_id=os.getpid(),
+                thread_id=threading.get_ident(),
+            )
+            self.stage_records.append(stage_record)
+            for stage_callback in self.stage_callbacks:
+                stage_callback(stage_record)
+
+    def build_chrome_trace(self) -> dict[str, object]:
+        """Return the records as a Chrome trace event object.
+
+        The result loads in ``chrome://tracing`` and Perfetto. Each stage is a
+        complete ("X") event, and its pixel and byte counts are event arguments.
+
+        Returns:
+            A JSON-serializable trace object.
+        """
+        trace_events = []
+        for stage_record in self.stage_records:
+            trace_events.append(
+                {
+                    "name": stage_record.name,
+                    "cat": CHROME_TRACE_CATEGORY,
+                    "ph": "X",
+                    "ts": stage_record.start_seconds * MICROSECONDS_PER_SECOND,
+                    "dur": stage_record.duration_seconds * MICROSECONDS_PER_SECOND,
+                    "pid": stage_record.process_id,
+                    "tid": stage_record.thread_id,
+                    "args": {
+                        "input_pixel_count": stage_record.input_pixel_count,
+                        "output_pixel_count": stage_record.output_pixel_count,
+                        "allocated_byte_count": stage_record.allocated_byte_count,
+                    },
+                }
+            )
+        return {"traceEvents": trace_events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, trace_path: str) -> None:
+        """Write the Chrome trace JSON to a file.
+
+        Args:
+            trace_path: Destination JSON file path.
+        """
+        with open(trace_path, "w", encoding="utf-8") as trace_file:
+            json.dump(self.build_chrome_trace(), trace_file)
+
+    def summarize_stage_durations(self) -> dict[str, float]:
+        """Return the total seconds spent in each stage name.
+
+        Returns:
+            Stage names mapped to their summed durations, in first-seen order.
+        """
+        stage_durations: dict[str, float] = {}
+        for stage_record in self.stage_records:
+            stage_durations[stage_record.name] = (
+                stage_durations.get(stage_record.name, 0.0) + stage_record.duration_seconds
+            )
+        return stage_durations
+
+
+def measure_pipeline_stage(
+    stage_profiler: StageProfiler | None,
+    stage_name: str,
+    input_image: Any = None,
+):
+    """Return a context that times a stage, or a shared no-op when profiling is off.
+
+    Args:
+        stage_profiler: Optional profiler that receives the stage record.
+        stage_name: Stage name shown in the trace.
+        input_image: Optional image the stage reads, used for its pixel count.
+
+    Returns:
+        A context manager whose value has a ``record_output`` method.
+    """
+    if stage_profiler is None:
+        return DISABLED_STAGE_CONTEXT
+    return stage_profiler.measure_stage(stage_name, input_image)
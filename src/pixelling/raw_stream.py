@@ -0,0 +1,399 @@
+"""Transform fixed-size raw video frames read from standard input."""
+
+import sys
+import time
+from argparse import ArgumentParser, Namespace, RawTextHelpFormatter
+from collections.abc import Iterable, Iterator
+from typing import BinaryIO, Sequence
+
+from PIL import Image
+
+from .cli import parse_command_line_arguments, validate_command_line_arguments, write_stage_profile
+from .ops.animated_pipeline import iterate_animated_image_transformation_pipeline
+from .ops.option_values import FRAME_PALETTE_STRATEGY, GLOBAL_PALETTE_STRATEGY, NEAREST_SAMPLING
+from .ops.palette_cache import get_process_palette_cache
+from .ops.resize import upscale_image_by_integer_factor
+from .profiling import StageProfiler
+
+RAW_PIXEL_FORMAT_MODES = {"rgb24": "RGB", "rgba": "RGBA"}
+DEFAULT_RAW_PIXEL_FORMAT = "rgb24"
+STREAM_INPUT_PLACEHOLDER = "-"
+STREAM_REJECTED_OPTIONS = {
+    "output_image_path": "-o/--output",
+    "strips": "--strips",
+    "cache_dir": "--cache-dir",
+    "max_pixels": "--max-pixels",
+    "encode_profile": "--encode-profile",
+}
+
+
+def calculate_raw_frame_byte_count(frame_size: tuple[int, int], pixel_format: str) -> int:
+    """Return the number of bytes in one raw frame.
+
+    Args:
+        frame_size: Frame width and height.
+        pixel_format: Raw pixel format, "rgb24" or "rgba".
+
+    Returns:
+        Width times height times the bytes per pixel of the format.
+    """
+    bytes_per_pixel = len(RAW_PIXEL_FORMAT_MODES[pixel_format])
+    return frame_size[0] * frame_size[1] * bytes_per_pixel
+
+
+def calculate_stream_output_frame_size(
+    frame_size: tuple[int, int],
+    transformation_mode: str,
+    block_size: int | None = None,
+    grid_width: int | None = None,
+    grid_height: int | None = None,
+    upscale_factor: int | None = None,
+) -> tuple[int, int]:
+    """Return the size of every frame a stream writes.
+
+    Args:
+        frame_size: Input frame width and height.
+        transformation_mode: Transformation mode such as "pixel" or "grid".
+        block_size: Pixel block size used for pixel mode.
+        grid_width: Target grid width used for grid mode.
+        grid_height: Target grid height used for grid mode.
+        upscale_factor: Optional whole-number enlargement of the logical image.
+
+    Returns:
+        Output frame width and height.
+    """
+    if transformation_mode == "grid":
+        return (grid_width, grid_height)
+    if upscale_factor is None:
+        return frame_size
+    frame_width, frame_height = frame_size
+    return (
+        frame_width // block_size * upscale_factor,
+        frame_height // block_size * upscale_factor,
+    )
+
+
+def read_exact_byte_count(input_stream: BinaryIO, byte_count: int) -> bytes:
+    """Read exactly ``byte_count`` bytes, or nothing at the end of the stream.
+
+    Pipes may return fewer bytes than requested, so reads are repeated until
+    the frame is complete.
+
+    Args:
+        input_stream: Binary stream to read from.
+        byte_count: Number of bytes to read.
+
+    Returns:
+        The bytes read, or empty bytes when the stream ended before any byte.
+    """
+    first_chunk = input_stream.read(byte_count)
+    if len(first_chunk) in (0, byte_count):
+        return first_chunk
+
+    chunks = [first_chunk]
+    remaining_byte_count = byte_count - len(first_chunk)
+    while remaining_byte_count > 0:
+        chunk = input_stream.read(remaining_byte_count)
+        if len(chunk) == 0:
+            raise ValueError(
+                f"Input ended inside a frame: expected {byte_count} bytes, "
+                f"got {byte_count - remaining_byte_count}."
+            )
+        chunks.append(chunk)
+        remaining_byte_count -= len(chunk)
+    return b"".join(chunks)
+
+
+def iterate_raw_video_frames(
+    input_stream: BinaryIO,
+    frame_size: tuple[int, int],
+    pixel_format: str,
+) -> Iterator[Image.Image]:
+    """Yield images decoded from consecutive fixed-size raw frames.
+
+    Args:
+        input_stream: Binary stream of raw frames with no headers.
+        frame_size: Width and height of every frame.
+        pixel_format: Raw pixel format, "rgb24" or "rgba".
+
+    Yields:
+        One image per complete frame, until the stream ends.
+    """
+    frame_mode = RAW_PIXEL_FORMAT_MODES[pixel_format]
+    frame_byte_count = calculate_raw_frame_byte_count(frame_size, pixel_format)
+    while True:
+        frame_bytes = read_exact_byte_count(input_stream, frame_byte_count)
+        if len(frame_bytes) == 0:
+            return
+        yield Image.frombytes(frame_mode, frame_size, frame_bytes)
+
+
+def write_raw_video_frames(
+    frames: Iterable[Image.Image],
+    output_stream: BinaryIO,
+    pixel_format: str,
+    upscale_factor: int = 1,
+) -> int:
+    """Write frames to a stream as raw pixels in one pixel format.
+
+    Args:
+        frames: Transformed frames. May be a lazy iterator.
+        output_stream: Binary stream that receives the raw frames.
+        pixel_format: Raw pixel format, "rgb24" or "rgba".
+        upscale_factor: Whole-number nearest-neighbor enlargement applied to
+            each frame just before it is written.
+
+    Returns:
+        The number of frames written.
+    """
+    frame_mode = RAW_PIXEL_FORMAT_MODES[pixel_format]
+    frame_count = 0
+    for frame in frames:
+        frame = upscale_image_by_integer_factor(frame, upscale_factor)
+        if frame.mode != frame_mode:
+            frame = frame.convert(frame_mode)
+        output_stream.write(frame.tobytes())
+        output_stream.flush()
+        frame_count += 1
+    return frame_count
+
+
+def transform_raw_video_stream(
+    input_stream: BinaryIO,
+    output_stream: BinaryIO,
+    frame_size: tuple[int, int],
+    pixel_format: str,
+    transformation_mode: str,
+    block_size: int | None = None,
+    grid_width: int | None = None,
+    grid_height: int | None = None,
+    color_count: int | None = None,
+    sampling_method: str = NEAREST_SAMPLING,
+    upscale_factor: int | None = None,
+    job_count: int = 1,
+    palette_strategy: str = GLOBAL_PALETTE_STRATEGY,
+    palette_cache_capacity: int | None = None,
+    stage_profiler: StageProfiler | None = None,
+) -> int:
+    """Transform raw frames from one stream and write raw frames to another.
+
+    Frames flow through the same lazy pipeline as animated GIFs, so memory
+    holds only the frames in flight. With the "global" palette strategy the
+    palette is built once from the first frames and reused for the rest.
+
+    Args:
+        input_stream: Binary stream of raw input frames.
+        output_stream: Binary stream that receives raw output frames.
+        frame_size: Width and height of every input frame.
+        pixel_format: Raw pixel format of both streams, "rgb24" or "rgba".
+        transformation_mode: Transformation mode such as "pixel" or "grid".
+        block_size: Pixel block size used for pixel mode.
+        grid_width: Target grid width used for grid mode.
+        grid_height: Target grid height used for grid mode.
+        color_count: Optional number of colors for quantization.
+        sampling_method: Block sampling method used for pixel mode.
+        upscale_factor: Optional whole-number enlargement of the logical image.
+        job_count: Number of worker processes transforming frames.
+        palette_strategy: "global" builds one palette for the stream; "frame"
+            builds one per frame.
+        palette_cache_capacity: Optional capacity of this process's palette cache.
+        stage_profiler: Optional profiler that records each frame's stages.
+
+    Returns:
+        The number of frames written.
+    """
+    if pixel_format not in RAW_PIXEL_FORMAT_MODES:
+        raise ValueError(
+            f"Invalid pixel format: '{pixel_format}'. "
+            f"Valid options are: {', '.join(RAW_PIXEL_FORMAT_MODES)}."
+        )
+    if frame_size[0] <= 0 or frame_size[1] <= 0:
+        raise ValueError("Frame width and height must be positive integers.")
+
+    palette_cache = None
+    if palette_cache_capacity is not None:
+        palette_cache = get_process_palette_cache(palette_cache_capacity)
+
+    transformed_frame_stream = iterate_animated_image_transformation_pipeline(
+        frames=iterate_raw_video_frames(input_stream, frame_size, pixel_format),
+        transformation_mode=transformation_mode,
+        block_size=block_size,
+        grid_width=grid_width,
+        grid_height=grid_height,
+        color_count=color_count,
+        sampling_method=sampling_method,
+        keep_logical_resolution=upscale_factor is not None,
+        job_count=job_count,
+        palette_strategy=palette_strategy,
+        palette_cache=palette_cache,
+        stage_profiler=stage_profiler,
+    )
+    return write_raw_video_frames(
+        frames=transformed_frame_stream,
+        output_stream=output_stream,
+        pixel_format=pixel_format,
+        upscale_factor=upscale_factor or 1,
+    )
+
+
+def create_stream_argument_parser() -> ArgumentParser:
+    """Create and return the argument parser for ``pixelling stream``.
+
+    Returns:
+        An argument parser configured with raw frame options.
+    """
+    argument_parser = ArgumentParser(
+        prog="pixelling stream",
+        description=(
+            "Read fixed-size raw frames from standard input, transform each one,\n"
+            "and write raw frames to standard output.\n"
+            "Transformation options are the same as for pixelling itself:\n"
+            "--mode, --block-size, --grid-width, --grid-height, --color-count,\n"
+            "--sampling, --upscale, --animated-palette, --palette-cache, --jobs,\n"
+            "and --profile."
+        ),
+        epilog=(
+            "Examples:\n"
+            "  ffmpeg -i in.mp4 -f rawvideo -pix_fmt rgb24 - \\\n"
+            "    | pixelling stream --width 1280 --height 720 --mode pixel --block-size 8 \\\n"
+            "    | ffmpeg -f rawvideo -pix_fmt rgb24 -s 1280x720 -r 30 -i - out.mp4"
+        ),
+        formatter_class=RawTextHelpFormatter,
+    )
+    argument_parser.add_argument(
+        "--width",
+        type=int,
+        required=True,
+        help="Width of every input frame in pixels. Must be greater than 0.",
+    )
+    argument_parser.add_argument(
+        "--height",
+        type=int,
+        required=True,
+        help="Height of every input frame in pixels. Must be greater than 0.",
+    )
+    argument_parser.add_argument(
+        "--pixel-format",
+        choices=list(RAW_PIXEL_FORMAT_MODES),
+        default=DEFAULT_RAW_PIXEL_FORMAT,
+        help=(
+            f"Raw pixel format of the input and output frames. Defaults to {DEFAULT_RAW_PIXEL_FORMAT}.\n"
+            "Names match ffmpeg's -pix_fmt values."
+        ),
+    )
+    return argument_parser
+
+
+def parse_stream_command_line_arguments(
+    command_line_arguments: Sequence[str],
+) -> tuple[Namespace, Namespace]:
+    """Parse and validate the stream options and the transformation options.
+
+    Args:
+        command_line_arguments: Arguments that follow ``stream``.
+
+    Returns:
+        The stream arguments and the validated transformation arguments.
+    """
+    stream_arguments, transformation_command_line_arguments = (
+        create_stream_argument_parser().parse_known_args(command_line_arguments)
+    )
+    if stream_arguments.width <= 0 or stream_arguments.height <= 0:
+        raise ValueError("Frame width and height must be greater than 0.")
+
+    parsed_arguments = parse_command_line_arguments(
+        [STREAM_INPUT_PLACEHOLDER, *transformation_command_line_arguments]
+    )
+    for option_name, option_flag in STREAM_REJECTED_OPTIONS.items():
+        if getattr(parsed_arguments, option_name) not in (None, False):
+            raise ValueError(f"{option_flag} cannot be combined with stream mode.")
+    if not any(
+        command_line_argument.startswith("--animated-palette")
+        for command_line_argument in transformation_command_line_arguments
+    ):
+        if parsed_arguments.color_count is not None:
+            parsed_arguments.animated_palette = GLOBAL_PALETTE_STRATEGY
+        else:
+            parsed_arguments.animated_palette = FRAME_PALETTE_STRATEGY
+    validate_command_line_arguments(parsed_arguments)
+    return stream_arguments, parsed_arguments
+
+
+def format_stream_throughput(frame_count: int, elapsed_seconds: float) -> str:
+    """Return a one-line frame count and frames-per-second summary.
+
+    Args:
+        frame_count: Number of frames written.
+        elapsed_seconds: Wall time of the whole stream.
+
+    Returns:
+        A human-readable throughput line.
+    """
+    frames_per_second = frame_count / elapsed_seconds if elapsed_seconds > 0 else 0.0
+    return (
+        f"Streamed {frame_count} frames in {elapsed_seconds:.2f} s "
+        f"({frames_per_second:.1f} frames per second)."
+    )
+
+
+def run_stream_command_line_interface(
+    command_line_arguments: Sequence[str] | None = None,
+) -> int:
+    """Run ``pixelling stream`` until standard input ends.
+
+    The output frame size is printed to standard error before any frame is
+    written, and the frame rate achieved is printed once the stream ends.
+
+    Args:
+        command_line_arguments: Optional arguments that follow ``stream``.
+
+    Returns:
+        Process exit status code.
+    """
+    stream_arguments, parsed_arguments = parse_stream_command_line_arguments(
+        command_line_arguments if command_line_arguments is not None else []
+    )
+    frame_size = (stream_arguments.width, stream_arguments.height)
+    output_frame_width, output_frame_height = calculate_stream_output_frame_size(
+        frame_size=frame_size,
+        transformation_mode=parsed_arguments.mode,
+        block_size=parsed_arguments.block_size,
+        grid_width=parsed_arguments.grid_width,
+        grid_height=parsed_arguments.grid_height,
+        upscale_factor=parsed_arguments.upscale,
+    )
+    print(
+        f"Output frames: {output_frame_width}x{output_frame_height} "
+        f"{stream_arguments.pixel_format}.",
+        file=sys.stderr,
+        flush=True,
+    )
+
+    stage_profiler = None
+    if parsed_arguments.profile is not None:
+        stage_profiler = StageProfiler()
+
+    start_time = time.perf_counter()
+    frame_count = transform_raw_video_stream(
+        input_stream=sys.stdin.buffer,
+        output_stream=sys.stdout.buffer,
+        frame_size=frame_size,
+        pixel_format=stream_arguments.pixel_format,
+        transformation_mode=parsed_arguments.mode,
+        block_size=parsed_arguments.block_size,
+        grid_width=parsed_arguments.grid_width,
+        grid_height=parsed_arguments.grid_height,
+        color_count=parsed_arguments.color_count,
+        sampling_method=parsed_arguments.sampling or NEAREST_SAMPLING,
+        upscale_factor=parsed_arguments.upscale,
+        job_count=parsed_arguments.jobs,
+        palette_strategy=parsed_arguments.animated_palette,
+        palette_cache_capacity=parsed_arguments.palette_cache,
+        stage_profiler=stage_profiler,
+    )
+    elapsed_seconds = time.perf_counter() - start_time
+
+    print(format_stream_throughput(frame_count, elapsed_seconds), file=sys.stderr)
+    if stage_profiler is not None:
+        write_stage_profile(stage_profiler, parsed_arguments.profile)
+    return 0
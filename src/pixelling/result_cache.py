@@ -0,0 +1,248 @@
+"""Content-addressed on-disk cache of encoded transformation outputs."""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from dataclasses import dataclass
+from functools import partial
+
+from .ops.option_values import DEFAULT_RESULT_CACHE_MAXIMUM_BYTE_COUNT
+from .output_writer import write_output_file_atomically
+
+RESULT_CACHE_FORMAT_VERSION = 1
+RESULT_CACHE_READ_CHUNK_BYTE_COUNT = 1 << 20
+RESULT_CACHE_TEMPORARY_FILE_PREFIX = ".pending-"
+RESULT_CACHE_ENTRY_DIRECTORY_NAME = "pixelling-results"
+
+
+def format_result_cache_statistics(hit_count: int, miss_count: int) -> str:
+    """Return a one-line summary of result cache hits and misses.
+
+    Args:
+        hit_count: Number of lookups that found an entry.
+        miss_count: Number of lookups that did not.
+
+    Returns:
+        Summary text such as "Result cache: 3 hits, 1 misses."
+    """
+    return f"Result cache: {hit_count} hits, {miss_count} misses."
+
+
+def normalize_result_cache_parameters(
+    transformation_mode: str,
+    output_extension: str,
+    block_size: int | None = None,
+    grid_width: int | None = None,
+    grid_height: int | None = None,
+    color_count: int | None = None,
+    sampling_method: str | None = None,
+    upscale_factor: int | None = None,
+    allow_reduced_decoding: bool = True,
+    palette_strategy: str | None = None,
+    use_strip_processing: bool = False,
+    palette_cache_capacity: int | None = None,
+    encode_profile: str | None = None,
+) -> dict[str, object]:
+    """Return the transformation parameters that determine the output bytes.
+
+    Options that only apply to the other mode, or to quantization when no
+    color count is set, are dropped so equivalent requests share an entry.
+    Settings that never change the output, such as the job count, are not
+    parameters here at all.
+
+    Args:
+        transformation_mode: Transformation mode such as "pixel" or "grid".
+        output_extension: Output file extension, which selects the encoder.
+        block_size: Pixel block size used for pixel mode.
+        grid_width: Target grid width used for grid mode.
+        grid_height: Target grid height used for grid mode.
+        color_count: Optional number of colors for quantization.
+        sampling_method: Block sampling method used for pixel mode.
+        upscale_factor: Optional whole-number enlargement of the logical image.
+        allow_reduced_decoding: Whether JPEG inputs may be decoded at a reduced size.
+        palette_strategy: Palette strategy used for animated GIF quantization.
+        use_strip_processing: Whether the output is written band by band.
+        palette_cache_capacity: Optional palette cache capacity. Outputs made
+            with a palette cache may reuse an earlier palette, so they are
+            kept apart from outputs made without one.
+        encode_profile: Optional encode profile, which changes the encoded
+            bytes but not the pixels.
+
+    Returns:
+        A dictionary of normalized parameters.
+    """
+    normalized_parameters: dict[str, object] = {
+        "version": RESULT_CACHE_FORMAT_VERSION,
+        "mode": transformation_mode,
+        "output_extension": output_extension.lower(),
+        "color_count": color_count,
+        "upscale_factor": upscale_factor,
+        "reduced_decoding": allow_reduced_decoding,
+        "strips": use_strip_processing,
+    }
+    if transformation_mode == "pixel":
+        normalized_parameters["block_size"] = block_size
+        normalized_parameters["sampling_method"] = sampling_method
+    else:
+        normalized_parameters["grid_size"] = [grid_width, grid_height]
+    if color_count is not None:
+        normalized_parameters["palette_strategy"] = palette_strategy
+        normalized_parameters["palette_cache"] = palette_cache_capacity is not None
+    if encode_profile is not None:
+        normalized_parameters["encode_profile"] = encode_profile
+    return normalized_parameters
+
+
+def build_result_cache_key(
+    input_image_path: str,
+    normalized_parameters: dict[str, object],
+) -> str:
+    """Return a key that hashes the input file bytes and the parameters.
+
+    Args:
+        input_image_path: Source image file path.
+        normalized_parameters: Parameters from ``normalize_result_cache_parameters``.
+
+    Returns:
+        A hexadecimal SHA-256 digest.
+    """
+    key_hash = hashlib.sha256()
+    with open(input_image_path, "rb") as input_file:
+        while True:
+            chunk_bytes = input_file.read(RESULT_CACHE_READ_CHUNK_BYTE_COUNT)
+            if not chunk_bytes:
+                break
+            key_hash.update(chunk_bytes)
+    key_hash.update(json.dumps(normalized_parameters, sort_keys=True).encode())
+    return key_hash.hexdigest()
+
+
+@dataclass
+class ResultCache:
+    """A directory of encoded outputs keyed by input content and parameters.
+
+    Entries are files named after their key, kept in a subdirectory that
+    only the cache writes to, so eviction never touches other files in the
+    cache directory. Reading an entry refreshes its modification time, and
+    the least recently used entries are removed once the entries grow past
+    the byte limit. The counters only cover lookups made through this
+    object in the current process.
+
+    Attributes:
+        cache_directory_path: Directory given by ``--cache-dir``.
+        maximum_byte_count: Largest total size of all entries in bytes.
+        hit_count: Number of lookups that found an entry.
+        miss_count: Number of lookups that did not.
+    """
+
+    cache_directory_path: str
+    maximum_byte_count: int = DEFAULT_RESULT_CACHE_MAXIMUM_BYTE_COUNT
+    hit_count: int = 0
+    miss_count: int = 0
+
+    def __post_init__(self) -> None:
+        if self.maximum_byte_count <= 0:
+            raise ValueError("Result cache size must be a positive integer.")
+
+    @property
+    def entry_directory_path(self) -> str:
+        """Return the subdirectory that holds the cache entries."""
+        return os.path.join(self.cache_directory_path, RESULT_CACHE_ENTRY_DIRECTORY_NAME)
+
+    def build_entry_path(self, cache_key: str, output_extension: str) -> str:
+        """Return the file path of the entry for a key.
+
+        Args:
+            cache_key: Key from ``build_result_cache_key``.
+            output_extension: Output file extension, including the dot.
+
+        Returns:
+            Path of the cache entry file.
+        """
+        return os.path.join(self.entry_directory_path, f"{cache_key}{output_extension.lower()}")
+
+    def copy_cached_output(self, cache_key: str, output_image_path: str) -> bool:
+        """Copy a cached output to the destination path when one exists.
+
+        Args:
+            cache_key: Key from ``build_result_cache_key``.
+            output_image_path: Destination image file path.
+
+        Returns:
+            True on a cache hit; otherwise False.
+        """
+        entry_path = self.build_entry_path(cache_key, os.path.splitext(output_image_path)[1])
+        try:
+            write_output_file_atomically(output_image_path, partial(shutil.copyfile, entry_path))
+        except FileNotFoundError:
+            self.miss_count += 1
+            return False
+
+        try:
+            os.utime(entry_path)
+        except FileNotFoundError:
+            pass
+        self.hit_count += 1
+        return True
+
+    def store_output(self, cache_key: str, output_image_path: str) -> None:
+        """Add a freshly written output to the cache, then enforce the size limit.
+
+        The entry is written to a temporary file and renamed into place, so
+        concurrent readers never see a partial entry.
+
+        Args:
+            cache_key: Key from ``build_result_cache_key``.
+            output_image_path: Path of the output that was just written.
+        """
+        os.makedirs(self.entry_directory_path, exist_ok=True)
+        entry_path = self.build_entry_path(cache_key, os.path.splitext(output_image_path)[1])
+        temporary_file_descriptor, temporary_entry_path = tempfile.mkstemp(
+            prefix=RESULT_CACHE_TEMPORARY_FILE_PREFIX,
+            dir=self.entry_directory_path,
+        )
+        try:
+            with os.fdopen(temporary_file_descriptor, "wb") as temporary_entry_file:
+                with open(output_image_path, "rb") as output_file:
+                    shutil.copyfileobj(output_file, temporary_entry_file)
+            os.replace(temporary_entry_path, entry_path)
+        except BaseException:
+            if os.path.exists(temporary_entry_path):
+                os.remove(temporary_entry_path)
+            raise
+
+        self.evict_least_recently_used_entries()
+
+    def evict_least_recently_used_entries(self) -> None:
+        """Remove the least recently used entries until the cache fits its limit."""
+        cache_entries: list[tuple[float, int, str]] = []
+        for directory_entry in os.scandir(self.entry_directory_path):
+            if not directory_entry.is_file() or directory_entry.name.startswith(
+                RESULT_CACHE_TEMPORARY_FILE_PREFIX
+            ):
+                continue
+            try:
+                entry_status = directory_entry.stat()
+            except FileNotFoundError:
+                continue
+            cache_entries.append((entry_status.st_mtime, entry_status.st_size, directory_entry.path))
+
+        total_byte_count = sum(entry_byte_count for _, entry_byte_count, _ in cache_entries)
+        for _, entry_byte_count, entry_path in sorted(cache_entries):
+            if total_byte_count <= self.maximum_byte_count:
+                break
+            try:
+                os.remove(entry_path)
+            except FileNotFoundError:
+                pass
+            total_byte_count -= entry_byte_count
+
+    def format_statistics(self) -> str:
+        """Return a one-line summary of the hit and miss counters.
+
+        Returns:
+            Summary text such as "Result cache: 3 hits, 1 misses."
+        """
+        return format_result_cache_statistics(self.hit_count, self.miss_count)
@@ -0,0 +1,767 @@
+"""Long-running server that runs transformation jobs on warm worker processes."""
+
+import json
+import mimetypes
+import os
+import socketserver
+import stat
+import sys
+import tempfile
+import threading
+from argparse import ArgumentParser, Namespace, RawTextHelpFormatter
+from concurrent.futures import Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Sequence
+from urllib.parse import parse_qsl, urlsplit
+
+from PIL import Image
+
+from .batch import is_batch_input_path
+from .cli import (
+    BYTES_PER_MEGABYTE,
+    build_transformation_options,
+    create_command_line_argument_parser,
+    validate_command_line_arguments,
+)
+from .io import build_default_output_image_path
+from .memory_transform import transform_image_bytes
+from .transform import transform_image_file
+
+SERVER_HOST = "127.0.0.1"
+DEFAULT_SERVER_PORT = 8765
+DEFAULT_SERVER_QUEUE_SIZE = 16
+DEFAULT_SERVER_MAXIMUM_REQUEST_MEGABYTE_COUNT = 64
+SERVER_RETRY_AFTER_SECONDS = 1
+SERVER_TRANSFORM_PATH = "/transform"
+SERVER_HEALTH_PATH = "/health"
+SERVER_JSON_CONTENT_TYPE = "application/json"
+SERVER_OUTPUT_FORMAT_OPTION = "format"
+SERVER_REJECTED_JOB_OPTIONS = ("help", "input_image_path", "jobs", "profile")
+DEFAULT_SERVER_OUTPUT_EXTENSION = ".png"
+SERVER_TRUE_OPTION_VALUES = ("", "1", "true", "yes")
+SERVER_FALSE_OPTION_VALUES = ("0", "false", "no")
+SERVER_FILE_ONLY_JOB_OPTIONS = ("allow_overwrite", "result_cache", "use_strip_processing")
+SERVER_BYTES_JOB_REJECTED_OPTIONS = ("output_image_path", "overwrite", "cache_dir", "cache_size_mb")
+SERVER_JOB_INPUT_ERROR_TYPES = (ValueError, FileNotFoundError, Image.UnidentifiedImageError)
+
+
+def raise_server_job_argument_error(message: str) -> None:
+    """Raise a job option error instead of exiting like the command line does.
+
+    Args:
+        message: Error text produced by the argument parser.
+    """
+    raise ValueError(f"Invalid job options: {message}")
+
+
+def build_job_command_line_arguments(
+    input_image_path: str,
+    job_options: dict[str, object],
+) -> list[str]:
+    """Return the command-line arguments equivalent to a job's options.
+
+    Option names are the long command-line flags without the leading dashes,
+    with either dashes or underscores. True adds a flag such as
+    ``--full-decode``; False and None leave the option out.
+
+    Args:
+        input_image_path: Input path given to the parser.
+        job_options: Option names mapped to their values.
+
+    Returns:
+        Arguments ready for the pixelling argument parser.
+    """
+    command_line_arguments = [input_image_path]
+    for option_name, option_value in job_options.items():
+        normalized_option_name = option_name.replace("-", "_")
+        if normalized_option_name in SERVER_REJECTED_JOB_OPTIONS:
+            raise ValueError(f"Job option '{option_name}' is not accepted by the server.")
+        if option_value is None or option_value is False:
+            continue
+        option_flag = "--" + normalized_option_name.replace("_", "-")
+        if option_value is True:
+            command_line_arguments.append(option_flag)
+        else:
+            command_line_arguments.extend([option_flag, str(option_value)])
+    return command_line_arguments
+
+
+def reject_server_bytes_job_file_options(job_options: dict[str, object]) -> None:
+    """Refuse options that would make a bytes job read or write server files.
+
+    Args:
+        job_options: Option names mapped to their values.
+    """
+    for option_name in job_options:
+        if option_name.replace("-", "_") in SERVER_BYTES_JOB_REJECTED_OPTIONS:
+            raise ValueError(
+                f"Job option '{option_name}' is not accepted for jobs that send image bytes; "
+                "they receive the output in the response."
+            )
+
+
+def confine_server_job_path(path: str, root_paths: Sequence[str]) -> None:
+    """Refuse a path job path that resolves outside the server's root directories.
+
+    Args:
+        path: Input, output, or cache path named by the job.
+        root_paths: Resolved root directories from ``--root``.
+    """
+    resolved_path = os.path.realpath(path)
+    for root_path in root_paths:
+        if os.path.commonpath([resolved_path, root_path]) == root_path:
+            return
+    raise PermissionError(f"Path '{path}' is outside the server's root directories.")
+
+
+def parse_server_job_arguments(command_line_arguments: list[str]) -> Namespace:
+    """Parse and validate job arguments with the same rules as the command line.
+
+    Args:
+        command_line_arguments: Arguments from ``build_job_command_line_arguments``.
+
+    Returns:
+        Validated arguments.
+    """
+    argument_parser = create_command_line_argument_parser()
+    argument_parser.error = raise_server_job_argument_error
+    parsed_arguments = argument_parser.parse_args(command_line_arguments)
+    validate_command_line_arguments(parsed_arguments)
+    return parsed_arguments
+
+
+def convert_query_option_values(query_options: dict[str, str]) -> dict[str, object]:
+    """Return query string options with flag values turned into booleans.
+
+    Args:
+        query_options: Query parameter names mapped to their text values.
+
+    Returns:
+        Options where "true", "1", "yes", or an empty value become True and
+        "false", "0", or "no" become False.
+    """
+    job_options: dict[str, object] = {}
+    for option_name, option_value in query_options.items():
+        lowered_option_value = option_value.lower()
+        if lowered_option_value in SERVER_TRUE_OPTION_VALUES:
+            job_options[option_name] = True
+        elif lowered_option_value in SERVER_FALSE_OPTION_VALUES:
+            job_options[option_name] = False
+        else:
+            job_options[option_name] = option_value
+    return job_options
+
+
+def run_server_path_job(
+    input_image_path: str,
+    output_image_path: str,
+    transformation_options: dict[str, object],
+) -> tuple[str, bool | None]:
+    """Transform a file named by a job, inside a worker process.
+
+    Args:
+        input_image_path: Source image file path.
+        output_image_path: Requested destination image file path.
+        transformation_options: Options from ``build_transformation_options``.
+
+    Returns:
+        A tuple containing:
+        - The path the output was written to.
+        - Whether the output came from the result cache, or None when no
+          result cache was used.
+    """
+    return transform_image_file(
+        input_image_path=input_image_path,
+        output_image_path=output_image_path,
+        job_count=1,
+        **transformation_options,
+    )
+
+
+def run_server_bytes_job(
+    input_image_bytes: bytes,
+    output_extension: str,
+    transformation_options: dict[str, object],
+) -> bytes:
+    """Transform image bytes sent with a job, inside a worker process.
+
+    Jobs are transformed in memory unless they use strip processing, which
+    works on files in a private temporary directory.
+
+    Args:
+        input_image_bytes: Encoded input image.
+        output_extension: Output file extension that selects the encoder.
+        transformation_options: Options from ``build_transformation_options``.
+
+    Returns:
+        The encoded output image.
+    """
+    if not transformation_options["use_strip_processing"]:
+        return transform_image_bytes(
+            input_image_data=input_image_bytes,
+            output_format=output_extension[1:],
+            job_count=1,
+            **{
+                option_name: option_value
+                for option_name, option_value in transformation_options.items()
+                if option_name not in SERVER_FILE_ONLY_JOB_OPTIONS
+            },
+        ).image_bytes
+
+    with tempfile.TemporaryDirectory(prefix="pixelling-serve-") as job_directory_path:
+        input_image_path = os.path.join(job_directory_path, "input")
+        output_image_path = os.path.join(job_directory_path, f"output{output_extension}")
+        with open(input_image_path, "wb") as input_file:
+            input_file.write(input_image_bytes)
+        transform_image_file(
+            input_image_path=input_image_path,
+            output_image_path=output_image_path,
+            job_count=1,
+            **{**transformation_options, "allow_overwrite": True},
+        )
+        with open(output_image_path, "rb") as output_file:
+            return output_file.read()
+
+
+def warm_up_server_worker() -> int:
+    """Load Pillow's format plugins in a worker so the first job does not pay for it.
+
+    Returns:
+        The worker's process identifier.
+    """
+    Image.init()
+    return os.getpid()
+
+
+class ServerJobQueue:
+    """A warm pool of worker processes that admits a bounded number of jobs.
+
+    Up to ``worker_count`` jobs run at once and up to ``queue_size`` more
+    wait for a free worker. Further jobs are refused so callers can back off
+    instead of piling up behind a long queue. When a worker process dies,
+    the broken pool is replaced by a new, warmed-up one.
+
+    Each path job builds its own ``ResultCache`` inside a worker process,
+    so result cache lookups are counted here, from the job results.
+
+    Attributes:
+        worker_count: Number of worker processes.
+        queue_size: Number of jobs allowed to wait for a worker.
+        admitted_job_count: Jobs currently running or waiting.
+        result_cache_hit_count: Finished jobs whose output came from the result cache.
+        result_cache_miss_count: Finished jobs that looked up the result cache and missed.
+    """
+
+    def __init__(self, worker_count: int, queue_size: int = DEFAULT_SERVER_QUEUE_SIZE) -> None:
+        if worker_count <= 0:
+            raise ValueError("Worker count must be a positive integer.")
+        if queue_size < 0:
+            raise ValueError("Queue size must not be negative.")
+        self.worker_count = worker_count
+        self.queue_size = queue_size
+        self.admitted_job_count = 0
+        self.result_cache_hit_count = 0
+        self.result_cache_miss_count = 0
+        self.admission_lock = threading.Lock()
+        self.executor = ProcessPoolExecutor(max_workers=worker_count)
+
+    def warm_up(self) -> None:
+        """Start every worker process and wait until each is ready."""
+        Image.init()
+        warm_up_futures = [
+            self.executor.submit(warm_up_server_worker) for _ in range(self.worker_count)
+        ]
+        wait(warm_up_futures)
+
+    def restart_broken_workers(self) -> None:
+        """Replace the worker pool with a new, warmed-up one if a worker died.
+
+        A pool whose worker process exited abruptly refuses every later job
+        with ``BrokenProcessPool``, so a warm-up job is submitted to check
+        it. The check and the replacement happen under the admission lock, so
+        concurrent callers replace a broken pool only once.
+        """
+        with self.admission_lock:
+            try:
+                self.executor.submit(warm_up_server_worker)
+                return
+            except BrokenProcessPool:
+                pass
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = ProcessPoolExecutor(max_workers=self.worker_count)
+            self.warm_up()
+
+    def try_submit_job(self, job_function: Callable[..., object], *job_arguments: object) -> Future | None:
+        """Submit a job unless the queue is full.
+
+        Args:
+            job_function: Module-level function run in a worker process.
+            *job_arguments: Positional arguments for the job function.
+
+        Returns:
+            The job's future, or None when the job was refused.
+        """
+        with self.admission_lock:
+            if self.admitted_job_count >= self.worker_count + self.queue_size:
+                return None
+            self.admitted_job_count += 1
+
+        try:
+            try:
+                job_future = self.executor.submit(job_function, *job_arguments)
+            except BrokenProcessPool:
+                self.restart_broken_workers()
+                job_future = self.executor.submit(job_function, *job_arguments)
+        except BaseException:
+            self.release_job_slot()
+            raise
+        job_future.add_done_callback(lambda _: self.release_job_slot())
+        return job_future
+
+    def release_job_slot(self) -> None:
+        """Free the admission slot of a finished job."""
+        with self.admission_lock:
+            self.admitted_job_count -= 1
+
+    def record_result_cache_lookup(self, cache_hit: bool | None) -> None:
+        """Count a finished job's result cache hit or miss.
+
+        Args:
+            cache_hit: Whether the job's output came from the result cache,
+                or None when the job used no result cache.
+        """
+        if cache_hit is None:
+            return
+        with self.admission_lock:
+            if cache_hit:
+                self.result_cache_hit_count += 1
+            else:
+                self.result_cache_miss_count += 1
+
+    def close(self) -> None:
+        """Cancel waiting jobs and stop the worker processes."""
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+
+class ServerRequestHandler(BaseHTTPRequestHandler):
+    """HTTP handler for transformation jobs and health checks.
+
+    ``POST /transform`` accepts either a JSON object naming an input file
+    and options, answered with JSON, or raw image bytes with options in the
+    query string, answered with the encoded output. ``GET /health`` reports
+    the worker and queue state and the result cache hits and misses. Path
+    jobs are refused unless the server was given root directories, and
+    their paths must resolve inside them.
+    """
+
+    server_version = "pixelling"
+
+    def address_string(self) -> str:
+        if isinstance(self.client_address, tuple):
+            return super().address_string()
+        return "unix-socket"
+
+    def do_GET(self) -> None:
+        if urlsplit(self.path).path != SERVER_HEALTH_PATH:
+            self.send_json_response(HTTPStatus.NOT_FOUND, {"error": "Unknown path."})
+            return
+
+        job_queue: ServerJobQueue = self.server.job_queue
+        self.send_json_response(
+            HTTPStatus.OK,
+            {
+                "status": "ok",
+                "worker_count": job_queue.worker_count,
+                "queue_size": job_queue.queue_size,
+                "admitted_job_count": job_queue.admitted_job_count,
+                "result_cache_hit_count": job_queue.result_cache_hit_count,
+                "result_cache_miss_count": job_queue.result_cache_miss_count,
+            },
+        )
+
+    def do_POST(self) -> None:
+        request_url = urlsplit(self.path)
+        if request_url.path != SERVER_TRANSFORM_PATH:
+            self.send_json_response(HTTPStatus.NOT_FOUND, {"error": "Unknown path."})
+            return
+
+        content_length_text = self.headers.get("Content-Length")
+        if content_length_text is None or not content_length_text.isdigit():
+            self.send_json_response(HTTPStatus.LENGTH_REQUIRED, {"error": "Content-Length is required."})
+            return
+        content_length = int(content_length_text)
+        if content_length > self.server.maximum_request_byte_count:
+            self.close_connection = True
+            self.send_json_response(
+                HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                {"error": f"Request body exceeds {self.server.maximum_request_byte_count} bytes."},
+            )
+            return
+        request_body = self.rfile.read(content_length)
+
+        content_type = self.headers.get("Content-Type", "").split(";")[0].strip()
+        try:
+            if content_type == SERVER_JSON_CONTENT_TYPE:
+                job_function, job_arguments = build_server_path_job(
+                    request_body, self.server.path_job_root_paths
+                )
+            else:
+                job_function, job_arguments = build_server_bytes_job(
+                    request_body, dict(parse_qsl(request_url.query, keep_blank_values=True))
+                )
+        except PermissionError as error:
+            self.send_json_response(HTTPStatus.FORBIDDEN, {"error": str(error)})
+            return
+        except ValueError as error:
+            self.send_json_response(HTTPStatus.BAD_REQUEST, {"error": str(error)})
+            return
+
+        job_future = self.server.job_queue.try_submit_job(job_function, *job_arguments)
+        if job_future is None:
+            self.send_json_response(
+                HTTPStatus.SERVICE_UNAVAILABLE,
+                {"error": "The job queue is full. Retry later."},
+                extra_headers={"Retry-After": str(SERVER_RETRY_AFTER_SECONDS)},
+            )
+            return
+
+        try:
+            job_result = job_future.result()
+        except BrokenProcessPool:
+            self.server.job_queue.restart_broken_workers()
+            self.send_json_response(
+                HTTPStatus.SERVICE_UNAVAILABLE,
+                {"error": "A worker process stopped while running the job. Retry later."},
+                extra_headers={"Retry-After": str(SERVER_RETRY_AFTER_SECONDS)},
+            )
+            return
+        except SERVER_JOB_INPUT_ERROR_TYPES as error:
+            self.send_json_response(
+                HTTPStatus.UNPROCESSABLE_ENTITY,
+                {"error": f"{type(error).__name__}: {error}"},
+            )
+            return
+        except Exception as error:
+            self.send_json_response(
+                HTTPStatus.INTERNAL_SERVER_ERROR,
+                {"error": f"{type(error).__name__}: {error}"},
+            )
+            return
+
+        if job_function is run_server_path_job:
+            output_image_path, cache_hit = job_result
+            self.server.job_queue.record_result_cache_lookup(cache_hit)
+            self.send_json_response(
+                HTTPStatus.OK,
+                {"output_image_path": output_image_path, "cache_hit": cache_hit},
+            )
+            return
+
+        output_content_type = mimetypes.guess_type(f"output{job_arguments[1]}")[0]
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", output_content_type or "application/octet-stream")
+        self.send_header("Content-Length", str(len(job_result)))
+        self.end_headers()
+        self.wfile.write(job_result)
+
+    def send_json_response(
+        self,
+        status: HTTPStatus,
+        response_object: dict[str, object],
+        extra_headers: dict[str, str] | None = None,
+    ) -> None:
+        """Send a JSON response body with the given status.
+
+        Args:
+            status: HTTP status code.
+            response_object: Object encoded as the JSON body.
+            extra_headers: Optional additional response headers.
+        """
+        response_body = json.dumps(response_object).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", SERVER_JSON_CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(response_body)))
+        for header_name, header_value in (extra_headers or {}).items():
+            self.send_header(header_name, header_value)
+        self.end_headers()
+        self.wfile.write(response_body)
+
+
+def build_server_path_job(
+    request_body: bytes,
+    root_paths: Sequence[str] = (),
+) -> tuple[Callable[..., object], tuple]:
+    """Return the worker function and arguments for a JSON job naming files.
+
+    Args:
+        request_body: JSON object with "input_image_path", an optional
+            "output_image_path", and command-line options.
+        root_paths: Resolved directories that the input, output, and cache
+            paths must stay inside. Path jobs are refused when empty.
+
+    Returns:
+        The worker function and its positional arguments.
+    """
+    if not root_paths:
+        raise PermissionError("Path jobs are disabled; start the server with --root to allow them.")
+    try:
+        job_options = json.loads(request_body)
+    except (UnicodeDecodeError, json.JSONDecodeError) as error:
+        raise ValueError(f"Request body is not valid JSON: {error}") from error
+    if not isinstance(job_options, dict):
+        raise ValueError("Request body must be a JSON object.")
+
+    input_image_path = job_options.pop("input_image_path", None)
+    if not isinstance(input_image_path, str):
+        raise ValueError("Job must include an 'input_image_path' string.")
+    if is_batch_input_path(input_image_path):
+        raise ValueError("Batch inputs are not accepted by the server; send one job per file.")
+
+    parsed_arguments = parse_server_job_arguments(
+        build_job_command_line_arguments(input_image_path, job_options)
+    )
+    output_image_path = parsed_arguments.output_image_path or build_default_output_image_path(
+        input_image_path
+    )
+    for job_path in (input_image_path, output_image_path, parsed_arguments.cache_dir):
+        if job_path is not None:
+            confine_server_job_path(job_path, root_paths)
+    return run_server_path_job, (
+        input_image_path,
+        output_image_path,
+        build_transformation_options(parsed_arguments),
+    )
+
+
+def build_server_bytes_job(
+    request_body: bytes,
+    query_options: dict[str, str],
+) -> tuple[Callable[..., object], tuple]:
+    """Return the worker function and arguments for a job sending image bytes.
+
+    Args:
+        request_body: Encoded input image.
+        query_options: Query string options, including an optional "format"
+            such as "png" or "gif" that selects the output encoder.
+
+    Returns:
+        The worker function and its positional arguments.
+    """
+    if len(request_body) == 0:
+        raise ValueError("Request body must contain the input image.")
+
+    output_format = query_options.pop(SERVER_OUTPUT_FORMAT_OPTION, "")
+    output_extension = f".{output_format.lower()}" if output_format else DEFAULT_SERVER_OUTPUT_EXTENSION
+    if output_extension not in Image.registered_extensions():
+        raise ValueError(f"Unsupported output format: '{output_format}'.")
+
+    job_options = convert_query_option_values(query_options)
+    reject_server_bytes_job_file_options(job_options)
+    parsed_arguments = parse_server_job_arguments(
+        build_job_command_line_arguments("input", job_options)
+    )
+    return run_server_bytes_job, (
+        request_body,
+        output_extension,
+        build_transformation_options(parsed_arguments),
+    )
+
+
+class ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """HTTP server listening on a Unix domain socket, one thread per connection.
+
+    Attributes:
+        socket_file_identity: Device and inode of the socket file this server
+            created, so only that file is removed on shutdown.
+    """
+
+    daemon_threads = True
+    socket_file_identity: tuple[int, int] | None = None
+
+    def server_bind(self) -> None:
+        super().server_bind()
+        socket_file_status = os.lstat(self.server_address)
+        self.socket_file_identity = (socket_file_status.st_dev, socket_file_status.st_ino)
+
+    def remove_socket_file(self) -> None:
+        """Remove the socket file if it is still the one this server created."""
+        try:
+            socket_file_status = os.lstat(self.server_address)
+        except FileNotFoundError:
+            return
+        is_own_socket_file = stat.S_ISSOCK(socket_file_status.st_mode) and (
+            (socket_file_status.st_dev, socket_file_status.st_ino) == self.socket_file_identity
+        )
+        if is_own_socket_file:
+            os.remove(self.server_address)
+
+
+def remove_stale_server_socket(socket_path: str) -> None:
+    """Remove a socket left behind at a path, refusing to remove anything else.
+
+    Args:
+        socket_path: Unix socket path the server is about to listen on.
+    """
+    try:
+        socket_file_status = os.lstat(socket_path)
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(socket_file_status.st_mode):
+        raise ValueError(f"Socket path exists and is not a socket: '{socket_path}'.")
+    os.remove(socket_path)
+
+
+def create_transformation_server(
+    job_queue: ServerJobQueue,
+    port: int = DEFAULT_SERVER_PORT,
+    socket_path: str | None = None,
+    maximum_request_byte_count: int = DEFAULT_SERVER_MAXIMUM_REQUEST_MEGABYTE_COUNT * BYTES_PER_MEGABYTE,
+    path_job_root_paths: Sequence[str] = (),
+) -> socketserver.BaseServer:
+    """Create an HTTP server bound to localhost or to a Unix socket.
+
+    Args:
+        job_queue: Worker pool that runs the jobs.
+        port: Localhost TCP port, used when no socket path is given. Zero
+            picks a free port.
+        socket_path: Optional Unix socket path to listen on instead. A stale
+            socket at the path is replaced; any other file is refused.
+        maximum_request_byte_count: Largest accepted request body in bytes.
+        path_job_root_paths: Directories that path jobs may read and write
+            inside. Path jobs are refused when empty.
+
+    Returns:
+        A server ready for ``serve_forever``.
+    """
+    if socket_path is not None:
+        remove_stale_server_socket(socket_path)
+        http_server = ThreadingUnixHTTPServer(socket_path, ServerRequestHandler)
+    else:
+        http_server = ThreadingHTTPServer((SERVER_HOST, port), ServerRequestHandler)
+    http_server.job_queue = job_queue
+    http_server.maximum_request_byte_count = maximum_request_byte_count
+    http_server.path_job_root_paths = tuple(
+        os.path.realpath(root_path) for root_path in path_job_root_paths
+    )
+    return http_server
+
+
+def create_server_argument_parser() -> ArgumentParser:
+    """Create and return the argument parser for ``pixelling serve``.
+
+    Returns:
+        An argument parser configured with server options.
+    """
+    argument_parser = ArgumentParser(
+        prog="pixelling serve",
+        description=(
+            "Keep warm worker processes and accept transformation jobs over\n"
+            "localhost HTTP or a Unix socket."
+        ),
+        epilog=(
+            "Examples:\n"
+            "  pixelling serve --port 8765 --jobs 4\n"
+            "  curl --data-binary @in.png 'http://127.0.0.1:8765/transform?mode=pixel&block_size=8' -o out.png"
+        ),
+        formatter_class=RawTextHelpFormatter,
+    )
+    argument_parser.add_argument(
+        "--port",
+        type=int,
+        default=DEFAULT_SERVER_PORT,
+        help=f"Localhost TCP port to listen on. Defaults to {DEFAULT_SERVER_PORT}.",
+    )
+    argument_parser.add_argument(
+        "--socket",
+        type=str,
+        default=None,
+        help="Optional Unix socket path to listen on instead of a TCP port.",
+    )
+    argument_parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of warm worker processes. Must be greater than 0.",
+    )
+    argument_parser.add_argument(
+        "--queue-size",
+        type=int,
+        default=DEFAULT_SERVER_QUEUE_SIZE,
+        help=(
+            "Number of jobs allowed to wait for a free worker. Must not be negative.\n"
+            "Jobs beyond this are refused with HTTP 503 and a Retry-After header."
+        ),
+    )
+    argument_parser.add_argument(
+        "--max-request-mb",
+        type=int,
+        default=DEFAULT_SERVER_MAXIMUM_REQUEST_MEGABYTE_COUNT,
+        help="Largest accepted request body in megabytes. Must be greater than 0.",
+    )
+    argument_parser.add_argument(
+        "--root",
+        action="append",
+        default=[],
+        metavar="DIRECTORY",
+        help=(
+            "Directory that JSON path jobs may read inputs from and write outputs to.\n"
+            "Repeat for several directories. Without --root, path jobs are refused."
+        ),
+    )
+    return argument_parser
+
+
+def run_server_command_line_interface(
+    command_line_arguments: Sequence[str] | None = None,
+) -> int:
+    """Run ``pixelling serve`` until interrupted.
+
+    Args:
+        command_line_arguments: Optional arguments that follow ``serve``.
+
+    Returns:
+        Process exit status code.
+    """
+    parsed_arguments = create_server_argument_parser().parse_args(command_line_arguments)
+    if parsed_arguments.jobs <= 0:
+        raise ValueError("Job count must be greater than 0.")
+    if parsed_arguments.queue_size < 0:
+        raise ValueError("Queue size must not be negative.")
+    if parsed_arguments.max_request_mb <= 0:
+        raise ValueError("Maximum request size must be greater than 0.")
+    for root_path in parsed_arguments.root:
+        if not os.path.isdir(root_path):
+            raise ValueError(f"Server root is not a directory: '{root_path}'.")
+
+    job_queue = ServerJobQueue(parsed_arguments.jobs, parsed_arguments.queue_size)
+    http_server = None
+    try:
+        job_queue.warm_up()
+        http_server = create_transformation_server(
+            job_queue=job_queue,
+            port=parsed_arguments.port,
+            socket_path=parsed_arguments.socket,
+            maximum_request_byte_count=parsed_arguments.max_request_mb * BYTES_PER_MEGABYTE,
+            path_job_root_paths=parsed_arguments.root,
+        )
+        with http_server:
+            if parsed_arguments.socket is not None:
+                listening_address = parsed_arguments.socket
+            else:
+                listening_address = f"http://{SERVER_HOST}:{http_server.server_address[1]}"
+            print(
+                f"Serving on {listening_address} with {parsed_arguments.jobs} workers.",
+                file=sys.stderr,
+                flush=True,
+            )
+            try:
+                http_server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+    finally:
+        job_queue.close()
+        if isinstance(http_server, ThreadingUnixHTTPServer):
+            http_server.remove_socket_file()
+    return 0
@@ -0,0 +1,403 @@
+"""Row-range image reading and incremental PNG and PPM writing for strip processing."""
+
+import os
+import struct
+import warnings
+import zlib
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from functools import partial
+from itertools import chain
+
+from PIL import Image
+
+from .array_io import NPY_FORMAT_NAME
+from .media_source import MediaSource, probe_media_source
+from .ops.pixelate import NEAREST_SAMPLING
+from .ops.strip_pixelate import iterate_pixelated_image_bands
+
+RAW_ROW_BYTES_PER_PIXEL = {
+    "L": 1,
+    "LA": 2,
+    "RGB": 3,
+    "BGR": 3,
+    "RGBA": 4,
+    "RGBX": 4,
+    "BGRA": 4,
+    "BGRX": 4,
+    "CMYK": 4,
+}
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+PNG_COLOR_TYPES = {"L": 0, "RGB": 2, "P": 3, "LA": 4, "RGBA": 6}
+PNG_NO_FILTER = b"\x00"
+PNG_UP_FILTER = b"\x02"
+NETPBM_MAGIC_NUMBERS = {"L": b"P5", "RGB": b"P6"}
+STRIP_OUTPUT_EXTENSIONS = (".png", ".ppm", ".pgm", ".pnm")
+
+
+def find_raw_row_layout(image: Image.Image) -> list[tuple[int, int, int, str, int, int]] | None:
+    """Return the file layout of an image whose rows can be read directly.
+
+    Uncompressed formats such as PPM, BMP, and uncompressed TIFF describe
+    their pixels as "raw" tiles. When every tile spans the full image width
+    and uses an 8-bit raw mode, any row can be located by offset alone.
+
+    Args:
+        image: Opened image that has not been loaded yet.
+
+    Returns:
+        One ``(top, bottom, offset, raw_mode, stride, row_step)`` tuple per
+        tile, or None when the rows cannot be read without decoding.
+    """
+    if image.mode == "P" or not image.tile:
+        return None
+
+    raw_row_layout: list[tuple[int, int, int, str, int, int]] = []
+    for tile in image.tile:
+        codec_name, extents, offset, arguments = tile
+        if codec_name != "raw":
+            return None
+        left, top, right, bottom = extents
+        if left != 0 or right != image.width:
+            return None
+
+        if isinstance(arguments, str):
+            arguments = (arguments,)
+        raw_mode = arguments[0]
+        stride = arguments[1] if len(arguments) > 1 else 0
+        row_step = arguments[2] if len(arguments) > 2 else 1
+        if raw_mode not in RAW_ROW_BYTES_PER_PIXEL or row_step not in (1, -1):
+            return None
+        if stride == 0:
+            stride = image.width * RAW_ROW_BYTES_PER_PIXEL[raw_mode]
+        raw_row_layout.append((top, bottom, offset, raw_mode, stride, row_step))
+    return raw_row_layout
+
+
+def read_raw_image_rows(
+    image_file,
+    image_mode: str,
+    image_width: int,
+    raw_row_layout: list[tuple[int, int, int, str, int, int]],
+    top_row: int,
+    bottom_row: int,
+) -> Image.Image:
+    """Read a range of full-width rows straight from an uncompressed file.
+
+    Args:
+        image_file: Binary file object opened on the image file.
+        image_mode: Pillow mode of the image.
+        image_width: Image width in pixels.
+        raw_row_layout: Tile layout returned by ``find_raw_row_layout``.
+        top_row: First row to read.
+        bottom_row: Row after the last row to read.
+
+    Returns:
+        An image holding only the requested rows.
+    """
+    rows_image = None
+    for tile_top, tile_bottom, offset, raw_mode, stride, row_step in raw_row_layout:
+        read_top_row = max(top_row, tile_top)
+        read_bottom_row = min(bottom_row, tile_bottom)
+        if read_top_row >= read_bottom_row:
+            continue
+
+        if row_step == 1:
+            image_file.seek(offset + (read_top_row - tile_top) * stride)
+        else:
+            image_file.seek(offset + (tile_bottom - read_bottom_row) * stride)
+        row_bytes = image_file.read((read_bottom_row - read_top_row) * stride)
+        tile_rows_image = Image.frombytes(
+            image_mode,
+            (image_width, read_bottom_row - read_top_row),
+            row_bytes,
+            "raw",
+            raw_mode,
+            stride,
+            row_step,
+        )
+        if read_top_row == top_row and read_bottom_row == bottom_row:
+            return tile_rows_image
+        if rows_image is None:
+            rows_image = Image.new(image_mode, (image_width, bottom_row - top_row))
+        rows_image.paste(tile_rows_image, (0, read_top_row - top_row))
+    return rows_image
+
+
+@contextmanager
+def open_image_row_reader(
+    input_image_path: str,
+) -> Iterator[tuple[tuple[int, int], Callable[[int, int], Image.Image]]]:
+    """Open an image for reading ranges of full-width rows.
+
+    Args:
+        input_image_path: Path to the input image file.
+
+    Yields:
+        A tuple containing:
+        - The image width and height.
+        - A function that returns the rows from a top row up to, but not
+          including, a bottom row.
+    """
+    with probe_media_source(input_image_path) as media_source:
+        yield media_source.size, create_media_source_row_reader(media_source)
+
+
+def create_media_source_row_reader(
+    media_source: MediaSource,
+) -> Callable[[int, int], Image.Image]:
+    """Return a function that reads full-width row ranges from a probed image.
+
+    Uncompressed formats (PPM, PGM, BMP, and uncompressed TIFF) are read
+    row range by row range from the source's open file handle, so only the
+    requested rows are ever in memory, and ``.npy`` files are already
+    memory-mapped. Compressed formats such as PNG, JPEG, and compressed
+    TIFF cannot be entered mid-stream; they are decoded once, with a
+    warning, and the rows are cropped from the decoded image.
+
+    Args:
+        media_source: Probed still image source. It must stay open while
+            the returned function is used.
+
+    Returns:
+        A function that returns the rows from a top row up to, but not
+        including, a bottom row.
+    """
+    image = media_source.image
+    raw_row_layout = find_raw_row_layout(image)
+    if raw_row_layout is None:
+        if media_source.format != NPY_FORMAT_NAME:
+            warnings.warn(
+                f"{media_source.format or 'This'} input cannot be read band by band, so the whole "
+                "image is decoded into memory first. Only uncompressed PPM, PGM, BMP, and TIFF "
+                "inputs are read band by band.",
+                RuntimeWarning,
+                stacklevel=2,
+            )
+        image.load()
+        return lambda top_row, bottom_row: image.crop((0, top_row, image.width, bottom_row))
+
+    return lambda top_row, bottom_row: read_raw_image_rows(
+        image_file=media_source.input_file,
+        image_mode=image.mode,
+        image_width=image.width,
+        raw_row_layout=raw_row_layout,
+        top_row=top_row,
+        bottom_row=bottom_row,
+    )
+
+
+def iterate_image_band_rows(image_band: Image.Image) -> Iterator[bytes]:
+    """Yield the raw pixel bytes of each row in an image band.
+
+    Args:
+        image_band: Full-width band of output rows.
+
+    Yields:
+        The packed bytes of one row, from top to bottom.
+    """
+    band_bytes = image_band.tobytes()
+    row_byte_count = len(band_bytes) // max(1, image_band.height)
+    for row_start in range(0, len(band_bytes), row_byte_count):
+        yield band_bytes[row_start : row_start + row_byte_count]
+
+
+def build_png_chunk(chunk_type: bytes, chunk_data: bytes) -> bytes:
+    """Return one PNG chunk with its length and checksum.
+
+    Args:
+        chunk_type: Four-byte chunk type such as ``b"IDAT"``.
+        chunk_data: Chunk payload.
+
+    Returns:
+        The encoded chunk.
+    """
+    chunk_checksum = zlib.crc32(chunk_data, zlib.crc32(chunk_type))
+    return struct.pack(">I", len(chunk_data)) + chunk_type + chunk_data + struct.pack(">I", chunk_checksum)
+
+
+def build_png_transparency_chunk_data(image: Image.Image) -> bytes | None:
+    """Return the tRNS payload for an image's transparency, if it has one.
+
+    Args:
+        image: Image whose ``info`` may carry a transparency entry.
+
+    Returns:
+        The tRNS payload, or None when the image has no such entry.
+    """
+    transparency = image.info.get("transparency")
+    if transparency is None:
+        return None
+    if image.mode == "P":
+        if isinstance(transparency, bytes):
+            return transparency
+        return b"\xff" * transparency + b"\x00"
+    if image.mode == "L" and isinstance(transparency, int):
+        return struct.pack(">H", transparency)
+    if image.mode == "RGB" and isinstance(transparency, tuple):
+        return struct.pack(">HHH", *transparency)
+    return None
+
+
+def write_png_image_bands(
+    output_file,
+    image_size: tuple[int, int],
+    image_bands: Iterable[Image.Image],
+    compress_level: int = zlib.Z_DEFAULT_COMPRESSION,
+    compress_type: int = zlib.Z_DEFAULT_STRATEGY,
+) -> None:
+    """Write full-width bands to a PNG file as they arrive.
+
+    Rows are deflated incrementally, so only one band is held at a time.
+    A row that repeats the row above it, as most rows of a pixelated image
+    do, is stored with PNG's "Up" filter so it compresses to almost nothing.
+
+    Args:
+        output_file: Binary file object to write to.
+        image_size: Final image width and height.
+        image_bands: Full-width bands from top to bottom, all in one mode.
+        compress_level: Deflate compression level, as for Pillow's PNG writer.
+        compress_type: Deflate strategy, as for Pillow's PNG writer.
+    """
+    image_band_iterator = iter(image_bands)
+    first_image_band = next(image_band_iterator)
+    if first_image_band.mode not in PNG_COLOR_TYPES:
+        raise ValueError(f"Strip output does not support image mode '{first_image_band.mode}' for PNG.")
+
+    output_file.write(PNG_SIGNATURE)
+    output_file.write(
+        build_png_chunk(
+            b"IHDR",
+            struct.pack(">IIBBBBB", *image_size, 8, PNG_COLOR_TYPES[first_image_band.mode], 0, 0, 0),
+        )
+    )
+    if first_image_band.mode == "P":
+        output_file.write(build_png_chunk(b"PLTE", first_image_band.palette.tobytes()[:768]))
+    transparency_chunk_data = build_png_transparency_chunk_data(first_image_band)
+    if transparency_chunk_data is not None:
+        output_file.write(build_png_chunk(b"tRNS", transparency_chunk_data))
+
+    row_compressor = zlib.compressobj(
+        compress_level, zlib.DEFLATED, zlib.MAX_WBITS, zlib.DEF_MEM_LEVEL, compress_type
+    )
+    previous_row_bytes = None
+    repeated_row_bytes = b""
+    for image_band in chain([first_image_band], image_band_iterator):
+        filtered_rows: list[bytes] = []
+        for row_bytes in iterate_image_band_rows(image_band):
+            if row_bytes == previous_row_bytes:
+                if len(repeated_row_bytes) != len(row_bytes) + 1:
+                    repeated_row_bytes = PNG_UP_FILTER + bytes(len(row_bytes))
+                filtered_rows.append(repeated_row_bytes)
+            else:
+                filtered_rows.append(PNG_NO_FILTER + row_bytes)
+            previous_row_bytes = row_bytes
+        compressed_bytes = row_compressor.compress(b"".join(filtered_rows))
+        del filtered_rows
+        if compressed_bytes:
+            output_file.write(build_png_chunk(b"IDAT", compressed_bytes))
+    output_file.write(build_png_chunk(b"IDAT", row_compressor.flush()))
+    output_file.write(build_png_chunk(b"IEND", b""))
+
+
+def write_netpbm_image_bands(
+    output_file,
+    image_size: tuple[int, int],
+    image_bands: Iterable[Image.Image],
+) -> None:
+    """Write full-width bands to a binary PGM or PPM file as they arrive.
+
+    Args:
+        output_file: Binary file object to write to.
+        image_size: Final image width and height.
+        image_bands: Full-width bands from top to bottom, all in L or RGB mode.
+    """
+    image_band_iterator = iter(image_bands)
+    first_image_band = next(image_band_iterator)
+    if first_image_band.mode not in NETPBM_MAGIC_NUMBERS:
+        raise ValueError(f"Strip output does not support image mode '{first_image_band.mode}' for PPM.")
+
+    width, height = image_size
+    output_file.write(NETPBM_MAGIC_NUMBERS[first_image_band.mode] + f"\n{width} {height}\n255\n".encode())
+    for image_band in chain([first_image_band], image_band_iterator):
+        output_file.write(image_band.tobytes())
+
+
+def pixelate_image_file_in_strips(
+    input_image_path: str,
+    output_image_path: str,
+    block_size: int,
+    sampling_method: str = NEAREST_SAMPLING,
+    band_block_row_count: int | None = None,
+) -> None:
+    """Pixelate an image file band by band and stream the result to disk.
+
+    Args:
+        input_image_path: Source image file path.
+        output_image_path: Destination image file path. It is written as is.
+        block_size: Size of each pixel block in pixels.
+        sampling_method: How each block's color is chosen.
+        band_block_row_count: Optional number of block rows per band.
+    """
+    with probe_media_source(input_image_path) as media_source:
+        pixelate_media_source_in_strips(
+            media_source=media_source,
+            output_image_path=output_image_path,
+            block_size=block_size,
+            sampling_method=sampling_method,
+            band_block_row_count=band_block_row_count,
+        )
+
+
+def pixelate_media_source_in_strips(
+    media_source: MediaSource,
+    output_image_path: str,
+    block_size: int,
+    sampling_method: str = NEAREST_SAMPLING,
+    band_block_row_count: int | None = None,
+    encoder_settings: dict[str, object] | None = None,
+) -> None:
+    """Pixelate a probed still image band by band and stream the result to disk.
+
+    The output matches ``pixelate_image_with_block_size`` on the fully
+    loaded image. Output is written as PNG, or as PGM/PPM for ``.pgm``,
+    ``.ppm``, and ``.pnm`` paths.
+
+    Args:
+        media_source: Probed still image source. It stays open.
+        output_image_path: Destination image file path. It is written as is.
+        block_size: Size of each pixel block in pixels.
+        sampling_method: How each block's color is chosen.
+        band_block_row_count: Optional number of block rows per band.
+        encoder_settings: Optional PNG ``compress_level`` and
+            ``compress_type`` settings. PGM/PPM output ignores them.
+    """
+    output_extension = os.path.splitext(output_image_path)[1].lower()
+    if output_extension not in STRIP_OUTPUT_EXTENSIONS:
+        raise ValueError(
+            f"Strip processing cannot write '{output_extension or output_image_path}' files. "
+            f"Valid options are: {', '.join(STRIP_OUTPUT_EXTENSIONS)}."
+        )
+    write_image_bands = write_netpbm_image_bands
+    if output_extension == ".png":
+        encoder_settings = encoder_settings or {}
+        write_image_bands = partial(
+            write_png_image_bands,
+            compress_level=encoder_settings.get("compress_level", zlib.Z_DEFAULT_COMPRESSION),
+            compress_type=encoder_settings.get("compress_type", zlib.Z_DEFAULT_STRATEGY),
+        )
+
+    output_image_bands = iterate_pixelated_image_bands(
+        read_image_rows=create_media_source_row_reader(media_source),
+        image_size=media_source.size,
+        block_size=block_size,
+        sampling_method=sampling_method,
+        band_block_row_count=band_block_row_count,
+    )
+    try:
+        with open(output_image_path, "wb") as output_file:
+            write_image_bands(output_file, media_source.size, output_image_bands)
+    except BaseException:
+        if os.path.exists(output_image_path):
+            os.remove(output_image_path)
+        raise
@@ -0,0 +1,408 @@
+"""Load, transform, and save one input file.
+
+This module loads Pillow and the transformation pipeline, so the command
+line imports it only once it has a file to transform.
+"""
+
+import os
+from collections.abc import Iterator
+from functools import partial
+
+from PIL import Image
+
+from .encode_profiles import get_encoder_setting_candidates
+from .gif_io import open_media_source_gif_frame_stream
+from .io import (
+    load_media_source_image,
+    save_animated_image_to_path,
+    save_image_to_path,
+)
+from .media_source import MediaSource, probe_media_source
+from .ops.animated_pipeline import (
+    GLOBAL_PALETTE_SAMPLE_FRAME_COUNT,
+    iterate_animated_image_transformation_pipeline,
+    select_palette_sample_frames,
+)
+from .ops.option_values import FRAME_PALETTE_STRATEGY, GLOBAL_PALETTE_STRATEGY, NEAREST_SAMPLING
+from .ops.palette_cache import PaletteCache, get_process_palette_cache
+from .ops.pipeline import calculate_reduced_decode_size, compile_transformation_plan
+from .output_writer import claim_output_image_path, save_output_file
+from .profiling import StageProfiler, measure_pipeline_stage
+from .result_cache import ResultCache, build_result_cache_key, normalize_result_cache_parameters
+from .strip_io import pixelate_media_source_in_strips
+
+
+def transform_image_file(
+    input_image_path: str,
+    output_image_path: str,
+    allow_overwrite: bool,
+    transformation_mode: str,
+    block_size: int | None = None,
+    grid_width: int | None = None,
+    grid_height: int | None = None,
+    color_count: int | None = None,
+    sampling_method: str = NEAREST_SAMPLING,
+    upscale_factor: int | None = None,
+    allow_reduced_decoding: bool = True,
+    job_count: int = 1,
+    palette_strategy: str = FRAME_PALETTE_STRATEGY,
+    use_strip_processing: bool = False,
+    maximum_pixel_count: int | None = None,
+    result_cache: ResultCache | None = None,
+    palette_cache_capacity: int | None = None,
+    encode_profile: str | None = None,
+    stage_profiler: StageProfiler | None = None,
+) -> tuple[str, bool | None]:
+    """Produce one output file, from the result cache when possible.
+
+    On a cache hit the cached output is copied to the destination and the
+    input is never decoded. On a miss the file is transformed as usual and
+    the new output is added to the cache.
+
+    Args:
+        input_image_path: Source image file path.
+        output_image_path: Destination image file path.
+        allow_overwrite: Whether an existing file may be overwritten.
+        transformation_mode: Transformation mode such as "pixel" or "grid".
+        block_size: Pixel block size used for pixel mode.
+        grid_width: Target grid width used for grid mode.
+        grid_height: Target grid height used for grid mode.
+        color_count: Optional number of colors for quantization.
+        sampling_method: Block sampling method used for pixel mode.
+        upscale_factor: Optional whole-number enlargement of the logical image.
+        allow_reduced_decoding: Whether JPEG inputs may be decoded at a
+            reduced size that still covers the final logical grid.
+        job_count: Number of worker processes used for animated GIF frames.
+        palette_strategy: Palette strategy used for animated GIF quantization.
+        use_strip_processing: Whether to pixelate a still image band by band.
+        maximum_pixel_count: Optional largest input width times height to accept.
+        result_cache: Optional cache of earlier outputs.
+        palette_cache_capacity: Optional capacity of this process's palette cache.
+        encode_profile: Optional encode profile that trades encoding time
+            against output size.
+        stage_profiler: Optional profiler that records the duration of each
+            stage. It does not change the output, so it is not part of the
+            result cache key.
+
+    Returns:
+        A tuple containing:
+        - The path the output was written to, which is numbered when the
+          requested path already exists and overwriting is disabled.
+        - Whether the output came from the result cache, or None when no
+          result cache was given.
+    """
+    transformation_options = {
+        "transformation_mode": transformation_mode,
+        "block_size": block_size,
+        "grid_width": grid_width,
+        "grid_height": grid_height,
+        "color_count": color_count,
+        "sampling_method": sampling_method,
+        "upscale_factor": upscale_factor,
+        "allow_reduced_decoding": allow_reduced_decoding,
+        "palette_strategy": palette_strategy,
+        "use_strip_processing": use_strip_processing,
+        "palette_cache_capacity": palette_cache_capacity,
+        "encode_profile": encode_profile,
+    }
+    if result_cache is None:
+        output_image_path = write_transformed_image_file(
+            input_image_path=input_image_path,
+            output_image_path=output_image_path,
+            allow_overwrite=allow_overwrite,
+            job_count=job_count,
+            maximum_pixel_count=maximum_pixel_count,
+            stage_profiler=stage_profiler,
+            **transformation_options,
+        )
+        return output_image_path, None
+
+    cache_key = build_result_cache_key(
+        input_image_path,
+        normalize_result_cache_parameters(
+            output_extension=os.path.splitext(output_image_path)[1],
+            **transformation_options,
+        ),
+    )
+    with claim_output_image_path(output_image_path, allow_overwrite) as output_image_path:
+        with measure_pipeline_stage(stage_profiler, "cache_lookup"):
+            cache_hit = result_cache.copy_cached_output(cache_key, output_image_path)
+        if cache_hit:
+            return output_image_path, True
+
+        write_transformed_image_file(
+            input_image_path=input_image_path,
+            output_image_path=output_image_path,
+            allow_overwrite=True,
+            job_count=job_count,
+            maximum_pixel_count=maximum_pixel_count,
+            stage_profiler=stage_profiler,
+            **transformation_options,
+        )
+    with measure_pipeline_stage(stage_profiler, "cache_store"):
+        result_cache.store_output(cache_key, output_image_path)
+    return output_image_path, False
+
+
+def write_transformed_image_file(
+    input_image_path: str,
+    output_image_path: str,
+    allow_overwrite: bool,
+    transformation_mode: str,
+    block_size: int | None = None,
+    grid_width: int | None = None,
+    grid_height: int | None = None,
+    color_count: int | None = None,
+    sampling_method: str = NEAREST_SAMPLING,
+    upscale_factor: int | None = None,
+    allow_reduced_decoding: bool = True,
+    job_count: int = 1,
+    palette_strategy: str = FRAME_PALETTE_STRATEGY,
+    use_strip_processing: bool = False,
+    maximum_pixel_count: int | None = None,
+    palette_cache_capacity: int | None = None,
+    encode_profile: str | None = None,
+    stage_profiler: StageProfiler | None = None,
+) -> str:
+    """Load, transform, and save one still image or animated GIF file.
+
+    This always decodes and transforms; ``transform_image_file`` adds the
+    result cache in front of it.
+
+    Args:
+        input_image_path: Source image file path.
+        output_image_path: Destination image file path.
+        allow_overwrite: Whether an existing file may be overwritten.
+        transformation_mode: Transformation mode such as "pixel" or "grid".
+        block_size: Pixel block size used for pixel mode.
+        grid_width: Target grid width used for grid mode.
+        grid_height: Target grid height used for grid mode.
+        color_count: Optional number of colors for quantization.
+        sampling_method: Block sampling method used for pixel mode.
+        upscale_factor: Optional whole-number enlargement of the logical image.
+            When given, the pipeline keeps the small image and the enlargement
+            happens only when saving.
+        allow_reduced_decoding: Whether JPEG inputs may be decoded at a
+            reduced size that still covers the final logical grid.
+        job_count: Number of worker processes used for animated GIF frames.
+        palette_strategy: Palette strategy used for animated GIF quantization.
+        use_strip_processing: Whether to pixelate a still image band by band
+            and stream the output rows to disk.
+        maximum_pixel_count: Optional largest input width times height to
+            accept. Defaults to Pillow's decompression bomb limit.
+        palette_cache_capacity: Optional capacity of this process's palette
+            cache, which quantization uses to reuse palettes of similar images.
+        encode_profile: Optional encode profile name. None keeps the
+            encoders' defaults.
+        stage_profiler: Optional profiler that records the "probe", "decode",
+            transformation, and "encode" stages. Animated GIF frames are
+            decoded, transformed, and encoded as one stream, so their decoding
+            and encoding are recorded together as one "animated" stage.
+
+    Returns:
+        The path the output was written to.
+    """
+    keep_logical_resolution = upscale_factor is not None
+    save_upscale_factor = upscale_factor or 1
+    palette_cache = None
+    if palette_cache_capacity is not None:
+        palette_cache = get_process_palette_cache(palette_cache_capacity)
+
+    with measure_pipeline_stage(stage_profiler, "probe"):
+        probed_media_source = probe_media_source(input_image_path, maximum_pixel_count)
+    with probed_media_source as media_source:
+        if use_strip_processing:
+            if media_source.is_animated_gif:
+                raise ValueError("Strip processing does not support animated GIF files.")
+            encoder_setting_candidates = get_encoder_setting_candidates(
+                os.path.splitext(output_image_path)[1], encode_profile
+            )
+            with measure_pipeline_stage(stage_profiler, "strips"):
+                return save_output_file(
+                    output_image_path,
+                    allow_overwrite,
+                    lambda temporary_output_image_path: pixelate_media_source_in_strips(
+                        media_source=media_source,
+                        output_image_path=temporary_output_image_path,
+                        block_size=block_size,
+                        sampling_method=sampling_method,
+                        encoder_settings=next(iter(encoder_setting_candidates), None),
+                    ),
+                )
+
+        if media_source.is_animated_gif:
+            transformed_frame_stream, metadata = open_transformed_frame_stream(
+                media_source=media_source,
+                transformation_mode=transformation_mode,
+                block_size=block_size,
+                grid_width=grid_width,
+                grid_height=grid_height,
+                color_count=color_count,
+                sampling_method=sampling_method,
+                keep_logical_resolution=keep_logical_resolution,
+                job_count=job_count,
+                palette_strategy=palette_strategy,
+                palette_cache=palette_cache,
+                stage_profiler=stage_profiler,
+            )
+            with measure_pipeline_stage(stage_profiler, "animated"):
+                return save_animated_image_to_path(
+                    frames=transformed_frame_stream,
+                    output_image_path=output_image_path,
+                    allow_overwrite=allow_overwrite,
+                    metadata=metadata,
+                    upscale_factor=save_upscale_factor,
+                    encode_profile=encode_profile,
+                )
+
+        output_image = transform_media_source_image(
+            media_source=media_source,
+            transformation_mode=transformation_mode,
+            block_size=block_size,
+            grid_width=grid_width,
+            grid_height=grid_height,
+            color_count=color_count,
+            sampling_method=sampling_method,
+            keep_logical_resolution=keep_logical_resolution,
+            allow_reduced_decoding=allow_reduced_decoding,
+            palette_cache=palette_cache,
+            stage_profiler=stage_profiler,
+        )
+
+    with measure_pipeline_stage(stage_profiler, "encode", output_image):
+        return save_image_to_path(
+            image=output_image,
+            output_image_path=output_image_path,
+            allow_overwrite=allow_overwrite,
+            upscale_factor=save_upscale_factor,
+            encode_profile=encode_profile,
+        )
+
+
+def open_transformed_frame_stream(
+    media_source: MediaSource,
+    transformation_mode: str,
+    block_size: int | None = None,
+    grid_width: int | None = None,
+    grid_height: int | None = None,
+    color_count: int | None = None,
+    sampling_method: str = NEAREST_SAMPLING,
+    keep_logical_resolution: bool = False,
+    job_count: int = 1,
+    palette_strategy: str = FRAME_PALETTE_STRATEGY,
+    palette_cache: PaletteCache | None = None,
+    stage_profiler: StageProfiler | None = None,
+) -> tuple[Iterator[Image.Image], dict[str, object]]:
+    """Return a lazy stream of an animated GIF's transformed frames.
+
+    With the global palette strategy, frames spread across the whole GIF
+    are decoded in a first pass to build the palette, using the frame count
+    from the probe, before the frames are streamed.
+
+    Args:
+        media_source: Probed animated GIF source. It must stay open until
+            the stream is exhausted.
+        transformation_mode: Transformation mode such as "pixel" or "grid".
+        block_size: Pixel block size used for pixel mode.
+        grid_width: Target grid width used for grid mode.
+        grid_height: Target grid height used for grid mode.
+        color_count: Optional number of colors for quantization.
+        sampling_method: Block sampling method used for pixel mode.
+        keep_logical_resolution: Whether pixel mode keeps one pixel per block.
+        job_count: Number of worker processes used for the frames.
+        palette_strategy: Palette strategy used for quantization.
+        palette_cache: Optional cache of palettes built for similar frames.
+        stage_profiler: Optional profiler that records each frame's stages.
+
+    Returns:
+        A tuple containing:
+        - An iterator over transformed frames, in order.
+        - The GIF metadata, whose frame durations fill in as frames are read.
+    """
+    frame_stream, metadata = open_media_source_gif_frame_stream(media_source)
+    palette_sample_frames = None
+    if (
+        palette_strategy == GLOBAL_PALETTE_STRATEGY
+        and media_source.frame_count > GLOBAL_PALETTE_SAMPLE_FRAME_COUNT
+    ):
+        sample_frame_stream, _ = open_media_source_gif_frame_stream(media_source)
+        palette_sample_frames = select_palette_sample_frames(sample_frame_stream, media_source.frame_count)
+    transformed_frame_stream = iterate_animated_image_transformation_pipeline(
+        frames=frame_stream,
+        transformation_mode=transformation_mode,
+        block_size=block_size,
+        grid_width=grid_width,
+        grid_height=grid_height,
+        color_count=color_count,
+        sampling_method=sampling_method,
+        keep_logical_resolution=keep_logical_resolution,
+        job_count=job_count,
+        palette_strategy=palette_strategy,
+        palette_cache=palette_cache,
+        stage_profiler=stage_profiler,
+        palette_sample_frames=palette_sample_frames,
+    )
+    return transformed_frame_stream, metadata
+
+
+def transform_media_source_image(
+    media_source: MediaSource,
+    transformation_mode: str,
+    block_size: int | None = None,
+    grid_width: int | None = None,
+    grid_height: int | None = None,
+    color_count: int | None = None,
+    sampling_method: str = NEAREST_SAMPLING,
+    keep_logical_resolution: bool = False,
+    allow_reduced_decoding: bool = True,
+    palette_cache: PaletteCache | None = None,
+    stage_profiler: StageProfiler | None = None,
+) -> Image.Image:
+    """Decode a still image source and run it through the transformation plan.
+
+    Args:
+        media_source: Probed still image source.
+        transformation_mode: Transformation mode such as "pixel" or "grid".
+        block_size: Pixel block size used for pixel mode.
+        grid_width: Target grid width used for grid mode.
+        grid_height: Target grid height used for grid mode.
+        color_count: Optional number of colors for quantization.
+        sampling_method: Block sampling method used for pixel mode.
+        keep_logical_resolution: Whether pixel mode keeps one pixel per block.
+        allow_reduced_decoding: Whether JPEG inputs may be decoded at a
+            reduced size that still covers the final logical grid.
+        palette_cache: Optional cache of palettes built for similar images.
+        stage_profiler: Optional profiler that records the "decode" and
+            transformation stages.
+
+    Returns:
+        The transformed image, before any save-time enlargement.
+    """
+    select_decode_size = None
+    if allow_reduced_decoding:
+        select_decode_size = partial(
+            calculate_reduced_decode_size,
+            transformation_mode=transformation_mode,
+            block_size=block_size,
+            grid_width=grid_width,
+            grid_height=grid_height,
+            sampling_method=sampling_method,
+            keep_logical_resolution=keep_logical_resolution,
+        )
+    with measure_pipeline_stage(stage_profiler, "decode") as stage_measurement:
+        image, decode_scale = load_media_source_image(media_source, select_decode_size)
+        stage_measurement.record_output(image)
+
+    if block_size is not None:
+        block_size = block_size // decode_scale
+
+    transformation_plan = compile_transformation_plan(
+        transformation_mode=transformation_mode,
+        block_size=block_size,
+        grid_width=grid_width,
+        grid_height=grid_height,
+        color_count=color_count,
+        sampling_method=sampling_method,
+        keep_logical_resolution=keep_logical_resolution,
+    )
+    return transformation_plan.apply(image, palette_cache, stage_profiler)
@@ -0,0 +1,28 @@
+"""Synthetic input images shared by the test modules."""
+
+from PIL import Image
+
+
+def create_gradient_image(width: int, height: int, mode: str = "RGB") -> Image.Image:
+    """Return a gradient with many colors and a transparent pixel in every five."""
+    gradient_image = Image.new("RGBA", (width, height))
+    for x_coordinate in range(width):
+        for y_coordinate in range(height):
+            gradient_image.putpixel(
+                (x_coordinate, y_coordinate),
+                (
+                    x_coordinate * 255 // width,
+                    y_coordinate * 255 // height,
+                    (x_coordinate * y_coordinate) % 256,
+                    255 if (x_coordinate + y_coordinate) % 5 else 0,
+                ),
+            )
+    return gradient_image.convert(mode)
+
+
+def create_noise_image(width: int, height: int) -> Image.Image:
+    """Return an RGB image of Gaussian noise, which compresses poorly."""
+    return Image.merge(
+        "RGB",
+        [Image.effect_noise((width, height), sigma).convert("L") for sigma in (40, 80, 120)],
+    )
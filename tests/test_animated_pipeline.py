@@ -10,7 +10,12 @@ SOURCE_DIRECTORY = PROJECT_ROOT_DIRECTORY / "src"
 if str(SOURCE_DIRECTORY) not in sys.path:
     sys.path.insert(0, str(SOURCE_DIRECTORY))
 
-from pixelling.ops.animated_pipeline import run_animated_image_transformation_pipeline
+from pixelling.ops.animated_pipeline import (
+    are_frames_identical,
+    iterate_animated_image_transformation_pipeline,
+    run_animated_image_transformation_pipeline,
+)
+from pixelling.ops.pipeline import TransformationPlan, compile_transformation_plan
 
 
 class AnimatedPipelineOperationTests(unittest.TestCase):
@@ -28,10 +33,12 @@ class AnimatedPipelineOperationTests(unittest.TestCase):
         first_output_frame = Image.new("RGB", (8, 8), color=(100, 110, 120))
         second_output_frame = Image.new("RGB", (8, 8), color=(120, 110, 100))
 
-        with patch(
-            "pixelling.ops.animated_pipeline.run_image_transformation_pipeline",
+        with patch.object(
+            TransformationPlan,
+            "apply",
+            autospec=True,
             side_effect=[first_output_frame, second_output_frame],
-        ) as pipeline_mock:
+        ) as apply_mock:
             transformed_frames = run_animated_image_transformation_pipeline(
                 frames=[first_input_frame, second_input_frame],
                 transformation_mode="pixel",
@@ -39,24 +46,166 @@ class AnimatedPipelineOperationTests(unittest.TestCase):
             )
 
         self.assertEqual(transformed_frames, [first_output_frame, second_output_frame])
+        self.assertEqual(apply_mock.call_count, 2)
+        expected_plan = compile_transformation_plan(transformation_mode="pixel", block_size=2)
+        apply_mock.assert_any_call(expected_plan, first_input_frame, None, None)
+        apply_mock.assert_any_call(expected_plan, second_input_frame, None, None)
+
+    def test_iterate_animated_pipeline_transforms_frames_only_when_requested(self) -> None:
+        input_frames = [
+            Image.new("RGB", (8, 8), color=(10, 20, 30)),
+            Image.new("RGB", (8, 8), color=(30, 20, 10)),
+        ]
+
+        with patch.object(
+            TransformationPlan,
+            "apply",
+            autospec=True,
+            side_effect=lambda transformation_plan, image, *_: image,
+        ) as pipeline_mock:
+            transformed_frame_stream = iterate_animated_image_transformation_pipeline(
+                frames=iter(input_frames),
+                transformation_mode="pixel",
+                block_size=2,
+            )
+            self.assertEqual(pipeline_mock.call_count, 0)
+
+            self.assertIs(next(transformed_frame_stream), input_frames[0])
+            self.assertEqual(pipeline_mock.call_count, 1)
+            self.assertEqual(list(transformed_frame_stream), [input_frames[1]])
+
+    def test_iterate_animated_pipeline_transforms_repeated_frames_once(self) -> None:
+        first_input_frame = Image.new("RGB", (8, 8), color=(10, 20, 30))
+        second_input_frame = Image.new("RGB", (8, 8), color=(30, 20, 10))
+        input_frames = [
+            first_input_frame,
+            first_input_frame.copy(),
+            first_input_frame.copy(),
+            second_input_frame,
+            second_input_frame.copy(),
+        ]
+
+        with patch.object(
+            TransformationPlan,
+            "apply",
+            autospec=True,
+            side_effect=lambda transformation_plan, image, *_: image.copy(),
+        ) as pipeline_mock:
+            transformed_frames = list(
+                iterate_animated_image_transformation_pipeline(
+                    frames=iter(input_frames),
+                    transformation_mode="pixel",
+                    block_size=2,
+                )
+            )
+
         self.assertEqual(pipeline_mock.call_count, 2)
-        pipeline_mock.assert_any_call(
-            image=first_input_frame,
+        self.assertEqual(len(transformed_frames), 5)
+        self.assertIs(transformed_frames[0], transformed_frames[2])
+        self.assertIs(transformed_frames[3], transformed_frames[4])
+        self.assertEqual(transformed_frames[3].tobytes(), second_input_frame.tobytes())
+
+    def test_frames_differing_in_one_pixel_between_probes_are_not_identical(self) -> None:
+        first_frame = Image.new("RGB", (16, 16), color=(10, 20, 30))
+        second_frame = first_frame.copy()
+        second_frame.putpixel((0, 0), (10, 20, 31))
+
+        self.assertTrue(are_frames_identical(first_frame, first_frame.copy()))
+        self.assertFalse(are_frames_identical(first_frame, second_frame))
+        self.assertFalse(are_frames_identical(first_frame, first_frame.convert("RGBA")))
+
+    def test_animated_pipeline_with_worker_processes_keeps_repeated_frames_in_order(self) -> None:
+        red_frame = Image.new("RGB", (8, 8), color=(200, 10, 10))
+        blue_frame = Image.new("RGB", (8, 8), color=(10, 10, 200))
+        input_frames = [red_frame, red_frame.copy(), blue_frame, red_frame.copy(), red_frame.copy()]
+
+        transformed_frames = run_animated_image_transformation_pipeline(
+            frames=input_frames,
             transformation_mode="pixel",
             block_size=2,
-            grid_width=None,
-            grid_height=None,
-            color_count=None,
+            job_count=2,
         )
-        pipeline_mock.assert_any_call(
-            image=second_input_frame,
+
+        self.assertEqual(
+            [frame.getpixel((0, 0)) for frame in transformed_frames],
+            [(200, 10, 10), (200, 10, 10), (10, 10, 200), (200, 10, 10), (200, 10, 10)],
+        )
+
+    def test_iterate_animated_pipeline_rejects_empty_frame_stream(self) -> None:
+        with self.assertRaises(ValueError):
+            list(
+                iterate_animated_image_transformation_pipeline(
+                    frames=iter([]),
+                    transformation_mode="pixel",
+                    block_size=2,
+                )
+            )
+
+    def test_animated_pipeline_with_worker_processes_matches_serial_output_in_order(self) -> None:
+        input_frames = []
+        for frame_index in range(5):
+            input_frame = Image.new("RGBA", (12, 8), color=(frame_index * 40, 20, 30, 255))
+            input_frame.putpixel((frame_index, 1), (255, 255, 255, 128))
+            input_frames.append(input_frame)
+
+        serial_frames = run_animated_image_transformation_pipeline(
+            frames=input_frames,
+            transformation_mode="pixel",
+            block_size=2,
+            color_count=4,
+        )
+        parallel_frames = run_animated_image_transformation_pipeline(
+            frames=input_frames,
+            transformation_mode="pixel",
+            block_size=2,
+            color_count=4,
+            job_count=2,
+        )
+
+        self.assertEqual(
+            [(frame.mode, frame.size, frame.tobytes()) for frame in parallel_frames],
+            [(frame.mode, frame.size, frame.tobytes()) for frame in serial_frames],
+        )
+
+    def test_animated_pipeline_rejects_non_positive_job_count(self) -> None:
+        with self.assertRaises(ValueError):
+            run_animated_image_transformation_pipeline(
+                frames=[Image.new("RGB", (8, 8))],
+                transformation_mode="pixel",
+                block_size=2,
+                job_count=0,
+            )
+
+    def test_animated_pipeline_global_palette_shares_one_palette_across_frames(self) -> None:
+        input_frames = [
+            Image.new("RGBA", (8, 8), color=(frame_index * 50, 100, 200 - frame_index * 40, 255))
+            for frame_index in range(4)
+        ]
+
+        transformed_frames = run_animated_image_transformation_pipeline(
+            frames=input_frames,
             transformation_mode="pixel",
             block_size=2,
-            grid_width=None,
-            grid_height=None,
-            color_count=None,
+            color_count=3,
+            palette_strategy="global",
         )
 
+        self.assertTrue(all(frame.mode == "P" for frame in transformed_frames))
+        self.assertEqual(len({tuple(frame.getpalette()) for frame in transformed_frames}), 1)
+        used_colors = set()
+        for frame in transformed_frames:
+            used_colors.update(color for _, color in frame.convert("RGB").getcolors())
+        self.assertLessEqual(len(used_colors), 3)
+
+    def test_animated_pipeline_rejects_unknown_palette_strategy(self) -> None:
+        with self.assertRaises(ValueError):
+            run_animated_image_transformation_pipeline(
+                frames=[Image.new("RGB", (8, 8))],
+                transformation_mode="pixel",
+                block_size=2,
+                palette_strategy="unknown",
+            )
+
 
 if __name__ == "__main__":
     unittest.main()
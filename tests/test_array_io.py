@@ -0,0 +1,183 @@
+import importlib.util
+import struct
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from PIL import Image
+
+PROJECT_ROOT_DIRECTORY = Path(__file__).resolve().parents[1]
+SOURCE_DIRECTORY = PROJECT_ROOT_DIRECTORY / "src"
+if str(SOURCE_DIRECTORY) not in sys.path:
+    sys.path.insert(0, str(SOURCE_DIRECTORY))
+
+from pixelling.array_io import NPY_HEADER_ALIGNMENT, RawImageLayout, build_npy_header
+from pixelling.cli import run_command_line_interface
+from pixelling.io import load_image_from_path, save_image_to_path
+from pixelling.media_source import probe_media_source
+from sample_images import create_gradient_image
+
+
+class ArrayInputOutputTests(unittest.TestCase):
+    def test_npy_round_trip_keeps_mode_size_and_pixels(self) -> None:
+        with tempfile.TemporaryDirectory() as temporary_directory_path:
+            for mode in ("L", "LA", "RGB", "RGBA"):
+                input_image = create_gradient_image(12, 8, mode)
+                array_path = Path(temporary_directory_path) / f"{mode}.npy"
+
+                save_image_to_path(input_image, str(array_path), allow_overwrite=True)
+                loaded_image = load_image_from_path(str(array_path))
+
+                with self.subTest(mode=mode):
+                    self.assertEqual(loaded_image.mode, mode)
+                    self.assertEqual(loaded_image.size, input_image.size)
+                    self.assertEqual(loaded_image.tobytes(), input_image.tobytes())
+                    array_file_bytes = array_path.read_bytes()
+                    self.assertEqual(array_file_bytes[:6], b"\x93NUMPY")
+                    header_byte_count = len(array_file_bytes) - len(input_image.tobytes())
+                    self.assertEqual(header_byte_count % NPY_HEADER_ALIGNMENT, 0)
+
+    def test_mapped_rgba_npy_input_is_read_only(self) -> None:
+        with tempfile.TemporaryDirectory() as temporary_directory_path:
+            array_path = Path(temporary_directory_path) / "input.npy"
+            save_image_to_path(
+                create_gradient_image(12, 8, "RGBA"), str(array_path), allow_overwrite=True
+            )
+
+            loaded_image = load_image_from_path(str(array_path))
+
+            self.assertTrue(loaded_image.readonly)
+
+    def test_raw_input_requires_layout_and_matching_size(self) -> None:
+        input_image = create_gradient_image(12, 8, "RGB")
+
+        with tempfile.TemporaryDirectory() as temporary_directory_path:
+            raw_path = Path(temporary_directory_path) / "input.raw"
+            save_image_to_path(input_image, str(raw_path), allow_overwrite=True)
+
+            self.assertEqual(raw_path.read_bytes(), input_image.tobytes())
+            loaded_image = load_image_from_path(str(raw_path), RawImageLayout(12, 8, "RGB"))
+            self.assertEqual(loaded_image.tobytes(), input_image.tobytes())
+            with self.assertRaises(ValueError):
+                load_image_from_path(str(raw_path))
+            with self.assertRaises(ValueError):
+                load_image_from_path(str(raw_path), RawImageLayout(12, 9, "RGB"))
+            with self.assertRaises(ValueError):
+                RawImageLayout(12, 8, "CMYK")
+
+    def test_palette_output_is_saved_as_rgb_or_rgba(self) -> None:
+        with tempfile.TemporaryDirectory() as temporary_directory_path:
+            opaque_path = Path(temporary_directory_path) / "opaque.npy"
+            transparent_path = Path(temporary_directory_path) / "transparent.npy"
+            for mode, array_path in (("RGB", opaque_path), ("RGBA", transparent_path)):
+                palette_image = create_gradient_image(12, 8, mode).quantize(4)
+                save_image_to_path(palette_image, str(array_path), allow_overwrite=True)
+
+            self.assertEqual(load_image_from_path(str(opaque_path)).mode, "RGB")
+            self.assertEqual(load_image_from_path(str(transparent_path)).mode, "RGBA")
+
+    def test_npy_header_is_rejected_before_mapping_oversized_arrays(self) -> None:
+        with tempfile.TemporaryDirectory() as temporary_directory_path:
+            array_path = Path(temporary_directory_path) / "huge.npy"
+            array_path.write_bytes(build_npy_header((100000, 100000), "RGB"))
+
+            with self.assertRaisesRegex(ValueError, "exceeds the limit"):
+                probe_media_source(str(array_path), maximum_pixel_count=1000)
+
+    def test_command_line_interface_pixelates_npy_input_into_npy_output(self) -> None:
+        input_image = create_gradient_image(16, 16)
+
+        with tempfile.TemporaryDirectory() as temporary_directory_path:
+            input_path = Path(temporary_directory_path) / "input.npy"
+            output_path = Path(temporary_directory_path) / "output.npy"
+            png_input_path = Path(temporary_directory_path) / "input.png"
+            expected_path = Path(temporary_directory_path) / "expected.png"
+            save_image_to_path(input_image, str(input_path), allow_overwrite=True)
+            input_image.save(png_input_path)
+
+            for input_file_path, output_file_path in ((input_path, output_path), (png_input_path, expected_path)):
+                exit_code = run_command_line_interface(
+                    [
+                        str(input_file_path),
+                        "--mode",
+                        "pixel",
+                        "--block-size",
+                        "4",
+                        "-o",
+                        str(output_file_path),
+                    ]
+                )
+                self.assertEqual(exit_code, 0)
+
+            with Image.open(expected_path) as expected_image:
+                self.assertEqual(load_image_from_path(str(output_path)).tobytes(), expected_image.tobytes())
+
+    def test_sixteen_bit_gray_input_keeps_its_values_through_block_sampling(self) -> None:
+        gray_values = [
+            (row_index * 64 + column_index) * 20 for row_index in range(8) for column_index in range(8)
+        ]
+        input_image = Image.frombytes("I;16", (8, 8), struct.pack("<64H", *gray_values))
+        sampling_methods = ["mean"]
+        if importlib.util.find_spec("numpy"):
+            sampling_methods += ["median", "mode"]
+
+        with tempfile.TemporaryDirectory() as temporary_directory_path:
+            input_path = Path(temporary_directory_path) / "gray.npy"
+            save_image_to_path(input_image, str(input_path), allow_overwrite=True)
+            for sampling_method in sampling_methods:
+                output_path = Path(temporary_directory_path) / f"{sampling_method}.npy"
+                exit_code = run_command_line_interface(
+                    [
+                        str(input_path),
+                        "--mode",
+                        "pixel",
+                        "--block-size",
+                        "4",
+                        "--sampling",
+                        sampling_method,
+                        "--upscale",
+                        "1",
+                        "-o",
+                        str(output_path),
+                    ]
+                )
+
+                output_image = load_image_from_path(str(output_path))
+                with self.subTest(sampling_method=sampling_method):
+                    self.assertEqual(exit_code, 0)
+                    self.assertEqual(output_image.mode, "I;16")
+                    expected_values = {"mean": (1950, 2030), "median": (1950, 2030), "mode": (0, 80)}
+                    self.assertEqual(
+                        (output_image.getpixel((0, 0)), output_image.getpixel((1, 0))),
+                        expected_values[sampling_method],
+                    )
+            with self.assertRaisesRegex(ValueError, "I;16"):
+                run_command_line_interface(
+                    [str(input_path), "--mode", "pixel", "--block-size", "4", "--color-count", "8"]
+                )
+
+    @unittest.skipUnless(importlib.util.find_spec("numpy"), "NumPy is not installed.")
+    def test_npy_files_are_interchangeable_with_numpy(self) -> None:
+        import numpy
+
+        with tempfile.TemporaryDirectory() as temporary_directory_path:
+            numpy_path = Path(temporary_directory_path) / "numpy.npy"
+            pixelling_path = Path(temporary_directory_path) / "pixelling.npy"
+            pixel_array = numpy.arange(8 * 12 * 3, dtype=numpy.uint8).reshape(8, 12, 3)
+            numpy.save(numpy_path, pixel_array)
+            gray_array = numpy.arange(8 * 12, dtype="<u2").reshape(8, 12) * 500
+            numpy.save(Path(temporary_directory_path) / "gray.npy", gray_array)
+
+            loaded_image = load_image_from_path(str(numpy_path))
+            save_image_to_path(loaded_image, str(pixelling_path), allow_overwrite=True)
+
+            self.assertTrue(numpy.array_equal(numpy.asarray(loaded_image), pixel_array))
+            self.assertTrue(numpy.array_equal(numpy.load(pixelling_path, mmap_mode="r"), pixel_array))
+            gray_image = load_image_from_path(str(Path(temporary_directory_path) / "gray.npy"))
+            self.assertEqual(gray_image.mode, "I;16")
+            self.assertTrue(numpy.array_equal(numpy.asarray(gray_image), gray_array))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,188 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from PIL import Image
+
+PROJECT_ROOT_DIRECTORY = Path(__file__).resolve().parents[1]
+SOURCE_DIRECTORY = PROJECT_ROOT_DIRECTORY / "src"
+if str(SOURCE_DIRECTORY) not in sys.path:
+    sys.path.insert(0, str(SOURCE_DIRECTORY))
+
+from pixelling.batch import (
+    BatchImageResult,
+    collect_batch_input_image_paths,
+    format_batch_result_summary,
+    is_batch_input_path,
+    run_batch_image_transformation,
+)
+from pixelling.cli import run_command_line_interface
+from pixelling.transform import transform_image_file
+
+
+class BatchOperationTests(unittest.TestCase):
+    def test_is_batch_input_path_detects_directories_and_glob_patterns(self) -> None:
+        with tempfile.TemporaryDirectory() as temporary_directory_path:
+            self.assertTrue(is_batch_input_path(temporary_directory_path))
+            self.assertTrue(is_batch_input_path(str(Path(temporary_directory_path) / "*.png")))
+            self.assertFalse(is_batch_input_path(str(Path(temporary_directory_path) / "a.png")))
+            literal_image_path = Path(temporary_directory_path) / "photo[1].png"
+            Image.new("RGB", (4, 4)).save(literal_image_path)
+            self.assertFalse(is_batch_input_path(str(literal_image_path)))
+
+    def test_collect_batch_input_image_paths_skips_non_images_and_previous_outputs(self) -> None:
+        with tempfile.TemporaryDirectory() as temporary_directory_path:
+            directory = Path(temporary_directory_path)
+            Image.new("RGB", (4, 4)).save(directory / "b.png")
+            Image.new("RGB", (4, 4)).save(directory / "a.jpg")
+            Image.new("RGB", (4, 4)).save(directory / "a_pixelling.png")
+            Image.new("RGB", (4, 4)).save(directory / "b_pixelling_2.png")
+            (directory / "notes.txt").write_text("not an image")
+
+            input_image_paths = collect_batch_input_image_paths(temporary_directory_path)
+            glob_input_image_paths = collect_batch_input_image_paths(str(directory / "*.png"))
+            output_glob_image_paths = collect_batch_input_image_paths(str(directory / "*_pixelling*.png"))
+
+            self.assertEqual(
+                input_image_paths,
+                [str(directory / "a.jpg"), str(directory / "b.png")],
+            )
+            self.assertEqual(glob_input_image_paths, [str(directory / "b.png")])
+            self.assertEqual(
+                output_glob_image_paths,
+                [str(directory / "a_pixelling.png"), str(directory / "b_pixelling_2.png")],
+            )
+
+    def test_run_batch_image_transformation_reports_failures_in_input_order(self) -> None:
+        with tempfile.TemporaryDirectory() as temporary_directory_path:
+            directory = Path(temporary_directory_path)
+            Image.new("RGB", (8, 8), color=(10, 20, 30)).save(directory / "good.png")
+            (directory / "broken.png").write_bytes(b"not an image")
+
+            batch_results = run_batch_image_transformation(
+                transform_image_file=transform_image_file,
+                input_and_output_image_paths=[
+                    (str(directory / "good.png"), str(directory / "good_out.png")),
+                    (str(directory / "broken.png"), str(directory / "broken_out.png")),
+                ],
+                transformation_options={
+                    "allow_overwrite": False,
+                    "transformation_mode": "pixel",
+                    "block_size": 2,
+                },
+                job_count=2,
+            )
+
+            self.assertEqual([result.succeeded for result in batch_results], [True, False])
+            self.assertTrue((directory / "good_out.png").exists())
+            self.assertIn("1 succeeded, 1 failed", format_batch_result_summary(batch_results))
+
+    def test_batch_results_report_the_numbered_path_they_wrote(self) -> None:
+        with tempfile.TemporaryDirectory() as temporary_directory_path:
+            directory = Path(temporary_directory_path)
+            Image.new("RGB", (8, 8), color=(10, 20, 30)).save(directory / "input.png")
+            (directory / "output.png").write_bytes(b"existing output")
+
+            batch_results = run_batch_image_transformation(
+                transform_image_file=transform_image_file,
+                input_and_output_image_paths=[
+                    (str(directory / "input.png"), str(directory / "output.png"))
+                ],
+                transformation_options={
+                    "allow_overwrite": False,
+                    "transformation_mode": "pixel",
+                    "block_size": 2,
+                },
+            )
+
+            self.assertEqual(batch_results[0].output_image_path, str(directory / "output_1.png"))
+            self.assertIn(
+                f"-> {directory / 'output_1.png'}", format_batch_result_summary(batch_results)
+            )
+            self.assertEqual((directory / "output.png").read_bytes(), b"existing output")
+
+    def test_batch_summary_counts_result_cache_hits(self) -> None:
+        batch_results = [
+            BatchImageResult("a.png", "a_out.png", succeeded=True, cache_hit=True),
+            BatchImageResult("b.png", "b_out.png", succeeded=True, cache_hit=False),
+            BatchImageResult("c.png", "c_out.png", succeeded=True, cache_hit=True),
+        ]
+
+        self.assertIn("Result cache: 2 hits, 1 misses.", format_batch_result_summary(batch_results))
+
+    def test_batch_summary_sums_palette_cache_lookups_across_jobs(self) -> None:
+        with tempfile.TemporaryDirectory() as temporary_directory_path:
+            directory = Path(temporary_directory_path)
+            input_and_output_image_paths = []
+            for image_index in range(3):
+                input_image_path = directory / f"{image_index}.png"
+                Image.new("RGB", (8, 8), color=(10, 20, 30 + image_index)).save(input_image_path)
+                input_and_output_image_paths.append(
+                    (str(input_image_path), str(directory / f"{image_index}_out.png"))
+                )
+
+            batch_results = run_batch_image_transformation(
+                transform_image_file=transform_image_file,
+                input_and_output_image_paths=input_and_output_image_paths,
+                transformation_options={
+                    "allow_overwrite": False,
+                    "transformation_mode": "pixel",
+                    "block_size": 2,
+                    "color_count": 4,
+                    "palette_cache_capacity": 8,
+                },
+                job_count=2,
+            )
+
+            self.assertEqual(
+                sum(
+                    batch_result.palette_cache_hit_count + batch_result.palette_cache_miss_count
+                    for batch_result in batch_results
+                ),
+                3,
+            )
+            self.assertRegex(
+                format_batch_result_summary(batch_results), r"Palette cache: \d+ hits, \d+ misses"
+            )
+
+    def test_run_batch_image_transformation_rejects_non_positive_job_count(self) -> None:
+        with self.assertRaises(ValueError):
+            run_batch_image_transformation(
+                transform_image_file=transform_image_file,
+                input_and_output_image_paths=[],
+                transformation_options={},
+                job_count=0,
+            )
+
+    def test_run_command_line_interface_processes_directory_into_output_directory(self) -> None:
+        with tempfile.TemporaryDirectory() as temporary_directory_path:
+            input_directory = Path(temporary_directory_path) / "input"
+            output_directory = Path(temporary_directory_path) / "output"
+            input_directory.mkdir()
+            Image.new("RGB", (8, 8), color=(10, 20, 30)).save(input_directory / "first.png")
+            Image.new("RGB", (8, 8), color=(30, 20, 10)).save(input_directory / "second.png")
+
+            exit_status = run_command_line_interface(
+                [
+                    str(input_directory),
+                    "--mode",
+                    "grid",
+                    "--grid-width",
+                    "4",
+                    "--grid-height",
+                    "4",
+                    "--jobs",
+                    "2",
+                    "-o",
+                    str(output_directory),
+                ]
+            )
+
+            self.assertEqual(exit_status, 0)
+            self.assertTrue((output_directory / "first_pixelling.png").exists())
+            self.assertTrue((output_directory / "second_pixelling.png").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,8 @@
 import sys
+import tempfile
 import unittest
 from pathlib import Path
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 from PIL import Image
 
@@ -90,6 +91,57 @@ class CommandLineArgumentTests(unittest.TestCase):
         with self.assertRaises(ValueError):
             validate_command_line_arguments(parsed_arguments)
 
+    def test_validation_rejects_sampling_argument_in_grid_mode(self) -> None:
+        parsed_arguments = parse_command_line_arguments(
+            [
+                "input.png",
+                "--mode",
+                "grid",
+                "--grid-width",
+                "16",
+                "--grid-height",
+                "16",
+                "--sampling",
+                "mean",
+            ]
+        )
+
+        with self.assertRaises(ValueError):
+            validate_command_line_arguments(parsed_arguments)
+
+    def test_validation_rejects_global_animated_palette_without_color_count(self) -> None:
+        parsed_arguments = parse_command_line_arguments(
+            [
+                "input.gif",
+                "--mode",
+                "pixel",
+                "--block-size",
+                "4",
+                "--animated-palette",
+                "global",
+            ]
+        )
+
+        with self.assertRaises(ValueError):
+            validate_command_line_arguments(parsed_arguments)
+
+    def test_validation_rejects_color_count_with_strip_processing(self) -> None:
+        parsed_arguments = parse_command_line_arguments(
+            [
+                "input.png",
+                "--mode",
+                "pixel",
+                "--block-size",
+                "4",
+                "--color-count",
+                "8",
+                "--strips",
+            ]
+        )
+
+        with self.assertRaises(ValueError):
+            validate_command_line_arguments(parsed_arguments)
+
     def test_run_command_line_interface_routes_animated_input_through_animated_pipeline(self) -> None:
         first_frame = Image.new("RGBA", (8, 8), color=(10, 20, 30, 255))
         second_frame = Image.new("RGBA", (8, 8), color=(30, 20, 10, 255))
@@ -99,22 +151,27 @@ class CommandLineArgumentTests(unittest.TestCase):
         ]
         metadata = {"loop": 1, "duration": 30}
 
-        with patch("pixelling.cli.is_animated_gif_file", return_value=True), patch(
-            "pixelling.cli.load_animated_gif_frames_from_path",
+        media_source = MagicMock(is_animated_gif=True)
+
+        with patch("pixelling.transform.probe_media_source") as probe_media_source_mock, patch(
+            "pixelling.transform.open_media_source_gif_frame_stream",
             return_value=([first_frame, second_frame], metadata),
-        ), patch(
-            "pixelling.cli.run_animated_image_transformation_pipeline",
+        ) as open_frame_stream_mock, patch(
+            "pixelling.transform.iterate_animated_image_transformation_pipeline",
             return_value=transformed_frames,
         ) as animated_pipeline_mock, patch(
-            "pixelling.cli.save_animated_image_to_path"
+            "pixelling.transform.save_animated_image_to_path"
         ) as save_animated_image_mock, patch(
-            "pixelling.cli.save_image_to_path"
+            "pixelling.transform.save_image_to_path"
         ) as save_single_image_mock:
+            probe_media_source_mock.return_value.__enter__.return_value = media_source
             exit_status = run_command_line_interface(
                 ["input.gif", "--mode", "pixel", "--block-size", "4"]
             )
 
         self.assertEqual(exit_status, 0)
+        probe_media_source_mock.assert_called_once_with("input.gif", None)
+        open_frame_stream_mock.assert_called_once_with(media_source)
         animated_pipeline_mock.assert_called_once_with(
             frames=[first_frame, second_frame],
             transformation_mode="pixel",
@@ -122,15 +179,66 @@ class CommandLineArgumentTests(unittest.TestCase):
             grid_width=None,
             grid_height=None,
             color_count=None,
+            sampling_method="nearest",
+            keep_logical_resolution=False,
+            job_count=1,
+            palette_strategy="frame",
+            palette_cache=None,
+            stage_profiler=None,
+            palette_sample_frames=None,
         )
         save_animated_image_mock.assert_called_once_with(
             frames=transformed_frames,
             output_image_path="input_pixelling.gif",
             allow_overwrite=False,
             metadata=metadata,
+            upscale_factor=1,
+            encode_profile=None,
         )
         save_single_image_mock.assert_not_called()
 
+    def test_run_command_line_interface_opens_animated_input_only_once(self) -> None:
+        frames = [Image.new("RGB", (8, 8), color=(index * 60, 0, 0)) for index in range(3)]
+
+        with tempfile.TemporaryDirectory() as temporary_directory_path:
+            input_image_path = Path(temporary_directory_path) / "input.gif"
+            output_image_path = Path(temporary_directory_path) / "output.gif"
+            frames[0].save(input_image_path, save_all=True, append_images=frames[1:], duration=[20, 40, 60])
+
+            with patch("PIL.Image.open", wraps=Image.open) as image_open_mock:
+                exit_status = run_command_line_interface(
+                    [str(input_image_path), "--mode", "pixel", "--block-size", "2", "-o", str(output_image_path)]
+                )
+
+            self.assertEqual(exit_status, 0)
+            self.assertEqual(image_open_mock.call_count, 1)
+            with Image.open(output_image_path) as saved_image:
+                self.assertEqual(saved_image.n_frames, 3)
+
+    def test_run_command_line_interface_writes_logical_image_with_upscale_factor(self) -> None:
+        with tempfile.TemporaryDirectory() as temporary_directory_path:
+            input_image_path = Path(temporary_directory_path) / "input.png"
+            output_image_path = Path(temporary_directory_path) / "output.png"
+            Image.new("RGB", (20, 12), color=(10, 20, 30)).save(input_image_path)
+
+            exit_status = run_command_line_interface(
+                [
+                    str(input_image_path),
+                    "--mode",
+                    "pixel",
+                    "--block-size",
+                    "4",
+                    "--upscale",
+                    "2",
+                    "-o",
+                    str(output_image_path),
+                ]
+            )
+
+            self.assertEqual(exit_status, 0)
+            with Image.open(output_image_path) as saved_image:
+                self.assertEqual(saved_image.size, (10, 6))
+
 
 if __name__ == "__main__":
     unittest.main()
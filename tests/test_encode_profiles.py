@@ -0,0 +1,143 @@
+import sys
+import tempfile
+import unittest
+import zlib
+from io import BytesIO
+from pathlib import Path
+
+from PIL import Image
+
+PROJECT_ROOT_DIRECTORY = Path(__file__).resolve().parents[1]
+SOURCE_DIRECTORY = PROJECT_ROOT_DIRECTORY / "src"
+if str(SOURCE_DIRECTORY) not in sys.path:
+    sys.path.insert(0, str(SOURCE_DIRECTORY))
+
+from pixelling.cli import run_command_line_interface
+from pixelling.encode_profiles import get_encoder_setting_candidates
+from pixelling.io import save_animated_image_to_path, save_image_to_path
+from pixelling.ops.option_values import ENCODE_PROFILES, SMALLEST_ENCODE_PROFILE
+from pixelling.result_cache import normalize_result_cache_parameters
+
+
+def create_blocky_test_image() -> Image.Image:
+    image = Image.new("RGB", (96, 64))
+    for block_row in range(8):
+        for block_column in range(12):
+            image.paste(
+                ((block_column * 23) % 256, (block_row * 37) % 256, (block_column * block_row * 11) % 256),
+                (block_column * 8, block_row * 8, block_column * 8 + 8, block_row * 8 + 8),
+            )
+    return image
+
+
+class EncodeProfileTests(unittest.TestCase):
+    def test_every_profile_decodes_to_the_same_pixels(self) -> None:
+        input_image = create_blocky_test_image()
+
+        with tempfile.TemporaryDirectory() as temporary_directory_path:
+            for output_extension in (".png", ".jpg"):
+                decoded_pixels = set()
+                for encode_profile in ENCODE_PROFILES:
+                    output_image_path = Path(temporary_directory_path) / f"{encode_profile}{output_extension}"
+                    save_image_to_path(
+                        input_image,
+                        str(output_image_path),
+                        allow_overwrite=True,
+                        encode_profile=encode_profile,
+                    )
+                    with Image.open(output_image_path) as output_image:
+                        decoded_pixels.add(output_image.convert("RGB").tobytes())
+
+                with self.subTest(output_extension=output_extension):
+                    self.assertEqual(len(decoded_pixels), 1)
+                    if output_extension == ".png":
+                        self.assertEqual(decoded_pixels, {input_image.tobytes()})
+
+    def test_smallest_png_profile_keeps_the_smallest_candidate(self) -> None:
+        input_image = create_blocky_test_image()
+        candidate_byte_counts = []
+        for encoder_settings in get_encoder_setting_candidates(".png", SMALLEST_ENCODE_PROFILE):
+            encoded_buffer = BytesIO()
+            input_image.save(encoded_buffer, format="PNG", **encoder_settings)
+            candidate_byte_counts.append(encoded_buffer.tell())
+
+        with tempfile.TemporaryDirectory() as temporary_directory_path:
+            output_image_path = Path(temporary_directory_path) / "smallest.png"
+            save_image_to_path(
+                input_image,
+                str(output_image_path),
+                allow_overwrite=False,
+                encode_profile=SMALLEST_ENCODE_PROFILE,
+            )
+
+            self.assertGreater(len(candidate_byte_counts), 1)
+            self.assertEqual(output_image_path.stat().st_size, min(candidate_byte_counts))
+
+    def test_animated_gif_profiles_keep_frames_and_pixels(self) -> None:
+        frames = [
+            Image.new("RGB", (16, 16), color=(200, 10, 10)),
+            Image.new("RGB", (16, 16), color=(10, 10, 200)),
+        ]
+
+        with tempfile.TemporaryDirectory() as temporary_directory_path:
+            for encode_profile in ENCODE_PROFILES:
+                output_image_path = Path(temporary_directory_path) / f"{encode_profile}.gif"
+                save_animated_image_to_path(
+                    frames=frames,
+                    output_image_path=str(output_image_path),
+                    allow_overwrite=True,
+                    metadata={"duration": 50, "loop": 0},
+                    encode_profile=encode_profile,
+                )
+                with Image.open(output_image_path) as output_image:
+                    with self.subTest(encode_profile=encode_profile):
+                        self.assertEqual(output_image.n_frames, 2)
+                        output_image.seek(1)
+                        self.assertEqual(output_image.convert("RGB").getpixel((0, 0)), (10, 10, 200))
+
+    def test_encoder_setting_candidates_follow_format_and_profile(self) -> None:
+        self.assertEqual(get_encoder_setting_candidates(".png", None), ())
+        self.assertEqual(get_encoder_setting_candidates(".bmp", SMALLEST_ENCODE_PROFILE), ())
+        self.assertEqual(
+            get_encoder_setting_candidates(".PNG", "fast"),
+            ({"compress_level": 1, "compress_type": zlib.Z_RLE},),
+        )
+        with self.assertRaises(ValueError):
+            get_encoder_setting_candidates(".png", "tiny")
+
+    def test_encode_profile_is_part_of_the_result_cache_key(self) -> None:
+        default_parameters = normalize_result_cache_parameters("pixel", ".png", block_size=2)
+        fast_parameters = normalize_result_cache_parameters(
+            "pixel", ".png", block_size=2, encode_profile="fast"
+        )
+
+        self.assertNotIn("encode_profile", default_parameters)
+        self.assertNotEqual(default_parameters, fast_parameters)
+
+    def test_command_line_interface_writes_output_with_encode_profile(self) -> None:
+        with tempfile.TemporaryDirectory() as temporary_directory_path:
+            input_image_path = Path(temporary_directory_path) / "input.png"
+            output_image_path = Path(temporary_directory_path) / "output.png"
+            create_blocky_test_image().save(input_image_path)
+
+            exit_code = run_command_line_interface(
+                [
+                    str(input_image_path),
+                    "--mode",
+                    "pixel",
+                    "--block-size",
+                    "8",
+                    "--encode-profile",
+                    "smallest",
+                    "-o",
+                    str(output_image_path),
+                ]
+            )
+
+            self.assertEqual(exit_code, 0)
+            with Image.open(output_image_path) as output_image:
+                self.assertEqual(output_image.convert("RGB").tobytes(), create_blocky_test_image().tobytes())
+
+
+if __name__ == "__main__":
+    unittest.main()
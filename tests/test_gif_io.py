@@ -1,16 +1,25 @@
+import io
 import sys
 import tempfile
 import unittest
 from pathlib import Path
+from unittest.mock import patch
 
-from PIL import Image
+from PIL import Image, ImageChops, ImageSequence
 
 PROJECT_ROOT_DIRECTORY = Path(__file__).resolve().parents[1]
 SOURCE_DIRECTORY = PROJECT_ROOT_DIRECTORY / "src"
 if str(SOURCE_DIRECTORY) not in sys.path:
     sys.path.insert(0, str(SOURCE_DIRECTORY))
 
-from pixelling.gif_io import save_animated_gif_frames_to_path
+from pixelling.media_source import probe_media_source
+from pixelling.gif_io import (
+    can_stream_gif_frames,
+    load_animated_gif_frames_from_path,
+    open_animated_gif_frame_stream,
+    open_media_source_gif_frame_stream,
+    save_animated_gif_frames_to_path,
+)
 
 
 class GifInputOutputOperationTests(unittest.TestCase):
@@ -40,6 +49,232 @@ class GifInputOutputOperationTests(unittest.TestCase):
                 self.assertTrue(bool(getattr(saved_image, "is_animated", False)))
                 self.assertEqual(saved_image.n_frames, 2)
 
+    def test_save_animated_gif_frames_to_path_matches_pillow_output_for_palette_frame_stream(self) -> None:
+        first_frame = Image.new("RGBA", (20, 16), color=(10, 20, 30, 255)).convert("P")
+        second_frame = first_frame.copy()
+        second_frame.putpixel((3, 4), 1)
+        third_frame = second_frame.copy()
+        third_frame.putpixel((15, 10), 2)
+        frames = [first_frame, second_frame, second_frame, third_frame]
+        frame_durations = [40, 20, 30, 50]
+
+        expected_output = io.BytesIO()
+        first_frame.save(
+            expected_output,
+            format="GIF",
+            save_all=True,
+            append_images=frames[1:],
+            loop=0,
+            duration=frame_durations,
+            transparency=0,
+        )
+
+        with tempfile.TemporaryDirectory() as temporary_directory_path:
+            output_image_path = Path(temporary_directory_path) / "streamed.gif"
+            save_animated_gif_frames_to_path(
+                frames=iter(frames),
+                output_image_path=str(output_image_path),
+                metadata={"loop": 0, "frame_durations": frame_durations, "transparency": 0},
+            )
+
+            self.assertEqual(output_image_path.read_bytes(), expected_output.getvalue())
+
+    def test_save_animated_gif_frames_to_path_writes_only_changed_regions(self) -> None:
+        first_frame = Image.new("RGB", (40, 30), color=(10, 20, 30))
+        second_frame = first_frame.copy()
+        second_frame.paste((200, 0, 0), (5, 6, 9, 10))
+        third_frame = second_frame.copy()
+        third_frame.paste((0, 0, 200), (30, 20, 34, 22))
+        frames = [first_frame, second_frame, second_frame.copy(), third_frame]
+
+        with tempfile.TemporaryDirectory() as temporary_directory_path:
+            output_image_path = Path(temporary_directory_path) / "delta.gif"
+            save_animated_gif_frames_to_path(
+                frames=iter(frames),
+                output_image_path=str(output_image_path),
+                metadata={"loop": 0, "frame_durations": [40, 20, 30, 50]},
+            )
+
+            with Image.open(output_image_path) as saved_image:
+                frame_extents = []
+                decoded_frames = []
+                frame_durations = []
+                for frame in ImageSequence.Iterator(saved_image):
+                    frame_extents.append(frame.tile[0].extents)
+                    frame_durations.append(frame.info["duration"])
+                    decoded_frames.append(frame.convert("RGB"))
+
+        self.assertEqual(frame_extents, [(0, 0, 40, 30), (5, 6, 9, 10), (30, 20, 34, 22)])
+        self.assertEqual(frame_durations, [40, 50, 50])
+        for decoded_frame, expected_frame in zip(decoded_frames, [first_frame, second_frame, third_frame]):
+            self.assertIsNone(ImageChops.difference(decoded_frame, expected_frame).getbbox())
+
+    def test_save_animated_gif_frames_to_path_is_no_larger_than_pillow_output_for_full_frame_changes(
+        self,
+    ) -> None:
+        with Image.open(PROJECT_ROOT_DIRECTORY / "content" / "bee_preview.gif") as input_image:
+            frames = [
+                frame.convert("RGBA").resize((45, 83), Image.Resampling.BOX)
+                for frame in ImageSequence.Iterator(input_image)
+            ]
+        pillow_output = io.BytesIO()
+        frames[0].save(
+            pillow_output,
+            format="GIF",
+            save_all=True,
+            append_images=frames[1:],
+            loop=0,
+            duration=50,
+            optimize=True,
+        )
+
+        with tempfile.TemporaryDirectory() as temporary_directory_path:
+            output_image_path = Path(temporary_directory_path) / "bee.gif"
+            save_animated_gif_frames_to_path(
+                frames=iter(frames),
+                output_image_path=str(output_image_path),
+                metadata={"loop": 0, "duration": 50},
+            )
+
+            self.assertLessEqual(output_image_path.stat().st_size, len(pillow_output.getvalue()))
+            with Image.open(output_image_path) as saved_image, Image.open(pillow_output) as pillow_image:
+                for saved_frame, pillow_frame in zip(
+                    ImageSequence.Iterator(saved_image), ImageSequence.Iterator(pillow_image)
+                ):
+                    frame_difference = ImageChops.difference(
+                        saved_frame.convert("RGB"), pillow_frame.convert("RGB")
+                    )
+                    self.assertIsNone(frame_difference.getbbox())
+
+    def test_save_animated_gif_frames_to_path_falls_back_to_pillow_without_its_gif_internals(self) -> None:
+        frames = [Image.new("RGB", (8, 8), color=(frame_index * 80, 10, 10)) for frame_index in range(3)]
+
+        with tempfile.TemporaryDirectory() as temporary_directory_path:
+            output_image_path = Path(temporary_directory_path) / "fallback.gif"
+            with patch("pixelling.gif_io.can_stream_gif_frames", return_value=False):
+                with self.assertWarns(RuntimeWarning):
+                    save_animated_gif_frames_to_path(
+                        frames=iter(frames),
+                        output_image_path=str(output_image_path),
+                        metadata={"loop": 0, "frame_durations": [30, 40, 50]},
+                    )
+
+            with Image.open(output_image_path) as saved_image:
+                saved_frames = [
+                    (frame.info["duration"], frame.convert("RGB").getpixel((0, 0)))
+                    for frame in ImageSequence.Iterator(saved_image)
+                ]
+
+        self.assertEqual(saved_frames, [(30, (0, 10, 10)), (40, (80, 10, 10)), (50, (160, 10, 10))])
+
+    def test_gif_internals_that_raise_type_errors_fail_the_streaming_check(self) -> None:
+        can_stream_gif_frames.cache_clear()
+        self.addCleanup(can_stream_gif_frames.cache_clear)
+
+        with patch("pixelling.gif_io.write_gif_frame_data", side_effect=TypeError("changed signature")):
+            self.assertFalse(can_stream_gif_frames())
+        can_stream_gif_frames.cache_clear()
+        self.assertTrue(can_stream_gif_frames())
+
+    def test_save_animated_gif_frames_to_path_clears_pixels_that_become_transparent(self) -> None:
+        frames = []
+        for frame_index in range(3):
+            frame = Image.new("RGBA", (24, 12), color=(0, 0, 0, 0))
+            frame.paste((0, 200, 0, 255), (frame_index * 6, 2, frame_index * 6 + 6, 8))
+            frames.append(frame)
+
+        with tempfile.TemporaryDirectory() as temporary_directory_path:
+            output_image_path = Path(temporary_directory_path) / "sprite.gif"
+            save_animated_gif_frames_to_path(
+                frames=iter(frames),
+                output_image_path=str(output_image_path),
+                metadata={"loop": 0, "duration": 50},
+            )
+
+            loaded_frames, _ = load_animated_gif_frames_from_path(str(output_image_path))
+
+        self.assertEqual(len(loaded_frames), 3)
+        for loaded_frame, expected_frame in zip(loaded_frames, frames):
+            self.assertEqual(
+                loaded_frame.getchannel("A").getbbox(),
+                expected_frame.getchannel("A").getbbox(),
+            )
+
+    def test_save_animated_gif_frames_to_path_keeps_palette_mode_frame_colors(self) -> None:
+        palette_values = [255, 0, 0, 0, 0, 255]
+        first_frame = Image.new("P", (4, 4), color=0)
+        first_frame.putpalette(palette_values)
+        second_frame = Image.new("P", (4, 4), color=1)
+        second_frame.putpalette(palette_values)
+
+        with tempfile.TemporaryDirectory() as temporary_directory_path:
+            output_image_path = Path(temporary_directory_path) / "paletted.gif"
+            save_animated_gif_frames_to_path(
+                frames=[first_frame, second_frame],
+                output_image_path=str(output_image_path),
+                metadata={"loop": 0, "duration": 50},
+            )
+
+            loaded_frames, _ = load_animated_gif_frames_from_path(str(output_image_path))
+
+        self.assertEqual(loaded_frames[0].getpixel((0, 0)), (255, 0, 0, 255))
+        self.assertEqual(loaded_frames[1].getpixel((0, 0)), (0, 0, 255, 255))
+
+    def test_open_animated_gif_frame_stream_records_durations_as_frames_are_read(self) -> None:
+        with tempfile.TemporaryDirectory() as temporary_directory_path:
+            input_image_path = Path(temporary_directory_path) / "input.gif"
+            first_frame = Image.new("RGB", (6, 6), color=(255, 0, 0))
+            second_frame = Image.new("RGB", (6, 6), color=(0, 255, 0))
+            first_frame.save(
+                input_image_path,
+                save_all=True,
+                append_images=[second_frame],
+                duration=[30, 60],
+                loop=0,
+            )
+
+            frame_stream, metadata = open_animated_gif_frame_stream(str(input_image_path))
+            self.assertEqual(metadata["frame_durations"], [])
+
+            streamed_frames = list(frame_stream)
+            loaded_frames, loaded_metadata = load_animated_gif_frames_from_path(
+                str(input_image_path)
+            )
+
+            self.assertEqual(metadata["frame_durations"], [30, 60])
+            self.assertEqual(loaded_metadata["frame_durations"], [30, 60])
+            self.assertEqual(
+                [frame.tobytes() for frame in streamed_frames],
+                [frame.tobytes() for frame in loaded_frames],
+            )
+            self.assertTrue(all(frame.mode == "RGBA" for frame in streamed_frames))
+
+    def test_media_source_frame_stream_has_durations_before_decoding(self) -> None:
+        with tempfile.TemporaryDirectory() as temporary_directory_path:
+            input_image_path = Path(temporary_directory_path) / "input.gif"
+            first_frame = Image.new("RGB", (6, 6), color=(255, 0, 0))
+            second_frame = Image.new("RGB", (6, 6), color=(0, 255, 0))
+            first_frame.save(
+                input_image_path,
+                save_all=True,
+                append_images=[second_frame],
+                duration=[30, 60],
+                loop=0,
+            )
+
+            with probe_media_source(str(input_image_path)) as media_source:
+                frame_stream, metadata = open_media_source_gif_frame_stream(media_source)
+                self.assertEqual(metadata["frame_durations"], [30, 60])
+
+                streamed_frames = list(frame_stream)
+                self.assertEqual(metadata["frame_durations"], [30, 60])
+
+            loaded_frames, _ = load_animated_gif_frames_from_path(str(input_image_path))
+            self.assertEqual(
+                [frame.tobytes() for frame in streamed_frames],
+                [frame.tobytes() for frame in loaded_frames],
+            )
+
 
 if __name__ == "__main__":
     unittest.main()
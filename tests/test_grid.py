@@ -2,14 +2,14 @@ import sys
 import unittest
 from pathlib import Path
 
-from PIL import Image
+from PIL import Image, ImageChops, ImageStat
 
 PROJECT_ROOT_DIRECTORY = Path(__file__).resolve().parents[1]
 SOURCE_DIRECTORY = PROJECT_ROOT_DIRECTORY / "src"
 if str(SOURCE_DIRECTORY) not in sys.path:
     sys.path.insert(0, str(SOURCE_DIRECTORY))
 
-from pixelling.ops.grid import resize_image_to_fixed_grid
+from pixelling.ops.grid import crop_image_to_target_aspect_ratio, resize_image_to_fixed_grid
 
 
 class GridOperationTests(unittest.TestCase):
@@ -80,6 +80,38 @@ class GridOperationTests(unittest.TestCase):
 
         self.assertEqual(list(actual_output_image.getdata()), list(expected_output_image.getdata()))
 
+    def test_grid_resize_stays_within_tolerance_of_cropped_box_resize(self) -> None:
+        input_image = Image.merge(
+            "RGB",
+            (
+                Image.radial_gradient("L").resize((1000, 700)),
+                Image.linear_gradient("L").resize((1000, 700)),
+                Image.linear_gradient("L").rotate(90).resize((1000, 700)),
+            ),
+        )
+        for grid_size in ((30, 21), (100, 70), (20, 20), (7, 5)):
+            with self.subTest(grid_size=grid_size):
+                expected_output_image = crop_image_to_target_aspect_ratio(input_image, *grid_size).resize(
+                    grid_size, resample=Image.Resampling.BOX
+                )
+
+                actual_output_image = resize_image_to_fixed_grid(input_image, *grid_size)
+
+                difference_image = ImageChops.difference(actual_output_image, expected_output_image)
+                self.assertLessEqual(max(high for _, high in difference_image.getextrema()), 4)
+                self.assertLess(max(ImageStat.Stat(difference_image).mean), 1)
+
+    def test_grid_resize_of_palette_image_matches_cropped_resize(self) -> None:
+        input_image = Image.linear_gradient("L").resize((300, 200)).convert("P")
+
+        expected_output_image = crop_image_to_target_aspect_ratio(input_image, 10, 10).resize(
+            (10, 10), resample=Image.Resampling.BOX
+        )
+        actual_output_image = resize_image_to_fixed_grid(input_image, 10, 10)
+
+        self.assertEqual(actual_output_image.mode, "P")
+        self.assertEqual(actual_output_image.tobytes(), expected_output_image.tobytes())
+
 
 if __name__ == "__main__":
     unittest.main()
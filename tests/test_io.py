@@ -14,6 +14,7 @@ from pixelling.io import (
     build_available_output_image_path,
     build_default_output_image_path,
     load_image_from_path,
+    load_image_with_reduced_decoding,
     save_animated_image_to_path,
     save_image_to_path,
 )
@@ -40,6 +41,32 @@ class InputOutputOperationTests(unittest.TestCase):
             self.assertEqual(loaded_image.size, (5, 5))
             self.assertEqual(loaded_image.mode, "RGB")
 
+    def test_load_image_with_reduced_decoding_downscales_jpeg_to_requested_size(self) -> None:
+        with tempfile.TemporaryDirectory() as temporary_directory_path:
+            input_image_path = Path(temporary_directory_path) / "input.jpg"
+            Image.new("RGB", (400, 300), color=(30, 60, 90)).save(input_image_path)
+
+            loaded_image, decode_scale = load_image_with_reduced_decoding(
+                str(input_image_path),
+                lambda input_size: (100, 75),
+            )
+
+            self.assertEqual(decode_scale, 4)
+            self.assertEqual(loaded_image.size, (100, 75))
+
+    def test_load_image_with_reduced_decoding_keeps_full_size_for_other_formats(self) -> None:
+        with tempfile.TemporaryDirectory() as temporary_directory_path:
+            input_image_path = Path(temporary_directory_path) / "input.png"
+            Image.new("RGB", (400, 300), color=(30, 60, 90)).save(input_image_path)
+
+            loaded_image, decode_scale = load_image_with_reduced_decoding(
+                str(input_image_path),
+                lambda input_size: (50, 50),
+            )
+
+            self.assertEqual(decode_scale, 1)
+            self.assertEqual(loaded_image.size, (400, 300))
+
     def test_save_image_to_path_creates_numbered_file_when_overwrite_is_disabled(self) -> None:
         with tempfile.TemporaryDirectory() as temporary_directory_path:
             output_image_path = Path(temporary_directory_path) / "result.png"
@@ -55,6 +82,20 @@ class InputOutputOperationTests(unittest.TestCase):
             numbered_output_image_path = Path(temporary_directory_path) / "result_1.png"
             self.assertTrue(numbered_output_image_path.exists())
 
+    def test_save_image_to_path_applies_upscale_factor_when_saving(self) -> None:
+        with tempfile.TemporaryDirectory() as temporary_directory_path:
+            output_image_path = Path(temporary_directory_path) / "result.png"
+
+            save_image_to_path(
+                image=Image.new("RGB", (3, 2), color=(1, 2, 3)),
+                output_image_path=str(output_image_path),
+                allow_overwrite=True,
+                upscale_factor=4,
+            )
+
+            with Image.open(output_image_path) as saved_image:
+                self.assertEqual(saved_image.size, (12, 8))
+
     def test_build_available_output_image_path_returns_numbered_path_when_needed(self) -> None:
         with tempfile.TemporaryDirectory() as temporary_directory_path:
             first_output_image_path = Path(temporary_directory_path) / "result.png"
@@ -0,0 +1,93 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from PIL import Image, ImageFile
+
+PROJECT_ROOT_DIRECTORY = Path(__file__).resolve().parents[1]
+SOURCE_DIRECTORY = PROJECT_ROOT_DIRECTORY / "src"
+if str(SOURCE_DIRECTORY) not in sys.path:
+    sys.path.insert(0, str(SOURCE_DIRECTORY))
+
+from pixelling.media_source import probe_media_source, raise_pillow_pixel_limit
+
+
+class MediaSourceTests(unittest.TestCase):
+    def test_probe_caches_animated_gif_header_details(self) -> None:
+        frames = [Image.new("RGB", (12, 10), color=(index * 50, 0, 0)) for index in range(4)]
+
+        with tempfile.TemporaryDirectory() as temporary_directory_path:
+            input_image_path = Path(temporary_directory_path) / "input.gif"
+            frames[0].save(
+                input_image_path,
+                save_all=True,
+                append_images=frames[1:],
+                duration=[10, 20, 30, 40],
+                loop=0,
+            )
+
+            with probe_media_source(str(input_image_path)) as media_source:
+                self.assertEqual(media_source.format, "GIF")
+                self.assertEqual(media_source.size, (12, 10))
+                self.assertEqual(media_source.mode, "P")
+                self.assertEqual(media_source.frame_count, 4)
+                self.assertEqual(media_source.frame_durations, (10, 20, 30, 40))
+                self.assertTrue(media_source.is_animated_gif)
+
+            self.assertTrue(media_source.input_file.closed)
+
+    def test_probe_reports_still_image_as_single_frame(self) -> None:
+        with tempfile.TemporaryDirectory() as temporary_directory_path:
+            input_image_path = Path(temporary_directory_path) / "input.png"
+            Image.new("RGBA", (6, 4)).save(input_image_path)
+
+            with probe_media_source(str(input_image_path)) as media_source:
+                self.assertEqual(media_source.format, "PNG")
+                self.assertEqual(media_source.frame_count, 1)
+                self.assertEqual(media_source.frame_durations, ())
+                self.assertFalse(media_source.is_animated_gif)
+
+    def test_probe_rejects_oversized_input_before_decoding(self) -> None:
+        with tempfile.TemporaryDirectory() as temporary_directory_path:
+            input_image_path = Path(temporary_directory_path) / "input.png"
+            Image.new("RGB", (20, 20)).save(input_image_path)
+
+            with patch.object(ImageFile.ImageFile, "load") as load_mock:
+                with self.assertRaises(ValueError):
+                    probe_media_source(str(input_image_path), maximum_pixel_count=399)
+
+            load_mock.assert_not_called()
+
+    def test_probe_only_warns_below_twice_pillow_limit_by_default(self) -> None:
+        with tempfile.TemporaryDirectory() as temporary_directory_path:
+            input_image_path = Path(temporary_directory_path) / "input.png"
+            Image.new("RGB", (12, 12)).save(input_image_path)
+
+            with patch.object(Image, "MAX_IMAGE_PIXELS", 100):
+                with self.assertWarns(Image.DecompressionBombWarning):
+                    with probe_media_source(str(input_image_path)) as media_source:
+                        self.assertEqual(media_source.size, (12, 12))
+
+    def test_probe_leaves_pillow_limit_alone_until_it_is_raised_at_startup(self) -> None:
+        with tempfile.TemporaryDirectory() as temporary_directory_path:
+            input_image_path = Path(temporary_directory_path) / "input.png"
+            Image.new("RGB", (20, 20)).save(input_image_path)
+
+            with patch.object(Image, "MAX_IMAGE_PIXELS", 100):
+                with self.assertRaisesRegex(ValueError, "decompression bomb limit"):
+                    probe_media_source(str(input_image_path), maximum_pixel_count=400)
+                self.assertEqual(Image.MAX_IMAGE_PIXELS, 100)
+
+                raise_pillow_pixel_limit(50)
+                self.assertEqual(Image.MAX_IMAGE_PIXELS, 100)
+                raise_pillow_pixel_limit(400)
+                with probe_media_source(str(input_image_path)) as media_source:
+                    self.assertEqual(media_source.size, (20, 20))
+                with self.assertRaises(ValueError):
+                    probe_media_source(str(input_image_path), maximum_pixel_count=399)
+
+
+if __name__ == "__main__":
+    unittest.main()
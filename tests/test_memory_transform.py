@@ -0,0 +1,170 @@
+import io
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from PIL import Image
+
+PROJECT_ROOT_DIRECTORY = Path(__file__).resolve().parents[1]
+SOURCE_DIRECTORY = PROJECT_ROOT_DIRECTORY / "src"
+if str(SOURCE_DIRECTORY) not in sys.path:
+    sys.path.insert(0, str(SOURCE_DIRECTORY))
+
+from pixelling.memory_transform import MemoryViewReader, transform_image_bytes
+from pixelling.transform import transform_image_file
+
+
+def create_still_image_bytes(image_format: str = "PNG") -> bytes:
+    input_image = Image.new("RGB", (24, 16))
+    for x_coordinate in range(24):
+        for y_coordinate in range(16):
+            input_image.putpixel((x_coordinate, y_coordinate), (x_coordinate * 10, y_coordinate * 15, 90))
+    image_buffer = io.BytesIO()
+    input_image.save(image_buffer, format=image_format)
+    return image_buffer.getvalue()
+
+
+def create_animated_gif_bytes() -> bytes:
+    frames = [Image.new("RGB", (16, 16), color=(frame_index * 60, 30, 200)) for frame_index in range(3)]
+    image_buffer = io.BytesIO()
+    frames[0].save(
+        image_buffer,
+        format="GIF",
+        save_all=True,
+        append_images=frames[1:],
+        duration=[40, 60, 80],
+        loop=2,
+    )
+    return image_buffer.getvalue()
+
+
+class MemoryTransformTests(unittest.TestCase):
+    def test_still_output_matches_file_transformation(self) -> None:
+        input_image_bytes = create_still_image_bytes()
+        with tempfile.TemporaryDirectory() as temporary_directory_path:
+            input_image_path = Path(temporary_directory_path) / "input.png"
+            expected_output_path = Path(temporary_directory_path) / "expected.png"
+            input_image_path.write_bytes(input_image_bytes)
+            transform_image_file(
+                input_image_path=str(input_image_path),
+                output_image_path=str(expected_output_path),
+                allow_overwrite=True,
+                transformation_mode="pixel",
+                block_size=4,
+                color_count=4,
+                upscale_factor=2,
+            )
+
+            transformed_image = transform_image_bytes(
+                input_image_bytes,
+                transformation_mode="pixel",
+                block_size=4,
+                color_count=4,
+                upscale_factor=2,
+            )
+
+            self.assertEqual(transformed_image.image_bytes, expected_output_path.read_bytes())
+            self.assertEqual(transformed_image.format, "PNG")
+            self.assertEqual(transformed_image.size, (12, 8))
+            self.assertEqual(transformed_image.frame_count, 1)
+
+    def test_accepts_buffers_and_file_objects(self) -> None:
+        input_image_bytes = create_still_image_bytes()
+        positioned_buffer = io.BytesIO(b"skip" + input_image_bytes)
+        positioned_buffer.seek(4)
+        input_sources = {
+            "bytes": input_image_bytes,
+            "bytearray": bytearray(input_image_bytes),
+            "memoryview": memoryview(input_image_bytes),
+            "BytesIO": positioned_buffer,
+            "BufferedReader": io.BufferedReader(io.BytesIO(input_image_bytes)),
+        }
+        expected_image_bytes = transform_image_bytes(
+            input_image_bytes, transformation_mode="grid", grid_width=6, grid_height=4
+        ).image_bytes
+
+        for source_name, input_source in input_sources.items():
+            with self.subTest(source_name=source_name):
+                transformed_image = transform_image_bytes(
+                    input_source, transformation_mode="grid", grid_width=6, grid_height=4
+                )
+                self.assertEqual(transformed_image.image_bytes, expected_image_bytes)
+
+        positioned_buffer.write(b"the buffer export is released")
+
+    def test_animated_gif_output_keeps_frames_and_timing(self) -> None:
+        transformed_image = transform_image_bytes(
+            create_animated_gif_bytes(),
+            transformation_mode="pixel",
+            block_size=4,
+            upscale_factor=3,
+            output_format="png",
+        )
+
+        self.assertEqual(transformed_image.format, "GIF")
+        self.assertEqual(transformed_image.size, (12, 12))
+        self.assertEqual(transformed_image.frame_count, 3)
+        self.assertEqual(transformed_image.frame_durations, (40, 60, 80))
+        self.assertEqual(transformed_image.loop, 2)
+        with Image.open(io.BytesIO(transformed_image.image_bytes)) as output_image:
+            self.assertEqual(output_image.n_frames, 3)
+            self.assertEqual(output_image.size, (12, 12))
+
+    def test_global_palette_samples_frames_after_the_first_sixteen(self) -> None:
+        frames = [Image.new("RGB", (16, 16), color=(200 + frame_index, 20, 20)) for frame_index in range(20)]
+        frames += [Image.new("RGB", (16, 16), color=(20, 20, 200 + frame_index)) for frame_index in range(20)]
+        image_buffer = io.BytesIO()
+        frames[0].save(image_buffer, format="GIF", save_all=True, append_images=frames[1:], duration=40)
+
+        transformed_image = transform_image_bytes(
+            image_buffer.getvalue(),
+            transformation_mode="pixel",
+            block_size=4,
+            color_count=2,
+            palette_strategy="global",
+        )
+
+        with Image.open(io.BytesIO(transformed_image.image_bytes)) as output_image:
+            output_image.seek(output_image.n_frames - 1)
+            red, _, blue = output_image.convert("RGB").getpixel((0, 0))
+            self.assertGreater(blue, red)
+
+    def test_does_not_open_files(self) -> None:
+        input_image_bytes = create_still_image_bytes("JPEG")
+        animated_image_bytes = create_animated_gif_bytes()
+
+        with patch("builtins.open", side_effect=AssertionError("opened a file")):
+            transform_image_bytes(
+                input_image_bytes, transformation_mode="pixel", block_size=8, output_format="jpeg"
+            )
+            transform_image_bytes(animated_image_bytes, transformation_mode="pixel", block_size=4)
+
+    def test_rejects_unknown_output_format_and_oversized_input(self) -> None:
+        with self.assertRaises(ValueError):
+            transform_image_bytes(
+                create_still_image_bytes(), transformation_mode="pixel", block_size=4, output_format="nope"
+            )
+        with self.assertRaisesRegex(ValueError, "exceeds the limit"):
+            transform_image_bytes(
+                create_still_image_bytes(), transformation_mode="pixel", block_size=4, maximum_pixel_count=100
+            )
+
+    def test_memory_view_reader_reads_and_seeks_like_a_file(self) -> None:
+        reader = MemoryViewReader(b"0123456789")
+
+        self.assertEqual(reader.read(3), b"012")
+        self.assertEqual(reader.seek(-2, io.SEEK_END), 8)
+        self.assertEqual(reader.read(), b"89")
+        self.assertEqual(reader.read(4), b"")
+        reader.seek(1)
+        target_buffer = bytearray(4)
+        self.assertEqual(reader.readinto(target_buffer), 4)
+        self.assertEqual(bytes(target_buffer), b"1234")
+        reader.close()
+        self.assertTrue(reader.closed)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+import os
+import sys
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from unittest.mock import patch
+
+PROJECT_ROOT_DIRECTORY = Path(__file__).resolve().parents[1]
+SOURCE_DIRECTORY = PROJECT_ROOT_DIRECTORY / "src"
+if str(SOURCE_DIRECTORY) not in sys.path:
+    sys.path.insert(0, str(SOURCE_DIRECTORY))
+
+from pixelling.output_writer import (
+    OUTPUT_TEMPORARY_FILE_PREFIX,
+    PROCESS_OUTPUT_NAME_INDEXES,
+    claim_output_image_path,
+    save_output_file,
+)
+
+
+def write_shared_output_file(output_image_path: str, output_text: str) -> str:
+    return save_output_file(
+        output_image_path,
+        allow_overwrite=False,
+        write_output_file=lambda temporary_output_image_path: Path(
+            temporary_output_image_path
+        ).write_text(output_text),
+    )
+
+
+class OutputWriterTests(unittest.TestCase):
+    def test_claims_skip_taken_names_after_listing_the_directory_once(self) -> None:
+        with tempfile.TemporaryDirectory() as temporary_directory_path:
+            for existing_file_name in ("result.png", "result_2.png"):
+                (Path(temporary_directory_path) / existing_file_name).write_bytes(b"old")
+            output_image_path = os.path.join(temporary_directory_path, "result.png")
+
+            with patch("pixelling.output_writer.os.listdir", wraps=os.listdir) as listdir_mock:
+                written_paths = [
+                    write_shared_output_file(output_image_path, str(output_index))
+                    for output_index in range(3)
+                ]
+
+            self.assertEqual(listdir_mock.call_count, 1)
+            self.assertEqual(
+                [os.path.basename(written_path) for written_path in written_paths],
+                ["result_1.png", "result_3.png", "result_4.png"],
+            )
+            self.assertEqual((Path(temporary_directory_path) / "result.png").read_bytes(), b"old")
+            self.assertEqual(Path(written_paths[2]).read_text(), "2")
+
+    def test_name_created_by_another_writer_after_listing_is_skipped(self) -> None:
+        with tempfile.TemporaryDirectory() as temporary_directory_path:
+            output_image_path = os.path.join(temporary_directory_path, "late.png")
+            first_written_path = write_shared_output_file(output_image_path, "first")
+            (Path(temporary_directory_path) / "late_1.png").write_text("other writer")
+
+            second_written_path = write_shared_output_file(output_image_path, "second")
+
+            self.assertEqual(first_written_path, output_image_path)
+            self.assertEqual(os.path.basename(second_written_path), "late_2.png")
+            self.assertEqual((Path(temporary_directory_path) / "late_1.png").read_text(), "other writer")
+
+    def test_name_indexes_are_bounded_and_dropped_when_idle(self) -> None:
+        with tempfile.TemporaryDirectory() as temporary_directory_path:
+            output_directory_paths = [
+                os.path.join(temporary_directory_path, str(directory_index)) for directory_index in range(3)
+            ]
+            for output_directory_path in output_directory_paths:
+                os.mkdir(output_directory_path)
+
+            with patch("pixelling.output_writer.OUTPUT_NAME_INDEX_CAPACITY", 2):
+                for output_directory_path in output_directory_paths:
+                    write_shared_output_file(os.path.join(output_directory_path, "out.png"), "first")
+                self.assertNotIn(output_directory_paths[0], PROCESS_OUTPUT_NAME_INDEXES)
+                self.assertLessEqual(len(PROCESS_OUTPUT_NAME_INDEXES), 2)
+
+            reused_path = os.path.join(output_directory_paths[2], "out.png")
+            os.remove(reused_path)
+            with patch("pixelling.output_writer.OUTPUT_NAME_INDEX_IDLE_SECONDS", 0.0):
+                self.assertEqual(write_shared_output_file(reused_path, "second"), reused_path)
+
+    def test_failed_write_leaves_no_claimed_or_partial_files(self) -> None:
+        def write_partial_output(temporary_output_image_path: str) -> None:
+            Path(temporary_output_image_path).write_text("partial")
+            raise OSError("encoder failed")
+
+        with tempfile.TemporaryDirectory() as temporary_directory_path:
+            output_image_path = os.path.join(temporary_directory_path, "broken.png")
+
+            for allow_overwrite in (False, True):
+                with self.assertRaises(OSError):
+                    save_output_file(output_image_path, allow_overwrite, write_partial_output)
+
+            self.assertEqual(os.listdir(temporary_directory_path), [])
+            with claim_output_image_path(output_image_path, allow_overwrite=False) as claimed_path:
+                self.assertEqual(claimed_path, output_image_path)
+
+    def test_concurrent_workers_write_distinct_complete_files(self) -> None:
+        with tempfile.TemporaryDirectory() as temporary_directory_path:
+            output_image_path = os.path.join(temporary_directory_path, "shared.txt")
+
+            with ProcessPoolExecutor(max_workers=4) as executor:
+                written_paths = list(
+                    executor.map(
+                        write_shared_output_file,
+                        [output_image_path] * 12,
+                        [f"output {output_index}" for output_index in range(12)],
+                    )
+                )
+
+            self.assertEqual(len(set(written_paths)), 12)
+            self.assertEqual(
+                sorted(Path(written_path).read_text() for written_path in written_paths),
+                sorted(f"output {output_index}" for output_index in range(12)),
+            )
+            self.assertFalse(
+                any(
+                    file_name.startswith(OUTPUT_TEMPORARY_FILE_PREFIX)
+                    for file_name in os.listdir(temporary_directory_path)
+                )
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import pickle
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from PIL import Image
+
+PROJECT_ROOT_DIRECTORY = Path(__file__).resolve().parents[1]
+SOURCE_DIRECTORY = PROJECT_ROOT_DIRECTORY / "src"
+if str(SOURCE_DIRECTORY) not in sys.path:
+    sys.path.insert(0, str(SOURCE_DIRECTORY))
+
+from pixelling.ops.palette_cache import (
+    PaletteCache,
+    build_color_histogram_signature,
+    get_process_palette_cache,
+)
+from pixelling.ops.quantize import quantize_image_colors
+from sample_images import create_gradient_image
+
+
+class PaletteCacheTests(unittest.TestCase):
+    def test_signature_ignores_small_differences(self) -> None:
+        gradient_image = create_gradient_image(64, 64)
+        changed_image = gradient_image.copy()
+        changed_image.putpixel((0, 0), (255, 255, 255))
+
+        first_signature = build_color_histogram_signature(gradient_image, 8)
+        second_signature = build_color_histogram_signature(changed_image, 8)
+
+        self.assertEqual(first_signature, second_signature)
+
+    def test_signature_separates_color_counts_and_distinct_images(self) -> None:
+        gradient_image = create_gradient_image(64, 64)
+        red_image = Image.new("RGB", (64, 64), (255, 0, 0))
+
+        self.assertNotEqual(
+            build_color_histogram_signature(gradient_image, 8),
+            build_color_histogram_signature(gradient_image, 16),
+        )
+        self.assertNotEqual(
+            build_color_histogram_signature(gradient_image, 8),
+            build_color_histogram_signature(red_image, 8),
+        )
+
+    def test_cache_hit_reuses_palette_without_building_a_new_one(self) -> None:
+        palette_cache = PaletteCache(capacity=4)
+        gradient_image = create_gradient_image(64, 64)
+        changed_image = gradient_image.copy()
+        changed_image.putpixel((0, 0), (255, 255, 255))
+        first_output_image = quantize_image_colors(gradient_image, 8, palette_cache)
+
+        with patch.object(
+            Image.Image, "quantize", autospec=True, side_effect=Image.Image.quantize
+        ) as quantize_mock:
+            second_output_image = quantize_image_colors(changed_image, 8, palette_cache)
+
+        self.assertEqual(quantize_mock.call_count, 1)
+        self.assertIn("palette", quantize_mock.call_args.kwargs)
+        self.assertEqual((palette_cache.hit_count, palette_cache.miss_count), (1, 1))
+        first_output_colors = {color for _, color in first_output_image.getcolors()}
+        second_output_colors = {color for _, color in second_output_image.getcolors()}
+        self.assertLessEqual(second_output_colors, first_output_colors)
+
+    def test_cache_evicts_least_recently_used_palette(self) -> None:
+        palette_cache = PaletteCache(capacity=2)
+        palette_image = Image.new("RGB", (2, 2), (10, 20, 30)).quantize(colors=2)
+        palette_cache.store_palette(("first",), palette_image)
+        palette_cache.store_palette(("second",), palette_image)
+        palette_cache.look_up_palette(("first",))
+        palette_cache.store_palette(("third",), palette_image)
+
+        self.assertEqual(len(palette_cache), 2)
+        self.assertIsNotNone(palette_cache.look_up_palette(("first",)))
+        self.assertIsNone(palette_cache.look_up_palette(("second",)))
+        self.assertEqual(palette_cache.hit_rate, 2 / 3)
+        self.assertEqual(
+            palette_cache.format_statistics(),
+            "Palette cache: 2 hits, 1 misses (67% hit rate).",
+        )
+
+    def test_pickled_cache_resolves_to_process_cache(self) -> None:
+        process_palette_cache = get_process_palette_cache(5)
+
+        self.assertIs(pickle.loads(pickle.dumps(PaletteCache(capacity=5))), process_palette_cache)
+        self.assertIs(get_process_palette_cache(5), process_palette_cache)
+
+    def test_non_positive_capacity_raises_error(self) -> None:
+        with self.assertRaises(ValueError):
+            PaletteCache(capacity=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
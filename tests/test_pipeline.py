@@ -9,7 +9,16 @@ SOURCE_DIRECTORY = PROJECT_ROOT_DIRECTORY / "src"
 if str(SOURCE_DIRECTORY) not in sys.path:
     sys.path.insert(0, str(SOURCE_DIRECTORY))
 
-from pixelling.ops.pipeline import run_image_transformation_pipeline
+from pixelling.ops.pipeline import (
+    calculate_reduced_decode_size,
+    calculate_weighted_quantization_size,
+    compile_transformation_plan,
+    run_image_transformation_pipeline,
+)
+from pixelling.ops.grid import resize_image_to_fixed_grid
+from pixelling.ops.pixelate import pixelate_image_with_block_size
+from pixelling.ops.quantize import quantize_image_colors
+from sample_images import create_gradient_image
 
 
 class PipelineOperationTests(unittest.TestCase):
@@ -36,6 +45,49 @@ class PipelineOperationTests(unittest.TestCase):
 
         self.assertEqual(output_image.size, (4, 2))
 
+    def test_pipeline_pixel_mode_can_keep_logical_resolution(self) -> None:
+        input_image = Image.new("RGB", (12, 8), color=(120, 40, 220))
+
+        output_image = run_image_transformation_pipeline(
+            image=input_image,
+            transformation_mode="pixel",
+            block_size=4,
+            keep_logical_resolution=True,
+        )
+
+        self.assertEqual(output_image.size, (3, 2))
+
+    def test_pipeline_pixel_mode_quantizes_before_upscaling_with_identical_output(self) -> None:
+        for image_size, mode, sampling_method in (
+            ((48, 32), "RGB", "nearest"),
+            ((50, 37), "RGB", "mean"),
+            ((45, 64), "RGBA", "mode"),
+            ((61, 29), "L", "median"),
+        ):
+            with self.subTest(image_size=image_size, mode=mode, sampling_method=sampling_method):
+                input_image = create_gradient_image(*image_size, mode=mode)
+                expected_image = quantize_image_colors(
+                    pixelate_image_with_block_size(input_image, 4, sampling_method),
+                    color_count=6,
+                )
+
+                output_image = run_image_transformation_pipeline(
+                    image=input_image,
+                    transformation_mode="pixel",
+                    block_size=4,
+                    color_count=6,
+                    sampling_method=sampling_method,
+                )
+
+                self.assertEqual(output_image.mode, expected_image.mode)
+                self.assertEqual(output_image.size, expected_image.size)
+                self.assertEqual(output_image.tobytes(), expected_image.tobytes())
+
+    def test_calculate_weighted_quantization_size_enlarges_only_uneven_axes(self) -> None:
+        self.assertEqual(calculate_weighted_quantization_size((12, 8), (48, 32)), (12, 8))
+        self.assertEqual(calculate_weighted_quantization_size((12, 9), (50, 36)), (50, 9))
+        self.assertEqual(calculate_weighted_quantization_size((12, 9), (48, 37)), (12, 37))
+
     def test_pipeline_rejects_missing_pixel_argument(self) -> None:
         input_image = Image.new("RGB", (12, 8), color=(120, 40, 220))
 
@@ -55,6 +107,111 @@ class PipelineOperationTests(unittest.TestCase):
                 transformation_mode="unknown",
             )
 
+    def test_compiled_plan_matches_the_separate_operations(self) -> None:
+        input_image = create_gradient_image(50, 37, mode="RGBA")
+        for transformation_options, expected_image in (
+            (
+                {"transformation_mode": "pixel", "block_size": 4, "sampling_method": "mean"},
+                pixelate_image_with_block_size(input_image, 4, "mean"),
+            ),
+            (
+                {"transformation_mode": "grid", "grid_width": 8, "grid_height": 8, "color_count": 5},
+                quantize_image_colors(resize_image_to_fixed_grid(input_image, 8, 8), color_count=5),
+            ),
+        ):
+            with self.subTest(transformation_options=transformation_options):
+                transformation_plan = compile_transformation_plan(**transformation_options)
+
+                output_image = transformation_plan.apply(input_image)
+
+                self.assertEqual(output_image.mode, expected_image.mode)
+                self.assertEqual(output_image.size, expected_image.size)
+                self.assertEqual(output_image.tobytes(), expected_image.tobytes())
+
+    def test_compiled_plan_resolves_each_input_size_once(self) -> None:
+        transformation_plan = compile_transformation_plan(
+            transformation_mode="grid", grid_width=4, grid_height=4, block_size=3
+        )
+
+        resolved_plan = transformation_plan.resolve_input_size((40, 20))
+
+        self.assertIsNone(transformation_plan.block_size)
+        self.assertIs(
+            compile_transformation_plan(transformation_mode="grid", grid_width=4, grid_height=4, block_size=3),
+            transformation_plan,
+        )
+        self.assertIs(transformation_plan.resolve_input_size((40, 20)), resolved_plan)
+        self.assertEqual(resolved_plan.crop_box, (10, 0, 30, 20))
+        self.assertEqual(resolved_plan.output_size, (4, 4))
+
+    def test_compiled_plan_sizes_pixel_mode_quantization_by_output_weight(self) -> None:
+        transformation_plan = compile_transformation_plan(
+            transformation_mode="pixel", block_size=4, color_count=6
+        )
+
+        resolved_plan = transformation_plan.resolve_input_size((50, 36))
+
+        self.assertEqual(resolved_plan.logical_size, (12, 9))
+        self.assertEqual(resolved_plan.quantization_size, (50, 9))
+        self.assertEqual(resolved_plan.output_size, (50, 36))
+        with self.assertRaises(ValueError):
+            transformation_plan.resolve_input_size((3, 30))
+
+    def test_compile_transformation_plan_rejects_invalid_options(self) -> None:
+        for transformation_options in (
+            {"transformation_mode": "pixel", "block_size": 0},
+            {"transformation_mode": "pixel", "block_size": 2, "sampling_method": "unknown"},
+            {"transformation_mode": "grid", "grid_width": 4},
+            {"transformation_mode": "grid", "grid_width": 4, "grid_height": 4, "color_count": 0},
+        ):
+            with self.subTest(transformation_options=transformation_options):
+                with self.assertRaises(ValueError):
+                    compile_transformation_plan(**transformation_options)
+
+    def test_calculate_reduced_decode_size_covers_center_cropped_grid(self) -> None:
+        decode_size = calculate_reduced_decode_size(
+            input_size=(4000, 3000),
+            transformation_mode="grid",
+            grid_width=64,
+            grid_height=64,
+        )
+
+        self.assertEqual(decode_size, (86, 64))
+
+    def test_calculate_reduced_decode_size_requires_full_decode_for_large_grids(self) -> None:
+        decode_size = calculate_reduced_decode_size(
+            input_size=(100, 100),
+            transformation_mode="grid",
+            grid_width=80,
+            grid_height=80,
+        )
+
+        self.assertIsNone(decode_size)
+
+    def test_calculate_reduced_decode_size_in_pixel_mode_needs_logical_resolution(self) -> None:
+        full_size_decode = calculate_reduced_decode_size(
+            input_size=(4000, 3000),
+            transformation_mode="pixel",
+            block_size=16,
+        )
+        logical_decode = calculate_reduced_decode_size(
+            input_size=(4000, 3000),
+            transformation_mode="pixel",
+            block_size=16,
+            keep_logical_resolution=True,
+        )
+        median_logical_decode = calculate_reduced_decode_size(
+            input_size=(4000, 3000),
+            transformation_mode="pixel",
+            block_size=16,
+            sampling_method="median",
+            keep_logical_resolution=True,
+        )
+
+        self.assertIsNone(full_size_decode)
+        self.assertEqual(logical_decode, (500, 375))
+        self.assertIsNone(median_logical_decode)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -26,6 +26,66 @@ class PixelateOperationTests(unittest.TestCase):
         with self.assertRaises(ValueError):
             pixelate_image_with_block_size(input_image, block_size=0)
 
+    def test_pixelate_block_sampling_reduces_each_whole_block(self) -> None:
+        input_image = Image.new("RGB", (4, 2))
+        input_image.putdata(
+            [
+                (10, 0, 0),
+                (10, 0, 0),
+                (0, 0, 0),
+                (0, 0, 200),
+                (10, 0, 0),
+                (90, 0, 0),
+                (0, 0, 200),
+                (0, 0, 201),
+            ]
+        )
+
+        expected_left_block_colors = {
+            "mean": (30, 0, 0),
+            "median": (10, 0, 0),
+            "mode": (10, 0, 0),
+        }
+        expected_right_block_colors = {
+            "mean": (0, 0, 150),
+            "median": (0, 0, 200),
+            "mode": (0, 0, 200),
+        }
+        for sampling_method in ("mean", "median", "mode"):
+            output_image = pixelate_image_with_block_size(
+                input_image,
+                block_size=2,
+                sampling_method=sampling_method,
+            )
+
+            self.assertEqual(output_image.size, (4, 2))
+            self.assertEqual(
+                output_image.getpixel((1, 1)),
+                expected_left_block_colors[sampling_method],
+            )
+            self.assertEqual(
+                output_image.getpixel((2, 0)),
+                expected_right_block_colors[sampling_method],
+            )
+
+    def test_pixelate_block_sampling_keeps_alpha_channel(self) -> None:
+        input_image = Image.new("RGBA", (4, 4), color=(20, 40, 60, 100))
+
+        output_image = pixelate_image_with_block_size(
+            input_image,
+            block_size=2,
+            sampling_method="mode",
+        )
+
+        self.assertEqual(output_image.mode, "RGBA")
+        self.assertEqual(output_image.getpixel((3, 3)), (20, 40, 60, 100))
+
+    def test_pixelate_raises_error_for_unknown_sampling_method(self) -> None:
+        input_image = Image.new("RGB", (12, 8), color=(0, 0, 0))
+
+        with self.assertRaises(ValueError):
+            pixelate_image_with_block_size(input_image, block_size=2, sampling_method="unknown")
+
 
 if __name__ == "__main__":
     unittest.main()
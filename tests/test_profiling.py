@@ -0,0 +1,129 @@
+import contextlib
+import io
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from PIL import Image
+
+PROJECT_ROOT_DIRECTORY = Path(__file__).resolve().parents[1]
+SOURCE_DIRECTORY = PROJECT_ROOT_DIRECTORY / "src"
+if str(SOURCE_DIRECTORY) not in sys.path:
+    sys.path.insert(0, str(SOURCE_DIRECTORY))
+
+from pixelling.cli import run_command_line_interface
+from pixelling.ops.pipeline import run_image_transformation_pipeline
+from pixelling.profiling import (
+    DISABLED_STAGE_CONTEXT,
+    StageProfiler,
+    calculate_image_buffer_byte_count,
+    measure_pipeline_stage,
+)
+
+
+class ProfilingTests(unittest.TestCase):
+    def test_pipeline_records_each_stage_with_pixel_counts(self) -> None:
+        image = Image.new("RGB", (32, 16), color=(40, 80, 120))
+        stage_profiler = StageProfiler()
+
+        run_image_transformation_pipeline(
+            image=image,
+            transformation_mode="pixel",
+            block_size=4,
+            color_count=4,
+            stage_profiler=stage_profiler,
+        )
+
+        stage_names = [stage_record.name for stage_record in stage_profiler.stage_records]
+        self.assertEqual(stage_names, ["pixelate", "split_alpha", "quantize", "restore_mode", "upscale"])
+        pixelate_record = stage_profiler.stage_records[0]
+        self.assertEqual(pixelate_record.input_pixel_count, 32 * 16)
+        self.assertEqual(pixelate_record.output_pixel_count, 8 * 4)
+        self.assertEqual(pixelate_record.allocated_byte_count, 8 * 4 * 4)
+        upscale_record = stage_profiler.stage_records[-1]
+        self.assertEqual(upscale_record.output_pixel_count, 32 * 16)
+        for stage_record in stage_profiler.stage_records:
+            self.assertGreaterEqual(stage_record.duration_seconds, 0.0)
+
+    def test_profiler_passes_each_record_to_callbacks(self) -> None:
+        received_stage_names = []
+        stage_profiler = StageProfiler(
+            stage_callbacks=[lambda stage_record: received_stage_names.append(stage_record.name)]
+        )
+
+        run_image_transformation_pipeline(
+            image=Image.new("RGB", (12, 12)),
+            transformation_mode="grid",
+            grid_width=4,
+            grid_height=4,
+            stage_profiler=stage_profiler,
+        )
+
+        self.assertEqual(received_stage_names, ["resize"])
+
+    def test_chrome_trace_has_complete_events_with_stage_arguments(self) -> None:
+        stage_profiler = StageProfiler()
+        with stage_profiler.measure_stage("decode") as stage_measurement:
+            stage_measurement.record_output(Image.new("L", (5, 3)))
+
+        chrome_trace = stage_profiler.build_chrome_trace()
+
+        self.assertEqual(len(chrome_trace["traceEvents"]), 1)
+        trace_event = chrome_trace["traceEvents"][0]
+        self.assertEqual(trace_event["name"], "decode")
+        self.assertEqual(trace_event["ph"], "X")
+        self.assertEqual(trace_event["args"]["output_pixel_count"], 15)
+        self.assertEqual(trace_event["args"]["allocated_byte_count"], 15)
+        json.dumps(chrome_trace)
+
+    def test_disabled_profiling_returns_shared_no_op_context(self) -> None:
+        self.assertIs(measure_pipeline_stage(None, "pixelate"), DISABLED_STAGE_CONTEXT)
+        with measure_pipeline_stage(None, "pixelate") as stage_measurement:
+            stage_measurement.record_output(Image.new("RGB", (2, 2)))
+
+    def test_image_buffer_byte_count_follows_pillow_storage(self) -> None:
+        self.assertEqual(calculate_image_buffer_byte_count(Image.new("P", (4, 4))), 16)
+        self.assertEqual(calculate_image_buffer_byte_count(Image.new("RGB", (4, 4))), 64)
+        self.assertEqual(calculate_image_buffer_byte_count(None), 0)
+
+    def test_command_line_profile_writes_chrome_trace(self) -> None:
+        with tempfile.TemporaryDirectory() as temporary_directory_path:
+            input_image_path = Path(temporary_directory_path) / "input.png"
+            output_image_path = Path(temporary_directory_path) / "output.png"
+            trace_path = Path(temporary_directory_path) / "trace.json"
+            Image.new("RGB", (16, 16), color=(10, 20, 30)).save(input_image_path)
+
+            standard_error = io.StringIO()
+            with contextlib.redirect_stderr(standard_error):
+                exit_status = run_command_line_interface(
+                    [
+                        str(input_image_path),
+                        "--mode",
+                        "pixel",
+                        "--block-size",
+                        "4",
+                        "-o",
+                        str(output_image_path),
+                        "--profile",
+                        str(trace_path),
+                    ]
+                )
+
+            self.assertEqual(exit_status, 0)
+            with open(trace_path, encoding="utf-8") as trace_file:
+                chrome_trace = json.load(trace_file)
+            stage_names = [trace_event["name"] for trace_event in chrome_trace["traceEvents"]]
+            self.assertEqual(stage_names, ["probe", "decode", "pixelate", "upscale", "encode"])
+            self.assertIn("pixelate:", standard_error.getvalue())
+
+    def test_command_line_profile_rejects_multiple_jobs(self) -> None:
+        with self.assertRaises(ValueError):
+            run_command_line_interface(
+                ["input.png", "--mode", "pixel", "--block-size", "4", "--profile", "trace.json", "--jobs", "2"]
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -9,7 +9,11 @@ SOURCE_DIRECTORY = PROJECT_ROOT_DIRECTORY / "src"
 if str(SOURCE_DIRECTORY) not in sys.path:
     sys.path.insert(0, str(SOURCE_DIRECTORY))
 
-from pixelling.ops.quantize import quantize_image_colors
+from pixelling.ops.quantize import (
+    build_shared_palette_image,
+    map_image_to_shared_palette,
+    quantize_image_colors,
+)
 
 
 class QuantizeOperationTests(unittest.TestCase):
@@ -50,6 +54,33 @@ class QuantizeOperationTests(unittest.TestCase):
         with self.assertRaises(ValueError):
             quantize_image_colors(input_image, color_count=0)
 
+    def test_map_image_to_shared_palette_reuses_one_palette_for_every_image(self) -> None:
+        first_image = Image.new("RGB", (4, 4), color=(250, 0, 0))
+        second_image = Image.new("RGB", (4, 4), color=(0, 0, 250))
+        second_image.putpixel((0, 0), (240, 10, 10))
+
+        palette_image = build_shared_palette_image([first_image, second_image], color_count=2)
+        first_mapped_image = map_image_to_shared_palette(first_image, palette_image)
+        second_mapped_image = map_image_to_shared_palette(second_image, palette_image)
+
+        self.assertEqual(first_mapped_image.mode, "P")
+        self.assertEqual(first_mapped_image.getpalette(), second_mapped_image.getpalette())
+        self.assertEqual(
+            first_mapped_image.getpixel((1, 1)),
+            second_mapped_image.getpixel((0, 0)),
+        )
+
+    def test_map_image_to_shared_palette_marks_fully_transparent_pixels(self) -> None:
+        input_image = Image.new("RGBA", (2, 1))
+        input_image.putdata([(255, 0, 0, 0), (0, 255, 0, 255)])
+
+        palette_image = build_shared_palette_image([input_image], color_count=2)
+        mapped_image = map_image_to_shared_palette(input_image, palette_image)
+
+        transparency_index = mapped_image.info["transparency"]
+        self.assertEqual(mapped_image.getpixel((0, 0)), transparency_index)
+        self.assertNotEqual(mapped_image.getpixel((1, 0)), transparency_index)
+
 
 if __name__ == "__main__":
     unittest.main()
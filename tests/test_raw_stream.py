@@ -0,0 +1,174 @@
+import io
+import os
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+from PIL import Image
+
+PROJECT_ROOT_DIRECTORY = Path(__file__).resolve().parents[1]
+SOURCE_DIRECTORY = PROJECT_ROOT_DIRECTORY / "src"
+if str(SOURCE_DIRECTORY) not in sys.path:
+    sys.path.insert(0, str(SOURCE_DIRECTORY))
+
+from pixelling.ops.pipeline import run_image_transformation_pipeline
+from pixelling.raw_stream import (
+    calculate_stream_output_frame_size,
+    parse_stream_command_line_arguments,
+    read_exact_byte_count,
+    transform_raw_video_stream,
+)
+
+
+class ChunkedByteStream(io.RawIOBase):
+    def __init__(self, data: bytes, chunk_size: int) -> None:
+        self.data = data
+        self.position = 0
+        self.chunk_size = chunk_size
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> bytes:
+        size = min(size, self.chunk_size)
+        chunk = self.data[self.position : self.position + size]
+        self.position += len(chunk)
+        return chunk
+
+
+def create_gradient_frames(frame_count: int, frame_size: tuple[int, int], mode: str) -> list[Image.Image]:
+    frames = []
+    for frame_index in range(frame_count):
+        frame = Image.new(mode, frame_size)
+        frame.putdata(
+            [
+                (x * 9 + frame_index * 20, y * 13, (x + y) * 5, 255 - x)[: len(mode)]
+                for y in range(frame_size[1])
+                for x in range(frame_size[0])
+            ]
+        )
+        frames.append(frame)
+    return frames
+
+
+class RawStreamTests(unittest.TestCase):
+    def test_stream_output_matches_pipeline_for_each_frame(self) -> None:
+        frames = create_gradient_frames(3, (16, 12), "RGB")
+        output_stream = io.BytesIO()
+
+        frame_count = transform_raw_video_stream(
+            input_stream=io.BytesIO(b"".join(frame.tobytes() for frame in frames)),
+            output_stream=output_stream,
+            frame_size=(16, 12),
+            pixel_format="rgb24",
+            transformation_mode="pixel",
+            block_size=4,
+        )
+
+        self.assertEqual(frame_count, 3)
+        expected_bytes = b"".join(
+            run_image_transformation_pipeline(frame, "pixel", block_size=4).tobytes()
+            for frame in frames
+        )
+        self.assertEqual(output_stream.getvalue(), expected_bytes)
+
+    def test_stream_writes_rgba_grid_frames_with_one_global_palette(self) -> None:
+        frames = create_gradient_frames(4, (20, 10), "RGBA")
+        output_stream = io.BytesIO()
+
+        transform_raw_video_stream(
+            input_stream=io.BytesIO(b"".join(frame.tobytes() for frame in frames)),
+            output_stream=output_stream,
+            frame_size=(20, 10),
+            pixel_format="rgba",
+            transformation_mode="grid",
+            grid_width=5,
+            grid_height=5,
+            color_count=4,
+        )
+
+        output_bytes = output_stream.getvalue()
+        frame_byte_count = 5 * 5 * 4
+        self.assertEqual(len(output_bytes), 4 * frame_byte_count)
+        stream_colors = set()
+        for frame_index in range(4):
+            frame_bytes = output_bytes[frame_index * frame_byte_count : (frame_index + 1) * frame_byte_count]
+            output_frame = Image.frombytes("RGBA", (5, 5), frame_bytes)
+            stream_colors.update(color[:3] for _, color in output_frame.getcolors())
+        self.assertLessEqual(len(stream_colors), 4)
+
+    def test_frames_split_across_short_reads_are_reassembled(self) -> None:
+        input_stream = ChunkedByteStream(bytes(range(30)), chunk_size=7)
+
+        self.assertEqual(read_exact_byte_count(input_stream, 30), bytes(range(30)))
+        self.assertEqual(read_exact_byte_count(input_stream, 30), b"")
+
+    def test_truncated_final_frame_is_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            transform_raw_video_stream(
+                input_stream=io.BytesIO(bytes(8 * 8 * 3 + 5)),
+                output_stream=io.BytesIO(),
+                frame_size=(8, 8),
+                pixel_format="rgb24",
+                transformation_mode="pixel",
+                block_size=2,
+            )
+
+    def test_output_frame_size_follows_mode_and_upscale(self) -> None:
+        self.assertEqual(calculate_stream_output_frame_size((30, 20), "pixel", block_size=4), (30, 20))
+        self.assertEqual(
+            calculate_stream_output_frame_size((30, 20), "pixel", block_size=4, upscale_factor=3),
+            (21, 15),
+        )
+        self.assertEqual(
+            calculate_stream_output_frame_size((30, 20), "grid", grid_width=8, grid_height=6),
+            (8, 6),
+        )
+
+    def test_stream_arguments_default_to_global_palette_and_reject_file_options(self) -> None:
+        _, parsed_arguments = parse_stream_command_line_arguments(
+            ["--width", "8", "--height", "8", "--mode", "pixel", "--block-size", "2", "--color-count", "4"]
+        )
+        self.assertEqual(parsed_arguments.animated_palette, "global")
+
+        with self.assertRaises(ValueError):
+            parse_stream_command_line_arguments(
+                ["--width", "8", "--height", "8", "--mode", "pixel", "--block-size", "2", "-o", "out.png"]
+            )
+
+    def test_stream_command_pipes_raw_frames_and_reports_frame_rate(self) -> None:
+        frames = create_gradient_frames(2, (8, 8), "RGB")
+        environment = dict(os.environ, PYTHONPATH=str(SOURCE_DIRECTORY))
+
+        completed_process = subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "pixelling",
+                "stream",
+                "--width",
+                "8",
+                "--height",
+                "8",
+                "--mode",
+                "grid",
+                "--grid-width",
+                "4",
+                "--grid-height",
+                "2",
+            ],
+            input=b"".join(frame.tobytes() for frame in frames),
+            capture_output=True,
+            env=environment,
+            check=True,
+        )
+
+        self.assertEqual(len(completed_process.stdout), 2 * 4 * 2 * 3)
+        standard_error = completed_process.stderr.decode()
+        self.assertIn("Output frames: 4x2 rgb24.", standard_error)
+        self.assertIn("Streamed 2 frames", standard_error)
+
+
+if __name__ == "__main__":
+    unittest.main()
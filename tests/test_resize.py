@@ -9,7 +9,11 @@ SOURCE_DIRECTORY = PROJECT_ROOT_DIRECTORY / "src"
 if str(SOURCE_DIRECTORY) not in sys.path:
     sys.path.insert(0, str(SOURCE_DIRECTORY))
 
-from pixelling.ops.resize import resize_image_with_resampling, select_resampling_filter
+from pixelling.ops.resize import (
+    resize_image_with_resampling,
+    select_resampling_filter,
+    upscale_image_by_integer_factor,
+)
 
 
 class ResizeOperationTests(unittest.TestCase):
@@ -36,6 +40,20 @@ class ResizeOperationTests(unittest.TestCase):
                 resampling_filter=Image.Resampling.NEAREST,
             )
 
+    def test_upscale_image_by_integer_factor_repeats_each_pixel(self) -> None:
+        input_image = Image.new("RGB", (2, 1))
+        input_image.putdata([(255, 0, 0), (0, 0, 255)])
+
+        output_image = upscale_image_by_integer_factor(input_image, 3)
+
+        self.assertEqual(output_image.size, (6, 3))
+        self.assertEqual(output_image.getpixel((2, 2)), (255, 0, 0))
+        self.assertEqual(output_image.getpixel((3, 0)), (0, 0, 255))
+
+    def test_upscale_image_by_integer_factor_rejects_non_positive_factor(self) -> None:
+        with self.assertRaises(ValueError):
+            upscale_image_by_integer_factor(Image.new("RGB", (2, 2)), 0)
+
     def test_select_resampling_filter_accepts_trimmed_case_insensitive_name(self) -> None:
         selected_filter = select_resampling_filter("  Lanczos  ")
 
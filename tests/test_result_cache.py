@@ -0,0 +1,138 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from PIL import Image
+
+PROJECT_ROOT_DIRECTORY = Path(__file__).resolve().parents[1]
+SOURCE_DIRECTORY = PROJECT_ROOT_DIRECTORY / "src"
+if str(SOURCE_DIRECTORY) not in sys.path:
+    sys.path.insert(0, str(SOURCE_DIRECTORY))
+
+from pixelling.cli import run_command_line_interface
+from pixelling.result_cache import (
+    ResultCache,
+    build_result_cache_key,
+    normalize_result_cache_parameters,
+)
+
+
+class ResultCacheTests(unittest.TestCase):
+    def test_cache_key_ignores_options_of_the_other_mode(self) -> None:
+        with tempfile.TemporaryDirectory() as temporary_directory_path:
+            input_image_path = Path(temporary_directory_path) / "input.png"
+            Image.new("RGB", (8, 8), color=(1, 2, 3)).save(input_image_path)
+
+            pixel_key = build_result_cache_key(
+                str(input_image_path),
+                normalize_result_cache_parameters("pixel", ".png", block_size=2, sampling_method="nearest"),
+            )
+            pixel_key_with_grid_options = build_result_cache_key(
+                str(input_image_path),
+                normalize_result_cache_parameters(
+                    "pixel", ".png", block_size=2, grid_width=4, grid_height=4, sampling_method="nearest"
+                ),
+            )
+            other_block_size_key = build_result_cache_key(
+                str(input_image_path),
+                normalize_result_cache_parameters("pixel", ".png", block_size=4, sampling_method="nearest"),
+            )
+
+            self.assertEqual(pixel_key, pixel_key_with_grid_options)
+            self.assertNotEqual(pixel_key, other_block_size_key)
+
+    def test_cache_key_changes_with_input_bytes(self) -> None:
+        with tempfile.TemporaryDirectory() as temporary_directory_path:
+            input_image_path = Path(temporary_directory_path) / "input.png"
+            normalized_parameters = normalize_result_cache_parameters("grid", ".png", grid_width=4, grid_height=4)
+
+            Image.new("RGB", (8, 8), color=(1, 2, 3)).save(input_image_path)
+            first_key = build_result_cache_key(str(input_image_path), normalized_parameters)
+            Image.new("RGB", (8, 8), color=(3, 2, 1)).save(input_image_path)
+            second_key = build_result_cache_key(str(input_image_path), normalized_parameters)
+
+            self.assertNotEqual(first_key, second_key)
+
+    def test_stored_output_is_copied_back_and_counted(self) -> None:
+        with tempfile.TemporaryDirectory() as temporary_directory_path:
+            result_cache = ResultCache(str(Path(temporary_directory_path) / "cache"))
+            output_image_path = Path(temporary_directory_path) / "output.png"
+            copied_image_path = Path(temporary_directory_path) / "copied.png"
+            output_image_path.write_bytes(b"encoded output")
+
+            self.assertFalse(result_cache.copy_cached_output("key", str(copied_image_path)))
+            result_cache.store_output("key", str(output_image_path))
+            self.assertTrue(result_cache.copy_cached_output("key", str(copied_image_path)))
+
+            self.assertEqual(copied_image_path.read_bytes(), b"encoded output")
+            self.assertEqual((result_cache.hit_count, result_cache.miss_count), (1, 1))
+            self.assertEqual(result_cache.format_statistics(), "Result cache: 1 hits, 1 misses.")
+
+    def test_eviction_keeps_files_the_cache_did_not_write(self) -> None:
+        with tempfile.TemporaryDirectory() as temporary_directory_path:
+            cache_directory_path = Path(temporary_directory_path) / "cache"
+            cache_directory_path.mkdir()
+            foreign_file_paths = [cache_directory_path / f"notes{note_index}.txt" for note_index in range(3)]
+            for foreign_file_path in foreign_file_paths:
+                foreign_file_path.write_bytes(b"x" * 100)
+                os.utime(foreign_file_path, (1000, 1000))
+            result_cache = ResultCache(str(cache_directory_path), maximum_byte_count=20)
+            output_image_path = Path(temporary_directory_path) / "output.png"
+            output_image_path.write_bytes(b"0123456789")
+
+            for cache_key in ("first", "second", "third"):
+                result_cache.store_output(cache_key, str(output_image_path))
+
+            self.assertTrue(all(foreign_file_path.exists() for foreign_file_path in foreign_file_paths))
+            self.assertFalse(os.path.exists(result_cache.build_entry_path("first", ".png")))
+            self.assertTrue(os.path.exists(result_cache.build_entry_path("third", ".png")))
+
+    def test_least_recently_used_entry_is_evicted_first(self) -> None:
+        with tempfile.TemporaryDirectory() as temporary_directory_path:
+            result_cache = ResultCache(str(Path(temporary_directory_path) / "cache"), maximum_byte_count=20)
+            output_image_path = Path(temporary_directory_path) / "output.png"
+            output_image_path.write_bytes(b"0123456789")
+
+            result_cache.store_output("first", str(output_image_path))
+            result_cache.store_output("second", str(output_image_path))
+            first_entry_path = result_cache.build_entry_path("first", ".png")
+            second_entry_path = result_cache.build_entry_path("second", ".png")
+            os.utime(first_entry_path, (1000, 1000))
+            os.utime(second_entry_path, (2000, 2000))
+            result_cache.copy_cached_output("first", str(Path(temporary_directory_path) / "copied.png"))
+            result_cache.store_output("third", str(output_image_path))
+
+            self.assertTrue(os.path.exists(first_entry_path))
+            self.assertFalse(os.path.exists(second_entry_path))
+            self.assertTrue(os.path.exists(result_cache.build_entry_path("third", ".png")))
+
+    def test_command_line_cache_hit_skips_decoding(self) -> None:
+        with tempfile.TemporaryDirectory() as temporary_directory_path:
+            input_image_path = Path(temporary_directory_path) / "input.png"
+            first_output_image_path = Path(temporary_directory_path) / "first.png"
+            second_output_image_path = Path(temporary_directory_path) / "second.png"
+            cache_directory_path = Path(temporary_directory_path) / "cache"
+            Image.effect_noise((16, 16), 50).convert("RGB").save(input_image_path)
+            command_line_arguments = [
+                str(input_image_path),
+                "--mode",
+                "pixel",
+                "--block-size",
+                "4",
+                "--cache-dir",
+                str(cache_directory_path),
+            ]
+
+            run_command_line_interface(command_line_arguments + ["-o", str(first_output_image_path)])
+            with patch("pixelling.transform.probe_media_source") as probe_media_source_mock:
+                run_command_line_interface(command_line_arguments + ["-o", str(second_output_image_path)])
+
+            probe_media_source_mock.assert_not_called()
+            self.assertEqual(second_output_image_path.read_bytes(), first_output_image_path.read_bytes())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,325 @@
+import http.client
+import io
+import json
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+from PIL import Image
+
+PROJECT_ROOT_DIRECTORY = Path(__file__).resolve().parents[1]
+SOURCE_DIRECTORY = PROJECT_ROOT_DIRECTORY / "src"
+if str(SOURCE_DIRECTORY) not in sys.path:
+    sys.path.insert(0, str(SOURCE_DIRECTORY))
+
+from pixelling.transform import transform_image_file
+from pixelling.server import (
+    ServerJobQueue,
+    build_job_command_line_arguments,
+    build_server_path_job,
+    create_transformation_server,
+)
+
+
+class UnixSocketHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path: str) -> None:
+        super().__init__("localhost")
+        self.socket_path = socket_path
+
+    def connect(self) -> None:
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(self.socket_path)
+
+
+def create_input_image_bytes() -> bytes:
+    input_image = Image.new("RGB", (16, 16))
+    for x_coordinate in range(16):
+        for y_coordinate in range(16):
+            input_image.putpixel((x_coordinate, y_coordinate), (x_coordinate * 16, y_coordinate * 16, 90))
+    image_buffer = io.BytesIO()
+    input_image.save(image_buffer, format="PNG")
+    return image_buffer.getvalue()
+
+
+def hold_server_worker(seconds: float) -> None:
+    time.sleep(seconds)
+
+
+def stop_server_worker() -> None:
+    os._exit(1)
+
+
+class TransformationServerTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.job_queue = ServerJobQueue(worker_count=1, queue_size=0)
+        cls.job_queue.warm_up()
+        cls.root_directory = tempfile.TemporaryDirectory()
+        cls.http_server = create_transformation_server(
+            cls.job_queue, port=0, path_job_root_paths=[cls.root_directory.name]
+        )
+        cls.server_thread = threading.Thread(target=cls.http_server.serve_forever, daemon=True)
+        cls.server_thread.start()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.http_server.shutdown()
+        cls.http_server.server_close()
+        cls.job_queue.close()
+        cls.root_directory.cleanup()
+
+    def send_request(
+        self,
+        method: str,
+        path: str,
+        request_body: bytes | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> tuple[int, dict[str, str], bytes]:
+        connection = http.client.HTTPConnection("127.0.0.1", self.http_server.server_address[1])
+        try:
+            connection.request(method, path, body=request_body, headers=headers or {})
+            response = connection.getresponse()
+            return response.status, dict(response.getheaders()), response.read()
+        finally:
+            connection.close()
+
+    def test_bytes_job_matches_command_line_output(self) -> None:
+        input_image_bytes = create_input_image_bytes()
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            input_image_path = os.path.join(temporary_directory, "input.png")
+            expected_output_path = os.path.join(temporary_directory, "expected.png")
+            Path(input_image_path).write_bytes(input_image_bytes)
+            transform_image_file(
+                input_image_path=input_image_path,
+                output_image_path=expected_output_path,
+                allow_overwrite=True,
+                transformation_mode="pixel",
+                block_size=4,
+                color_count=4,
+            )
+
+            status, headers, response_body = self.send_request(
+                "POST",
+                "/transform?mode=pixel&block_size=4&color-count=4",
+                input_image_bytes,
+            )
+
+            self.assertEqual(status, 200)
+            self.assertEqual(headers["Content-Type"], "image/png")
+            self.assertEqual(response_body, Path(expected_output_path).read_bytes())
+
+    def send_path_job(self, job_options: dict[str, object]) -> tuple[int, dict[str, object]]:
+        status, _, response_body = self.send_request(
+            "POST",
+            "/transform",
+            json.dumps(job_options).encode(),
+            {"Content-Type": "application/json"},
+        )
+        return status, json.loads(response_body)
+
+    def test_path_job_writes_output_file(self) -> None:
+        with tempfile.TemporaryDirectory(dir=self.root_directory.name) as temporary_directory:
+            input_image_path = os.path.join(temporary_directory, "input.png")
+            Path(input_image_path).write_bytes(create_input_image_bytes())
+
+            status, _, response_body = self.send_request(
+                "POST",
+                "/transform",
+                json.dumps(
+                    {"input_image_path": input_image_path, "mode": "grid", "grid_width": 4, "grid_height": 2}
+                ).encode(),
+                {"Content-Type": "application/json"},
+            )
+
+            self.assertEqual(status, 200)
+            response_object = json.loads(response_body)
+            self.assertEqual(
+                response_object["output_image_path"],
+                os.path.join(temporary_directory, "input_pixelling.png"),
+            )
+            with Image.open(response_object["output_image_path"]) as output_image:
+                self.assertEqual(output_image.size, (4, 2))
+
+    def test_invalid_options_are_rejected_with_bad_request(self) -> None:
+        for path in (
+            "/transform?mode=pixel",
+            "/transform?mode=pixel&block_size=4&grid_width=3",
+            "/transform?mode=pixel&block_size=4&jobs=2",
+            "/transform?mode=pixel&block_size=4&format=nope",
+        ):
+            with self.subTest(path=path):
+                status, _, response_body = self.send_request("POST", path, b"image")
+
+                self.assertEqual(status, 400)
+                self.assertIn("error", json.loads(response_body))
+
+    def test_bytes_jobs_refuse_options_that_name_server_files(self) -> None:
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            for query in (
+                f"cache_dir={temporary_directory}",
+                "cache-size-mb=10",
+                "overwrite=1",
+                f"output_image_path={temporary_directory}/output.png",
+            ):
+                with self.subTest(query=query):
+                    status, _, _ = self.send_request(
+                        "POST", f"/transform?mode=pixel&block_size=4&{query}", create_input_image_bytes()
+                    )
+
+                    self.assertEqual(status, 400)
+            self.assertEqual(os.listdir(temporary_directory), [])
+
+    def test_path_jobs_outside_the_root_are_forbidden(self) -> None:
+        with tempfile.TemporaryDirectory() as outside_directory:
+            outside_input_path = os.path.join(outside_directory, "input.png")
+            inside_input_path = os.path.join(self.root_directory.name, "inside.png")
+            Path(outside_input_path).write_bytes(create_input_image_bytes())
+            Path(inside_input_path).write_bytes(create_input_image_bytes())
+            os.symlink(outside_directory, os.path.join(self.root_directory.name, "link"))
+            base_options = {"mode": "pixel", "block_size": 4}
+
+            for job_options in (
+                {"input_image_path": outside_input_path},
+                {"input_image_path": inside_input_path, "output_image_path": outside_directory + "/out.png"},
+                {"input_image_path": inside_input_path, "cache_dir": outside_directory},
+                {"input_image_path": os.path.join(self.root_directory.name, "link", "input.png")},
+            ):
+                with self.subTest(job_options=job_options):
+                    status, response_object = self.send_path_job({**job_options, **base_options})
+
+                    self.assertEqual(status, 403)
+                    self.assertIn("root", response_object["error"])
+            self.assertEqual(sorted(os.listdir(outside_directory)), ["input.png"])
+
+    def test_unreadable_image_reports_unprocessable_entity(self) -> None:
+        status, _, response_body = self.send_request(
+            "POST", "/transform?mode=pixel&block_size=4", b"not an image"
+        )
+
+        self.assertEqual(status, 422)
+        self.assertIn("UnidentifiedImageError", json.loads(response_body)["error"])
+
+    def test_full_queue_refuses_jobs_with_retry_after(self) -> None:
+        held_future = self.job_queue.try_submit_job(hold_server_worker, 0.5)
+        try:
+            status, headers, _ = self.send_request(
+                "POST", "/transform?mode=pixel&block_size=4", create_input_image_bytes()
+            )
+        finally:
+            held_future.result()
+
+        self.assertEqual(status, 503)
+        self.assertEqual(headers["Retry-After"], "1")
+
+    def test_jobs_run_again_after_a_worker_process_dies(self) -> None:
+        stopped_future = self.job_queue.try_submit_job(stop_server_worker)
+        with self.assertRaises(BrokenProcessPool):
+            stopped_future.result()
+
+        status, _, response_body = self.send_request(
+            "POST", "/transform?mode=pixel&block_size=4", create_input_image_bytes()
+        )
+
+        self.assertEqual(status, 200, response_body)
+
+    def test_health_counts_result_cache_hits_of_path_jobs(self) -> None:
+        _, _, response_body = self.send_request("GET", "/health")
+        initial_counts = json.loads(response_body)
+        with tempfile.TemporaryDirectory(dir=self.root_directory.name) as temporary_directory:
+            input_image_path = os.path.join(temporary_directory, "input.png")
+            Path(input_image_path).write_bytes(create_input_image_bytes())
+            job_options = {
+                "input_image_path": input_image_path,
+                "mode": "pixel",
+                "block_size": 4,
+                "cache_dir": os.path.join(temporary_directory, "cache"),
+            }
+
+            cache_hits = [self.send_path_job(job_options)[1]["cache_hit"] for _ in range(2)]
+
+        _, _, response_body = self.send_request("GET", "/health")
+        final_counts = json.loads(response_body)
+        self.assertEqual(cache_hits, [False, True])
+        for count_name in ("result_cache_hit_count", "result_cache_miss_count"):
+            self.assertEqual(final_counts[count_name] - initial_counts[count_name], 1)
+
+    def test_health_reports_worker_state(self) -> None:
+        status, _, response_body = self.send_request("GET", "/health")
+
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(response_body)["worker_count"], 1)
+
+
+class TransformationServerHelperTests(unittest.TestCase):
+    def test_job_options_become_command_line_arguments(self) -> None:
+        command_line_arguments = build_job_command_line_arguments(
+            "input.png",
+            {"mode": "pixel", "block-size": 8, "full_decode": True, "strips": False, "upscale": None},
+        )
+
+        self.assertEqual(
+            command_line_arguments,
+            ["input.png", "--mode", "pixel", "--block-size", "8", "--full-decode"],
+        )
+
+    def test_unix_socket_server_answers_health_checks(self) -> None:
+        job_queue = ServerJobQueue(worker_count=1)
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            socket_path = os.path.join(temporary_directory, "pixelling.sock")
+            http_server = create_transformation_server(job_queue, socket_path=socket_path)
+            server_thread = threading.Thread(target=http_server.serve_forever, daemon=True)
+            server_thread.start()
+            try:
+                connection = UnixSocketHTTPConnection(socket_path)
+                connection.request("GET", "/health")
+                response = connection.getresponse()
+                response_object = json.loads(response.read())
+                connection.close()
+            finally:
+                http_server.shutdown()
+                http_server.server_close()
+                job_queue.close()
+
+        self.assertEqual(response.status, 200)
+        self.assertEqual(response_object["status"], "ok")
+
+    def test_unix_socket_server_only_removes_its_own_socket(self) -> None:
+        job_queue = ServerJobQueue(worker_count=1)
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            socket_path = os.path.join(temporary_directory, "pixelling.sock")
+            Path(socket_path).write_text("not a socket")
+            with self.assertRaises(ValueError):
+                create_transformation_server(job_queue, socket_path=socket_path)
+            self.assertEqual(Path(socket_path).read_text(), "not a socket")
+
+            os.remove(socket_path)
+            stale_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            stale_socket.bind(socket_path)
+            stale_socket.close()
+            http_server = create_transformation_server(job_queue, socket_path=socket_path)
+            http_server.server_close()
+            os.remove(socket_path)
+            Path(socket_path).write_text("replaced")
+            http_server.remove_socket_file()
+            self.assertEqual(Path(socket_path).read_text(), "replaced")
+
+            os.remove(socket_path)
+            http_server = create_transformation_server(job_queue, socket_path=socket_path)
+            http_server.server_close()
+            http_server.remove_socket_file()
+            self.assertFalse(os.path.exists(socket_path))
+        job_queue.close()
+
+    def test_server_without_roots_refuses_path_jobs(self) -> None:
+        with self.assertRaises(PermissionError):
+            build_server_path_job(b'{"input_image_path": "input.png", "mode": "pixel", "block_size": 4}')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import contextlib
+import io
+import os
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+PROJECT_ROOT_DIRECTORY = Path(__file__).resolve().parents[1]
+SOURCE_DIRECTORY = PROJECT_ROOT_DIRECTORY / "src"
+BENCHMARK_DIRECTORY = PROJECT_ROOT_DIRECTORY / "benchmarks"
+for import_directory in (SOURCE_DIRECTORY, BENCHMARK_DIRECTORY):
+    if str(import_directory) not in sys.path:
+        sys.path.insert(0, str(import_directory))
+
+from benchmark_startup import is_pillow_module_name, measure_help_import_times
+from benchmark_startup import main as run_startup_benchmark
+
+
+def run_python_in_subprocess(python_arguments: list[str]) -> subprocess.CompletedProcess:
+    environment = dict(os.environ, PYTHONPATH=str(SOURCE_DIRECTORY))
+    return subprocess.run(
+        [sys.executable, *python_arguments],
+        capture_output=True,
+        text=True,
+        env=environment,
+        cwd=PROJECT_ROOT_DIRECTORY,
+    )
+
+
+class CommandLineStartupTests(unittest.TestCase):
+    def test_help_does_not_import_pillow(self) -> None:
+        import_times = measure_help_import_times()
+
+        self.assertIn("pixelling.cli", import_times)
+        self.assertEqual(
+            [module_name for module_name in import_times if is_pillow_module_name(module_name)],
+            [],
+        )
+
+    def test_startup_benchmark_fails_past_its_import_time_limit(self) -> None:
+        with contextlib.redirect_stdout(io.StringIO()) as benchmark_output:
+            exit_status = run_startup_benchmark(["--repeat", "1", "--max-import-ms", "0.001"])
+
+        self.assertEqual(exit_status, 1)
+        self.assertIn("over the 0.001ms limit", benchmark_output.getvalue())
+
+    def test_argument_validation_error_does_not_import_pillow(self) -> None:
+        completed_process = run_python_in_subprocess(
+            [
+                "-c",
+                "import sys\n"
+                "from pixelling.cli import run_command_line_interface\n"
+                "try:\n"
+                "    run_command_line_interface(['input.png', '--mode', 'pixel'])\n"
+                "except ValueError as error:\n"
+                "    print(error)\n"
+                "print(sorted(name for name in sys.modules if name.split('.')[0] == 'PIL'))\n",
+            ]
+        )
+
+        self.assertEqual(completed_process.returncode, 0, completed_process.stderr)
+        self.assertEqual(
+            completed_process.stdout.splitlines(),
+            ["Block size must be provided for pixel mode.", "[]"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
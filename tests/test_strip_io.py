@@ -0,0 +1,122 @@
+import sys
+import tempfile
+import unittest
+import warnings
+from pathlib import Path
+
+from PIL import Image
+
+PROJECT_ROOT_DIRECTORY = Path(__file__).resolve().parents[1]
+SOURCE_DIRECTORY = PROJECT_ROOT_DIRECTORY / "src"
+if str(SOURCE_DIRECTORY) not in sys.path:
+    sys.path.insert(0, str(SOURCE_DIRECTORY))
+
+from pixelling.ops.pixelate import pixelate_image_with_block_size
+from pixelling.strip_io import (
+    find_raw_row_layout,
+    open_image_row_reader,
+    pixelate_image_file_in_strips,
+)
+from sample_images import create_noise_image
+
+
+class StripInputOutputTests(unittest.TestCase):
+    def test_row_reader_reads_rows_of_uncompressed_and_compressed_files(self) -> None:
+        input_image = create_noise_image(13, 9)
+
+        with tempfile.TemporaryDirectory() as temporary_directory_path:
+            for file_name in ("input.ppm", "input.bmp", "input.tif", "input.png"):
+                with self.subTest(file_name=file_name):
+                    input_image_path = Path(temporary_directory_path) / file_name
+                    input_image.save(input_image_path)
+
+                    with warnings.catch_warnings(record=True) as caught_warnings:
+                        warnings.simplefilter("always")
+                        with open_image_row_reader(str(input_image_path)) as (image_size, read_image_rows):
+                            rows_image = read_image_rows(2, 7)
+
+                    self.assertEqual(len(caught_warnings), 1 if file_name == "input.png" else 0)
+
+                    self.assertEqual(image_size, (13, 9))
+                    self.assertEqual(rows_image.tobytes(), input_image.crop((0, 2, 13, 7)).tobytes())
+
+    def test_raw_row_layout_is_found_only_for_uncompressed_files(self) -> None:
+        input_image = create_noise_image(8, 8)
+
+        with tempfile.TemporaryDirectory() as temporary_directory_path:
+            uncompressed_image_path = Path(temporary_directory_path) / "input.ppm"
+            compressed_image_path = Path(temporary_directory_path) / "input.png"
+            input_image.save(uncompressed_image_path)
+            input_image.save(compressed_image_path)
+
+            with Image.open(uncompressed_image_path) as uncompressed_image:
+                self.assertIsNotNone(find_raw_row_layout(uncompressed_image))
+            with Image.open(compressed_image_path) as compressed_image:
+                self.assertIsNone(find_raw_row_layout(compressed_image))
+
+    def test_strip_output_matches_in_memory_pixelation(self) -> None:
+        input_image = create_noise_image(37, 29)
+
+        with tempfile.TemporaryDirectory() as temporary_directory_path:
+            input_image_path = Path(temporary_directory_path) / "input.bmp"
+            input_image.save(input_image_path)
+
+            for output_file_name in ("output.png", "output.ppm"):
+                for sampling_method in ("nearest", "mean"):
+                    with self.subTest(output_file_name=output_file_name, sampling_method=sampling_method):
+                        output_image_path = Path(temporary_directory_path) / output_file_name
+                        pixelate_image_file_in_strips(
+                            input_image_path=str(input_image_path),
+                            output_image_path=str(output_image_path),
+                            block_size=4,
+                            sampling_method=sampling_method,
+                            band_block_row_count=2,
+                        )
+
+                        expected_image = pixelate_image_with_block_size(input_image, 4, sampling_method)
+                        with Image.open(output_image_path) as saved_image:
+                            self.assertEqual(saved_image.mode, expected_image.mode)
+                            self.assertEqual(saved_image.tobytes(), expected_image.tobytes())
+
+    def test_compressed_input_is_decoded_whole_with_a_warning(self) -> None:
+        input_image = create_noise_image(21, 17)
+
+        with tempfile.TemporaryDirectory() as temporary_directory_path:
+            for input_file_name, save_options in (
+                ("input.png", {}),
+                ("input.jpg", {"quality": 95}),
+                ("input.tif", {"compression": "tiff_deflate"}),
+            ):
+                with self.subTest(input_file_name=input_file_name):
+                    input_image_path = Path(temporary_directory_path) / input_file_name
+                    output_image_path = Path(temporary_directory_path) / "output.png"
+                    input_image.save(input_image_path, **save_options)
+
+                    with self.assertWarnsRegex(RuntimeWarning, "decoded into memory"):
+                        pixelate_image_file_in_strips(
+                            input_image_path=str(input_image_path),
+                            output_image_path=str(output_image_path),
+                            block_size=4,
+                            band_block_row_count=2,
+                        )
+
+                    with Image.open(input_image_path) as decoded_input_image:
+                        expected_image = pixelate_image_with_block_size(decoded_input_image.convert("RGB"), 4)
+                    with Image.open(output_image_path) as saved_image:
+                        self.assertEqual(saved_image.tobytes(), expected_image.tobytes())
+
+    def test_strip_output_rejects_unsupported_extension(self) -> None:
+        with tempfile.TemporaryDirectory() as temporary_directory_path:
+            input_image_path = Path(temporary_directory_path) / "input.png"
+            create_noise_image(8, 8).save(input_image_path)
+
+            with self.assertRaises(ValueError):
+                pixelate_image_file_in_strips(
+                    input_image_path=str(input_image_path),
+                    output_image_path=str(Path(temporary_directory_path) / "output.jpg"),
+                    block_size=2,
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import sys
+import unittest
+from pathlib import Path
+
+from PIL import Image
+
+PROJECT_ROOT_DIRECTORY = Path(__file__).resolve().parents[1]
+SOURCE_DIRECTORY = PROJECT_ROOT_DIRECTORY / "src"
+if str(SOURCE_DIRECTORY) not in sys.path:
+    sys.path.insert(0, str(SOURCE_DIRECTORY))
+
+from pixelling.ops.pixelate import pixelate_image_with_block_size
+from pixelling.ops.strip_pixelate import (
+    calculate_nearest_source_indices,
+    iterate_pixelated_image_bands,
+)
+from sample_images import create_noise_image
+
+
+def stack_image_bands(image_bands: list[Image.Image]) -> Image.Image:
+    stacked_image = Image.new(image_bands[0].mode, (image_bands[0].width, sum(band.height for band in image_bands)))
+    top_row = 0
+    for image_band in image_bands:
+        stacked_image.paste(image_band, (0, top_row))
+        top_row += image_band.height
+    return stacked_image
+
+
+class StripPixelateOperationTests(unittest.TestCase):
+    def test_nearest_source_indices_match_pillow_resize(self) -> None:
+        column_image = Image.new("L", (1, 11))
+        column_image.putdata([row * 20 for row in range(11)])
+
+        source_indices = calculate_nearest_source_indices(11, 3)
+        resized_column_image = column_image.resize((1, 3), resample=Image.Resampling.NEAREST)
+
+        self.assertEqual([index * 20 for index in source_indices], list(resized_column_image.getdata()))
+
+    def test_bands_match_in_memory_pixelation_for_every_sampling_method(self) -> None:
+        input_image = create_noise_image(53, 41)
+
+        for sampling_method in ("nearest", "mean", "median", "mode"):
+            for band_block_row_count in (1, 3, 100):
+                with self.subTest(sampling_method=sampling_method, band_block_row_count=band_block_row_count):
+                    image_bands = list(
+                        iterate_pixelated_image_bands(
+                            read_image_rows=lambda top_row, bottom_row: input_image.crop(
+                                (0, top_row, input_image.width, bottom_row)
+                            ),
+                            image_size=input_image.size,
+                            block_size=5,
+                            sampling_method=sampling_method,
+                            band_block_row_count=band_block_row_count,
+                        )
+                    )
+                    expected_image = pixelate_image_with_block_size(input_image, 5, sampling_method)
+
+                    self.assertEqual(stack_image_bands(image_bands).tobytes(), expected_image.tobytes())
+
+    def test_nearest_bands_read_only_one_row_per_block_row(self) -> None:
+        input_image = create_noise_image(24, 24)
+        requested_row_ranges: list[tuple[int, int]] = []
+
+        def read_image_rows(top_row: int, bottom_row: int) -> Image.Image:
+            requested_row_ranges.append((top_row, bottom_row))
+            return input_image.crop((0, top_row, input_image.width, bottom_row))
+
+        list(
+            iterate_pixelated_image_bands(
+                read_image_rows=read_image_rows,
+                image_size=input_image.size,
+                block_size=6,
+            )
+        )
+
+        self.assertEqual(len(requested_row_ranges), 4)
+        self.assertTrue(all(bottom_row - top_row == 1 for top_row, bottom_row in requested_row_ranges))
+
+    def test_bands_raise_error_when_block_size_is_not_positive(self) -> None:
+        with self.assertRaises(ValueError):
+            next(iterate_pixelated_image_bands(lambda top_row, bottom_row: None, (8, 8), 0))
+
+
+if __name__ == "__main__":
+    unittest.main()